@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Defines AsyncAvroConsumer, an asyncio facade over AvroConsumerApi
+"""
+import asyncio
+import threading
+import traceback
+from typing import Tuple
+
+from confluent_kafka.avro import SerializerError
+from confluent_kafka.cimpl import KafkaError
+
+from fabric_mb.message_bus.base import Base
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.dead_letter import RoutingException
+from fabric_mb.message_bus.messages.message import IMessageAvro
+
+# Queued by the poll thread once it stops
+_STOPPED = object()
+
+
+class AsyncAvroConsumer(Base):
+    """
+    Exposes the messages received by AvroConsumerApi through async for. A background thread polls the consumer
+    and hands the messages over to the event loop. Uses Kafka's auto commit; offsets of up to max_pending
+    messages may be committed before the messages are processed.
+
+        async with AsyncAvroConsumer(consumer) as async_consumer:
+            async for message in async_consumer:
+                ...
+    """
+    def __init__(self, consumer: AvroConsumerApi, max_pending: int = 1000, poll_timeout: float = 1.0,
+                 logger=None):
+        """
+        Initialize the asynchronous consumer
+        :param consumer: consumer used to receive and decode the messages
+        :param max_pending: maximum number of messages received but not yet taken by the event loop; polling
+                            pauses while the limit is reached. If the consumer has a flow_control, polling goes on
+                            and the partitions with too many messages pending are paused instead, so that the
+                            consumer does not exceed max.poll.interval.ms while the event loop catches up
+        :param poll_timeout: maximum time in seconds the background thread blocks in poll
+        :param logger: logger; defaults to the logger of the consumer
+        """
+        super().__init__(logger if logger is not None else consumer.logger)
+        self.consumer = consumer
+        self.poll_timeout = poll_timeout
+        self.slots = threading.Semaphore(max_pending)
+        # (topic, partition) -> messages received but not yet taken by the event loop, with flow control
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.loop = None
+        self.queue = None
+        self.thread = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> IMessageAvro:
+        self.start()
+        item = await self.queue.get()
+        if item is _STOPPED:
+            # Keep ending any further iteration
+            self.queue.put_nowait(_STOPPED)
+            raise StopAsyncIteration
+        message, tp = item
+        if self.consumer.flow_control is None:
+            self.slots.release()
+        else:
+            with self.pending_lock:
+                self.pending[tp] -= 1
+        return message
+
+    def start(self):
+        """
+        Subscribe and start the poll thread; must be called from the event loop consuming the messages.
+        Invoked by the first iteration if not called explicitly
+        """
+        if self.thread is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.thread = threading.Thread(target=self._poll_loop, name="AsyncAvroConsumer", daemon=True)
+        self.thread.start()
+
+    def _hand_over(self, item):
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+        except RuntimeError:
+            self.log_error("Event loop closed, dropping message")
+
+    def _poll(self) -> Tuple[IMessageAvro, Tuple[str, int]]:
+        try:
+            msg = self.consumer.poll(self.poll_timeout)
+
+            # There were no messages on the queue, continue polling
+            if msg is None:
+                return None
+
+            if msg.error():
+                if msg.error().code() != KafkaError._PARTITION_EOF:
+                    self.log_error("Consumer error: {}".format(msg.error()))
+                return None
+
+            # Stored as handed over, as enable.auto.offset.store would
+            self.consumer.store_offsets([msg])
+            return self.consumer.create_message(msg.value()), (msg.topic(), msg.partition())
+        except SerializerError as e:
+            # Report malformed record, discard results, continue polling
+            self.log_error("Message deserialization failed {}".format(e))
+        except RoutingException:
+            # Stop polling rather than commit past the record
+            raise
+        except Exception as e:
+            self.log_error("Discarding message: {}".format(e))
+            self.log_error(traceback.format_exc())
+        return None
+
+    def _poll_loop(self):
+        flow_control = self.consumer.flow_control
+        if flow_control is None:
+            self.consumer.consumer.subscribe(self.consumer.get_topics())
+        else:
+            self.consumer.consumer.subscribe(self.consumer.get_topics(),
+                                             on_revoke=lambda consumer, partitions: flow_control.remove(partitions))
+        try:
+            while self.consumer.running:
+                if flow_control is not None:
+                    with self.pending_lock:
+                        pending = dict(self.pending)
+                    flow_control.update(self.consumer.consumer, pending)
+                elif not self.slots.acquire(timeout=self.poll_timeout):
+                    continue
+                item = self._poll()
+                if item is None:
+                    if flow_control is None:
+                        self.slots.release()
+                    continue
+                if flow_control is not None:
+                    with self.pending_lock:
+                        self.pending[item[1]] = self.pending.get(item[1], 0) + 1
+                self._hand_over(item)
+        finally:
+            self.log_debug("Shutting down consumer..")
+            self.consumer.close()
+            self._hand_over(_STOPPED)
+
+    async def close(self):
+        """
+        Stop polling and close the consumer; messages already received remain available to async for
+        """
+        self.consumer.shutdown()
+        if self.thread is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.thread.join)
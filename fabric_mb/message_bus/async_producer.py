@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Defines AsyncAvroProducer, an asyncio facade over AvroProducerApi
+"""
+import asyncio
+import threading
+import time
+import traceback
+
+from confluent_kafka import KafkaException
+
+from fabric_mb.message_bus.base import Base
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.producer import AvroProducerApi
+
+
+class AsyncAvroProducer(Base):
+    """
+    Exposes AvroProducerApi to asyncio code. Delivery reports are served by a single background thread and
+    handed over to the event loop, so any number of records awaiting delivery cost one thread.
+
+        async with AsyncAvroProducer(producer) as async_producer:
+            message = await async_producer.send("topic1", record)
+    """
+    def __init__(self, producer: AvroProducerApi, poll_timeout: float = 0.1, logger=None):
+        """
+        Initialize the asynchronous producer
+        :param producer: producer used to encode and write the records
+        :param poll_timeout: maximum time in seconds the background thread blocks waiting for delivery reports
+        :param logger: logger; defaults to the logger of the producer
+        """
+        super().__init__(logger if logger is not None else producer.logger)
+        self.producer = producer
+        self.poll_timeout = poll_timeout
+        self.loop = None
+        self.thread = None
+        self.running = False
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def start(self):
+        """
+        Start the delivery report thread; must be called from the event loop the records are sent from.
+        Invoked by the first send if not called explicitly
+        """
+        if self.thread is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.running = True
+        self.thread = threading.Thread(target=self._poll_loop, name="AsyncAvroProducer", daemon=True)
+        self.thread.start()
+
+    def _poll_loop(self):
+        while self.running:
+            try:
+                if not self.producer.serve_delivery_reports(self.poll_timeout):
+                    # Another thread is serving delivery reports
+                    time.sleep(self.poll_timeout)
+            except Exception as e:
+                self.log_error("Failed to serve delivery reports: {}".format(e))
+                self.log_error(traceback.format_exc())
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, err, msg):
+        if future.done():
+            return
+        if err is not None:
+            future.set_exception(KafkaException(err))
+        else:
+            future.set_result(msg)
+
+    def _on_delivery(self, future: asyncio.Future, err, msg, obj: IMessageAvro):
+        # Runs on the thread serving delivery reports
+        self.producer.delivery_report(err, msg, obj)
+        try:
+            self.loop.call_soon_threadsafe(self._resolve, future, err, msg)
+        except RuntimeError:
+            self.log_error("Event loop closed, dropping delivery report for {}".format(obj.get_message_id()))
+
+    def send(self, topic: str, record: IMessageAvro) -> asyncio.Future:
+        """
+        Produce a record; the record is queued before send returns
+        :param topic: topic to which messages are written to
+        :param record: record/message to be written
+        :return future resolved with the delivered message; failed with KafkaException if delivery failed
+        :raises BufferError if the local producer queue is full
+        :raises ValueError if the record does not match the schema
+        """
+        self.start()
+        future = self.loop.create_future()
+        self.producer._produce(topic, record,
+                               callback=lambda err, msg, obj=record: self._on_delivery(future, err, msg, obj))
+        return future
+
+    async def flush(self, timeout: float = None) -> int:
+        """
+        Wait for all queued records to be delivered
+        :param timeout: maximum time to wait in seconds
+        :return number of records still awaiting delivery
+        """
+        args = () if timeout is None else (timeout,)
+        return await asyncio.get_running_loop().run_in_executor(None, self.producer.producer.flush, *args)
+
+    async def close(self, timeout: float = None):
+        """
+        Flush outstanding records and stop the delivery report thread
+        :param timeout: maximum time to wait for outstanding records in seconds
+        """
+        if self.thread is None:
+            return
+        remaining = await self.flush(timeout)
+        if remaining > 0:
+            self.log_error("{} records not delivered on close".format(remaining))
+        self.running = False
+        await asyncio.get_running_loop().run_in_executor(None, self.thread.join)
+        self.thread = None
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Policies applied when the local producer queue is full, the overflow buffer holding records that did not fit and
+the metrics of both
+"""
+import threading
+from collections import deque
+from typing import Tuple
+
+# Raise BufferError to the caller
+FAIL = "fail"
+# Serve delivery reports and retry until the queue has room or queue_full_timeout elapses
+BLOCK = "block"
+# Drop the record
+DROP = "drop"
+# Hold the encoded record in the overflow buffer, produced once the queue has room
+OVERFLOW = "overflow"
+
+POLICIES = (FAIL, BLOCK, DROP, OVERFLOW)
+
+# Topic, key, value and headers of an encoded record
+EncodedRecord = Tuple[str, bytes, bytes, list]
+
+
+class OverflowBuffer:
+    """
+    In memory FIFO of encoded records awaiting room in the producer queue, bounded by the total size of the keys and
+    values. The oldest records are dropped to make room for new ones. Holding encoded records rather than messages
+    keeps the memory used by large messages, e.g. carrying BQM graphs, within the bound.
+
+    Other buffers, e.g. persistent ones, implement append, peek, pop, __len__ and size.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        :param max_bytes: maximum total size of the buffered keys and values
+        """
+        self.max_bytes = max_bytes
+        self.records = deque()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_size(record: EncodedRecord) -> int:
+        topic, key, value, headers = record
+        return (len(key) if key is not None else 0) + (len(value) if value is not None else 0)
+
+    def append(self, record: EncodedRecord) -> int:
+        """
+        Append a record, dropping the oldest records beyond max_bytes
+        :param record: encoded record
+        :return number of records dropped, including this one if it is larger than max_bytes on its own
+        """
+        size = self.get_size(record)
+        if size > self.max_bytes:
+            return 1
+        dropped = 0
+        with self.lock:
+            while self.size + size > self.max_bytes:
+                self.size -= self.get_size(self.records.popleft())
+                dropped += 1
+            self.records.append(record)
+            self.size += size
+        return dropped
+
+    def peek(self) -> EncodedRecord:
+        """
+        Return the oldest record, or None if empty
+        """
+        with self.lock:
+            return self.records[0] if len(self.records) > 0 else None
+
+    def pop(self):
+        """
+        Remove the oldest record, once produced
+        """
+        with self.lock:
+            self.size -= self.get_size(self.records.popleft())
+
+    def __len__(self):
+        return len(self.records)
+
+
+class ProducerMetrics:
+    """
+    Counters of the backpressure applied by a producer
+    """
+    def __init__(self):
+        self.queue_full = 0
+        self.blocked_time = 0.0
+        self.dropped = 0
+        self.overflowed = 0
+        self.lock = threading.Lock()
+
+    def add(self, queue_full: int = 0, blocked_time: float = 0.0, dropped: int = 0, overflowed: int = 0):
+        with self.lock:
+            self.queue_full += queue_full
+            self.blocked_time += blocked_time
+            self.dropped += dropped
+            self.overflowed += overflowed
+
+    def to_dict(self) -> dict:
+        """
+        :return queue_full: number of produce calls that found the queue full, blocked_time: seconds spent waiting
+                for room in the queue, dropped: records dropped, overflowed: records held in the overflow buffer
+        """
+        with self.lock:
+            return {"queue_full": self.queue_full, "blocked_time": self.blocked_time, "dropped": self.dropped,
+                    "overflowed": self.overflowed}
@@ -27,6 +27,7 @@
 """
 Base class
 """
+import logging
 
 
 class Base:
@@ -36,6 +37,12 @@ class Base:
     def __init__(self, logger=None):
         self.logger = logger
 
+    def is_debug_enabled(self) -> bool:
+        """
+        Return True if debug messages are logged
+        """
+        return self.logger is None or self.logger.isEnabledFor(logging.DEBUG)
+
     def log_debug(self, message: str):
         """
         Log a debug message
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares encode and decode time per message type of the confluent_kafka.avro serializer against the avro and
+fastavro codecs. Values are written against the union in schema/message.avsc as done by default.
+
+Usage: python -m fabric_mb.message_bus.benchmark.codec_benchmark [iterations]
+"""
+import sys
+import timeit
+
+from confluent_kafka import avro
+from confluent_kafka.avro.serializer import message_serializer
+from confluent_kafka.avro.serializer.message_serializer import MessageSerializer
+
+from fabric_mb.message_bus.codec import AvroCodec, CodecSerializer, FastAvroCodec
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE
+from fabric_mb.message_bus.test.fake_kafka import FakeSchemaRegistry
+from fabric_mb.message_bus.test.message_samples import build_result_reservations, build_samples
+
+
+def average(function, iterations: int) -> float:
+    """
+    Return the average time in microseconds taken by function
+    """
+    return timeit.timeit(function, number=iterations) * 1e6 / iterations
+
+
+def main(iterations: int = 200):
+    with open(DEFAULT_SCHEMA_FILE, "r") as f:
+        schema = avro.loads(f.read())
+    registry = FakeSchemaRegistry()
+    legacy = MessageSerializer(registry, reader_value_schema=schema)
+    codecs = [AvroCodec(), FastAvroCodec()]
+    serializers = [CodecSerializer(registry, codec, reader_value_schema=schema) for codec in codecs]
+
+    print("confluent_kafka.avro uses {}".format("fastavro" if message_serializer.HAS_FAST else "avro"))
+    print("{:<34}{:>32}{:>32}".format("", "encode (us)", "decode (us)"))
+    print("{:<34}{:>10}{:>8}{:>8}{:>6}{:>10}{:>8}{:>8}{:>6}".format(
+        "Message", "confluent", "avro", "fast", "", "confluent", "avro", "fast", ""))
+    samples = [(type(m).__name__, m) for m in build_samples()]
+    samples.append(("ResultReservationAvro x500", build_result_reservations(500)))
+    for name, message in samples:
+        count = max(1, iterations // 50) if name.endswith("x500") else iterations
+        value = message.to_dict()
+        encode = [average(lambda: legacy.encode_record_with_schema("topic1", schema, value), count)]
+        encoded = legacy.encode_record_with_schema("topic1", schema, value)
+        decode = [average(lambda: legacy.decode_message(encoded), count)]
+        for codec, serializer in zip(codecs, serializers):
+            prepared = codec.prepare(message, schema)
+            encode.append(average(lambda: serializer.encode_record_with_schema("topic1", schema, prepared), count))
+            encoded = serializer.encode_record_with_schema("topic1", schema, prepared)
+            decode.append(average(lambda: serializer.decode_message(encoded), count))
+        print("{:<34}{:>10.0f}{:>8.0f}{:>8.0f}{:>5.1f}x{:>10.0f}{:>8.0f}{:>8.0f}{:>5.1f}x".format(
+            name, *encode, encode[0] / encode[2], *decode, decode[0] / decode[2]))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares memory and from_dict/to_dict time of the hand written message classes against the slotted classes
+generated from the schema, for a ResultRecordList carrying thousands of reservations.
+
+Usage: python -m fabric_mb.message_bus.benchmark.codegen_benchmark [reservations]
+"""
+import sys
+import timeit
+import tracemalloc
+
+from fabric_mb.message_bus.message_registry import create_generated_registry, default_registry
+from fabric_mb.message_bus.test.message_samples import build_result_reservations
+
+
+def measure(registry, name: str, value: dict, iterations: int = 5):
+    """
+    Return the memory in KiB held by a decoded message and the average from_dict and to_dict time in ms
+    """
+    tracemalloc.start()
+    message = registry.create(name)
+    message.from_dict(value)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    def decode():
+        registry.create(name).from_dict(value)
+
+    from_dict = timeit.timeit(decode, number=iterations) * 1e3 / iterations
+    to_dict = timeit.timeit(message.to_dict, number=iterations) * 1e3 / iterations
+    return size / 1024, from_dict, to_dict
+
+
+def main(count: int = 5000):
+    sample = build_result_reservations(count)
+    name = sample.get_message_name()
+    value = sample.to_dict()
+    print("{} with {} reservations".format(type(sample).__name__, count))
+    print("{:<14}{:>14}{:>16}{:>14}".format("Classes", "memory (KiB)", "from_dict (ms)", "to_dict (ms)"))
+    for label, registry in [("hand written", default_registry), ("generated", create_generated_registry())]:
+        print("{:<14}{:>14.0f}{:>16.1f}{:>14.1f}".format(label, *measure(registry, name, value)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
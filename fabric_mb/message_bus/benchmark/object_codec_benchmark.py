@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares encode and decode time of a ResultRecordList carrying thousands of reservations: to_dict() written
+by the confluent_kafka.avro serializer and by FastAvroCodec against the objects written directly by ObjectCodec,
+then dicts read by FastAvroCodec followed by from_dict() against the objects read directly by ObjectCodec, with
+all fields and with LAZY_FIELDS left pending as done for consumers only reading the envelope of a message.
+
+Usage: python -m fabric_mb.message_bus.benchmark.object_codec_benchmark [iterations]
+"""
+import sys
+import timeit
+
+from confluent_kafka.avro.serializer.message_serializer import MessageSerializer
+
+from confluent_kafka import avro
+
+from fabric_mb.message_bus.codec import CodecSerializer, FastAvroCodec
+from fabric_mb.message_bus.lazy_message import LAZY_FIELDS
+from fabric_mb.message_bus.message_registry import default_registry
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE, MessageSchemas
+from fabric_mb.message_bus.object_codec import ObjectCodec
+from fabric_mb.message_bus.test.fake_kafka import FakeSchemaRegistry
+from fabric_mb.message_bus.test.message_samples import build_result_reservations
+
+
+def average(function, iterations: int) -> float:
+    """
+    Return the average time in milliseconds taken by function
+    """
+    return timeit.timeit(function, number=iterations) * 1e3 / iterations
+
+
+def main(iterations: int = 10):
+    with open(DEFAULT_SCHEMA_FILE, "r") as f:
+        union_schema = avro.loads(f.read())
+    schemas = MessageSchemas()
+    registry = FakeSchemaRegistry()
+    legacy = MessageSerializer(registry)
+    fast = FastAvroCodec()
+    codec = ObjectCodec()
+    fast_serializer = CodecSerializer(registry, fast, reader_value_schema=union_schema)
+    serializer = CodecSerializer(registry, codec, reader_value_schema=union_schema)
+    lazy = CodecSerializer(registry, ObjectCodec(lazy_fields=LAZY_FIELDS), reader_value_schema=union_schema)
+
+    def from_dict(encoded: bytes):
+        value = fast_serializer.decode_message(encoded)
+        default_registry.create(value['name']).from_dict(value)
+
+    print("{:<14}{:>48}{:>48}".format("", "encode", "decode"))
+    print("{:<14}{:>12}{:>12}{:>12}{:>12}{:>12}{:>12}{:>12}{:>12}".format("Reservations", "to_dict", "confluent",
+                                                                          "fastavro", "object", "fastavro",
+                                                                          "object", "lazy", ""))
+    for count in [100, 1000, 5000, 10000]:
+        message = build_result_reservations(count)
+        schema = schemas.get_message_schema(message)
+        expected = legacy.encode_record_with_schema("topic1", schema, message.to_dict())
+        encoded = serializer.encode_record_with_schema("topic1", schema, codec.prepare(message, schema))
+        assert expected == encoded
+        encode = [average(message.to_dict, iterations),
+                  average(lambda: legacy.encode_record_with_schema("topic1", schema, message.to_dict()), iterations),
+                  average(lambda: fast_serializer.encode_record_with_schema("topic1", schema,
+                                                                            fast.prepare(message, schema)),
+                          iterations),
+                  average(lambda: serializer.encode_record_with_schema("topic1", schema,
+                                                                       codec.prepare(message, schema)), iterations)]
+        decode = [average(lambda: from_dict(encoded), iterations),
+                  average(lambda: serializer.decode_message(encoded), iterations),
+                  average(lambda: lazy.decode_message(encoded).get_message_id(), iterations)]
+        print("{:<14}{:>10.1f}ms{:>10.1f}ms{:>10.1f}ms{:>10.1f}ms{:>10.1f}ms{:>10.1f}ms{:>10.1f}ms{:>11.1f}x".format(
+            count, *encode, *decode, decode[0] / decode[1]))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares the time to spool encoded records to the outbox when syncing to disk after every record and in batches,
+for small requests and for BQM results.
+
+Usage: python -m fabric_mb.message_bus.benchmark.outbox_benchmark [records]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+from fabric_mb.message_bus.outbox import Outbox
+from fabric_mb.message_bus.test.fake_kafka import build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query, build_samples
+
+
+def spool(records: list, **kwargs) -> float:
+    """
+    Return the time in milliseconds taken to append and sync the records
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        outbox = Outbox(directory, **kwargs)
+        start = time.perf_counter()
+        for record in records:
+            outbox.append(record)
+        outbox.sync()
+        elapsed = time.perf_counter() - start
+        outbox.close()
+        return elapsed * 1e3
+    finally:
+        shutil.rmtree(directory)
+
+
+def main(count: int = 1000):
+    api = build_mock_producer()
+    model = [m for m in build_samples() if m.get_message_name() == "ResultBrokerQueryModel"][0]
+    print("{:<12}{:>10}{:>12}{:>14}{:>14}".format("Message", "Records", "Size", "every record", "batched"))
+    for label, message in [("Query", build_query()), ("BQM", model)]:
+        key, value = api.encode(["topic1"], message)["topic1"]
+        records = [("topic1", key, value, None)] * count
+        times = [spool(records, sync_interval=0, sync_bytes=0), spool(records)]
+        print("{:<12}{:>10}{:>11}B{:>12.1f}ms{:>12.1f}ms".format(label, count, len(value), *times))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
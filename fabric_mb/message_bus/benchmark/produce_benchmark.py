@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares produce_sync latency of flushing the producer after every message against waiting for the delivery
+report of each message within a bounded in-flight window, for 1, 10 and 100 concurrent senders.
+Runs against the librdkafka mock cluster with an in memory schema registry.
+
+Usage: python -m fabric_mb.message_bus.benchmark.produce_benchmark [messages per sender count]
+"""
+import logging
+import statistics
+import sys
+import threading
+import time
+from typing import List
+
+from fabric_mb.message_bus.messages.query_avro import QueryAvro
+from fabric_mb.message_bus.producer import AvroProducerApi
+from fabric_mb.message_bus.test.fake_kafka import build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query
+
+# flush transmits immediately regardless of linger.ms; the windowed path waits up to linger.ms for a batch
+LINGER_MS = 0
+
+
+def build_producer() -> AvroProducerApi:
+    logger = logging.getLogger("produce_benchmark")
+    logger.setLevel(logging.WARNING)
+    return build_mock_producer(conf={'linger.ms': LINGER_MS}, logger=logger)
+
+
+def flush_per_message(api: AvroProducerApi, topic: str, message: QueryAvro) -> bool:
+    """
+    produce_sync as previously implemented; flush waits for every outstanding message
+    """
+    api._produce(topic, message)
+    api.producer.flush()
+    return True
+
+
+def run(api: AvroProducerApi, send, senders: int, count: int) -> (List[float], float):
+    latencies = []
+    lock = threading.Lock()
+
+    def sender(index: int):
+        local = []
+        for i in range(count):
+            message = build_query("{}-{}".format(index, i))
+            start = time.perf_counter()
+            send(api, "topic1", message)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=sender, args=(i,)) for i in range(senders)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+
+def report(name: str, latencies: List[float], elapsed: float):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print("  {:<18} p50 {:>8.2f}ms  p99 {:>8.2f}ms  {:>9.0f} msgs/s".format(
+        name, statistics.median(latencies) * 1000, p99 * 1000, len(latencies) / elapsed))
+
+
+def main(count: int = 200):
+    api = build_producer()
+    # Register the schemas and warm up the connection to the mock broker
+    run(api, AvroProducerApi.produce_sync, 1, 10)
+    for senders in (1, 10, 100):
+        print("{} concurrent senders, {} messages each".format(senders, count))
+        report("flush per message", *run(api, flush_per_message, senders, count))
+        report("windowed", *run(api, AvroProducerApi.produce_sync, senders, count))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares decode time with the full message schema and with a reader schema projecting it, for a ResultRecordList
+carrying thousands of reservations of which only reservation_id and state are read, and for a BQM of which only
+the level is read: dicts read by FastAvroCodec followed by from_dict() and objects read directly by ObjectCodec.
+
+Usage: python -m fabric_mb.message_bus.benchmark.projection_benchmark [iterations]
+"""
+import sys
+import timeit
+
+from confluent_kafka import avro
+
+from fabric_mb.message_bus.codec import AvroCodec, CodecSerializer, FastAvroCodec
+from fabric_mb.message_bus.message_registry import default_registry
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE, MessageSchemas
+from fabric_mb.message_bus.messages.broker_query_model_avro import BrokerQueryModelAvro
+from fabric_mb.message_bus.messages.result_broker_query_model_avro import ResultBrokerQueryModelAvro
+from fabric_mb.message_bus.object_codec import ObjectCodec
+from fabric_mb.message_bus.test.fake_kafka import FakeSchemaRegistry
+from fabric_mb.message_bus.test.message_samples import GRAPHML_FILE, build_result_reservations, build_status
+
+PROJECTION = {"ReservationMngRecord": ["reservation_id", "state"], "BrokerQueryModelRecord": ["level"]}
+
+
+def average(function, iterations: int) -> float:
+    """
+    Return the average time in milliseconds taken by function
+    """
+    return timeit.timeit(function, number=iterations) * 1e3 / iterations
+
+
+def build_model(copies: int) -> ResultBrokerQueryModelAvro:
+    """
+    Build a BQM result carrying copies of the test graph
+    """
+    with open(GRAPHML_FILE, 'r') as f:
+        graph = f.read()
+    result = ResultBrokerQueryModelAvro()
+    result.message_id = "msg-model"
+    result.status = build_status()
+    result.model = BrokerQueryModelAvro()
+    result.model.level = 1
+    result.model.model = graph * copies
+    return result
+
+
+def main(iterations: int = 10):
+    with open(DEFAULT_SCHEMA_FILE, "r") as f:
+        union_schema = avro.loads(f.read())
+    schemas = MessageSchemas()
+    reader_schema = schemas.get_projected_schema(PROJECTION)
+    registry = FakeSchemaRegistry()
+    writer = CodecSerializer(registry, ObjectCodec())
+
+    def decoder(codec: AvroCodec, schema):
+        serializer = CodecSerializer(registry, codec, reader_value_schema=schema)
+        if isinstance(codec, ObjectCodec):
+            return serializer.decode_message
+
+        def from_dict(encoded: bytes):
+            value = serializer.decode_message(encoded)
+            default_registry.create(value['name']).from_dict(value)
+
+        return from_dict
+
+    decoders = [decoder(FastAvroCodec(), union_schema), decoder(FastAvroCodec(), reader_schema),
+                decoder(ObjectCodec(), union_schema), decoder(ObjectCodec(), reader_schema)]
+
+    print("{:<22}{:>12}{:>24}{:>24}".format("", "", "fastavro + from_dict", "object"))
+    print("{:<22}{:>12}{:>12}{:>12}{:>12}{:>12}".format("Message", "Size", "full", "projected", "full",
+                                                        "projected"))
+    samples = [("{} reservations".format(count), build_result_reservations(count)) for count in [100, 1000, 5000]]
+    samples += [("BQM x{}".format(copies), build_model(copies)) for copies in [1, 10, 100]]
+    for label, message in samples:
+        encoded = writer.encode_record_with_schema("topic1", schemas.get_message_schema(message), message)
+        for decode in decoders:
+            # Leave out building the decoders for the schema
+            decode(encoded)
+        times = [average(lambda: decode(encoded), iterations) for decode in decoders]
+        print("{:<22}{:>10.0f}kB{:>10.2f}ms{:>10.2f}ms{:>10.2f}ms{:>10.2f}ms".format(label, len(encoded) / 1e3,
+                                                                                 *times))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares message class lookup throughput of the message registry against the importlib and regex lookup
+
+Usage: python -m fabric_mb.message_bus.benchmark.registry_benchmark [count]
+"""
+import importlib
+import re
+import sys
+import time
+
+from fabric_mb.message_bus.message_registry import MessageRegistry, default_registry
+from fabric_mb.message_bus.messages.message import IMessageAvro
+
+
+def lookup_by_convention(value: dict) -> IMessageAvro:
+    """
+    Lookup as previously done by AvroConsumerApi.process_message
+    """
+    class_name = value.get('name', None) + 'Avro'
+    module_name = 'fabric_mb.message_bus.messages.' + re.sub(r'(?<!^)(?=[A-Z])', '_', class_name).lower()
+    module = importlib.import_module(module_name)
+    class_ = getattr(module, class_name)
+    return class_()
+
+
+def main(count: int = 300000):
+    names = [name for attribute, name in vars(IMessageAvro).items()
+             if not attribute.startswith('_') and isinstance(name, str)]
+    values = [{'name': names[i % len(names)], 'message_id': str(i)} for i in range(count)]
+    registry = MessageRegistry(parent=default_registry)
+
+    start = time.perf_counter()
+    for value in values:
+        lookup_by_convention(value)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for value in values:
+        registry.create(value.get('name', None))
+    after = time.perf_counter() - start
+
+    print("{} synthetic messages across {} message types".format(count, len(names)))
+    print("importlib + regex: {:>10.3f}s {:>12.0f} msgs/s".format(before, count / before))
+    print("registry:          {:>10.3f}s {:>12.0f} msgs/s".format(after, count / after))
+    print("speedup:           {:>10.1f}x".format(before / after))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares encode time per message type for the union value schema against per message type record schemas
+
+Usage: python -m fabric_mb.message_bus.benchmark.schema_benchmark [iterations]
+"""
+import io
+import sys
+import timeit
+
+import avro.io
+from confluent_kafka import avro as confluent_avro
+
+from fabric_mb.message_bus.message_schemas import MessageSchemas, DEFAULT_SCHEMA_FILE
+from fabric_mb.message_bus.test.message_samples import build_samples
+
+
+def encode_time(schema, value: dict, iterations: int) -> float:
+    """
+    Return the average time in microseconds taken to encode value against schema
+    """
+    writer = avro.io.DatumWriter(schema)
+
+    def encode():
+        writer.write(value, avro.io.BinaryEncoder(io.BytesIO()))
+
+    return timeit.timeit(encode, number=iterations) * 1e6 / iterations
+
+
+def main(iterations: int = 1000):
+    with open(DEFAULT_SCHEMA_FILE, "r") as f:
+        union_schema = confluent_avro.loads(f.read())
+    schemas = MessageSchemas()
+
+    print("{:<36}{:<28}{:>12}{:>12}{:>9}".format("Message", "Record", "union(us)", "record(us)", "speedup"))
+    for message in build_samples():
+        value = message.to_dict()
+        before = encode_time(union_schema, value, iterations)
+        after = encode_time(schemas.get_message_schema(message), value, iterations)
+        print("{:<36}{:<28}{:>12.1f}{:>12.1f}{:>8.1f}x".format(type(message).__name__, message.get_schema_name(),
+                                                               before, after, before / after))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
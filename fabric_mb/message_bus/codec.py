@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Pluggable Avro codecs used to encode and decode message values in the Confluent wire format
+(magic byte + schema id + Avro binary)
+"""
+import json
+import threading
+from typing import BinaryIO, Callable
+
+import avro.io
+from confluent_kafka.avro import SerializerError
+from confluent_kafka.avro.error import ClientError
+from confluent_kafka.avro.serializer import KeySerializerError, ValueSerializerError
+from confluent_kafka.avro.serializer.message_serializer import MessageSerializer
+from fastavro import parse_schema, schemaless_reader, schemaless_writer
+
+from fabric_mb.message_bus.messages.message import IMessageAvro
+
+
+class AvroCodec:
+    """
+    Codec based on the pure Python avro library; confluent_kafka.avro falls back to it when fastavro is missing
+    """
+    name = "avro"
+
+    def get_encoder(self, writer_schema) -> Callable[[object, BinaryIO], None]:
+        """
+        Return a function writing a value prepared by prepare to a stream
+        :param writer_schema: loaded AVRO schema
+        """
+        writer = avro.io.DatumWriter(writer_schema)
+        return lambda value, fp: writer.write(value, avro.io.BinaryEncoder(fp))
+
+    def get_decoder(self, writer_schema, reader_schema=None) -> Callable[[BinaryIO], object]:
+        """
+        Return a function reading a value from a stream
+        :param writer_schema: loaded AVRO schema the value was written with
+        :param reader_schema: loaded AVRO schema the value is resolved against; None reads the writer schema
+        """
+        reader = avro.io.DatumReader(writer_schema, reader_schema)
+        return lambda fp: reader.read(avro.io.BinaryDecoder(fp))
+
+    def prepare(self, record: IMessageAvro, writer_schema) -> object:
+        """
+        Return the value passed to the encoder for a record
+        :param record: record/message to be written
+        :param writer_schema: loaded AVRO schema the record is written with
+        """
+        return record.to_dict()
+
+
+class FastAvroCodec(AvroCodec):
+    """
+    Codec based on fastavro, which compiles each schema once into a specialized encoder and decoder. Records
+    written against a union, e.g. schema/message.avsc, name their branch explicitly (IMessageAvro.schema_name)
+    instead of the encoder validating the record against each branch.
+    """
+    name = "fastavro"
+
+    def __init__(self):
+        # schema JSON -> parsed schema
+        self.parsed = {}
+        # id(schema) -> (schema, record name -> full name of the union branch)
+        self.branches = {}
+        self.lock = threading.Lock()
+
+    def parse(self, schema) -> dict:
+        """
+        Return the fastavro schema for a loaded AVRO schema
+        """
+        key = str(schema)
+        with self.lock:
+            parsed = self.parsed.get(key, None)
+        if parsed is None:
+            parsed = parse_schema(json.loads(key))
+            with self.lock:
+                self.parsed[key] = parsed
+        return parsed
+
+    def get_branches(self, schema) -> dict:
+        """
+        Return the full name of each record branch keyed by record name if schema is a union
+        """
+        entry = self.branches.get(id(schema), None)
+        if entry is None:
+            parsed = self.parse(schema)
+            names = {}
+            if isinstance(parsed, list):
+                for branch in parsed:
+                    if isinstance(branch, dict) and 'name' in branch:
+                        names[branch['name'].split('.')[-1]] = branch['name']
+            # Keep a reference so that the id is not reused
+            entry = (schema, names)
+            with self.lock:
+                self.branches[id(schema)] = entry
+        return entry[1]
+
+    def get_encoder(self, writer_schema) -> Callable[[object, BinaryIO], None]:
+        parsed = self.parse(writer_schema)
+        return lambda value, fp: schemaless_writer(fp, parsed, value)
+
+    def get_decoder(self, writer_schema, reader_schema=None) -> Callable[[BinaryIO], object]:
+        writer = self.parse(writer_schema)
+        reader = None
+        if reader_schema is not None and str(reader_schema) != str(writer_schema):
+            reader = self.parse(reader_schema)
+        return lambda fp: schemaless_reader(fp, writer, reader)
+
+    def prepare(self, record: IMessageAvro, writer_schema) -> object:
+        value = record.to_dict()
+        branch = self.get_branches(writer_schema).get(record.get_schema_name(), None)
+        if branch is not None:
+            # fastavro tuple notation selects the union branch by name
+            return branch, value
+        return value
+
+
+class CodecSerializer(MessageSerializer):
+    """
+    MessageSerializer encoding and decoding with a codec; keeps the Confluent framing and schema registry handling
+    """
+    def __init__(self, registry_client, codec: AvroCodec, reader_key_schema=None, reader_value_schema=None):
+        super().__init__(registry_client, reader_key_schema=reader_key_schema,
+                         reader_value_schema=reader_value_schema)
+        self.codec = codec
+        # (topic, is_key, id(schema)) -> (schema, schema id)
+        self.schema_ids = {}
+
+    def _get_encoder_func(self, writer_schema):
+        return self.codec.get_encoder(writer_schema)
+
+    def encode_record_with_schema(self, topic, schema, record, is_key=False):
+        """
+        Same as MessageSerializer.encode_record_with_schema, except that the schema id is cached per schema object.
+        The registry client looks its cache up by the hash of the schema, i.e. of its full JSON, on every call
+        """
+        key = (topic, is_key, id(schema))
+        entry = self.schema_ids.get(key, None)
+        if entry is None:
+            subject = topic + ('-key' if is_key else '-value')
+            if self.registry_client.auto_register_schemas:
+                schema_id = self.registry_client.register(subject, schema)
+            else:
+                schema_id = self.registry_client.check_registration(subject, schema)
+            if not schema_id:
+                serialize_err = KeySerializerError if is_key else ValueSerializerError
+                raise serialize_err("Unable to retrieve schema id for subject %s" % subject)
+            if schema_id not in self.id_to_writers:
+                self.id_to_writers[schema_id] = self._get_encoder_func(schema)
+            # Keep a reference so that the id is not reused
+            entry = (schema, schema_id)
+            self.schema_ids[key] = entry
+        return self.encode_record_with_schema_id(entry[1], record, is_key=is_key)
+
+    def _get_decoder_func(self, schema_id, payload, is_key=False):
+        key = (schema_id, is_key)
+        decoder = self.id_to_decoder_func.get(key, None)
+        if decoder is not None:
+            return decoder
+
+        # fetch writer schema from schema registry
+        try:
+            writer_schema = self.registry_client.get_by_id(schema_id)
+        except ClientError as e:
+            raise SerializerError("unable to fetch schema with id %d: %s" % (schema_id, str(e)))
+        if writer_schema is None:
+            raise SerializerError("unable to fetch schema with id %d" % schema_id)
+
+        reader_schema = self.reader_key_schema if is_key else self.reader_value_schema
+        decoder = self.codec.get_decoder(writer_schema, reader_schema)
+        self.id_to_decoder_func[key] = decoder
+        return decoder
+
+
+def install_codec(client, codec: AvroCodec, reader_key_schema=None, reader_value_schema=None):
+    """
+    Replace the serializer of an AvroProducer or AvroConsumer with one using codec
+    :param client: AvroProducer or AvroConsumer
+    :param codec: codec
+    :param reader_key_schema: reader schema for keys; consumers only
+    :param reader_value_schema: reader schema for values; consumers only
+    """
+    client._serializer = CodecSerializer(client._serializer.registry_client, codec,
+                                         reader_key_schema=reader_key_schema, reader_value_schema=reader_value_schema)
+
+
+def get_deserializer(consumer, codec: AvroCodec = None, reader_key_schema=None,
+                     reader_value_schema=None) -> MessageSerializer:
+    """
+    Return the deserializer of an AvroConsumer, installing one using codec first if any. AvroConsumer only decodes
+    in poll; messages returned by consume are decoded with it, so that both share the same schema cache
+    :param consumer: AvroConsumer
+    :param codec: codec; None keeps the confluent_kafka.avro decoder
+    :param reader_key_schema: reader schema for keys
+    :param reader_value_schema: reader schema for values
+    """
+    if codec is not None:
+        install_codec(consumer, codec, reader_key_schema=reader_key_schema, reader_value_schema=reader_value_schema)
+    return consumer._serializer
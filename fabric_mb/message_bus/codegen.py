@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Generates slotted message classes with straight-line to_dict/from_dict converters from schema/message.avsc
+
+Usage: python -m fabric_mb.message_bus.codegen [output file]
+"""
+import json
+import keyword
+import os
+import sys
+from typing import List, Tuple
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE, MessageSchemas, PRIMITIVE_TYPES
+
+DEFAULT_OUTPUT_FILE = os.path.join(os.path.dirname(__file__), 'generated', 'records.py')
+
+PYTHON_TYPES = {"null": "None", "boolean": "bool", "int": "int", "long": "int", "float": "float", "double": "float",
+                "bytes": "bytes", "string": "str", "enum": "str", "fixed": "bytes"}
+
+HEADER_FILE = os.path.join(os.path.dirname(__file__), 'base.py')
+MAX_LINE_LENGTH = 120
+
+# Accessors of the hand written classes whose names differ from the field they read; record -> alias -> field
+ACCESSOR_ALIASES = {
+    "AddReservations": {"reservation": "reservation_list"},
+    "AddUpdateReservation": {"reservation": "reservation_obj"},
+    "DelegationRecord": {"slice_object": "slice"},
+    "ReservationMngRecord": {"config_properties": "config", "local_properties": "local",
+                             "request_properties": "request", "resource_properties": "resource",
+                             "resource_type": "rtype", "ticket_properties": "ticket",
+                             "redeem_predecessors": "redeem_processors"},
+    "ReservationPredecessorMngRecord": {"filter_properties": "filter"},
+    "ResultString": {"result": "result_str"},
+    "SliceRecord": {"slice_id": "guid"},
+    "UnitRecord": {"unit_id": "reservation_id", "resource_type": "rtype"},
+}
+
+# Bytes fields the hand written classes pickle on set and unpickle on get; record -> fields
+PICKLED_FIELDS = {
+    "ReservationMngRecord": ["sliver"],
+    "UnitRecord": ["sliver"],
+    "resource_set_record": ["sliver"],
+}
+
+# Records whose hand written classes convert each record field on its own, i.e. from_dict_<field>(value) and
+# to_dict_<field>(result)
+FIELD_CONVERTERS = ["ResultRecordList"]
+
+
+def class_name(record_name: str) -> str:
+    """
+    Return the Python class name for a record name, e.g. resource_set_record -> ResourceSetRecord
+    """
+    name = record_name.split('.')[-1]
+    if '_' in name or name.islower():
+        name = ''.join(part[:1].upper() + part[1:] for part in name.split('_'))
+    return name
+
+
+class FieldType:
+    """
+    Shape of a field type relevant for conversion: kind is one of primitive, record, array or map; item is the
+    FieldType of the array items or map values
+    """
+    def __init__(self, kind: str, python_type: str, nullable: bool = False, record: str = None,
+                 item: 'FieldType' = None):
+        self.kind = kind
+        self.python_type = python_type
+        self.nullable = nullable
+        self.record = record
+        self.item = item
+
+    def to_value(self, expression: str) -> str:
+        """
+        Expression converting expression to its dict representation
+        """
+        if self.kind == 'record':
+            return "{}.to_dict()".format(expression)
+        if self.kind == 'array' and self.item.kind != 'primitive':
+            return "[v.to_dict() for v in {}]".format(expression)
+        if self.kind == 'map' and self.item.kind != 'primitive':
+            return "{{k: v.to_dict() for k, v in {}.items()}}".format(expression)
+        return expression
+
+    def from_value(self, expression: str) -> str:
+        """
+        Expression converting the dict representation expression to its object
+        """
+        if self.kind == 'record':
+            return "{}.create({})".format(self.record, expression)
+        if self.kind == 'array' and self.item.kind != 'primitive':
+            return "[{}.create(v) for v in {}]".format(self.item.record, expression)
+        if self.kind == 'map' and self.item.kind != 'primitive':
+            return "{{k: {}.create(v) for k, v in {}.items()}}".format(self.item.record, expression)
+        return expression
+
+
+class Generator:
+    """
+    Emits one slotted class per named record in the schema. Message records additionally implement the
+    IMessageAvro interface and derive from it.
+    """
+    def __init__(self, schema_file: str = DEFAULT_SCHEMA_FILE):
+        with open(schema_file, "r") as f:
+            schema_str = f.read()
+        self.schemas = MessageSchemas(schema_str=schema_str)
+        parsed = json.loads(schema_str)
+        # Records of the top level union carrying a message_id are messages
+        self.messages = set()
+        for s in parsed if isinstance(parsed, list) else [parsed]:
+            if any(f['name'] == 'message_id' for f in s.get('fields', [])):
+                self.messages.add(self.resolve(s['name'], s.get('namespace')))
+        self.lines = []
+
+    def resolve(self, name: str, namespace: str) -> str:
+        full_name = MessageSchemas._full_name(name, namespace)
+        if full_name not in self.schemas.definitions:
+            full_name = self.schemas.aliases.get(name, full_name)
+        if full_name not in self.schemas.definitions:
+            raise MessageBusException("Unknown Avro type {}".format(name))
+        return full_name
+
+    def field_type(self, schema, namespace: str) -> FieldType:
+        if isinstance(schema, list):
+            branches = [s for s in schema if s != "null"]
+            if len(branches) == 1:
+                result = self.field_type(branches[0], namespace)
+                result.nullable = len(branches) < len(schema)
+                return result
+            return FieldType('primitive', 'object', nullable="null" in schema)
+        if isinstance(schema, str):
+            if schema in PRIMITIVE_TYPES:
+                return FieldType('primitive', PYTHON_TYPES[schema])
+            definition, definition_namespace = self.schemas.definitions[self.resolve(schema, namespace)]
+            return self.field_type(definition, definition_namespace)
+        schema_type = schema['type']
+        if schema_type in ('record', 'error'):
+            record = class_name(schema['name'])
+            return FieldType('record', record, record=record)
+        if schema_type == 'array':
+            item = self.field_type(schema['items'], namespace)
+            return FieldType('array', 'list', item=item)
+        if schema_type == 'map':
+            item = self.field_type(schema['values'], namespace)
+            return FieldType('map', 'dict', item=item)
+        if schema_type in PYTHON_TYPES:
+            return FieldType('primitive', PYTHON_TYPES[schema_type])
+        return self.field_type(schema_type, namespace)
+
+    def get_fields(self, full_name: str) -> List[Tuple[str, FieldType]]:
+        definition, namespace = self.schemas.definitions[full_name]
+        namespace = definition.get('namespace', namespace)
+        return [(f['name'], self.field_type(f['type'], namespace)) for f in definition.get('fields', [])]
+
+    def get_records(self) -> List[str]:
+        """
+        Return the full names of all records; dependencies first
+        """
+        ordered = []
+
+        def visit(full_name: str):
+            if full_name in ordered:
+                return
+            ordered.append(None)
+            for name, field_type in self.get_fields(full_name):
+                for t in [field_type, field_type.item]:
+                    if t is not None and t.kind == 'record':
+                        visit(self.record_names[t.record])
+            ordered[ordered.index(None)] = full_name
+
+        self.record_names = {class_name(n): n for n, (s, ns) in self.schemas.definitions.items()
+                             if s['type'] in ('record', 'error')}
+        for full_name in self.record_names.values():
+            visit(full_name)
+        return ordered
+
+    def emit(self, line: str = "", indent: int = 0):
+        self.lines.append("    " * indent + line if line else "")
+
+    def emit_wrapped(self, prefix: str, items: List[str], suffix: str, indent: int, first_separator: str = ", ",
+                     hanging: int = 1):
+        """
+        Emit prefix, items and suffix on one line or, if too long, one item per line
+        """
+        line = prefix + (first_separator + ", ".join(items) if len(items) > 0 else "") + suffix
+        if len("    " * indent + line) <= MAX_LINE_LENGTH:
+            self.emit(line, indent)
+            return
+        self.emit(prefix + first_separator.strip(), indent)
+        for item in items:
+            self.emit(item + ",", indent + hanging)
+        self.emit(suffix.strip(), indent)
+
+    def emit_record(self, full_name: str):
+        fields = self.get_fields(full_name)
+        name = class_name(full_name)
+        is_message = full_name in self.messages
+        slots = [f for f, t in fields]
+        if is_message:
+            slots.append("id")
+        for f in slots:
+            if keyword.iskeyword(f):
+                raise MessageBusException("Field {} of {} is a Python keyword".format(f, full_name))
+
+        self.emit()
+        self.emit()
+        self.emit("class {}{}:".format(name, "(IMessageAvro)" if is_message else ""))
+        self.emit('"""', 1)
+        self.emit("Generated from {}".format(full_name), 1)
+        self.emit('"""', 1)
+        self.emit_wrapped("__slots__ = (", ['"{}"'.format(f) for f in slots], ",)" if len(slots) == 1 else ")", 1,
+                          first_separator="")
+        self.emit('schema_name = "{}"'.format(full_name.split('.')[-1]), 1)
+
+        # Constructor
+        self.emit()
+        self.emit_wrapped("def __init__(self", ["{}: {} = None".format(f, t.python_type) for f, t in fields], "):", 1,
+                          hanging=2)
+        for f, t in fields:
+            self.emit("self.{0} = {0}".format(f), 2)
+        if is_message:
+            self.emit("# Unique id used to track produce request success/failures.", 2)
+            self.emit("# Do *not* include in the serialized object.", 2)
+            self.emit("self.id = uuid4()", 2)
+
+        # Converters
+        self.emit()
+        self.emit("@classmethod", 1)
+        self.emit("def create(cls, value: dict) -> '{}':".format(name), 1)
+        self.emit("result = cls()", 2)
+        self.emit("result.from_dict(value)", 2)
+        self.emit("return result", 2)
+
+        self.emit()
+        self.emit("def from_dict(self, value: dict):", 1)
+        for f, t in fields:
+            if t.nullable:
+                if t.kind == 'primitive':
+                    self.emit("self.{0} = value.get('{0}')".format(f), 2)
+                else:
+                    self.emit("{0} = value.get('{0}')".format(f), 2)
+                    self.emit("if {} is not None:".format(f), 2)
+                    self.emit("{} = {}".format(f, t.from_value(f)), 3)
+                    self.emit("self.{0} = {0}".format(f), 2)
+            else:
+                self.emit("self.{0} = {1}".format(f, t.from_value("value['{}']".format(f))), 2)
+        if len(fields) == 0:
+            self.emit("pass", 2)
+
+        self.emit()
+        self.emit("def to_dict(self) -> dict:", 1)
+        self.emit("if not self.validate():", 2)
+        self.emit('raise MessageBusException("Invalid arguments")', 3)
+        required = [(f, t) for f, t in fields if not t.nullable]
+        optional = [(f, t) for f, t in fields if t.nullable]
+        self.emit_wrapped("result = {", ['"{}": {}'.format(f, t.to_value("self." + f)) for f, t in required], "}", 2,
+                          first_separator="")
+        for f, t in optional:
+            self.emit("if self.{} is not None:".format(f), 2)
+            self.emit('result["{}"] = {}'.format(f, t.to_value("self." + f)), 3)
+        self.emit("return result", 2)
+
+        self.emit()
+        self.emit("def validate(self) -> bool:", 1)
+        checks = ["self.{} is not None".format(f) for f, t in required]
+        self.emit("return {}".format(" and ".join(checks) if len(checks) > 0 else "True"), 2)
+        if len(self.lines[-1]) > MAX_LINE_LENGTH:
+            self.lines.pop()
+            self.emit_wrapped("return all(getattr(self, f) is not None for f in (",
+                              ['"{}"'.format(f) for f, t in required], "))", 2, first_separator="")
+
+        self.emit()
+        self.emit("def __str__(self):", 1)
+        self.emit_wrapped('return " ".join("{}: {}".format(f, getattr(self, f)) for f in (',
+                          ['"{}"'.format(f) for f, t in fields], ",))" if len(fields) == 1 else "))", 2,
+                          first_separator="")
+
+        self.emit()
+        self.emit("def print(self):", 1)
+        self.emit("print(self)", 2)
+
+        record_name = full_name.split('.')[-1]
+        if record_name in FIELD_CONVERTERS:
+            for f, t in fields:
+                if t.kind == 'primitive':
+                    continue
+                self.emit()
+                value_type = "dict" if t.kind == 'record' else t.python_type
+                self.emit("def from_dict_{}(self, value: {}):".format(f, value_type), 1)
+                self.emit("if value is not None:", 2)
+                self.emit("self.{} = {}".format(f, t.from_value("value")), 3)
+                self.emit()
+                self.emit("def to_dict_{}(self, result: dict) -> dict:".format(f), 1)
+                self.emit("if self.{} is not None:".format(f), 2)
+                self.emit('result["{}"] = {}'.format(f, t.to_value("self." + f)), 3)
+                self.emit("return result", 2)
+
+        pickled = PICKLED_FIELDS.get(record_name, [])
+        for f in pickled:
+            self.emit()
+            self.emit("@staticmethod", 1)
+            self.emit("def {}_to_bytes(value) -> bytes:".format(f), 1)
+            self.emit("return pickle.dumps(value) if value is not None else None", 2)
+            self.emit()
+            self.emit("@staticmethod", 1)
+            self.emit("def bytes_to_{}(value: bytes):".format(f), 1)
+            self.emit("return pickle.loads(value) if value is not None else None", 2)
+
+        # Getters the message interface already provides
+        provided = set()
+        if is_message:
+            field_names = [f for f, t in fields]
+            provided = {"message_id", "callback_topic"}
+            self.emit()
+            self.emit("def get_message_id(self) -> str:", 1)
+            self.emit("return self.message_id", 2)
+            self.emit()
+            self.emit("def get_message_name(self) -> str:", 1)
+            self.emit("return self.name", 2)
+            self.emit()
+            self.emit("def get_callback_topic(self) -> str:", 1)
+            self.emit("return {}".format("self.callback_topic" if "callback_topic" in field_names else "None"), 2)
+            self.emit()
+            self.emit("def get_id(self) -> str:", 1)
+            self.emit("return self.id.__str__()", 2)
+            self.emit()
+            self.emit("def get_schema_name(self) -> str:", 1)
+            self.emit("return self.schema_name", 2)
+
+        # Accessors
+        field_types = dict(fields)
+        accessors = [(f, f) for f, t in fields]
+        accessors.extend(sorted(ACCESSOR_ALIASES.get(record_name, {}).items()))
+        for accessor, f in accessors:
+            python_type = field_types[f].python_type
+            if f in pickled:
+                # Values are kept pickled, as by the hand written classes
+                self.emit()
+                self.emit("def get_{}(self):".format(accessor), 1)
+                self.emit("return self.bytes_to_{0}(self.{0})".format(f), 2)
+                self.emit()
+                self.emit("def set_{}(self, value):".format(accessor), 1)
+                self.emit("self.{0} = self.{0}_to_bytes(value)".format(f), 2)
+                continue
+            if accessor not in provided:
+                self.emit()
+                self.emit("def get_{}(self) -> {}:".format(accessor, python_type), 1)
+                self.emit("return self.{}".format(f), 2)
+            if python_type == "bool":
+                self.emit()
+                self.emit("def is_{}(self) -> bool:".format(accessor), 1)
+                self.emit("return self.{}".format(f), 2)
+            self.emit()
+            self.emit("def set_{}(self, value: {}):".format(accessor, python_type), 1)
+            self.emit("self.{} = value".format(f), 2)
+
+    def generate(self) -> str:
+        """
+        Return the source of the generated module
+        """
+        self.lines = []
+        with open(HEADER_FILE, "r") as f:
+            header = [line.rstrip("\n") for line in f.readlines()]
+        # License header of the package
+        header = header[:header.index('"""')]
+        while header[-1] == "":
+            header.pop()
+        self.lines.extend(header)
+        self.emit("# Generated by fabric_mb.message_bus.codegen from schema/message.avsc; do not edit")
+        self.emit('"""')
+        self.emit("Slotted classes for the records in schema/message.avsc")
+        self.emit('"""')
+        self.emit("import pickle")
+        self.emit("from uuid import uuid4")
+        self.emit()
+        self.emit("from fabric_mb.message_bus.message_bus_exception import MessageBusException")
+        self.emit("from fabric_mb.message_bus.messages.message import IMessageAvro")
+        records = self.get_records()
+        for full_name in records:
+            self.emit_record(full_name)
+        self.emit()
+        self.emit()
+        self.emit("# Record name -> class")
+        self.emit("RECORDS = {")
+        for full_name in records:
+            self.emit('"{}": {},'.format(full_name.split('.')[-1], class_name(full_name)), 1)
+        self.emit("}")
+        self.emit()
+        self.emit("# Message records")
+        self.emit_wrapped("MESSAGES = [", [class_name(n) for n in records if n in self.messages], "]", 0,
+                          first_separator="")
+        return "\n".join(self.lines) + "\n"
+
+
+def generate(schema_file: str = DEFAULT_SCHEMA_FILE) -> str:
+    """
+    Return the source of the module generated for a schema file
+    """
+    return Generator(schema_file).generate()
+
+
+if __name__ == '__main__':
+    output = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT_FILE
+    with open(output, "w") as out:
+        out.write(generate())
+    print("Generated {}".format(output))
@@ -28,13 +28,26 @@
 Defines AvroConsumer API class which exposes interface for various consumer functions
 """
 import importlib
-import re
+from concurrent.futures import Executor
+from typing import Callable, Dict, Iterable, List, Tuple, Union
 
+from confluent_kafka import KafkaException, TopicPartition
 from confluent_kafka.avro import AvroConsumer, SerializerError
 from confluent_kafka.cimpl import KafkaError
 
 from fabric_mb.message_bus.base import Base
+from fabric_mb.message_bus.codec import AvroCodec, get_deserializer
+from fabric_mb.message_bus.dead_letter import DeadLetterRouter, FailedRecord, RoutingException
+from fabric_mb.message_bus.dedup_cache import DedupCache
+from fabric_mb.message_bus.dispatcher import KeyedDispatcher
+from fabric_mb.message_bus.flow_control import FlowControl
+from fabric_mb.message_bus.message_headers import HeaderFilter, build_header_filter, parse_headers
+from fabric_mb.message_bus.message_keys import KeyFunction, default_ordering_key, get_key_function
+from fabric_mb.message_bus.message_registry import MessageRegistry, default_registry
+from fabric_mb.message_bus.message_schemas import MessageSchemas
 from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.object_codec import ObjectCodec
+from fabric_mb.message_bus.offset_tracker import OffsetCommitter, OffsetTracker
 
 
 class AvroConsumerApi(Base):
@@ -42,12 +55,89 @@ class AvroConsumerApi(Base):
     This class implements the Interface for Kafka consumer carrying Avro messages.
     It is expected that the users would extend this class and override handle_message function.
     """
-    def __init__(self, conf, key_schema, record_schema, topics, batch_size=5, logger=None):
+    def __init__(self, conf, key_schema, record_schema, topics, batch_size=5, logger=None,
+                 registry: MessageRegistry = None, max_batch_size: int = 100, max_batch_wait: float = 1.0,
+                 codec: AvroCodec = None, projection: Dict[str, Iterable[str]] = None,
+                 header_filter: Union[Iterable[str], HeaderFilter] = None, read_committed: bool = None,
+                 dedup: DedupCache = None, dead_letter: DeadLetterRouter = None, flow_control: FlowControl = None):
+        """
+        Initialize the Consumer API
+        :param conf: configuration
+        :param key_schema: loaded AVRO schema for the key
+        :param record_schema: loaded AVRO schema for the value
+        :param topics: list of topics to subscribe to
+        :param batch_size: number of messages processed between synchronous commits
+        :param logger: logger
+        :param registry: registry used to map incoming message names to message classes; defaults to a
+                         registry layered on top of the default registry
+        :param max_batch_size: maximum number of messages fetched per call by consume_batch
+        :param max_batch_wait: maximum time in seconds consume_batch waits to fill a batch
+        :param codec: codec used to decode records, e.g. FastAvroCodec; None keeps the confluent_kafka.avro decoder.
+                      ObjectCodec decodes straight into messages created by its registry, defaulting to registry
+        :param projection: fields to decode per record, keyed by record name e.g.
+                           {"ReservationMngRecord": ["reservation_id", "state"]}; the other fields are skipped and
+                           keep their defaults. Fields without a default are always decoded
+        :param header_filter: message names to decode, or callable returning True for the headers (see
+                              message_headers) of the messages to decode. Other messages are passed to
+                              handle_filtered without decoding their value
+        :param read_committed: True to only read records of committed transactions (isolation.level
+                               read_committed), False to also read records of open and aborted transactions. None
+                               keeps isolation.level from conf, else the librdkafka default, read_committed
+        :param dedup: cache of the message ids handled recently; messages found in it are redelivered duplicates
+                      and are dropped instead of being handled again
+        :param dead_letter: routes records failing deserialization or handling to retry topics, which are consumed
+                            along with topics, and to a dead letter topic, instead of logging and skipping them.
+                            Turns enable.auto.offset.store off: offsets are stored once their records are
+                            processed, so that commits stop before retries held back until they are due
+        :param flow_control: pauses partitions with too many messages received but not handled yet, for
+                             consume_parallel and AsyncAvroConsumer, which otherwise buffer messages without bound
+        """
         super().__init__(logger)
+        conf = dict(conf)
+        if read_committed is not None:
+            conf['isolation.level'] = 'read_committed' if read_committed else 'read_uncommitted'
+        # Results of asynchronous commits are reported to the committer of the running consume loop, if any
+        self.committer = None
+        self.user_on_commit = conf.get('on_commit')
+        conf['on_commit'] = self._on_commit
+        if dead_letter is not None:
+            # Offsets stored as records are consumed would move past the retries held back by seeking
+            conf['enable.auto.offset.store'] = False
+        if projection is not None:
+            record_schema = MessageSchemas(schema_str=str(record_schema)).get_projected_schema(projection)
         self.consumer = AvroConsumer(conf, reader_key_schema=key_schema, reader_value_schema=record_schema)
         self.running = True
         self.topics = topics
         self.batch_size = batch_size
+        self.registry = registry if registry is not None else MessageRegistry(parent=default_registry)
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.codec = codec
+        self.header_filter = build_header_filter(header_filter) if header_filter is not None else None
+        self.dedup = dedup
+        self.dead_letter = dead_letter
+        self.flow_control = flow_control
+        # Record of the last message returned by poll, as consumed
+        self.last_record = None
+        if isinstance(codec, ObjectCodec) and codec.registry is None:
+            codec.registry = self.registry
+        # Decodes the messages returned by consume; AvroConsumer only decodes in poll
+        self.deserializer = get_deserializer(self.consumer, codec, reader_key_schema=key_schema,
+                                             reader_value_schema=record_schema)
+
+    def get_topics(self) -> List[str]:
+        """
+        Return the topics to subscribe to: topics, and the retry topics of the dead letter router if any
+        """
+        if self.dead_letter is None:
+            return self.topics
+        return list(self.topics) + self.dead_letter.get_topics()
+
+    def _on_commit(self, err: KafkaError, partitions: List[TopicPartition]):
+        if self.committer is not None:
+            self.committer.on_commit(err, partitions)
+        if self.user_on_commit is not None:
+            self.user_on_commit(err, partitions)
 
     def shutdown(self):
         """
@@ -69,6 +159,14 @@ class AvroConsumerApi(Base):
         class_ = getattr(module, class_name)
         return class_
 
+    def register_message(self, name: str, factory: Callable[[], IMessageAvro] = None):
+        """
+        Register a message type with this consumer; usable as a class decorator
+        :param name: message name
+        :param factory: callable returning a new message instance
+        """
+        return self.registry.register(name, factory)
+
     def process_message(self, topic: str, key: dict, value: dict):
         """
         Process the incoming message. Must be overridden in the derived class
@@ -80,15 +178,71 @@ class AvroConsumerApi(Base):
         self.log_debug("Message received for topic " + topic)
         self.log_debug("Key = {}".format(key))
         self.log_debug("Value = {}".format(value))
-        class_name = value.get('name', None) + 'Avro'
-        self.log_debug("class_name = {}".format(class_name))
-        module_name = 'fabric_mb.message_bus.messages.' + re.sub(r'(?<!^)(?=[A-Z])', '_', class_name).lower()
-        self.log_debug("module_name = {}".format(module_name))
 
-        message = self._create_instance(module_name=module_name, class_name=class_name)
-        message.from_dict(value)
+        message = self.create_message(value)
 
+        if self.is_duplicate(message):
+            return
         self.handle_message(message=message)
+        self.mark_handled(message)
+
+    def is_duplicate(self, message: IMessageAvro) -> bool:
+        """
+        Return True if a message was already handled according to the dedup cache
+        :param message: incoming message
+        """
+        if self.dedup is None or message.get_message_id() is None:
+            return False
+        if self.dedup.contains(message.get_message_id()):
+            self.log_debug("Dropping duplicate message {}".format(message.get_message_id()))
+            return True
+        return False
+
+    def mark_handled(self, message: IMessageAvro):
+        """
+        Add a message that has been handled to the dedup cache. Messages are only added once handled, so that a
+        message whose handling did not complete is handled again when redelivered
+        :param message: handled message
+        """
+        if self.dedup is not None and message.get_message_id() is not None:
+            self.dedup.add(message.get_message_id())
+
+    def drop_duplicates(self, messages: List[IMessageAvro]) -> List[IMessageAvro]:
+        """
+        Return the messages of a batch not handled yet according to the dedup cache, keeping the first of several
+        messages with the same message id
+        :param messages: incoming messages
+        """
+        if self.dedup is None:
+            return messages
+        result = []
+        seen = set()
+        for message in messages:
+            if message.get_message_id() in seen or self.is_duplicate(message):
+                continue
+            seen.add(message.get_message_id())
+            result.append(message)
+        return result
+
+    def close(self):
+        """
+        Close the consumer, saving the dedup cache if any
+        """
+        if self.dedup is not None:
+            self.dedup.save()
+        self.consumer.close()
+
+    def create_message(self, value: dict) -> IMessageAvro:
+        """
+        Create the message object for a decoded value
+        :param value: incoming message value; returned as is when already decoded into a message e.g. by ObjectCodec
+        :return message
+        """
+        if not isinstance(value, dict):
+            return value
+        message = self.registry.create(value.get('name', None))
+        message.from_dict(value)
+        return message
 
     def handle_message(self, message: IMessageAvro):
         """
@@ -97,15 +251,201 @@ class AvroConsumerApi(Base):
         """
         print(message)
 
+    def handle_messages(self, messages: List[IMessageAvro]):
+        """
+        Handle a batch of incoming messages received by consume_batch. Defaults to calling handle_message for
+        each message in order; may be overridden by the derived class to process the batch as a whole
+        :param messages: incoming messages
+        """
+        for message in messages:
+            self.handle_message(message=message)
+
+    def accept(self, msg) -> bool:
+        """
+        Return True if a message passes the header filter and is to be decoded; other messages are passed to
+        handle_filtered
+        :param msg: message, not yet decoded
+        """
+        if self.header_filter is None or self.header_filter(parse_headers(msg.headers())):
+            return True
+        self.handle_filtered(msg)
+        return False
+
+    def handle_filtered(self, msg):
+        """
+        Handle a message left out by the header filter; may be overridden by the derived class e.g. to reroute
+        the message as is to another topic
+        :param msg: message, not decoded
+        """
+        self.log_debug("Skipping message at {} [{}] offset {}".format(msg.topic(), msg.partition(), msg.offset()))
+
+    def poll(self, timeout: float):
+        """
+        Return the next message with its key and value decoded. Messages left out by the header filter are not
+        decoded and None is returned in their place, as when no message is available
+        :param timeout: maximum time to block in seconds
+        :return message or None
+        """
+        if self.header_filter is None and self.dead_letter is None:
+            return self.consumer.poll(timeout)
+        if self.dead_letter is not None:
+            self.dead_letter.resume_due(self.consumer)
+        # AvroConsumer decodes in poll; consume returns the message as is
+        msgs = self.consumer.consume(num_messages=1, timeout=timeout)
+        if not msgs:
+            return None
+        msg = msgs[0]
+        if msg.error() is None:
+            if self.dead_letter is not None and self.dead_letter.hold(self.consumer, msg):
+                return None
+            if not self.accept(msg):
+                self.store_offsets([msg])
+                return None
+            if self.dead_letter is not None:
+                # Kept to route the message as consumed should handling fail
+                self.last_record = FailedRecord.from_message(msg)
+            try:
+                key, value = self.decode(msg)
+            except SerializerError as e:
+                if self.dead_letter is None:
+                    raise
+                self.route(self.last_record, e, retry=False)
+                self.store_offsets([msg])
+                return None
+            msg.set_key(key)
+            msg.set_value(value)
+        return msg
+
+    def store_offsets(self, msgs: list) -> List[TopicPartition]:
+        """
+        Store the offsets following the messages of a batch, once they are processed. Only needed with a dead letter
+        router, which turns enable.auto.offset.store off; otherwise offsets are stored as messages are consumed
+        :param msgs: messages returned by consumer.consume or poll
+        :return offsets following the last message of each partition
+        """
+        offsets = {}
+        for msg in msgs:
+            if msg.error() is None:
+                tp = (msg.topic(), msg.partition())
+                offsets[tp] = max(offsets.get(tp, 0), msg.offset() + 1)
+        result = [TopicPartition(topic, partition, offset) for (topic, partition), offset in offsets.items()]
+        if self.dead_letter is not None and len(result) > 0:
+            self.consumer.store_offsets(offsets=result)
+        return result
+
+    def decode(self, msg):
+        """
+        Decode key and value of a message returned by consumer.consume; AvroConsumer only decodes in poll
+        :param msg: message
+        :return tuple of decoded key and value
+        """
+        return self.deserializer.decode_message(msg.key(), is_key=True), self.deserializer.decode_message(msg.value())
+
+    def process_batch(self, msgs: list) -> List[IMessageAvro]:
+        """
+        Decode a batch of messages returned by consumer.consume; errors and malformed records are logged and
+        skipped, or routed to the dead letter topic if any, messages left out by the header filter are not decoded
+        :param msgs: messages
+        :return list of decoded messages
+        """
+        return [message for msg, message in self.decode_batch(msgs)]
+
+    def decode_batch(self, msgs: list) -> List[Tuple[object, IMessageAvro]]:
+        """
+        Decode a batch of messages returned by consumer.consume, see process_batch
+        :param msgs: messages
+        :return list of message as consumed and decoded message
+        """
+        messages = []
+        for msg in msgs:
+            if msg.error():
+                if msg.error().code() != KafkaError._PARTITION_EOF:
+                    self.log_error("Consumer error: {}".format(msg.error()))
+                continue
+            if not self.accept(msg):
+                continue
+            try:
+                key, value = self.decode(msg)
+                messages.append((msg, self.create_message(value)))
+            except SerializerError as e:
+                self.log_error("Message deserialization failed for message at {} [{}] offset {}: {}".format(
+                    msg.topic(), msg.partition(), msg.offset(), e))
+                if self.dead_letter is not None:
+                    self.route(FailedRecord.from_message(msg), e, retry=False)
+        return messages
+
+    def hold_retries(self, msgs: list) -> list:
+        """
+        Return the messages of a batch that are not held back by the dead letter router: retries that are not due
+        yet, and the messages following them in their partition
+        :param msgs: messages returned by consumer.consume
+        """
+        if self.dead_letter is None:
+            return msgs
+        return [msg for msg in msgs if msg.error() is not None or not (self.dead_letter.is_held(msg) or
+                                                                        self.dead_letter.hold(self.consumer, msg))]
+
+    def route(self, record: FailedRecord, error: BaseException, retry: bool = True):
+        """
+        Route a failed record with the dead letter router
+        :param record: failed record
+        :param error: error raised by the decoder or the handler
+        :param retry: False to send the record to the dead letter topic right away
+        :raises RoutingException if the record could not be delivered, so that its offset is not committed
+        """
+        if not self.dead_letter.route(record, error, retry=retry):
+            raise RoutingException("Failed to route record at {} [{}] offset {}".format(
+                record.topic, record.partition, record.offset)) from error
+
+    def process_record(self, msg):
+        """
+        Process a message returned by poll. If processing fails, the message is routed by the dead letter router if
+        any, else the exception is raised. RoutingException is raised if routing fails
+        :param msg: message
+        """
+        if self.dead_letter is None:
+            self.process_message(msg.topic(), msg.key(), msg.value())
+            return
+        record = self.last_record
+        try:
+            self.process_message(msg.topic(), msg.key(), msg.value())
+        except Exception as e:
+            self.route(record, e)
+
+    def handle_batch(self, decoded: List[Tuple[object, IMessageAvro]], messages: List[IMessageAvro]) -> set:
+        """
+        Pass a batch to handle_messages. If it fails and there is a dead letter router, the messages are handled one
+        at a time, and the ones failing are routed
+        :param decoded: messages as consumed and decoded, from decode_batch
+        :param messages: decoded messages to handle
+        :return ids of the messages that failed
+        """
+        try:
+            self.handle_messages(messages)
+            return set()
+        except Exception as e:
+            if self.dead_letter is None:
+                raise
+            self.log_error("Failed to handle batch, handling messages one at a time: {}".format(e))
+        consumed = {id(message): msg for msg, message in decoded}
+        failed = set()
+        for message in messages:
+            try:
+                self.handle_message(message)
+            except Exception as e:
+                failed.add(id(message))
+                self.route(FailedRecord.from_message(consumed[id(message)]), e)
+        return failed
+
     def consume_auto(self):
         """
             Consume records unless shutdown triggered. Uses Kafka's auto commit.
         """
-        self.consumer.subscribe(self.topics)
+        self.consumer.subscribe(self.get_topics())
 
         while self.running:
             try:
-                msg = self.consumer.poll(1)
+                msg = self.poll(1)
 
                 # There were no messages on the queue, continue polling
                 if msg is None:
@@ -121,7 +461,8 @@ class AvroConsumerApi(Base):
                         self.log_error("Consumer error: {}".format(msg.error()))
                         continue
 
-                self.process_message(msg.topic(), msg.key(), msg.value())
+                self.process_record(msg)
+                self.store_offsets([msg])
             except SerializerError as e:
                 # Report malformed record, discard results, continue polling
                 self.log_error("Message deserialization failed {}".format(e))
@@ -130,18 +471,34 @@ class AvroConsumerApi(Base):
                 break
 
         self.log_debug("Shutting down consumer..")
-        self.consumer.close()
+        self.close()
 
-    def consume_sync(self):
+    def consume_sync(self, async_commit: bool = False, commit_interval: float = 1.0):
         """
             Consume records unless shutdown triggered. Using synchronous commit after a message batch.
+            :param async_commit: True to commit asynchronously instead, once batch_size messages have been
+                                 processed or commit_interval elapsed, and only up to the last processed message.
+                                 Offsets are then committed synchronously on revocation and shutdown
+            :param commit_interval: maximum time in seconds between processing a message and committing its offset,
+                                    with async_commit
         """
-        self.consumer.subscribe(self.topics)
+        committer = None
+        if async_commit:
+            committer = OffsetCommitter(self.consumer, commit_interval=commit_interval,
+                                        commit_count=self.batch_size, logger=self.logger)
+            self.committer = committer
+            # close() revokes the partitions, so the callback must not depend on self.committer
+            self.consumer.subscribe(self.get_topics(),
+                                    on_revoke=lambda consumer, partitions: committer.remove(partitions))
+        else:
+            self.consumer.subscribe(self.get_topics())
 
         msg_count = 0
         while self.running:
             try:
-                msg = self.consumer.poll(1)
+                if committer is not None:
+                    committer.maybe_commit()
+                msg = self.poll(1)
 
                 # There were no messages on the queue, continue polling
                 if msg is None:
@@ -157,7 +514,18 @@ class AvroConsumerApi(Base):
                         self.log_error("Consumer error: {}".format(msg.error()))
                         continue
 
-                self.process_message(msg.topic(), msg.key(), msg.value())
+                if committer is not None:
+                    committer.add(msg.topic(), msg.partition(), msg.offset())
+                    try:
+                        self.process_record(msg)
+                    except SerializerError:
+                        # Discarded below, do not hold back the commit watermark on it
+                        committer.complete(msg.topic(), msg.partition(), msg.offset())
+                        raise
+                    committer.complete(msg.topic(), msg.partition(), msg.offset())
+                    continue
+                self.process_record(msg)
+                self.store_offsets([msg])
                 msg_count += 1
                 if msg_count % self.batch_size == 0:
                     self.consumer.commit(asynchronous=False)
@@ -170,4 +538,167 @@ class AvroConsumerApi(Base):
                 break
 
         self.log_debug("Shutting down consumer..")
-        self.consumer.close()
+        if committer is not None:
+            committer.commit(asynchronous=False)
+        self.close()
+        self.committer = None
+
+    def consume_batch(self):
+        """
+            Consume records in batches of up to max_batch_size unless shutdown triggered. Each batch is decoded
+            and passed to handle_messages. Offsets are committed synchronously once per batch.
+        """
+        self.consumer.subscribe(self.get_topics())
+
+        while self.running:
+            try:
+                if self.dead_letter is not None:
+                    self.dead_letter.resume_due(self.consumer)
+                msgs = self.consumer.consume(num_messages=self.max_batch_size, timeout=self.max_batch_wait)
+
+                # There were no messages on the queue, continue polling
+                if not msgs:
+                    continue
+
+                consumed = self.hold_retries(msgs)
+                decoded = self.decode_batch(consumed)
+                messages = self.drop_duplicates([message for msg, message in decoded])
+                if len(messages) > 0:
+                    failed = self.handle_batch(decoded, messages)
+                    for message in messages:
+                        if id(message) not in failed:
+                            self.mark_handled(message)
+                # Commit up to the held retries, if any; there is nothing to commit when the batch only carried
+                # error events or held retries
+                offsets = self.store_offsets(consumed)
+                if len(offsets) > 0:
+                    self.consumer.commit(offsets=offsets, asynchronous=False)
+            except KeyboardInterrupt:
+                break
+
+        self.log_debug("Shutting down consumer..")
+        self.close()
+
+    def commit_offsets(self, tracker: OffsetTracker):
+        """
+        Synchronously commit the offsets up to which all messages have been handled
+        :param tracker: offset tracker
+        """
+        offsets = tracker.get_commit_offsets()
+        if len(offsets) == 0:
+            return
+        try:
+            self.consumer.commit(offsets=offsets, asynchronous=False)
+        except KafkaException as e:
+            self.log_error("Failed to commit offsets {}: {}".format(offsets, e))
+
+    def consume_parallel(self, max_workers: int = 8, key_function: Union[str, KeyFunction] = None,
+                         executor: Executor = None, handler: Callable[[IMessageAvro], None] = None,
+                         commit_interval: float = 1.0):
+        """
+            Consume records unless shutdown triggered, handling them on a worker pool. Messages with the same
+            ordering key are handled one at a time in the order received; messages with different keys, or no
+            key, are handled in parallel. Offsets are committed only up to the oldest message not yet handled in
+            each partition, so delivery remains at-least-once. A handler failure, unless routed by the dead letter
+            router, stops the loop once the messages in progress are handled and is raised. Commits are asynchronous
+            and issued once batch_size messages have been handled or commit_interval elapsed; they are synchronous on
+            revocation and shutdown. Requires 'enable.auto.commit': False.
+            :param max_workers: number of worker threads; ignored when executor is passed
+            :param key_function: returns the ordering key of a message, or the name of a key in
+                                 message_keys.KEY_FUNCTIONS e.g. "slice_id"; defaults to the reservation id, else
+                                 the delegation id, else the slice id the message refers to
+            :param executor: executor running the handler e.g. a ProcessPoolExecutor; the handler and messages
+                             must then be picklable
+            :param handler: callable invoked for each message; defaults to handle_message
+            :param commit_interval: maximum time in seconds between handling a message and committing its offset
+        """
+        key_function = get_key_function(key_function) if key_function is not None else default_ordering_key
+        if handler is None:
+            handler = self.handle_message
+        dispatcher = KeyedDispatcher(handler=handler, max_workers=max_workers, executor=executor,
+                                     logger=self.logger)
+        tracker = OffsetTracker()
+        committer = OffsetCommitter(self.consumer, tracker=tracker, commit_interval=commit_interval,
+                                    commit_count=self.batch_size, logger=self.logger)
+        self.committer = committer
+
+        def on_revoke(consumer, partitions):
+            # close() revokes the partitions, so the callback must not depend on self.committer
+            committer.remove(partitions)
+            if self.flow_control is not None:
+                self.flow_control.remove(partitions)
+
+        self.consumer.subscribe(self.get_topics(), on_revoke=on_revoke)
+
+        # Handler failures not routed by a dead letter router, and failures to route a record; the offset of the
+        # record is not completed, the loop stops and the failure is raised
+        failures = []
+        while self.running and len(failures) == 0:
+            try:
+                if self.flow_control is not None:
+                    # Paused partitions are not fetched from, but polling goes on to remain in the group
+                    self.flow_control.update(self.consumer, tracker.get_in_flight())
+                committer.maybe_commit()
+                msg = self.poll(1)
+
+                # There were no messages on the queue, continue polling
+                if msg is None:
+                    continue
+
+                if msg.error():
+                    if msg.error().code() != KafkaError._PARTITION_EOF:
+                        self.log_error("Consumer error: {}".format(msg.error()))
+                    continue
+
+                topic, partition, offset = msg.topic(), msg.partition(), msg.offset()
+                record = self.last_record
+                # Completions of the partition are ignored once it is revoked, even if it is assigned back meanwhile
+                generation = tracker.add(topic, partition, offset)
+                try:
+                    message = self.create_message(msg.value())
+                except Exception as e:
+                    # Do not hold back the commit watermark on a message that can never be handled
+                    self.log_error("Discarding message at {} [{}] offset {}: {}".format(topic, partition, offset, e))
+                    if self.dead_letter is not None:
+                        self.route(record, e, retry=False)
+                    committer.complete(topic, partition, offset)
+                    continue
+                if self.is_duplicate(message):
+                    committer.complete(topic, partition, offset)
+                    continue
+                dispatcher.submit(key_function(message), message,
+                                  lambda item, error, t=topic, p=partition, o=offset, g=generation, r=record:
+                                  self._on_handled(item, error, committer, t, p, o, g, r, failures))
+            except RoutingException as e:
+                failures.append(e)
+            except SerializerError as e:
+                # Report malformed record, discard results, continue polling
+                self.log_error("Message deserialization failed {}".format(e))
+                continue
+            except KeyboardInterrupt:
+                break
+
+        self.log_debug("Shutting down consumer..")
+        dispatcher.shutdown(wait=True)
+        committer.commit(asynchronous=False)
+        self.close()
+        self.committer = None
+        if len(failures) > 0:
+            raise failures[0]
+
+    def _on_handled(self, message: IMessageAvro, error: BaseException, committer: OffsetCommitter, topic: str,
+                    partition: int, offset: int, generation: int, record: FailedRecord, failures: list):
+        if error is not None:
+            try:
+                if self.dead_letter is None:
+                    raise error
+                self.route(record, error)
+            except Exception as e:
+                # Not completed, so that the commit watermark of the partition stays before the failed record
+                failures.append(e)
+                return
+        try:
+            if error is None:
+                self.mark_handled(message)
+        finally:
+            committer.complete(topic, partition, offset, generation)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Routes records that failed deserialization or handling to tiered retry topics, each delaying the next attempt,
+and finally to a dead letter topic, keeping the original bytes and headers along with the error
+"""
+import threading
+import time
+import traceback
+from typing import Dict, Iterable, List, Tuple
+
+from confluent_kafka import TopicPartition
+
+from fabric_mb.message_bus.base import Base
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_headers import parse_headers
+from fabric_mb.message_bus.producer import AvroProducerApi
+
+ERROR_HEADER = "fabric.error"
+ERROR_TYPE_HEADER = "fabric.error_type"
+ERROR_TRACE_HEADER = "fabric.error_trace"
+ORIGINAL_TOPIC_HEADER = "fabric.original_topic"
+ORIGINAL_PARTITION_HEADER = "fabric.original_partition"
+ORIGINAL_OFFSET_HEADER = "fabric.original_offset"
+RETRY_COUNT_HEADER = "fabric.retry_count"
+RETRY_AT_HEADER = "fabric.retry_at"
+
+# Set by the router; replaced on every failure rather than accumulated
+ROUTING_HEADERS = {ERROR_HEADER, ERROR_TYPE_HEADER, ERROR_TRACE_HEADER, RETRY_COUNT_HEADER, RETRY_AT_HEADER}
+ORIGINAL_HEADERS = {ORIGINAL_TOPIC_HEADER, ORIGINAL_PARTITION_HEADER, ORIGINAL_OFFSET_HEADER}
+
+MAX_ERROR_LENGTH = 1024
+MAX_TRACE_LENGTH = 8192
+
+
+def build_retry_topics(topic: str, delays: Iterable[float] = (1, 30, 300)) -> List[Tuple[str, float]]:
+    """
+    Return retry topics named after a topic and a delay each, e.g. topic.retry.30s
+    :param topic: topic the records are consumed from
+    :param delays: delay in seconds of each retry, in order
+    :return list of retry topic and delay
+    """
+    return [("{}.retry.{:g}s".format(topic, delay), delay) for delay in delays]
+
+
+class RoutingException(MessageBusException):
+    """
+    Raised when a failed record could not be delivered to its retry or dead letter topic; its offset must not be
+    committed
+    """
+    pass
+
+
+class FailedRecord:
+    """
+    Record as consumed, before decoding
+    """
+    __slots__ = ["topic", "partition", "offset", "key", "value", "headers"]
+
+    def __init__(self, topic: str, partition: int, offset: int, key: bytes, value: bytes, headers: list = None):
+        self.topic = topic
+        self.partition = partition
+        self.offset = offset
+        self.key = key
+        self.value = value
+        self.headers = headers
+
+    @staticmethod
+    def from_message(msg):
+        """
+        Return the record of a message that has not been decoded yet
+        """
+        return FailedRecord(msg.topic(), msg.partition(), msg.offset(), msg.key(), msg.value(), msg.headers())
+
+
+class DeadLetterRouter(Base):
+    """
+    Records failing to be handled are produced to the first retry topic, then to the next one each time they fail
+    again, and to the dead letter topic once the retries are exhausted. Records failing deserialization go to the
+    dead letter topic right away. Each retry topic delays its records: a consumer receiving a record before it is
+    due pauses the retry partition and seeks back to the record, so that other partitions keep being consumed while
+    it waits. Routed records keep their key, value and headers, with headers added for the error, the original
+    topic, partition and offset, the number of retries so far and the time the next retry is due.
+    """
+    def __init__(self, producer: AvroProducerApi, dlq_topic: str, retry_topics: List[Tuple[str, float]] = None,
+                 timeout: float = 10.0, logger=None):
+        """
+        :param producer: producer the records are routed with
+        :param dlq_topic: dead letter topic
+        :param retry_topics: retry topics and the delay of each in seconds, in order, see build_retry_topics;
+                             None sends failed records to the dead letter topic right away
+        :param timeout: maximum time in seconds to wait for a routed record to be delivered
+        :param logger: logger; defaults to the logger of the producer
+        """
+        super().__init__(logger if logger is not None else producer.logger)
+        self.producer = producer
+        self.dlq_topic = dlq_topic
+        self.retry_topics = list(retry_topics) if retry_topics is not None else []
+        self.retry_topic_names = {topic for topic, delay in self.retry_topics}
+        self.timeout = timeout
+        # (topic, partition) of the paused retry partitions -> time the record sought back to is due
+        self.held = {}  # type: Dict[Tuple[str, int], float]
+        self.retried = 0
+        self.dead_lettered = 0
+        self.route_failures = 0
+        self.lock = threading.Lock()
+
+    def get_topics(self) -> List[str]:
+        """
+        Return the retry topics, consumed along with the topics of the consumer
+        """
+        return [topic for topic, delay in self.retry_topics]
+
+    def route(self, record: FailedRecord, error: BaseException, retry: bool = True) -> bool:
+        """
+        Produce a failed record to the next retry topic, or to the dead letter topic, and wait for its delivery
+        :param record: failed record
+        :param error: error raised by the decoder or the handler
+        :param retry: False to send the record to the dead letter topic right away, e.g. for a malformed record
+        :return True if the record was delivered
+        """
+        headers = parse_headers(record.headers)
+        retry_count = int(headers.get(RETRY_COUNT_HEADER, 0))
+        if retry and retry_count < len(self.retry_topics):
+            topic, delay = self.retry_topics[retry_count]
+            retry_at = int((time.time() + delay) * 1000)
+        else:
+            topic, retry_at = self.dlq_topic, None
+
+        routed = [(name, value) for name, value in (record.headers or []) if name not in ROUTING_HEADERS]
+        if ORIGINAL_TOPIC_HEADER not in headers:
+            routed.extend([(ORIGINAL_TOPIC_HEADER, record.topic.encode('utf-8')),
+                           (ORIGINAL_PARTITION_HEADER, str(record.partition).encode('utf-8')),
+                           (ORIGINAL_OFFSET_HEADER, str(record.offset).encode('utf-8'))])
+        trace = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+        routed.extend([(ERROR_HEADER, str(error)[:MAX_ERROR_LENGTH].encode('utf-8')),
+                       (ERROR_TYPE_HEADER, type(error).__name__.encode('utf-8')),
+                       (ERROR_TRACE_HEADER, trace[-MAX_TRACE_LENGTH:].encode('utf-8'))])
+        if retry_at is not None:
+            routed.extend([(RETRY_COUNT_HEADER, str(retry_count + 1).encode('utf-8')),
+                           (RETRY_AT_HEADER, str(retry_at).encode('utf-8'))])
+        else:
+            routed.append((RETRY_COUNT_HEADER, str(retry_count).encode('utf-8')))
+
+        self.log_error("Routing record at {} [{}] offset {} to {}: {}".format(record.topic, record.partition,
+                                                                             record.offset, topic, error))
+        delivered = self.producer.forward(topic, record.key, record.value, headers=routed, timeout=self.timeout)
+        with self.lock:
+            if not delivered:
+                self.route_failures += 1
+            elif retry_at is not None:
+                self.retried += 1
+            else:
+                self.dead_lettered += 1
+        if not delivered:
+            self.log_error("Failed to route record at {} [{}] offset {} to {}".format(record.topic, record.partition,
+                                                                                  record.offset, topic))
+        return delivered
+
+    def hold(self, consumer, msg) -> bool:
+        """
+        Hold back a record consumed from a retry topic before it is due: the partition is paused and the consumer
+        seeks back to the record, which is consumed again once resume_due resumes the partition
+        :param consumer: confluent_kafka consumer
+        :param msg: message, not decoded
+        :return True if the record is held back
+        """
+        if msg.topic() not in self.retry_topic_names:
+            return False
+        retry_at = parse_headers(msg.headers()).get(RETRY_AT_HEADER, None)
+        if retry_at is None or int(retry_at) <= time.time() * 1000:
+            return False
+        partition = TopicPartition(msg.topic(), msg.partition())
+        consumer.pause([partition])
+        consumer.seek(TopicPartition(msg.topic(), msg.partition(), msg.offset()))
+        self.held[(msg.topic(), msg.partition())] = int(retry_at) / 1000
+        return True
+
+    def is_held(self, msg) -> bool:
+        """
+        Return True if a message belongs to a partition held back by hold
+        """
+        return (msg.topic(), msg.partition()) in self.held
+
+    def resume_due(self, consumer):
+        """
+        Resume the retry partitions whose record is due
+        :param consumer: confluent_kafka consumer
+        """
+        if len(self.held) == 0:
+            return
+        now = time.time()
+        due = [tp for tp, retry_at in self.held.items() if retry_at <= now]
+        for topic, partition in due:
+            del self.held[(topic, partition)]
+            try:
+                consumer.resume([TopicPartition(topic, partition)])
+            except Exception as e:
+                # The partition was revoked meanwhile
+                self.log_debug("Failed to resume {} [{}]: {}".format(topic, partition, e))
+
+    def get_metrics(self) -> dict:
+        """
+        Return the number of records sent to a retry topic (retried), to the dead letter topic (dead_lettered),
+        that could not be routed (route_failures) and of retry partitions held back (held)
+        """
+        with self.lock:
+            return {"retried": self.retried, "dead_lettered": self.dead_lettered,
+                    "route_failures": self.route_failures, "held": len(self.held)}
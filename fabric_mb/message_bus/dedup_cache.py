@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Remembers the message_id of recently handled messages so that consumers can drop messages redelivered under
+at-least-once delivery, e.g. after a rebalance or a crash
+"""
+import base64
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings, sized for a number of items and false positive rate
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        :param capacity: number of items the filter is sized for
+        :param error_rate: false positive rate once capacity items were added
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing; the two halves of a single digest stand in for independent hash functions
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def to_dict(self) -> dict:
+        return {"capacity": self.capacity, "error_rate": self.error_rate, "count": self.count,
+                "bits": base64.b64encode(bytes(self.bits)).decode("ascii")}
+
+    @staticmethod
+    def from_dict(value: dict):
+        result = BloomFilter(value["capacity"], value["error_rate"])
+        bits = base64.b64decode(value["bits"])
+        if len(bits) == len(result.bits):
+            result.bits = bytearray(bits)
+            result.count = value["count"]
+        return result
+
+
+class DedupCache:
+    """
+    Bounded set of recently handled message ids. Ids are kept in an LRU of up to max_size entries, each expiring ttl
+    seconds after it was added. For windows too large to keep every id, a Bloom filter additionally remembers ids
+    evicted from the LRU, at the cost of reporting new ids as duplicates with probability bloom_error_rate. The Bloom
+    filter is made of two generations of bloom_capacity ids, rotated every ttl seconds, so an id is remembered for
+    between ttl and twice ttl seconds.
+
+    The cache is saved to path, if set, every save_interval seconds and on save, and loaded back on creation.
+    """
+    def __init__(self, max_size: int = 100000, ttl: float = 3600.0, bloom_capacity: int = None,
+                 bloom_error_rate: float = 0.001, path: str = None, save_interval: float = 10.0):
+        """
+        :param max_size: maximum number of ids in the LRU
+        :param ttl: time in seconds an id is remembered
+        :param bloom_capacity: number of ids per Bloom filter generation; None disables the Bloom filter
+        :param bloom_error_rate: false positive rate of each Bloom filter generation
+        :param path: file the cache is saved to and loaded from
+        :param save_interval: minimum time in seconds between saves triggered by add
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.path = path
+        self.save_interval = save_interval
+        # message id -> expiry time, oldest first
+        self.entries = OrderedDict()
+        self.bloom = None
+        self.previous_bloom = None
+        self.bloom_started = time.time()
+        if bloom_capacity is not None:
+            self.bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+        self.hits = 0
+        self.misses = 0
+        self.last_saved = time.monotonic()
+        self.lock = threading.Lock()
+        # Serializes saves, which write to the same temporary file, without holding lock during file I/O
+        self.save_lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _rotate(self, now: float):
+        if self.bloom is None:
+            return
+        if now - self.bloom_started >= self.ttl or self.bloom.count >= self.bloom_capacity:
+            # The current generation is out of the window too if it did not rotate for another ttl
+            self.previous_bloom = self.bloom if now - self.bloom_started < 2 * self.ttl else None
+            self.bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+            self.bloom_started = now
+
+    def contains(self, message_id: str) -> bool:
+        """
+        Return True if a message id was added within ttl, counting a hit, else count a miss
+        :param message_id: message id
+        """
+        now = time.time()
+        with self.lock:
+            self._rotate(now)
+            expiry = self.entries.get(message_id, None)
+            if expiry is not None:
+                found = expiry > now
+            else:
+                found = self.bloom is not None and (message_id in self.bloom or (
+                    self.previous_bloom is not None and message_id in self.previous_bloom))
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return found
+
+    def add(self, message_id: str):
+        """
+        Remember a message id for ttl seconds, evicting the least recently added ids past max_size
+        :param message_id: message id
+        """
+        now = time.time()
+        with self.lock:
+            self._rotate(now)
+            self.entries[message_id] = now + self.ttl
+            self.entries.move_to_end(message_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            # Drop expired ids, oldest first
+            while len(self.entries) > 0:
+                oldest, expiry = next(iter(self.entries.items()))
+                if expiry > now:
+                    break
+                del self.entries[oldest]
+            if self.bloom is not None:
+                self.bloom.add(message_id)
+            # Claimed under lock so that concurrent adds trigger a single save
+            due = self.path is not None and time.monotonic() - self.last_saved >= self.save_interval
+            if due:
+                self.last_saved = time.monotonic()
+        if due:
+            self.save()
+
+    def get_metrics(self) -> dict:
+        """
+        Return the number of duplicates found (hits), of new ids (misses) and of ids in the LRU (size)
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+    def save(self):
+        """
+        Save the cache to path; the file is replaced atomically
+        """
+        if self.path is None:
+            return
+        with self.save_lock:
+            with self.lock:
+                state = {"entries": list(self.entries.items()), "bloom_started": self.bloom_started,
+                         "bloom": self.bloom.to_dict() if self.bloom is not None else None,
+                         "previous_bloom": self.previous_bloom.to_dict() if self.previous_bloom is not None
+                         else None}
+                self.last_saved = time.monotonic()
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.path)
+
+    def load(self):
+        """
+        Load the cache saved to path, dropping expired ids. A Bloom filter saved with a different capacity or error
+        rate is discarded
+        """
+        with open(self.path, "r") as f:
+            state = json.load(f)
+        now = time.time()
+        with self.lock:
+            self.entries = OrderedDict((message_id, expiry) for message_id, expiry in state["entries"]
+                                       if expiry > now)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            if self.bloom_capacity is not None and state.get("bloom", None) is not None:
+                blooms = [BloomFilter.from_dict(state[name]) if state.get(name, None) is not None else None
+                          for name in ["bloom", "previous_bloom"]]
+                if all(b is None or (b.capacity == self.bloom_capacity and b.error_rate == self.bloom_error_rate)
+                       for b in blooms):
+                    self.bloom, self.previous_bloom = blooms
+                    self.bloom_started = state["bloom_started"]
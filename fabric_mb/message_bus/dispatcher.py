@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Dispatches messages to a worker pool, running messages that share a key one at a time and in order
+"""
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, Future
+from typing import Callable, Any
+
+from fabric_mb.message_bus.base import Base
+
+
+class KeyedDispatcher(Base):
+    """
+    Runs a handler on a worker pool. Items submitted with the same key are handled sequentially in submission order;
+    items with different keys, or without a key, are handled in parallel.
+
+    Works with any concurrent.futures.Executor: a thread pool by default, or a process pool when the handler and
+    the items are picklable. Only the next item of a key is handed to the executor, once the previous one completes.
+    """
+    def __init__(self, handler: Callable[[Any], None], max_workers: int = 8, executor: Executor = None,
+                 logger=None):
+        """
+        Initialize the dispatcher
+        :param handler: callable invoked with each item
+        :param max_workers: number of worker threads; ignored when executor is passed
+        :param executor: executor running the handler
+        """
+        super().__init__(logger)
+        self.handler = handler
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_workers)
+        self.queues = {}
+        self.pending = 0
+        self.lock = threading.Condition()
+
+    def submit(self, key, item, on_complete: Callable[[Any, BaseException], None] = None):
+        """
+        Submit an item
+        :param key: ordering key; None if the item has no ordering constraint
+        :param item: item passed to the handler
+        :param on_complete: callable invoked with the item and the exception raised by the handler (None on
+                            success) once the item has been handled
+        """
+        with self.lock:
+            self.pending += 1
+            if key is not None:
+                queue = self.queues.get(key)
+                if queue is not None:
+                    queue.append((item, on_complete))
+                    return
+                self.queues[key] = deque()
+        self._start(key, item, on_complete)
+
+    def _start(self, key, item, on_complete):
+        future = self.executor.submit(self.handler, item)
+        future.add_done_callback(lambda f: self._done(key, item, on_complete, f))
+
+    def _done(self, key, item, on_complete, future: Future):
+        error = future.exception()
+        if error is not None:
+            self.log_error("Handler failed for key {}: {}".format(key, ''.join(
+                traceback.format_exception(type(error), error, error.__traceback__))))
+        if on_complete is not None:
+            try:
+                on_complete(item, error)
+            except Exception as e:
+                self.log_error("Completion callback failed for key {}: {}".format(key, e))
+
+        next_item = None
+        with self.lock:
+            self.pending -= 1
+            if key is not None:
+                queue = self.queues[key]
+                if len(queue) > 0:
+                    next_item = queue.popleft()
+                else:
+                    self.queues.pop(key)
+            self.lock.notify_all()
+
+        if next_item is not None:
+            self._start(key, next_item[0], next_item[1])
+
+    def get_pending(self) -> int:
+        """
+        Return the number of items submitted but not yet handled
+        """
+        with self.lock:
+            return self.pending
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until all submitted items have been handled
+        :param timeout: maximum time to wait in seconds
+        :return True if all items were handled, False on timeout
+        """
+        with self.lock:
+            return self.lock.wait_for(lambda: self.pending == 0, timeout=timeout)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shutdown the dispatcher
+        :param wait: wait for submitted items to be handled
+        """
+        if wait:
+            self.wait()
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Pauses fetching from partitions whose messages pile up faster than they are handled, and resumes them once the
+backlog drained, while the consumer keeps polling so that it remains a member of its group
+"""
+import threading
+import time
+from typing import Dict, Tuple
+
+from confluent_kafka import TopicPartition
+
+from fabric_mb.message_bus.base import Base
+
+
+class FlowControl(Base):
+    """
+    Applies high and low watermarks to the number of messages in flight, i.e. received but not yet handled, per
+    partition. A partition reaching high_watermark is paused; it is resumed once its backlog dropped to
+    low_watermark. Messages fetched before the pause may still be received, so the backlog can exceed the high
+    watermark by the consumer's prefetch.
+    """
+    def __init__(self, high_watermark: int = 1000, low_watermark: int = None, logger=None):
+        """
+        :param high_watermark: number of messages in flight at which a partition is paused
+        :param low_watermark: number of messages in flight at which a paused partition is resumed; defaults to half
+                              the high watermark
+        :param logger: logger
+        """
+        super().__init__(logger)
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark if low_watermark is not None else high_watermark // 2
+        if self.low_watermark >= self.high_watermark:
+            self.low_watermark = self.high_watermark - 1
+        # (topic, partition) -> time the partition was paused
+        self.paused = {}  # type: Dict[Tuple[str, int], float]
+        self.pauses = 0
+        self.pause_time = 0.0
+        self.lock = threading.Lock()
+
+    def update(self, consumer, in_flight: Dict[Tuple[str, int], int]):
+        """
+        Pause the partitions at or over the high watermark and resume the paused ones at or below the low watermark.
+        Called from the thread polling the consumer
+        :param consumer: confluent_kafka consumer
+        :param in_flight: number of messages in flight per (topic, partition); partitions left out have none
+        """
+        pause = []
+        resume = []
+        now = time.monotonic()
+        with self.lock:
+            for tp, count in in_flight.items():
+                if count >= self.high_watermark and tp not in self.paused:
+                    self.paused[tp] = now
+                    self.pauses += 1
+                    pause.append(tp)
+            for tp, paused in list(self.paused.items()):
+                if in_flight.get(tp, 0) <= self.low_watermark:
+                    del self.paused[tp]
+                    self.pause_time += now - paused
+                    resume.append(tp)
+        if len(pause) > 0:
+            self.log_debug("Pausing partitions {}".format(pause))
+            consumer.pause([TopicPartition(topic, partition) for topic, partition in pause])
+        if len(resume) > 0:
+            self.log_debug("Resuming partitions {}".format(resume))
+            try:
+                consumer.resume([TopicPartition(topic, partition) for topic, partition in resume])
+            except Exception as e:
+                # A partition was revoked meanwhile
+                self.log_debug("Failed to resume partitions {}: {}".format(resume, e))
+
+    def remove(self, partitions: list):
+        """
+        Forget paused partitions e.g. on revocation; they are no longer paused once assigned again
+        :param partitions: list of TopicPartition
+        """
+        now = time.monotonic()
+        with self.lock:
+            for tp in partitions:
+                paused = self.paused.pop((tp.topic, tp.partition), None)
+                if paused is not None:
+                    self.pause_time += now - paused
+
+    def get_metrics(self) -> dict:
+        """
+        Return the number of partitions paused (paused), of times a partition was paused (pauses) and the total time
+        in seconds partitions spent paused, including the ongoing pauses (pause_time)
+        """
+        now = time.monotonic()
+        with self.lock:
+            return {"paused": len(self.paused), "pauses": self.pauses,
+                    "pause_time": self.pause_time + sum(now - paused for paused in self.paused.values())}
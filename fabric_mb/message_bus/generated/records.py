@@ -0,0 +1,4107 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+# Generated by fabric_mb.message_bus.codegen from schema/message.avsc; do not edit
+"""
+Slotted classes for the records in schema/message.avsc
+"""
+import pickle
+from uuid import uuid4
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.messages.message import IMessageAvro
+
+
+class AuthRecord:
+    """
+    Generated from fabric.cf.model.AuthRecord
+    """
+    __slots__ = ("name", "guid", "oidc_sub_claim")
+    schema_name = "AuthRecord"
+
+    def __init__(self, name: str = None, guid: str = None, oidc_sub_claim: str = None):
+        self.name = name
+        self.guid = guid
+        self.oidc_sub_claim = oidc_sub_claim
+
+    @classmethod
+    def create(cls, value: dict) -> 'AuthRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.guid = value['guid']
+        self.oidc_sub_claim = value.get('oidc_sub_claim')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"name": self.name, "guid": self.guid}
+        if self.oidc_sub_claim is not None:
+            result["oidc_sub_claim"] = self.oidc_sub_claim
+        return result
+
+    def validate(self) -> bool:
+        return self.name is not None and self.guid is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("name", "guid", "oidc_sub_claim"))
+
+    def print(self):
+        print(self)
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_oidc_sub_claim(self) -> str:
+        return self.oidc_sub_claim
+
+    def set_oidc_sub_claim(self, value: str):
+        self.oidc_sub_claim = value
+
+
+class ResultRecord:
+    """
+    Generated from fabric.cf.model.ResultRecord
+    """
+    __slots__ = ("code", "message", "details")
+    schema_name = "ResultRecord"
+
+    def __init__(self, code: int = None, message: str = None, details: str = None):
+        self.code = code
+        self.message = message
+        self.details = details
+
+    @classmethod
+    def create(cls, value: dict) -> 'ResultRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.code = value['code']
+        self.message = value.get('message')
+        self.details = value.get('details')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"code": self.code}
+        if self.message is not None:
+            result["message"] = self.message
+        if self.details is not None:
+            result["details"] = self.details
+        return result
+
+    def validate(self) -> bool:
+        return self.code is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("code", "message", "details"))
+
+    def print(self):
+        print(self)
+
+    def get_code(self) -> int:
+        return self.code
+
+    def set_code(self, value: int):
+        self.code = value
+
+    def get_message(self) -> str:
+        return self.message
+
+    def set_message(self, value: str):
+        self.message = value
+
+    def get_details(self) -> str:
+        return self.details
+
+    def set_details(self, value: str):
+        self.details = value
+
+
+class ReservationStateRecord:
+    """
+    Generated from fabric.cf.model.ReservationStateRecord
+    """
+    __slots__ = ("name", "state", "pending_state", "joining")
+    schema_name = "ReservationStateRecord"
+
+    def __init__(self, name: str = None, state: int = None, pending_state: int = None, joining: int = None):
+        self.name = name
+        self.state = state
+        self.pending_state = pending_state
+        self.joining = joining
+
+    @classmethod
+    def create(cls, value: dict) -> 'ReservationStateRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.state = value['state']
+        self.pending_state = value['pending_state']
+        self.joining = value.get('joining')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"name": self.name, "state": self.state, "pending_state": self.pending_state}
+        if self.joining is not None:
+            result["joining"] = self.joining
+        return result
+
+    def validate(self) -> bool:
+        return self.name is not None and self.state is not None and self.pending_state is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("name", "state", "pending_state", "joining"))
+
+    def print(self):
+        print(self)
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def get_state(self) -> int:
+        return self.state
+
+    def set_state(self, value: int):
+        self.state = value
+
+    def get_pending_state(self) -> int:
+        return self.pending_state
+
+    def set_pending_state(self, value: int):
+        self.pending_state = value
+
+    def get_joining(self) -> int:
+        return self.joining
+
+    def set_joining(self, value: int):
+        self.joining = value
+
+
+class ProxyRecord:
+    """
+    Generated from fabric.cf.model.ProxyRecord
+    """
+    __slots__ = ("protocol", "name", "guid", "type", "kafka_topic")
+    schema_name = "ProxyRecord"
+
+    def __init__(self,
+            protocol: str = None,
+            name: str = None,
+            guid: str = None,
+            type: str = None,
+            kafka_topic: str = None,
+    ):
+        self.protocol = protocol
+        self.name = name
+        self.guid = guid
+        self.type = type
+        self.kafka_topic = kafka_topic
+
+    @classmethod
+    def create(cls, value: dict) -> 'ProxyRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.protocol = value['protocol']
+        self.name = value['name']
+        self.guid = value['guid']
+        self.type = value['type']
+        self.kafka_topic = value['kafka_topic']
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "protocol": self.protocol,
+            "name": self.name,
+            "guid": self.guid,
+            "type": self.type,
+            "kafka_topic": self.kafka_topic,
+        }
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("protocol", "name", "guid", "type", "kafka_topic"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "protocol",
+            "name",
+            "guid",
+            "type",
+            "kafka_topic",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_protocol(self) -> str:
+        return self.protocol
+
+    def set_protocol(self, value: str):
+        self.protocol = value
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_type(self) -> str:
+        return self.type
+
+    def set_type(self, value: str):
+        self.type = value
+
+    def get_kafka_topic(self) -> str:
+        return self.kafka_topic
+
+    def set_kafka_topic(self, value: str):
+        self.kafka_topic = value
+
+
+class UnitRecord:
+    """
+    Generated from fabric.cf.model.UnitRecord
+    """
+    __slots__ = (
+        "reservation_id",
+        "rtype",
+        "sliver",
+        "parent_id",
+        "state",
+        "sequence",
+        "slice_id",
+        "actor_id",
+        "properties",
+    )
+    schema_name = "UnitRecord"
+
+    def __init__(self,
+            reservation_id: str = None,
+            rtype: str = None,
+            sliver: bytes = None,
+            parent_id: str = None,
+            state: int = None,
+            sequence: int = None,
+            slice_id: str = None,
+            actor_id: str = None,
+            properties: dict = None,
+    ):
+        self.reservation_id = reservation_id
+        self.rtype = rtype
+        self.sliver = sliver
+        self.parent_id = parent_id
+        self.state = state
+        self.sequence = sequence
+        self.slice_id = slice_id
+        self.actor_id = actor_id
+        self.properties = properties
+
+    @classmethod
+    def create(cls, value: dict) -> 'UnitRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.reservation_id = value['reservation_id']
+        self.rtype = value.get('rtype')
+        self.sliver = value.get('sliver')
+        self.parent_id = value.get('parent_id')
+        self.state = value.get('state')
+        self.sequence = value.get('sequence')
+        self.slice_id = value.get('slice_id')
+        self.actor_id = value.get('actor_id')
+        properties = value.get('properties')
+        if properties is not None:
+            properties = properties
+        self.properties = properties
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"reservation_id": self.reservation_id}
+        if self.rtype is not None:
+            result["rtype"] = self.rtype
+        if self.sliver is not None:
+            result["sliver"] = self.sliver
+        if self.parent_id is not None:
+            result["parent_id"] = self.parent_id
+        if self.state is not None:
+            result["state"] = self.state
+        if self.sequence is not None:
+            result["sequence"] = self.sequence
+        if self.slice_id is not None:
+            result["slice_id"] = self.slice_id
+        if self.actor_id is not None:
+            result["actor_id"] = self.actor_id
+        if self.properties is not None:
+            result["properties"] = self.properties
+        return result
+
+    def validate(self) -> bool:
+        return self.reservation_id is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "reservation_id",
+            "rtype",
+            "sliver",
+            "parent_id",
+            "state",
+            "sequence",
+            "slice_id",
+            "actor_id",
+            "properties",
+        ))
+
+    def print(self):
+        print(self)
+
+    @staticmethod
+    def sliver_to_bytes(value) -> bytes:
+        return pickle.dumps(value) if value is not None else None
+
+    @staticmethod
+    def bytes_to_sliver(value: bytes):
+        return pickle.loads(value) if value is not None else None
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, value: str):
+        self.reservation_id = value
+
+    def get_rtype(self) -> str:
+        return self.rtype
+
+    def set_rtype(self, value: str):
+        self.rtype = value
+
+    def get_sliver(self):
+        return self.bytes_to_sliver(self.sliver)
+
+    def set_sliver(self, value):
+        self.sliver = self.sliver_to_bytes(value)
+
+    def get_parent_id(self) -> str:
+        return self.parent_id
+
+    def set_parent_id(self, value: str):
+        self.parent_id = value
+
+    def get_state(self) -> int:
+        return self.state
+
+    def set_state(self, value: int):
+        self.state = value
+
+    def get_sequence(self) -> int:
+        return self.sequence
+
+    def set_sequence(self, value: int):
+        self.sequence = value
+
+    def get_slice_id(self) -> str:
+        return self.slice_id
+
+    def set_slice_id(self, value: str):
+        self.slice_id = value
+
+    def get_actor_id(self) -> str:
+        return self.actor_id
+
+    def set_actor_id(self, value: str):
+        self.actor_id = value
+
+    def get_properties(self) -> dict:
+        return self.properties
+
+    def set_properties(self, value: dict):
+        self.properties = value
+
+    def get_resource_type(self) -> str:
+        return self.rtype
+
+    def set_resource_type(self, value: str):
+        self.rtype = value
+
+    def get_unit_id(self) -> str:
+        return self.reservation_id
+
+    def set_unit_id(self, value: str):
+        self.reservation_id = value
+
+
+class ActorRecord:
+    """
+    Generated from fabric.cf.model.ActorRecord
+    """
+    __slots__ = (
+        "name",
+        "type",
+        "owner",
+        "description",
+        "policy_module",
+        "policy_class",
+        "actor_module",
+        "actor_class",
+        "online",
+        "management_module",
+        "management_class",
+        "id",
+        "policy_guid",
+    )
+    schema_name = "ActorRecord"
+
+    def __init__(self,
+            name: str = None,
+            type: int = None,
+            owner: AuthRecord = None,
+            description: str = None,
+            policy_module: str = None,
+            policy_class: str = None,
+            actor_module: str = None,
+            actor_class: str = None,
+            online: bool = None,
+            management_module: str = None,
+            management_class: str = None,
+            id: str = None,
+            policy_guid: str = None,
+    ):
+        self.name = name
+        self.type = type
+        self.owner = owner
+        self.description = description
+        self.policy_module = policy_module
+        self.policy_class = policy_class
+        self.actor_module = actor_module
+        self.actor_class = actor_class
+        self.online = online
+        self.management_module = management_module
+        self.management_class = management_class
+        self.id = id
+        self.policy_guid = policy_guid
+
+    @classmethod
+    def create(cls, value: dict) -> 'ActorRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.type = value.get('type')
+        self.owner = AuthRecord.create(value['owner'])
+        self.description = value['description']
+        self.policy_module = value['policy_module']
+        self.policy_class = value['policy_class']
+        self.actor_module = value['actor_module']
+        self.actor_class = value['actor_class']
+        self.online = value.get('online')
+        self.management_module = value.get('management_module')
+        self.management_class = value.get('management_class')
+        self.id = value['id']
+        self.policy_guid = value['policy_guid']
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "owner": self.owner.to_dict(),
+            "description": self.description,
+            "policy_module": self.policy_module,
+            "policy_class": self.policy_class,
+            "actor_module": self.actor_module,
+            "actor_class": self.actor_class,
+            "id": self.id,
+            "policy_guid": self.policy_guid,
+        }
+        if self.type is not None:
+            result["type"] = self.type
+        if self.online is not None:
+            result["online"] = self.online
+        if self.management_module is not None:
+            result["management_module"] = self.management_module
+        if self.management_class is not None:
+            result["management_class"] = self.management_class
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in (
+            "name",
+            "owner",
+            "description",
+            "policy_module",
+            "policy_class",
+            "actor_module",
+            "actor_class",
+            "id",
+            "policy_guid",
+        ))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "type",
+            "owner",
+            "description",
+            "policy_module",
+            "policy_class",
+            "actor_module",
+            "actor_class",
+            "online",
+            "management_module",
+            "management_class",
+            "id",
+            "policy_guid",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def get_type(self) -> int:
+        return self.type
+
+    def set_type(self, value: int):
+        self.type = value
+
+    def get_owner(self) -> AuthRecord:
+        return self.owner
+
+    def set_owner(self, value: AuthRecord):
+        self.owner = value
+
+    def get_description(self) -> str:
+        return self.description
+
+    def set_description(self, value: str):
+        self.description = value
+
+    def get_policy_module(self) -> str:
+        return self.policy_module
+
+    def set_policy_module(self, value: str):
+        self.policy_module = value
+
+    def get_policy_class(self) -> str:
+        return self.policy_class
+
+    def set_policy_class(self, value: str):
+        self.policy_class = value
+
+    def get_actor_module(self) -> str:
+        return self.actor_module
+
+    def set_actor_module(self, value: str):
+        self.actor_module = value
+
+    def get_actor_class(self) -> str:
+        return self.actor_class
+
+    def set_actor_class(self, value: str):
+        self.actor_class = value
+
+    def get_online(self) -> bool:
+        return self.online
+
+    def is_online(self) -> bool:
+        return self.online
+
+    def set_online(self, value: bool):
+        self.online = value
+
+    def get_management_module(self) -> str:
+        return self.management_module
+
+    def set_management_module(self, value: str):
+        self.management_module = value
+
+    def get_management_class(self) -> str:
+        return self.management_class
+
+    def set_management_class(self, value: str):
+        self.management_class = value
+
+    def get_id(self) -> str:
+        return self.id
+
+    def set_id(self, value: str):
+        self.id = value
+
+    def get_policy_guid(self) -> str:
+        return self.policy_guid
+
+    def set_policy_guid(self, value: str):
+        self.policy_guid = value
+
+
+class BrokerQueryModelRecord:
+    """
+    Generated from fabric.cf.model.BrokerQueryModelRecord
+    """
+    __slots__ = ("level", "model")
+    schema_name = "BrokerQueryModelRecord"
+
+    def __init__(self, level: int = None, model: str = None):
+        self.level = level
+        self.model = model
+
+    @classmethod
+    def create(cls, value: dict) -> 'BrokerQueryModelRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.level = value['level']
+        self.model = value.get('model')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"level": self.level}
+        if self.model is not None:
+            result["model"] = self.model
+        return result
+
+    def validate(self) -> bool:
+        return self.level is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("level", "model"))
+
+    def print(self):
+        print(self)
+
+    def get_level(self) -> int:
+        return self.level
+
+    def set_level(self, value: int):
+        self.level = value
+
+    def get_model(self) -> str:
+        return self.model
+
+    def set_model(self, value: str):
+        self.model = value
+
+
+class SliceRecord:
+    """
+    Generated from fabric.cf.model.SliceRecord
+    """
+    __slots__ = (
+        "slice_name",
+        "guid",
+        "owner",
+        "description",
+        "config_properties",
+        "resource_type",
+        "graph_id",
+        "state",
+        "client_slice",
+        "broker_client_slice",
+        "inventory",
+    )
+    schema_name = "SliceRecord"
+
+    def __init__(self,
+            slice_name: str = None,
+            guid: str = None,
+            owner: AuthRecord = None,
+            description: str = None,
+            config_properties: dict = None,
+            resource_type: str = None,
+            graph_id: str = None,
+            state: int = None,
+            client_slice: bool = None,
+            broker_client_slice: bool = None,
+            inventory: bool = None,
+    ):
+        self.slice_name = slice_name
+        self.guid = guid
+        self.owner = owner
+        self.description = description
+        self.config_properties = config_properties
+        self.resource_type = resource_type
+        self.graph_id = graph_id
+        self.state = state
+        self.client_slice = client_slice
+        self.broker_client_slice = broker_client_slice
+        self.inventory = inventory
+
+    @classmethod
+    def create(cls, value: dict) -> 'SliceRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.slice_name = value['slice_name']
+        self.guid = value['guid']
+        owner = value.get('owner')
+        if owner is not None:
+            owner = AuthRecord.create(owner)
+        self.owner = owner
+        self.description = value.get('description')
+        config_properties = value.get('config_properties')
+        if config_properties is not None:
+            config_properties = config_properties
+        self.config_properties = config_properties
+        self.resource_type = value.get('resource_type')
+        self.graph_id = value.get('graph_id')
+        self.state = value.get('state')
+        self.client_slice = value.get('client_slice')
+        self.broker_client_slice = value.get('broker_client_slice')
+        self.inventory = value.get('inventory')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"slice_name": self.slice_name, "guid": self.guid}
+        if self.owner is not None:
+            result["owner"] = self.owner.to_dict()
+        if self.description is not None:
+            result["description"] = self.description
+        if self.config_properties is not None:
+            result["config_properties"] = self.config_properties
+        if self.resource_type is not None:
+            result["resource_type"] = self.resource_type
+        if self.graph_id is not None:
+            result["graph_id"] = self.graph_id
+        if self.state is not None:
+            result["state"] = self.state
+        if self.client_slice is not None:
+            result["client_slice"] = self.client_slice
+        if self.broker_client_slice is not None:
+            result["broker_client_slice"] = self.broker_client_slice
+        if self.inventory is not None:
+            result["inventory"] = self.inventory
+        return result
+
+    def validate(self) -> bool:
+        return self.slice_name is not None and self.guid is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "slice_name",
+            "guid",
+            "owner",
+            "description",
+            "config_properties",
+            "resource_type",
+            "graph_id",
+            "state",
+            "client_slice",
+            "broker_client_slice",
+            "inventory",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_slice_name(self) -> str:
+        return self.slice_name
+
+    def set_slice_name(self, value: str):
+        self.slice_name = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_owner(self) -> AuthRecord:
+        return self.owner
+
+    def set_owner(self, value: AuthRecord):
+        self.owner = value
+
+    def get_description(self) -> str:
+        return self.description
+
+    def set_description(self, value: str):
+        self.description = value
+
+    def get_config_properties(self) -> dict:
+        return self.config_properties
+
+    def set_config_properties(self, value: dict):
+        self.config_properties = value
+
+    def get_resource_type(self) -> str:
+        return self.resource_type
+
+    def set_resource_type(self, value: str):
+        self.resource_type = value
+
+    def get_graph_id(self) -> str:
+        return self.graph_id
+
+    def set_graph_id(self, value: str):
+        self.graph_id = value
+
+    def get_state(self) -> int:
+        return self.state
+
+    def set_state(self, value: int):
+        self.state = value
+
+    def get_client_slice(self) -> bool:
+        return self.client_slice
+
+    def is_client_slice(self) -> bool:
+        return self.client_slice
+
+    def set_client_slice(self, value: bool):
+        self.client_slice = value
+
+    def get_broker_client_slice(self) -> bool:
+        return self.broker_client_slice
+
+    def is_broker_client_slice(self) -> bool:
+        return self.broker_client_slice
+
+    def set_broker_client_slice(self, value: bool):
+        self.broker_client_slice = value
+
+    def get_inventory(self) -> bool:
+        return self.inventory
+
+    def is_inventory(self) -> bool:
+        return self.inventory
+
+    def set_inventory(self, value: bool):
+        self.inventory = value
+
+    def get_slice_id(self) -> str:
+        return self.guid
+
+    def set_slice_id(self, value: str):
+        self.guid = value
+
+
+class ReservationPredecessorMngRecord:
+    """
+    Generated from fabric.cf.model.ReservationPredecessorMngRecord
+    """
+    __slots__ = ("reservation_id", "filter")
+    schema_name = "ReservationPredecessorMngRecord"
+
+    def __init__(self, reservation_id: str = None, filter: dict = None):
+        self.reservation_id = reservation_id
+        self.filter = filter
+
+    @classmethod
+    def create(cls, value: dict) -> 'ReservationPredecessorMngRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.reservation_id = value['reservation_id']
+        self.filter = value['filter']
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"reservation_id": self.reservation_id, "filter": self.filter}
+        return result
+
+    def validate(self) -> bool:
+        return self.reservation_id is not None and self.filter is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("reservation_id", "filter"))
+
+    def print(self):
+        print(self)
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, value: str):
+        self.reservation_id = value
+
+    def get_filter(self) -> dict:
+        return self.filter
+
+    def set_filter(self, value: dict):
+        self.filter = value
+
+    def get_filter_properties(self) -> dict:
+        return self.filter
+
+    def set_filter_properties(self, value: dict):
+        self.filter = value
+
+
+class ReservationMngRecord:
+    """
+    Generated from fabric.cf.model.ReservationMngRecord
+    """
+    __slots__ = (
+        "name",
+        "authority",
+        "join_state",
+        "leased_units",
+        "redeem_processors",
+        "broker",
+        "ticket",
+        "renewable",
+        "renew_time",
+        "reservation_id",
+        "slice_id",
+        "start",
+        "end",
+        "requested_end",
+        "rtype",
+        "units",
+        "state",
+        "pending_state",
+        "local",
+        "config",
+        "request",
+        "resource",
+        "notices",
+        "sliver",
+    )
+    schema_name = "ReservationMngRecord"
+
+    def __init__(self,
+            name: str = None,
+            authority: str = None,
+            join_state: int = None,
+            leased_units: int = None,
+            redeem_processors: list = None,
+            broker: str = None,
+            ticket: dict = None,
+            renewable: bool = None,
+            renew_time: int = None,
+            reservation_id: str = None,
+            slice_id: str = None,
+            start: int = None,
+            end: int = None,
+            requested_end: int = None,
+            rtype: str = None,
+            units: int = None,
+            state: int = None,
+            pending_state: int = None,
+            local: dict = None,
+            config: dict = None,
+            request: dict = None,
+            resource: dict = None,
+            notices: str = None,
+            sliver: bytes = None,
+    ):
+        self.name = name
+        self.authority = authority
+        self.join_state = join_state
+        self.leased_units = leased_units
+        self.redeem_processors = redeem_processors
+        self.broker = broker
+        self.ticket = ticket
+        self.renewable = renewable
+        self.renew_time = renew_time
+        self.reservation_id = reservation_id
+        self.slice_id = slice_id
+        self.start = start
+        self.end = end
+        self.requested_end = requested_end
+        self.rtype = rtype
+        self.units = units
+        self.state = state
+        self.pending_state = pending_state
+        self.local = local
+        self.config = config
+        self.request = request
+        self.resource = resource
+        self.notices = notices
+        self.sliver = sliver
+
+    @classmethod
+    def create(cls, value: dict) -> 'ReservationMngRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.authority = value.get('authority')
+        self.join_state = value.get('join_state')
+        self.leased_units = value.get('leased_units')
+        redeem_processors = value.get('redeem_processors')
+        if redeem_processors is not None:
+            redeem_processors = [ReservationPredecessorMngRecord.create(v) for v in redeem_processors]
+        self.redeem_processors = redeem_processors
+        self.broker = value.get('broker')
+        ticket = value.get('ticket')
+        if ticket is not None:
+            ticket = ticket
+        self.ticket = ticket
+        self.renewable = value.get('renewable')
+        self.renew_time = value.get('renew_time')
+        self.reservation_id = value['reservation_id']
+        self.slice_id = value.get('slice_id')
+        self.start = value.get('start')
+        self.end = value.get('end')
+        self.requested_end = value.get('requested_end')
+        self.rtype = value['rtype']
+        self.units = value.get('units')
+        self.state = value.get('state')
+        self.pending_state = value.get('pending_state')
+        local = value.get('local')
+        if local is not None:
+            local = local
+        self.local = local
+        config = value.get('config')
+        if config is not None:
+            config = config
+        self.config = config
+        request = value.get('request')
+        if request is not None:
+            request = request
+        self.request = request
+        resource = value.get('resource')
+        if resource is not None:
+            resource = resource
+        self.resource = resource
+        self.notices = value['notices']
+        self.sliver = value.get('sliver')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "reservation_id": self.reservation_id,
+            "rtype": self.rtype,
+            "notices": self.notices,
+        }
+        if self.authority is not None:
+            result["authority"] = self.authority
+        if self.join_state is not None:
+            result["join_state"] = self.join_state
+        if self.leased_units is not None:
+            result["leased_units"] = self.leased_units
+        if self.redeem_processors is not None:
+            result["redeem_processors"] = [v.to_dict() for v in self.redeem_processors]
+        if self.broker is not None:
+            result["broker"] = self.broker
+        if self.ticket is not None:
+            result["ticket"] = self.ticket
+        if self.renewable is not None:
+            result["renewable"] = self.renewable
+        if self.renew_time is not None:
+            result["renew_time"] = self.renew_time
+        if self.slice_id is not None:
+            result["slice_id"] = self.slice_id
+        if self.start is not None:
+            result["start"] = self.start
+        if self.end is not None:
+            result["end"] = self.end
+        if self.requested_end is not None:
+            result["requested_end"] = self.requested_end
+        if self.units is not None:
+            result["units"] = self.units
+        if self.state is not None:
+            result["state"] = self.state
+        if self.pending_state is not None:
+            result["pending_state"] = self.pending_state
+        if self.local is not None:
+            result["local"] = self.local
+        if self.config is not None:
+            result["config"] = self.config
+        if self.request is not None:
+            result["request"] = self.request
+        if self.resource is not None:
+            result["resource"] = self.resource
+        if self.sliver is not None:
+            result["sliver"] = self.sliver
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("name", "reservation_id", "rtype", "notices"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "authority",
+            "join_state",
+            "leased_units",
+            "redeem_processors",
+            "broker",
+            "ticket",
+            "renewable",
+            "renew_time",
+            "reservation_id",
+            "slice_id",
+            "start",
+            "end",
+            "requested_end",
+            "rtype",
+            "units",
+            "state",
+            "pending_state",
+            "local",
+            "config",
+            "request",
+            "resource",
+            "notices",
+            "sliver",
+        ))
+
+    def print(self):
+        print(self)
+
+    @staticmethod
+    def sliver_to_bytes(value) -> bytes:
+        return pickle.dumps(value) if value is not None else None
+
+    @staticmethod
+    def bytes_to_sliver(value: bytes):
+        return pickle.loads(value) if value is not None else None
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def get_authority(self) -> str:
+        return self.authority
+
+    def set_authority(self, value: str):
+        self.authority = value
+
+    def get_join_state(self) -> int:
+        return self.join_state
+
+    def set_join_state(self, value: int):
+        self.join_state = value
+
+    def get_leased_units(self) -> int:
+        return self.leased_units
+
+    def set_leased_units(self, value: int):
+        self.leased_units = value
+
+    def get_redeem_processors(self) -> list:
+        return self.redeem_processors
+
+    def set_redeem_processors(self, value: list):
+        self.redeem_processors = value
+
+    def get_broker(self) -> str:
+        return self.broker
+
+    def set_broker(self, value: str):
+        self.broker = value
+
+    def get_ticket(self) -> dict:
+        return self.ticket
+
+    def set_ticket(self, value: dict):
+        self.ticket = value
+
+    def get_renewable(self) -> bool:
+        return self.renewable
+
+    def is_renewable(self) -> bool:
+        return self.renewable
+
+    def set_renewable(self, value: bool):
+        self.renewable = value
+
+    def get_renew_time(self) -> int:
+        return self.renew_time
+
+    def set_renew_time(self, value: int):
+        self.renew_time = value
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, value: str):
+        self.reservation_id = value
+
+    def get_slice_id(self) -> str:
+        return self.slice_id
+
+    def set_slice_id(self, value: str):
+        self.slice_id = value
+
+    def get_start(self) -> int:
+        return self.start
+
+    def set_start(self, value: int):
+        self.start = value
+
+    def get_end(self) -> int:
+        return self.end
+
+    def set_end(self, value: int):
+        self.end = value
+
+    def get_requested_end(self) -> int:
+        return self.requested_end
+
+    def set_requested_end(self, value: int):
+        self.requested_end = value
+
+    def get_rtype(self) -> str:
+        return self.rtype
+
+    def set_rtype(self, value: str):
+        self.rtype = value
+
+    def get_units(self) -> int:
+        return self.units
+
+    def set_units(self, value: int):
+        self.units = value
+
+    def get_state(self) -> int:
+        return self.state
+
+    def set_state(self, value: int):
+        self.state = value
+
+    def get_pending_state(self) -> int:
+        return self.pending_state
+
+    def set_pending_state(self, value: int):
+        self.pending_state = value
+
+    def get_local(self) -> dict:
+        return self.local
+
+    def set_local(self, value: dict):
+        self.local = value
+
+    def get_config(self) -> dict:
+        return self.config
+
+    def set_config(self, value: dict):
+        self.config = value
+
+    def get_request(self) -> dict:
+        return self.request
+
+    def set_request(self, value: dict):
+        self.request = value
+
+    def get_resource(self) -> dict:
+        return self.resource
+
+    def set_resource(self, value: dict):
+        self.resource = value
+
+    def get_notices(self) -> str:
+        return self.notices
+
+    def set_notices(self, value: str):
+        self.notices = value
+
+    def get_sliver(self):
+        return self.bytes_to_sliver(self.sliver)
+
+    def set_sliver(self, value):
+        self.sliver = self.sliver_to_bytes(value)
+
+    def get_config_properties(self) -> dict:
+        return self.config
+
+    def set_config_properties(self, value: dict):
+        self.config = value
+
+    def get_local_properties(self) -> dict:
+        return self.local
+
+    def set_local_properties(self, value: dict):
+        self.local = value
+
+    def get_redeem_predecessors(self) -> list:
+        return self.redeem_processors
+
+    def set_redeem_predecessors(self, value: list):
+        self.redeem_processors = value
+
+    def get_request_properties(self) -> dict:
+        return self.request
+
+    def set_request_properties(self, value: dict):
+        self.request = value
+
+    def get_resource_properties(self) -> dict:
+        return self.resource
+
+    def set_resource_properties(self, value: dict):
+        self.resource = value
+
+    def get_resource_type(self) -> str:
+        return self.rtype
+
+    def set_resource_type(self, value: str):
+        self.rtype = value
+
+    def get_ticket_properties(self) -> dict:
+        return self.ticket
+
+    def set_ticket_properties(self, value: dict):
+        self.ticket = value
+
+
+class TermRecord:
+    """
+    Generated from fabric.cf.model.TermRecord
+    """
+    __slots__ = ("start_time", "end_time", "ticket_time", "new_start_time")
+    schema_name = "TermRecord"
+
+    def __init__(self,
+            start_time: int = None,
+            end_time: int = None,
+            ticket_time: int = None,
+            new_start_time: int = None,
+    ):
+        self.start_time = start_time
+        self.end_time = end_time
+        self.ticket_time = ticket_time
+        self.new_start_time = new_start_time
+
+    @classmethod
+    def create(cls, value: dict) -> 'TermRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.start_time = value['start_time']
+        self.end_time = value['end_time']
+        self.ticket_time = value.get('ticket_time')
+        self.new_start_time = value.get('new_start_time')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"start_time": self.start_time, "end_time": self.end_time}
+        if self.ticket_time is not None:
+            result["ticket_time"] = self.ticket_time
+        if self.new_start_time is not None:
+            result["new_start_time"] = self.new_start_time
+        return result
+
+    def validate(self) -> bool:
+        return self.start_time is not None and self.end_time is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "start_time",
+            "end_time",
+            "ticket_time",
+            "new_start_time",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_start_time(self) -> int:
+        return self.start_time
+
+    def set_start_time(self, value: int):
+        self.start_time = value
+
+    def get_end_time(self) -> int:
+        return self.end_time
+
+    def set_end_time(self, value: int):
+        self.end_time = value
+
+    def get_ticket_time(self) -> int:
+        return self.ticket_time
+
+    def set_ticket_time(self, value: int):
+        self.ticket_time = value
+
+    def get_new_start_time(self) -> int:
+        return self.new_start_time
+
+    def set_new_start_time(self, value: int):
+        self.new_start_time = value
+
+
+class ResourceTicketRecord:
+    """
+    Generated from fabric.cf.model.ResourceTicketRecord
+    """
+    __slots__ = ("guid", "term", "units", "properties", "type", "issuer", "holder")
+    schema_name = "ResourceTicketRecord"
+
+    def __init__(self,
+            guid: str = None,
+            term: TermRecord = None,
+            units: int = None,
+            properties: dict = None,
+            type: str = None,
+            issuer: str = None,
+            holder: str = None,
+    ):
+        self.guid = guid
+        self.term = term
+        self.units = units
+        self.properties = properties
+        self.type = type
+        self.issuer = issuer
+        self.holder = holder
+
+    @classmethod
+    def create(cls, value: dict) -> 'ResourceTicketRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.guid = value['guid']
+        term = value.get('term')
+        if term is not None:
+            term = TermRecord.create(term)
+        self.term = term
+        self.units = value['units']
+        properties = value.get('properties')
+        if properties is not None:
+            properties = properties
+        self.properties = properties
+        self.type = value['type']
+        self.issuer = value.get('issuer')
+        self.holder = value.get('holder')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"guid": self.guid, "units": self.units, "type": self.type}
+        if self.term is not None:
+            result["term"] = self.term.to_dict()
+        if self.properties is not None:
+            result["properties"] = self.properties
+        if self.issuer is not None:
+            result["issuer"] = self.issuer
+        if self.holder is not None:
+            result["holder"] = self.holder
+        return result
+
+    def validate(self) -> bool:
+        return self.guid is not None and self.units is not None and self.type is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "guid",
+            "term",
+            "units",
+            "properties",
+            "type",
+            "issuer",
+            "holder",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_term(self) -> TermRecord:
+        return self.term
+
+    def set_term(self, value: TermRecord):
+        self.term = value
+
+    def get_units(self) -> int:
+        return self.units
+
+    def set_units(self, value: int):
+        self.units = value
+
+    def get_properties(self) -> dict:
+        return self.properties
+
+    def set_properties(self, value: dict):
+        self.properties = value
+
+    def get_type(self) -> str:
+        return self.type
+
+    def set_type(self, value: str):
+        self.type = value
+
+    def get_issuer(self) -> str:
+        return self.issuer
+
+    def set_issuer(self, value: str):
+        self.issuer = value
+
+    def get_holder(self) -> str:
+        return self.holder
+
+    def set_holder(self, value: str):
+        self.holder = value
+
+
+class TicketRecord:
+    """
+    Generated from fabric.cf.model.TicketRecord
+    """
+    __slots__ = ("authority", "old_units", "resource_ticket", "delegation_id")
+    schema_name = "TicketRecord"
+
+    def __init__(self,
+            authority: AuthRecord = None,
+            old_units: int = None,
+            resource_ticket: ResourceTicketRecord = None,
+            delegation_id: str = None,
+    ):
+        self.authority = authority
+        self.old_units = old_units
+        self.resource_ticket = resource_ticket
+        self.delegation_id = delegation_id
+
+    @classmethod
+    def create(cls, value: dict) -> 'TicketRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.authority = AuthRecord.create(value['authority'])
+        self.old_units = value['old_units']
+        self.resource_ticket = ResourceTicketRecord.create(value['resource_ticket'])
+        self.delegation_id = value['delegation_id']
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "authority": self.authority.to_dict(),
+            "old_units": self.old_units,
+            "resource_ticket": self.resource_ticket.to_dict(),
+            "delegation_id": self.delegation_id,
+        }
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("authority", "old_units", "resource_ticket", "delegation_id"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "authority",
+            "old_units",
+            "resource_ticket",
+            "delegation_id",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_authority(self) -> AuthRecord:
+        return self.authority
+
+    def set_authority(self, value: AuthRecord):
+        self.authority = value
+
+    def get_old_units(self) -> int:
+        return self.old_units
+
+    def set_old_units(self, value: int):
+        self.old_units = value
+
+    def get_resource_ticket(self) -> ResourceTicketRecord:
+        return self.resource_ticket
+
+    def set_resource_ticket(self, value: ResourceTicketRecord):
+        self.resource_ticket = value
+
+    def get_delegation_id(self) -> str:
+        return self.delegation_id
+
+    def set_delegation_id(self, value: str):
+        self.delegation_id = value
+
+
+class ResourceSetRecord:
+    """
+    Generated from fabric.cf.model.resource_set_record
+    """
+    __slots__ = ("units", "type", "sliver", "ticket", "unit_set")
+    schema_name = "resource_set_record"
+
+    def __init__(self,
+            units: int = None,
+            type: str = None,
+            sliver: bytes = None,
+            ticket: TicketRecord = None,
+            unit_set: list = None,
+    ):
+        self.units = units
+        self.type = type
+        self.sliver = sliver
+        self.ticket = ticket
+        self.unit_set = unit_set
+
+    @classmethod
+    def create(cls, value: dict) -> 'ResourceSetRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.units = value['units']
+        self.type = value['type']
+        self.sliver = value.get('sliver')
+        ticket = value.get('ticket')
+        if ticket is not None:
+            ticket = TicketRecord.create(ticket)
+        self.ticket = ticket
+        unit_set = value.get('unit_set')
+        if unit_set is not None:
+            unit_set = [UnitRecord.create(v) for v in unit_set]
+        self.unit_set = unit_set
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"units": self.units, "type": self.type}
+        if self.sliver is not None:
+            result["sliver"] = self.sliver
+        if self.ticket is not None:
+            result["ticket"] = self.ticket.to_dict()
+        if self.unit_set is not None:
+            result["unit_set"] = [v.to_dict() for v in self.unit_set]
+        return result
+
+    def validate(self) -> bool:
+        return self.units is not None and self.type is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("units", "type", "sliver", "ticket", "unit_set"))
+
+    def print(self):
+        print(self)
+
+    @staticmethod
+    def sliver_to_bytes(value) -> bytes:
+        return pickle.dumps(value) if value is not None else None
+
+    @staticmethod
+    def bytes_to_sliver(value: bytes):
+        return pickle.loads(value) if value is not None else None
+
+    def get_units(self) -> int:
+        return self.units
+
+    def set_units(self, value: int):
+        self.units = value
+
+    def get_type(self) -> str:
+        return self.type
+
+    def set_type(self, value: str):
+        self.type = value
+
+    def get_sliver(self):
+        return self.bytes_to_sliver(self.sliver)
+
+    def set_sliver(self, value):
+        self.sliver = self.sliver_to_bytes(value)
+
+    def get_ticket(self) -> TicketRecord:
+        return self.ticket
+
+    def set_ticket(self, value: TicketRecord):
+        self.ticket = value
+
+    def get_unit_set(self) -> list:
+        return self.unit_set
+
+    def set_unit_set(self, value: list):
+        self.unit_set = value
+
+
+class ReservationRecord:
+    """
+    Generated from fabric.cf.model.ReservationRecord
+    """
+    __slots__ = ("reservation_id", "sequence", "slice", "term", "resource_set")
+    schema_name = "ReservationRecord"
+
+    def __init__(self,
+            reservation_id: str = None,
+            sequence: int = None,
+            slice: SliceRecord = None,
+            term: TermRecord = None,
+            resource_set: ResourceSetRecord = None,
+    ):
+        self.reservation_id = reservation_id
+        self.sequence = sequence
+        self.slice = slice
+        self.term = term
+        self.resource_set = resource_set
+
+    @classmethod
+    def create(cls, value: dict) -> 'ReservationRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.reservation_id = value['reservation_id']
+        self.sequence = value.get('sequence')
+        slice = value.get('slice')
+        if slice is not None:
+            slice = SliceRecord.create(slice)
+        self.slice = slice
+        self.term = TermRecord.create(value['term'])
+        self.resource_set = ResourceSetRecord.create(value['resource_set'])
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "reservation_id": self.reservation_id,
+            "term": self.term.to_dict(),
+            "resource_set": self.resource_set.to_dict(),
+        }
+        if self.sequence is not None:
+            result["sequence"] = self.sequence
+        if self.slice is not None:
+            result["slice"] = self.slice.to_dict()
+        return result
+
+    def validate(self) -> bool:
+        return self.reservation_id is not None and self.term is not None and self.resource_set is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "reservation_id",
+            "sequence",
+            "slice",
+            "term",
+            "resource_set",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, value: str):
+        self.reservation_id = value
+
+    def get_sequence(self) -> int:
+        return self.sequence
+
+    def set_sequence(self, value: int):
+        self.sequence = value
+
+    def get_slice(self) -> SliceRecord:
+        return self.slice
+
+    def set_slice(self, value: SliceRecord):
+        self.slice = value
+
+    def get_term(self) -> TermRecord:
+        return self.term
+
+    def set_term(self, value: TermRecord):
+        self.term = value
+
+    def get_resource_set(self) -> ResourceSetRecord:
+        return self.resource_set
+
+    def set_resource_set(self, value: ResourceSetRecord):
+        self.resource_set = value
+
+
+class DelegationRecord:
+    """
+    Generated from fabric.cf.model.DelegationRecord
+    """
+    __slots__ = ("delegation_id", "sequence", "slice", "graph")
+    schema_name = "DelegationRecord"
+
+    def __init__(self, delegation_id: str = None, sequence: int = None, slice: SliceRecord = None, graph: str = None):
+        self.delegation_id = delegation_id
+        self.sequence = sequence
+        self.slice = slice
+        self.graph = graph
+
+    @classmethod
+    def create(cls, value: dict) -> 'DelegationRecord':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.delegation_id = value['delegation_id']
+        self.sequence = value.get('sequence')
+        slice = value.get('slice')
+        if slice is not None:
+            slice = SliceRecord.create(slice)
+        self.slice = slice
+        self.graph = value.get('graph')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"delegation_id": self.delegation_id}
+        if self.sequence is not None:
+            result["sequence"] = self.sequence
+        if self.slice is not None:
+            result["slice"] = self.slice.to_dict()
+        if self.graph is not None:
+            result["graph"] = self.graph
+        return result
+
+    def validate(self) -> bool:
+        return self.delegation_id is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("delegation_id", "sequence", "slice", "graph"))
+
+    def print(self):
+        print(self)
+
+    def get_delegation_id(self) -> str:
+        return self.delegation_id
+
+    def set_delegation_id(self, value: str):
+        self.delegation_id = value
+
+    def get_sequence(self) -> int:
+        return self.sequence
+
+    def set_sequence(self, value: int):
+        self.sequence = value
+
+    def get_slice(self) -> SliceRecord:
+        return self.slice
+
+    def set_slice(self, value: SliceRecord):
+        self.slice = value
+
+    def get_graph(self) -> str:
+        return self.graph
+
+    def set_graph(self, value: str):
+        self.graph = value
+
+    def get_slice_object(self) -> SliceRecord:
+        return self.slice
+
+    def set_slice_object(self, value: SliceRecord):
+        self.slice = value
+
+
+class Query(IMessageAvro):
+    """
+    Generated from fabric.cf.model.Query
+    """
+    __slots__ = ("name", "callback_topic", "message_id", "properties", "auth", "id_token", "id")
+    schema_name = "Query"
+
+    def __init__(self,
+            name: str = None,
+            callback_topic: str = None,
+            message_id: str = None,
+            properties: dict = None,
+            auth: AuthRecord = None,
+            id_token: str = None,
+    ):
+        self.name = name
+        self.callback_topic = callback_topic
+        self.message_id = message_id
+        self.properties = properties
+        self.auth = auth
+        self.id_token = id_token
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'Query':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.callback_topic = value['callback_topic']
+        self.message_id = value['message_id']
+        self.properties = value['properties']
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+        self.id_token = value.get('id_token')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "callback_topic": self.callback_topic,
+            "message_id": self.message_id,
+            "properties": self.properties,
+        }
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        if self.id_token is not None:
+            result["id_token"] = self.id_token
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("name", "callback_topic", "message_id", "properties"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "callback_topic",
+            "message_id",
+            "properties",
+            "auth",
+            "id_token",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return self.callback_topic
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_callback_topic(self, value: str):
+        self.callback_topic = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_properties(self) -> dict:
+        return self.properties
+
+    def set_properties(self, value: dict):
+        self.properties = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+    def get_id_token(self) -> str:
+        return self.id_token
+
+    def set_id_token(self, value: str):
+        self.id_token = value
+
+
+class QueryResult(IMessageAvro):
+    """
+    Generated from fabric.cf.model.QueryResult
+    """
+    __slots__ = ("name", "request_id", "message_id", "properties", "auth", "id")
+    schema_name = "QueryResult"
+
+    def __init__(self,
+            name: str = None,
+            request_id: str = None,
+            message_id: str = None,
+            properties: dict = None,
+            auth: AuthRecord = None,
+    ):
+        self.name = name
+        self.request_id = request_id
+        self.message_id = message_id
+        self.properties = properties
+        self.auth = auth
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'QueryResult':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.request_id = value['request_id']
+        self.message_id = value['message_id']
+        self.properties = value['properties']
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "request_id": self.request_id,
+            "message_id": self.message_id,
+            "properties": self.properties,
+        }
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("name", "request_id", "message_id", "properties"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "request_id",
+            "message_id",
+            "properties",
+            "auth",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return None
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def get_request_id(self) -> str:
+        return self.request_id
+
+    def set_request_id(self, value: str):
+        self.request_id = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_properties(self) -> dict:
+        return self.properties
+
+    def set_properties(self, value: dict):
+        self.properties = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+
+class FailedRPC(IMessageAvro):
+    """
+    Generated from fabric.cf.model.FailedRPC
+    """
+    __slots__ = ("name", "request_id", "message_id", "reservation_id", "request_type", "error_details", "auth", "id")
+    schema_name = "FailedRPC"
+
+    def __init__(self,
+            name: str = None,
+            request_id: str = None,
+            message_id: str = None,
+            reservation_id: str = None,
+            request_type: int = None,
+            error_details: str = None,
+            auth: AuthRecord = None,
+    ):
+        self.name = name
+        self.request_id = request_id
+        self.message_id = message_id
+        self.reservation_id = reservation_id
+        self.request_type = request_type
+        self.error_details = error_details
+        self.auth = auth
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'FailedRPC':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.request_id = value.get('request_id')
+        self.message_id = value['message_id']
+        self.reservation_id = value.get('reservation_id')
+        self.request_type = value['request_type']
+        self.error_details = value['error_details']
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "message_id": self.message_id,
+            "request_type": self.request_type,
+            "error_details": self.error_details,
+        }
+        if self.request_id is not None:
+            result["request_id"] = self.request_id
+        if self.reservation_id is not None:
+            result["reservation_id"] = self.reservation_id
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("name", "message_id", "request_type", "error_details"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "request_id",
+            "message_id",
+            "reservation_id",
+            "request_type",
+            "error_details",
+            "auth",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return None
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def get_request_id(self) -> str:
+        return self.request_id
+
+    def set_request_id(self, value: str):
+        self.request_id = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, value: str):
+        self.reservation_id = value
+
+    def get_request_type(self) -> int:
+        return self.request_type
+
+    def set_request_type(self, value: int):
+        self.request_type = value
+
+    def get_error_details(self) -> str:
+        return self.error_details
+
+    def set_error_details(self, value: str):
+        self.error_details = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+
+class UpdateData:
+    """
+    Generated from fabric.cf.model.update_data
+    """
+    __slots__ = ("failed", "message")
+    schema_name = "update_data"
+
+    def __init__(self, failed: bool = None, message: str = None):
+        self.failed = failed
+        self.message = message
+
+    @classmethod
+    def create(cls, value: dict) -> 'UpdateData':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.failed = value['failed']
+        self.message = value.get('message')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"failed": self.failed}
+        if self.message is not None:
+            result["message"] = self.message
+        return result
+
+    def validate(self) -> bool:
+        return self.failed is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("failed", "message"))
+
+    def print(self):
+        print(self)
+
+    def get_failed(self) -> bool:
+        return self.failed
+
+    def is_failed(self) -> bool:
+        return self.failed
+
+    def set_failed(self, value: bool):
+        self.failed = value
+
+    def get_message(self) -> str:
+        return self.message
+
+    def set_message(self, value: str):
+        self.message = value
+
+
+class ReservationOrDelegation(IMessageAvro):
+    """
+    Generated from fabric.cf.model.ReservationOrDelegation
+    """
+    __slots__ = (
+        "name",
+        "callback_topic",
+        "message_id",
+        "update_data",
+        "id_token",
+        "reservation",
+        "delegation",
+        "auth",
+        "id",
+    )
+    schema_name = "ReservationOrDelegation"
+
+    def __init__(self,
+            name: str = None,
+            callback_topic: str = None,
+            message_id: str = None,
+            update_data: UpdateData = None,
+            id_token: str = None,
+            reservation: ReservationRecord = None,
+            delegation: DelegationRecord = None,
+            auth: AuthRecord = None,
+    ):
+        self.name = name
+        self.callback_topic = callback_topic
+        self.message_id = message_id
+        self.update_data = update_data
+        self.id_token = id_token
+        self.reservation = reservation
+        self.delegation = delegation
+        self.auth = auth
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'ReservationOrDelegation':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.callback_topic = value['callback_topic']
+        self.message_id = value['message_id']
+        update_data = value.get('update_data')
+        if update_data is not None:
+            update_data = UpdateData.create(update_data)
+        self.update_data = update_data
+        self.id_token = value.get('id_token')
+        reservation = value.get('reservation')
+        if reservation is not None:
+            reservation = ReservationRecord.create(reservation)
+        self.reservation = reservation
+        delegation = value.get('delegation')
+        if delegation is not None:
+            delegation = DelegationRecord.create(delegation)
+        self.delegation = delegation
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"name": self.name, "callback_topic": self.callback_topic, "message_id": self.message_id}
+        if self.update_data is not None:
+            result["update_data"] = self.update_data.to_dict()
+        if self.id_token is not None:
+            result["id_token"] = self.id_token
+        if self.reservation is not None:
+            result["reservation"] = self.reservation.to_dict()
+        if self.delegation is not None:
+            result["delegation"] = self.delegation.to_dict()
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        return result
+
+    def validate(self) -> bool:
+        return self.name is not None and self.callback_topic is not None and self.message_id is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "callback_topic",
+            "message_id",
+            "update_data",
+            "id_token",
+            "reservation",
+            "delegation",
+            "auth",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return self.callback_topic
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_callback_topic(self, value: str):
+        self.callback_topic = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_update_data(self) -> UpdateData:
+        return self.update_data
+
+    def set_update_data(self, value: UpdateData):
+        self.update_data = value
+
+    def get_id_token(self) -> str:
+        return self.id_token
+
+    def set_id_token(self, value: str):
+        self.id_token = value
+
+    def get_reservation(self) -> ReservationRecord:
+        return self.reservation
+
+    def set_reservation(self, value: ReservationRecord):
+        self.reservation = value
+
+    def get_delegation(self) -> DelegationRecord:
+        return self.delegation
+
+    def set_delegation(self, value: DelegationRecord):
+        self.delegation = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+
+class ResultRecordList(IMessageAvro):
+    """
+    Generated from fabric.cf.model.ResultRecordList
+    """
+    __slots__ = (
+        "name",
+        "message_id",
+        "status",
+        "slices",
+        "reservations",
+        "reservation_states",
+        "units",
+        "proxies",
+        "model",
+        "delegations",
+        "actors",
+        "id",
+    )
+    schema_name = "ResultRecordList"
+
+    def __init__(self,
+            name: str = None,
+            message_id: str = None,
+            status: ResultRecord = None,
+            slices: list = None,
+            reservations: list = None,
+            reservation_states: list = None,
+            units: list = None,
+            proxies: list = None,
+            model: BrokerQueryModelRecord = None,
+            delegations: list = None,
+            actors: list = None,
+    ):
+        self.name = name
+        self.message_id = message_id
+        self.status = status
+        self.slices = slices
+        self.reservations = reservations
+        self.reservation_states = reservation_states
+        self.units = units
+        self.proxies = proxies
+        self.model = model
+        self.delegations = delegations
+        self.actors = actors
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'ResultRecordList':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.message_id = value['message_id']
+        self.status = ResultRecord.create(value['status'])
+        slices = value.get('slices')
+        if slices is not None:
+            slices = [SliceRecord.create(v) for v in slices]
+        self.slices = slices
+        reservations = value.get('reservations')
+        if reservations is not None:
+            reservations = [ReservationMngRecord.create(v) for v in reservations]
+        self.reservations = reservations
+        reservation_states = value.get('reservation_states')
+        if reservation_states is not None:
+            reservation_states = [ReservationStateRecord.create(v) for v in reservation_states]
+        self.reservation_states = reservation_states
+        units = value.get('units')
+        if units is not None:
+            units = [UnitRecord.create(v) for v in units]
+        self.units = units
+        proxies = value.get('proxies')
+        if proxies is not None:
+            proxies = [ProxyRecord.create(v) for v in proxies]
+        self.proxies = proxies
+        model = value.get('model')
+        if model is not None:
+            model = BrokerQueryModelRecord.create(model)
+        self.model = model
+        delegations = value.get('delegations')
+        if delegations is not None:
+            delegations = [DelegationRecord.create(v) for v in delegations]
+        self.delegations = delegations
+        actors = value.get('actors')
+        if actors is not None:
+            actors = [ActorRecord.create(v) for v in actors]
+        self.actors = actors
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"name": self.name, "message_id": self.message_id, "status": self.status.to_dict()}
+        if self.slices is not None:
+            result["slices"] = [v.to_dict() for v in self.slices]
+        if self.reservations is not None:
+            result["reservations"] = [v.to_dict() for v in self.reservations]
+        if self.reservation_states is not None:
+            result["reservation_states"] = [v.to_dict() for v in self.reservation_states]
+        if self.units is not None:
+            result["units"] = [v.to_dict() for v in self.units]
+        if self.proxies is not None:
+            result["proxies"] = [v.to_dict() for v in self.proxies]
+        if self.model is not None:
+            result["model"] = self.model.to_dict()
+        if self.delegations is not None:
+            result["delegations"] = [v.to_dict() for v in self.delegations]
+        if self.actors is not None:
+            result["actors"] = [v.to_dict() for v in self.actors]
+        return result
+
+    def validate(self) -> bool:
+        return self.name is not None and self.message_id is not None and self.status is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "message_id",
+            "status",
+            "slices",
+            "reservations",
+            "reservation_states",
+            "units",
+            "proxies",
+            "model",
+            "delegations",
+            "actors",
+        ))
+
+    def print(self):
+        print(self)
+
+    def from_dict_status(self, value: dict):
+        if value is not None:
+            self.status = ResultRecord.create(value)
+
+    def to_dict_status(self, result: dict) -> dict:
+        if self.status is not None:
+            result["status"] = self.status.to_dict()
+        return result
+
+    def from_dict_slices(self, value: list):
+        if value is not None:
+            self.slices = [SliceRecord.create(v) for v in value]
+
+    def to_dict_slices(self, result: dict) -> dict:
+        if self.slices is not None:
+            result["slices"] = [v.to_dict() for v in self.slices]
+        return result
+
+    def from_dict_reservations(self, value: list):
+        if value is not None:
+            self.reservations = [ReservationMngRecord.create(v) for v in value]
+
+    def to_dict_reservations(self, result: dict) -> dict:
+        if self.reservations is not None:
+            result["reservations"] = [v.to_dict() for v in self.reservations]
+        return result
+
+    def from_dict_reservation_states(self, value: list):
+        if value is not None:
+            self.reservation_states = [ReservationStateRecord.create(v) for v in value]
+
+    def to_dict_reservation_states(self, result: dict) -> dict:
+        if self.reservation_states is not None:
+            result["reservation_states"] = [v.to_dict() for v in self.reservation_states]
+        return result
+
+    def from_dict_units(self, value: list):
+        if value is not None:
+            self.units = [UnitRecord.create(v) for v in value]
+
+    def to_dict_units(self, result: dict) -> dict:
+        if self.units is not None:
+            result["units"] = [v.to_dict() for v in self.units]
+        return result
+
+    def from_dict_proxies(self, value: list):
+        if value is not None:
+            self.proxies = [ProxyRecord.create(v) for v in value]
+
+    def to_dict_proxies(self, result: dict) -> dict:
+        if self.proxies is not None:
+            result["proxies"] = [v.to_dict() for v in self.proxies]
+        return result
+
+    def from_dict_model(self, value: dict):
+        if value is not None:
+            self.model = BrokerQueryModelRecord.create(value)
+
+    def to_dict_model(self, result: dict) -> dict:
+        if self.model is not None:
+            result["model"] = self.model.to_dict()
+        return result
+
+    def from_dict_delegations(self, value: list):
+        if value is not None:
+            self.delegations = [DelegationRecord.create(v) for v in value]
+
+    def to_dict_delegations(self, result: dict) -> dict:
+        if self.delegations is not None:
+            result["delegations"] = [v.to_dict() for v in self.delegations]
+        return result
+
+    def from_dict_actors(self, value: list):
+        if value is not None:
+            self.actors = [ActorRecord.create(v) for v in value]
+
+    def to_dict_actors(self, result: dict) -> dict:
+        if self.actors is not None:
+            result["actors"] = [v.to_dict() for v in self.actors]
+        return result
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return None
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_status(self) -> ResultRecord:
+        return self.status
+
+    def set_status(self, value: ResultRecord):
+        self.status = value
+
+    def get_slices(self) -> list:
+        return self.slices
+
+    def set_slices(self, value: list):
+        self.slices = value
+
+    def get_reservations(self) -> list:
+        return self.reservations
+
+    def set_reservations(self, value: list):
+        self.reservations = value
+
+    def get_reservation_states(self) -> list:
+        return self.reservation_states
+
+    def set_reservation_states(self, value: list):
+        self.reservation_states = value
+
+    def get_units(self) -> list:
+        return self.units
+
+    def set_units(self, value: list):
+        self.units = value
+
+    def get_proxies(self) -> list:
+        return self.proxies
+
+    def set_proxies(self, value: list):
+        self.proxies = value
+
+    def get_model(self) -> BrokerQueryModelRecord:
+        return self.model
+
+    def set_model(self, value: BrokerQueryModelRecord):
+        self.model = value
+
+    def get_delegations(self) -> list:
+        return self.delegations
+
+    def set_delegations(self, value: list):
+        self.delegations = value
+
+    def get_actors(self) -> list:
+        return self.actors
+
+    def set_actors(self, value: list):
+        self.actors = value
+
+
+class ExtendReservationAvro(IMessageAvro):
+    """
+    Generated from fabric.cf.model.ExtendReservationAvro
+    """
+    __slots__ = (
+        "name",
+        "message_id",
+        "guid",
+        "auth",
+        "reservation_id",
+        "end_time",
+        "new_units",
+        "new_resource_type",
+        "request_properties",
+        "config_properties",
+        "callback_topic",
+        "id_token",
+        "id",
+    )
+    schema_name = "ExtendReservationAvro"
+
+    def __init__(self,
+            name: str = None,
+            message_id: str = None,
+            guid: str = None,
+            auth: AuthRecord = None,
+            reservation_id: str = None,
+            end_time: int = None,
+            new_units: int = None,
+            new_resource_type: str = None,
+            request_properties: dict = None,
+            config_properties: dict = None,
+            callback_topic: str = None,
+            id_token: str = None,
+    ):
+        self.name = name
+        self.message_id = message_id
+        self.guid = guid
+        self.auth = auth
+        self.reservation_id = reservation_id
+        self.end_time = end_time
+        self.new_units = new_units
+        self.new_resource_type = new_resource_type
+        self.request_properties = request_properties
+        self.config_properties = config_properties
+        self.callback_topic = callback_topic
+        self.id_token = id_token
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'ExtendReservationAvro':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.message_id = value['message_id']
+        self.guid = value['guid']
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+        self.reservation_id = value['reservation_id']
+        self.end_time = value['end_time']
+        self.new_units = value['new_units']
+        self.new_resource_type = value['new_resource_type']
+        request_properties = value.get('request_properties')
+        if request_properties is not None:
+            request_properties = request_properties
+        self.request_properties = request_properties
+        config_properties = value.get('config_properties')
+        if config_properties is not None:
+            config_properties = config_properties
+        self.config_properties = config_properties
+        self.callback_topic = value['callback_topic']
+        self.id_token = value.get('id_token')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "message_id": self.message_id,
+            "guid": self.guid,
+            "reservation_id": self.reservation_id,
+            "end_time": self.end_time,
+            "new_units": self.new_units,
+            "new_resource_type": self.new_resource_type,
+            "callback_topic": self.callback_topic,
+        }
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        if self.request_properties is not None:
+            result["request_properties"] = self.request_properties
+        if self.config_properties is not None:
+            result["config_properties"] = self.config_properties
+        if self.id_token is not None:
+            result["id_token"] = self.id_token
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in (
+            "name",
+            "message_id",
+            "guid",
+            "reservation_id",
+            "end_time",
+            "new_units",
+            "new_resource_type",
+            "callback_topic",
+        ))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "message_id",
+            "guid",
+            "auth",
+            "reservation_id",
+            "end_time",
+            "new_units",
+            "new_resource_type",
+            "request_properties",
+            "config_properties",
+            "callback_topic",
+            "id_token",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return self.callback_topic
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, value: str):
+        self.reservation_id = value
+
+    def get_end_time(self) -> int:
+        return self.end_time
+
+    def set_end_time(self, value: int):
+        self.end_time = value
+
+    def get_new_units(self) -> int:
+        return self.new_units
+
+    def set_new_units(self, value: int):
+        self.new_units = value
+
+    def get_new_resource_type(self) -> str:
+        return self.new_resource_type
+
+    def set_new_resource_type(self, value: str):
+        self.new_resource_type = value
+
+    def get_request_properties(self) -> dict:
+        return self.request_properties
+
+    def set_request_properties(self, value: dict):
+        self.request_properties = value
+
+    def get_config_properties(self) -> dict:
+        return self.config_properties
+
+    def set_config_properties(self, value: dict):
+        self.config_properties = value
+
+    def set_callback_topic(self, value: str):
+        self.callback_topic = value
+
+    def get_id_token(self) -> str:
+        return self.id_token
+
+    def set_id_token(self, value: str):
+        self.id_token = value
+
+
+class RequestById(IMessageAvro):
+    """
+    Generated from fabric.cf.model.RequestById
+    """
+    __slots__ = (
+        "name",
+        "callback_topic",
+        "message_id",
+        "guid",
+        "slice_id",
+        "slice_name",
+        "reservation_id",
+        "delegation_id",
+        "type",
+        "unit_id",
+        "broker_id",
+        "reservation_state",
+        "delegation_state",
+        "auth",
+        "id_token",
+        "level",
+        "id",
+    )
+    schema_name = "RequestById"
+
+    def __init__(self,
+            name: str = None,
+            callback_topic: str = None,
+            message_id: str = None,
+            guid: str = None,
+            slice_id: str = None,
+            slice_name: str = None,
+            reservation_id: str = None,
+            delegation_id: str = None,
+            type: str = None,
+            unit_id: str = None,
+            broker_id: str = None,
+            reservation_state: int = None,
+            delegation_state: int = None,
+            auth: AuthRecord = None,
+            id_token: str = None,
+            level: int = None,
+    ):
+        self.name = name
+        self.callback_topic = callback_topic
+        self.message_id = message_id
+        self.guid = guid
+        self.slice_id = slice_id
+        self.slice_name = slice_name
+        self.reservation_id = reservation_id
+        self.delegation_id = delegation_id
+        self.type = type
+        self.unit_id = unit_id
+        self.broker_id = broker_id
+        self.reservation_state = reservation_state
+        self.delegation_state = delegation_state
+        self.auth = auth
+        self.id_token = id_token
+        self.level = level
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'RequestById':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.callback_topic = value['callback_topic']
+        self.message_id = value['message_id']
+        self.guid = value['guid']
+        self.slice_id = value.get('slice_id')
+        self.slice_name = value.get('slice_name')
+        self.reservation_id = value.get('reservation_id')
+        self.delegation_id = value.get('delegation_id')
+        self.type = value.get('type')
+        self.unit_id = value.get('unit_id')
+        self.broker_id = value.get('broker_id')
+        self.reservation_state = value.get('reservation_state')
+        self.delegation_state = value.get('delegation_state')
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+        self.id_token = value.get('id_token')
+        self.level = value.get('level')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "callback_topic": self.callback_topic,
+            "message_id": self.message_id,
+            "guid": self.guid,
+        }
+        if self.slice_id is not None:
+            result["slice_id"] = self.slice_id
+        if self.slice_name is not None:
+            result["slice_name"] = self.slice_name
+        if self.reservation_id is not None:
+            result["reservation_id"] = self.reservation_id
+        if self.delegation_id is not None:
+            result["delegation_id"] = self.delegation_id
+        if self.type is not None:
+            result["type"] = self.type
+        if self.unit_id is not None:
+            result["unit_id"] = self.unit_id
+        if self.broker_id is not None:
+            result["broker_id"] = self.broker_id
+        if self.reservation_state is not None:
+            result["reservation_state"] = self.reservation_state
+        if self.delegation_state is not None:
+            result["delegation_state"] = self.delegation_state
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        if self.id_token is not None:
+            result["id_token"] = self.id_token
+        if self.level is not None:
+            result["level"] = self.level
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("name", "callback_topic", "message_id", "guid"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "callback_topic",
+            "message_id",
+            "guid",
+            "slice_id",
+            "slice_name",
+            "reservation_id",
+            "delegation_id",
+            "type",
+            "unit_id",
+            "broker_id",
+            "reservation_state",
+            "delegation_state",
+            "auth",
+            "id_token",
+            "level",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return self.callback_topic
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_callback_topic(self, value: str):
+        self.callback_topic = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_slice_id(self) -> str:
+        return self.slice_id
+
+    def set_slice_id(self, value: str):
+        self.slice_id = value
+
+    def get_slice_name(self) -> str:
+        return self.slice_name
+
+    def set_slice_name(self, value: str):
+        self.slice_name = value
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, value: str):
+        self.reservation_id = value
+
+    def get_delegation_id(self) -> str:
+        return self.delegation_id
+
+    def set_delegation_id(self, value: str):
+        self.delegation_id = value
+
+    def get_type(self) -> str:
+        return self.type
+
+    def set_type(self, value: str):
+        self.type = value
+
+    def get_unit_id(self) -> str:
+        return self.unit_id
+
+    def set_unit_id(self, value: str):
+        self.unit_id = value
+
+    def get_broker_id(self) -> str:
+        return self.broker_id
+
+    def set_broker_id(self, value: str):
+        self.broker_id = value
+
+    def get_reservation_state(self) -> int:
+        return self.reservation_state
+
+    def set_reservation_state(self, value: int):
+        self.reservation_state = value
+
+    def get_delegation_state(self) -> int:
+        return self.delegation_state
+
+    def set_delegation_state(self, value: int):
+        self.delegation_state = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+    def get_id_token(self) -> str:
+        return self.id_token
+
+    def set_id_token(self, value: str):
+        self.id_token = value
+
+    def get_level(self) -> int:
+        return self.level
+
+    def set_level(self, value: int):
+        self.level = value
+
+
+class GetReservationsStateRequest(IMessageAvro):
+    """
+    Generated from fabric.cf.model.GetReservationsStateRequest
+    """
+    __slots__ = ("name", "callback_topic", "message_id", "guid", "reservation_ids", "auth", "id_token", "id")
+    schema_name = "GetReservationsStateRequest"
+
+    def __init__(self,
+            name: str = None,
+            callback_topic: str = None,
+            message_id: str = None,
+            guid: str = None,
+            reservation_ids: list = None,
+            auth: AuthRecord = None,
+            id_token: str = None,
+    ):
+        self.name = name
+        self.callback_topic = callback_topic
+        self.message_id = message_id
+        self.guid = guid
+        self.reservation_ids = reservation_ids
+        self.auth = auth
+        self.id_token = id_token
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'GetReservationsStateRequest':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.callback_topic = value['callback_topic']
+        self.message_id = value['message_id']
+        self.guid = value['guid']
+        self.reservation_ids = value['reservation_ids']
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+        self.id_token = value.get('id_token')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "callback_topic": self.callback_topic,
+            "message_id": self.message_id,
+            "guid": self.guid,
+            "reservation_ids": self.reservation_ids,
+        }
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        if self.id_token is not None:
+            result["id_token"] = self.id_token
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in (
+            "name",
+            "callback_topic",
+            "message_id",
+            "guid",
+            "reservation_ids",
+        ))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "callback_topic",
+            "message_id",
+            "guid",
+            "reservation_ids",
+            "auth",
+            "id_token",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return self.callback_topic
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_callback_topic(self, value: str):
+        self.callback_topic = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_reservation_ids(self) -> list:
+        return self.reservation_ids
+
+    def set_reservation_ids(self, value: list):
+        self.reservation_ids = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+    def get_id_token(self) -> str:
+        return self.id_token
+
+    def set_id_token(self, value: str):
+        self.id_token = value
+
+
+class ResultString(IMessageAvro):
+    """
+    Generated from fabric.cf.model.ResultString
+    """
+    __slots__ = ("name", "message_id", "result_str", "status", "id")
+    schema_name = "ResultString"
+
+    def __init__(self, name: str = None, message_id: str = None, result_str: str = None, status: ResultRecord = None):
+        self.name = name
+        self.message_id = message_id
+        self.result_str = result_str
+        self.status = status
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'ResultString':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.message_id = value['message_id']
+        self.result_str = value.get('result_str')
+        self.status = ResultRecord.create(value['status'])
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"name": self.name, "message_id": self.message_id, "status": self.status.to_dict()}
+        if self.result_str is not None:
+            result["result_str"] = self.result_str
+        return result
+
+    def validate(self) -> bool:
+        return self.name is not None and self.message_id is not None and self.status is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("name", "message_id", "result_str", "status"))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return None
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_result_str(self) -> str:
+        return self.result_str
+
+    def set_result_str(self, value: str):
+        self.result_str = value
+
+    def get_status(self) -> ResultRecord:
+        return self.status
+
+    def set_status(self, value: ResultRecord):
+        self.status = value
+
+    def get_result(self) -> str:
+        return self.result_str
+
+    def set_result(self, value: str):
+        self.result_str = value
+
+
+class ResultStrings(IMessageAvro):
+    """
+    Generated from fabric.cf.model.ResultStrings
+    """
+    __slots__ = ("name", "message_id", "result", "status", "id")
+    schema_name = "ResultStrings"
+
+    def __init__(self, name: str = None, message_id: str = None, result: list = None, status: ResultRecord = None):
+        self.name = name
+        self.message_id = message_id
+        self.result = result
+        self.status = status
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'ResultStrings':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.message_id = value['message_id']
+        result = value.get('result')
+        if result is not None:
+            result = result
+        self.result = result
+        self.status = ResultRecord.create(value['status'])
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {"name": self.name, "message_id": self.message_id, "status": self.status.to_dict()}
+        if self.result is not None:
+            result["result"] = self.result
+        return result
+
+    def validate(self) -> bool:
+        return self.name is not None and self.message_id is not None and self.status is not None
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in ("name", "message_id", "result", "status"))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return None
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_result(self) -> list:
+        return self.result
+
+    def set_result(self, value: list):
+        self.result = value
+
+    def get_status(self) -> ResultRecord:
+        return self.status
+
+    def set_status(self, value: ResultRecord):
+        self.status = value
+
+
+class AddUpdateSlice(IMessageAvro):
+    """
+    Generated from fabric.cf.model.AddUpdateSlice
+    """
+    __slots__ = ("name", "callback_topic", "message_id", "guid", "slice_obj", "auth", "id_token", "id")
+    schema_name = "AddUpdateSlice"
+
+    def __init__(self,
+            name: str = None,
+            callback_topic: str = None,
+            message_id: str = None,
+            guid: str = None,
+            slice_obj: SliceRecord = None,
+            auth: AuthRecord = None,
+            id_token: str = None,
+    ):
+        self.name = name
+        self.callback_topic = callback_topic
+        self.message_id = message_id
+        self.guid = guid
+        self.slice_obj = slice_obj
+        self.auth = auth
+        self.id_token = id_token
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'AddUpdateSlice':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.callback_topic = value['callback_topic']
+        self.message_id = value['message_id']
+        self.guid = value['guid']
+        slice_obj = value.get('slice_obj')
+        if slice_obj is not None:
+            slice_obj = SliceRecord.create(slice_obj)
+        self.slice_obj = slice_obj
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+        self.id_token = value.get('id_token')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "callback_topic": self.callback_topic,
+            "message_id": self.message_id,
+            "guid": self.guid,
+        }
+        if self.slice_obj is not None:
+            result["slice_obj"] = self.slice_obj.to_dict()
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        if self.id_token is not None:
+            result["id_token"] = self.id_token
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("name", "callback_topic", "message_id", "guid"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "callback_topic",
+            "message_id",
+            "guid",
+            "slice_obj",
+            "auth",
+            "id_token",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return self.callback_topic
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_callback_topic(self, value: str):
+        self.callback_topic = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_slice_obj(self) -> SliceRecord:
+        return self.slice_obj
+
+    def set_slice_obj(self, value: SliceRecord):
+        self.slice_obj = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+    def get_id_token(self) -> str:
+        return self.id_token
+
+    def set_id_token(self, value: str):
+        self.id_token = value
+
+
+class AddUpdateReservation(IMessageAvro):
+    """
+    Generated from fabric.cf.model.AddUpdateReservation
+    """
+    __slots__ = (
+        "name",
+        "callback_topic",
+        "message_id",
+        "guid",
+        "reservation_obj",
+        "auth",
+        "id_token",
+        "reservation_id",
+        "id",
+    )
+    schema_name = "AddUpdateReservation"
+
+    def __init__(self,
+            name: str = None,
+            callback_topic: str = None,
+            message_id: str = None,
+            guid: str = None,
+            reservation_obj: ReservationMngRecord = None,
+            auth: AuthRecord = None,
+            id_token: str = None,
+            reservation_id: str = None,
+    ):
+        self.name = name
+        self.callback_topic = callback_topic
+        self.message_id = message_id
+        self.guid = guid
+        self.reservation_obj = reservation_obj
+        self.auth = auth
+        self.id_token = id_token
+        self.reservation_id = reservation_id
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'AddUpdateReservation':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.callback_topic = value['callback_topic']
+        self.message_id = value['message_id']
+        self.guid = value['guid']
+        reservation_obj = value.get('reservation_obj')
+        if reservation_obj is not None:
+            reservation_obj = ReservationMngRecord.create(reservation_obj)
+        self.reservation_obj = reservation_obj
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+        self.id_token = value.get('id_token')
+        self.reservation_id = value.get('reservation_id')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "callback_topic": self.callback_topic,
+            "message_id": self.message_id,
+            "guid": self.guid,
+        }
+        if self.reservation_obj is not None:
+            result["reservation_obj"] = self.reservation_obj.to_dict()
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        if self.id_token is not None:
+            result["id_token"] = self.id_token
+        if self.reservation_id is not None:
+            result["reservation_id"] = self.reservation_id
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("name", "callback_topic", "message_id", "guid"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "callback_topic",
+            "message_id",
+            "guid",
+            "reservation_obj",
+            "auth",
+            "id_token",
+            "reservation_id",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return self.callback_topic
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_callback_topic(self, value: str):
+        self.callback_topic = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_reservation_obj(self) -> ReservationMngRecord:
+        return self.reservation_obj
+
+    def set_reservation_obj(self, value: ReservationMngRecord):
+        self.reservation_obj = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+    def get_id_token(self) -> str:
+        return self.id_token
+
+    def set_id_token(self, value: str):
+        self.id_token = value
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, value: str):
+        self.reservation_id = value
+
+    def get_reservation(self) -> ReservationMngRecord:
+        return self.reservation_obj
+
+    def set_reservation(self, value: ReservationMngRecord):
+        self.reservation_obj = value
+
+
+class AddReservations(IMessageAvro):
+    """
+    Generated from fabric.cf.model.AddReservations
+    """
+    __slots__ = ("name", "callback_topic", "message_id", "guid", "reservation_list", "auth", "id_token", "id")
+    schema_name = "AddReservations"
+
+    def __init__(self,
+            name: str = None,
+            callback_topic: str = None,
+            message_id: str = None,
+            guid: str = None,
+            reservation_list: list = None,
+            auth: AuthRecord = None,
+            id_token: str = None,
+    ):
+        self.name = name
+        self.callback_topic = callback_topic
+        self.message_id = message_id
+        self.guid = guid
+        self.reservation_list = reservation_list
+        self.auth = auth
+        self.id_token = id_token
+        # Unique id used to track produce request success/failures.
+        # Do *not* include in the serialized object.
+        self.id = uuid4()
+
+    @classmethod
+    def create(cls, value: dict) -> 'AddReservations':
+        result = cls()
+        result.from_dict(value)
+        return result
+
+    def from_dict(self, value: dict):
+        self.name = value['name']
+        self.callback_topic = value['callback_topic']
+        self.message_id = value['message_id']
+        self.guid = value['guid']
+        reservation_list = value.get('reservation_list')
+        if reservation_list is not None:
+            reservation_list = [ReservationMngRecord.create(v) for v in reservation_list]
+        self.reservation_list = reservation_list
+        auth = value.get('auth')
+        if auth is not None:
+            auth = AuthRecord.create(auth)
+        self.auth = auth
+        self.id_token = value.get('id_token')
+
+    def to_dict(self) -> dict:
+        if not self.validate():
+            raise MessageBusException("Invalid arguments")
+        result = {
+            "name": self.name,
+            "callback_topic": self.callback_topic,
+            "message_id": self.message_id,
+            "guid": self.guid,
+        }
+        if self.reservation_list is not None:
+            result["reservation_list"] = [v.to_dict() for v in self.reservation_list]
+        if self.auth is not None:
+            result["auth"] = self.auth.to_dict()
+        if self.id_token is not None:
+            result["id_token"] = self.id_token
+        return result
+
+    def validate(self) -> bool:
+        return all(getattr(self, f) is not None for f in ("name", "callback_topic", "message_id", "guid"))
+
+    def __str__(self):
+        return " ".join("{}: {}".format(f, getattr(self, f)) for f in (
+            "name",
+            "callback_topic",
+            "message_id",
+            "guid",
+            "reservation_list",
+            "auth",
+            "id_token",
+        ))
+
+    def print(self):
+        print(self)
+
+    def get_message_id(self) -> str:
+        return self.message_id
+
+    def get_message_name(self) -> str:
+        return self.name
+
+    def get_callback_topic(self) -> str:
+        return self.callback_topic
+
+    def get_id(self) -> str:
+        return self.id.__str__()
+
+    def get_schema_name(self) -> str:
+        return self.schema_name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def set_name(self, value: str):
+        self.name = value
+
+    def set_callback_topic(self, value: str):
+        self.callback_topic = value
+
+    def set_message_id(self, value: str):
+        self.message_id = value
+
+    def get_guid(self) -> str:
+        return self.guid
+
+    def set_guid(self, value: str):
+        self.guid = value
+
+    def get_reservation_list(self) -> list:
+        return self.reservation_list
+
+    def set_reservation_list(self, value: list):
+        self.reservation_list = value
+
+    def get_auth(self) -> AuthRecord:
+        return self.auth
+
+    def set_auth(self, value: AuthRecord):
+        self.auth = value
+
+    def get_id_token(self) -> str:
+        return self.id_token
+
+    def set_id_token(self, value: str):
+        self.id_token = value
+
+    def get_reservation(self) -> list:
+        return self.reservation_list
+
+    def set_reservation(self, value: list):
+        self.reservation_list = value
+
+
+# Record name -> class
+RECORDS = {
+    "AuthRecord": AuthRecord,
+    "ResultRecord": ResultRecord,
+    "ReservationStateRecord": ReservationStateRecord,
+    "ProxyRecord": ProxyRecord,
+    "UnitRecord": UnitRecord,
+    "ActorRecord": ActorRecord,
+    "BrokerQueryModelRecord": BrokerQueryModelRecord,
+    "SliceRecord": SliceRecord,
+    "ReservationPredecessorMngRecord": ReservationPredecessorMngRecord,
+    "ReservationMngRecord": ReservationMngRecord,
+    "TermRecord": TermRecord,
+    "ResourceTicketRecord": ResourceTicketRecord,
+    "TicketRecord": TicketRecord,
+    "resource_set_record": ResourceSetRecord,
+    "ReservationRecord": ReservationRecord,
+    "DelegationRecord": DelegationRecord,
+    "Query": Query,
+    "QueryResult": QueryResult,
+    "FailedRPC": FailedRPC,
+    "update_data": UpdateData,
+    "ReservationOrDelegation": ReservationOrDelegation,
+    "ResultRecordList": ResultRecordList,
+    "ExtendReservationAvro": ExtendReservationAvro,
+    "RequestById": RequestById,
+    "GetReservationsStateRequest": GetReservationsStateRequest,
+    "ResultString": ResultString,
+    "ResultStrings": ResultStrings,
+    "AddUpdateSlice": AddUpdateSlice,
+    "AddUpdateReservation": AddUpdateReservation,
+    "AddReservations": AddReservations,
+}
+
+# Message records
+MESSAGES = [
+    Query,
+    QueryResult,
+    FailedRPC,
+    ReservationOrDelegation,
+    ResultRecordList,
+    ExtendReservationAvro,
+    RequestById,
+    GetReservationsStateRequest,
+    ResultString,
+    ResultStrings,
+    AddUpdateSlice,
+    AddUpdateReservation,
+    AddReservations,
+]
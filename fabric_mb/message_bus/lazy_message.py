@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Lazily decoded message fields: the encoded value of a field is kept as is and only read on first access
+"""
+import threading
+from types import MemberDescriptorType
+from typing import Callable, Dict, Iterable, Tuple
+
+# Fields left encoded until accessed by default
+LAZY_FIELDS = frozenset(["reservations", "units", "model", "graph", "sliver"])
+# Values encoded in fewer bytes are read right away, which costs less than keeping them pending
+MIN_LAZY_SIZE = 32
+
+
+class Pending:
+    """
+    Encoded value of a field not read yet
+    """
+    __slots__ = ("reader", "data", "pos")
+
+    def __init__(self, reader: Callable[[bytes, int], Tuple[object, int]], data: bytes, pos: int):
+        """
+        :param reader: function reading the value
+        :param data: encoded message
+        :param pos: position of the value in data
+        """
+        self.reader = reader
+        self.data = data
+        self.pos = pos
+
+    def load(self):
+        """
+        Read the value
+        """
+        return self.reader(self.data, self.pos)[0]
+
+
+class LazyField:
+    """
+    Descriptor reading a pending field value on first access and caching it. Pending values are kept in the
+    instance dict; read values where the base class keeps them, i.e. in its slot if any
+    """
+    __slots__ = ("name", "slot")
+
+    def __init__(self, name: str, slot: MemberDescriptorType = None):
+        self.name = name
+        self.slot = slot
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.__dict__.get(self.name, None)
+        if type(value) is Pending:
+            value = value.load()
+            self.__set__(instance, value)
+            return value
+        if self.slot is not None:
+            return self.slot.__get__(instance, owner)
+        if self.name not in instance.__dict__:
+            raise AttributeError(self.name)
+        return value
+
+    def __set__(self, instance, value):
+        if self.slot is not None and type(value) is not Pending:
+            instance.__dict__.pop(self.name, None)
+            self.slot.__set__(instance, value)
+        else:
+            instance.__dict__[self.name] = value
+
+
+class LazyMessage:
+    """
+    Mixin of the lazy subclasses created by get_lazy_class
+    """
+    __slots__ = ()
+    lazy_fields = ()
+
+    def load(self):
+        """
+        Read all pending fields
+        """
+        for name in self.lazy_fields:
+            getattr(self, name, None)
+
+    def __reduce__(self):
+        # Pickled as the base class, e.g. to hand messages over to a process pool
+        self.load()
+        values = dict(getattr(self, "__dict__", {}))
+        for cls in type(self).__mro__:
+            slots = cls.__dict__.get("__slots__", ())
+            for name in [slots] if isinstance(slots, str) else slots:
+                if name not in ("__dict__", "__weakref__") and hasattr(self, name):
+                    values[name] = getattr(self, name)
+        return restore, (self.base_class, values)
+
+    def __reduce_ex__(self, protocol):
+        return self.__reduce__()
+
+
+def restore(cls: type, values: dict):
+    """
+    Create an instance of cls holding values without calling its constructor; used to unpickle lazy messages
+    """
+    instance = cls.__new__(cls)
+    for name, value in values.items():
+        setattr(instance, name, value)
+    return instance
+
+
+# (class, fields) -> lazy subclass
+lazy_classes = {}  # type: Dict[Tuple[type, frozenset], type]
+lazy_classes_lock = threading.Lock()
+
+
+def get_lazy_class(base: type, fields: Iterable[str]) -> type:
+    """
+    Return the subclass of base reading fields lazily. Keeps the layout of base when base has an instance dict,
+    so that existing instances can be switched to it
+    :param base: class
+    :param fields: names of the lazy fields
+    """
+    fields = frozenset(fields)
+    key = (base, fields)
+    lazy_class = lazy_classes.get(key, None)
+    if lazy_class is not None:
+        return lazy_class
+    namespace = {"lazy_fields": tuple(sorted(fields)), "base_class": base}
+    if base.__dictoffset__ != 0:
+        namespace["__slots__"] = ()
+    for name in fields:
+        slot = None
+        for cls in base.__mro__:
+            if isinstance(cls.__dict__.get(name, None), MemberDescriptorType):
+                slot = cls.__dict__[name]
+                break
+        namespace[name] = LazyField(name, slot)
+    lazy_class = type("Lazy" + base.__name__, (LazyMessage, base), namespace)
+    with lazy_classes_lock:
+        lazy_class = lazy_classes.setdefault(key, lazy_class)
+    return lazy_class
+
+
+def is_loaded(message, name: str) -> bool:
+    """
+    Return True unless a field of a message is still pending
+    :param message: message or record
+    :param name: field name
+    """
+    values = getattr(message, "__dict__", None)
+    return values is None or type(values.get(name, None)) is not Pending
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Kafka headers stamped on produced messages, carrying the message name, schema id, message id and produce time,
+so that consumers can route and filter messages without decoding their Avro value
+"""
+import time
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+from fabric_mb.message_bus.messages.message import IMessageAvro
+
+NAME_HEADER = "fabric.name"
+SCHEMA_ID_HEADER = "fabric.schema_id"
+MESSAGE_ID_HEADER = "fabric.message_id"
+TIMESTAMP_HEADER = "fabric.timestamp"
+
+# Returns True for the messages to decode, given their headers
+HeaderFilter = Callable[[Dict[str, str]], bool]
+
+
+def build_headers(record: IMessageAvro, schema_id: int = None) -> List[Tuple[str, bytes]]:
+    """
+    Return the headers of a produced record
+    :param record: record/message to be written
+    :param schema_id: id of the value schema the record is encoded against
+    :return list of header name and value
+    """
+    headers = [(NAME_HEADER, record.get_message_name().encode('utf-8'))]
+    if schema_id is not None:
+        headers.append((SCHEMA_ID_HEADER, str(schema_id).encode('utf-8')))
+    message_id = record.get_message_id()
+    if message_id is not None:
+        headers.append((MESSAGE_ID_HEADER, str(message_id).encode('utf-8')))
+    # Milliseconds since the epoch, as Kafka timestamps
+    headers.append((TIMESTAMP_HEADER, str(int(time.time() * 1000)).encode('utf-8')))
+    return headers
+
+
+def parse_headers(headers) -> Dict[str, str]:
+    """
+    Return the headers of a consumed message as a dict; later values win for repeated names. Values that are not
+    UTF-8, e.g. binary headers of other producers sharing the topic, have the invalid bytes replaced
+    :param headers: headers as returned by Message.headers(), a list of name and value or None
+    :return header values by name
+    """
+    if not headers:
+        return {}
+    if isinstance(headers, dict):
+        headers = headers.items()
+    return {name: value.decode('utf-8', errors='replace') if isinstance(value, bytes) else value
+            for name, value in headers}
+
+
+def build_header_filter(accept: Union[Iterable[str], HeaderFilter]) -> HeaderFilter:
+    """
+    Return the header filter for an allow list of message names, or the filter itself when callable. Messages
+    without the name header, e.g. from producers not stamping headers, are accepted by an allow list
+    :param accept: message names to decode, or callable returning True for the headers of messages to decode
+    :return header filter
+    """
+    if callable(accept):
+        return accept
+    names = frozenset(accept)
+    return lambda headers: NAME_HEADER not in headers or headers[NAME_HEADER] in names
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Extracts the identifiers of the reservation, delegation, slice or actor a message refers to, used as ordering key
+by consumers and as partition key by producers
+"""
+from typing import Callable, Union
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.messages.message import IMessageAvro
+
+# Returns the key of a message, or None if the message has none
+KeyFunction = Callable[[IMessageAvro], str]
+
+
+def get_reservation_id(message: IMessageAvro) -> str:
+    """
+    Return the reservation id a message refers to e.g. RequestByIdRecord.reservation_id or
+    ReservationOrDelegationRecord.reservation.reservation_id
+    :param message: message
+    :return reservation id or None
+    """
+    reservation_id = getattr(message, 'reservation_id', None)
+    if reservation_id is not None:
+        return reservation_id
+    for attribute in ['reservation', 'reservation_obj']:
+        reservation = getattr(message, attribute, None)
+        if reservation is not None:
+            return reservation.reservation_id
+    return None
+
+
+def get_delegation_id(message: IMessageAvro) -> str:
+    """
+    Return the delegation id a message refers to e.g. RequestByIdRecord.delegation_id or
+    ReservationOrDelegationRecord.delegation.delegation_id
+    :param message: message
+    :return delegation id or None
+    """
+    delegation_id = getattr(message, 'delegation_id', None)
+    if delegation_id is not None:
+        return delegation_id
+    delegation = getattr(message, 'delegation', None)
+    if delegation is not None:
+        return delegation.delegation_id
+    return None
+
+
+def get_slice_id(message: IMessageAvro) -> str:
+    """
+    Return the slice id a message refers to e.g. RequestByIdRecord.slice_id, AddUpdateSliceRecord.slice_obj.guid or
+    the slice of the reservation or delegation carried by the message
+    :param message: message
+    :return slice id or None
+    """
+    slice_id = getattr(message, 'slice_id', None)
+    if slice_id is not None:
+        return slice_id
+    slice_obj = getattr(message, 'slice_obj', None)
+    if slice_obj is not None:
+        return slice_obj.guid
+    for attribute in ['reservation', 'delegation']:
+        obj = getattr(message, attribute, None)
+        if obj is not None and obj.slice is not None:
+            return obj.slice.guid
+    reservation = getattr(message, 'reservation_obj', None)
+    if reservation is not None:
+        return reservation.slice_id
+    reservation_list = getattr(message, 'reservation_list', None)
+    if reservation_list:
+        return reservation_list[0].slice_id
+    return None
+
+
+def default_ordering_key(message: IMessageAvro) -> str:
+    """
+    Return the key messages are ordered by: the reservation id if the message refers to a reservation, else the
+    delegation id, else the slice id
+    :param message: message
+    :return ordering key or None if the message does not refer to any of them
+    """
+    key = get_reservation_id(message)
+    if key is None:
+        key = get_delegation_id(message)
+    if key is None:
+        key = get_slice_id(message)
+    return key
+
+
+def get_actor_guid(message: IMessageAvro) -> str:
+    """
+    Return the guid of the actor a message is addressed to e.g. RequestByIdRecord.guid, else the guid of the actor
+    sending it (auth.guid)
+    :param message: message
+    :return actor guid or None
+    """
+    guid = getattr(message, 'guid', None)
+    if guid is not None:
+        return guid
+    auth = getattr(message, 'auth', None)
+    if auth is not None:
+        return auth.guid
+    return None
+
+
+KEY_FUNCTIONS = {
+    "reservation_id": get_reservation_id,
+    "delegation_id": get_delegation_id,
+    "slice_id": get_slice_id,
+    "actor_guid": get_actor_guid,
+    "ordering": default_ordering_key,
+}
+
+
+def get_key_function(key: Union[str, KeyFunction]) -> KeyFunction:
+    """
+    Return the key function for a name in KEY_FUNCTIONS, or the key function itself when callable
+    :param key: name of the key e.g. "slice_id", or callable returning the key of a message
+    :return key function
+    :raises MessageBusException if the name is unknown
+    """
+    if callable(key):
+        return key
+    if key not in KEY_FUNCTIONS:
+        raise MessageBusException("Unknown message key {}; expected one of {}".format(key, list(KEY_FUNCTIONS)))
+    return KEY_FUNCTIONS[key]
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Registry mapping message names to the classes used to de-serialize them
+"""
+import importlib
+import re
+import threading
+from typing import Callable
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.messages.message import IMessageAvro
+
+MESSAGES_PACKAGE = 'fabric_mb.message_bus.messages'
+
+
+class MessageRegistry:
+    """
+    Maps the name carried by an incoming message to a factory creating the corresponding IMessageAvro instance.
+    Lookups fall through to the parent registry, so a consumer specific registry only holds its own additions.
+    Names not registered are resolved once using the naming convention (<Message Name>Avro in module
+    <message_name>_avro) and cached.
+    """
+    def __init__(self, parent=None):
+        """
+        Initialize the registry
+        :param parent: registry consulted for names not registered here
+        """
+        self.parent = parent
+        self.factories = {}
+        self.lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], IMessageAvro] = None):
+        """
+        Register a factory for a message name. Can be used as a class decorator when factory is not passed e.g.
+
+            @registry.register("MyMessage")
+            class MyMessageAvro(IMessageAvro):
+                ...
+
+        :param name: message name
+        :param factory: callable returning a new message instance; typically the message class
+        :return factory
+        """
+        if factory is None:
+            def decorator(cls):
+                self.register(name, cls)
+                return cls
+            return decorator
+        with self.lock:
+            self.factories[name] = factory
+        return factory
+
+    def unregister(self, name: str):
+        """
+        Remove a message name
+        :param name: message name
+        """
+        with self.lock:
+            self.factories.pop(name, None)
+
+    def get_factory(self, name: str) -> Callable[[], IMessageAvro]:
+        """
+        Return the factory registered for a message name
+        :param name: message name
+        :return factory or None if not registered
+        """
+        factory = self.factories.get(name)
+        if factory is None and self.parent is not None:
+            factory = self.parent.get_factory(name)
+        return factory
+
+    def create(self, name: str) -> IMessageAvro:
+        """
+        Create a new message instance for a message name
+        :param name: message name
+        :return message instance
+        :raises MessageBusException if the message name cannot be resolved
+        """
+        factory = self.get_factory(name)
+        if factory is None:
+            factory = self.register(name, self._load_by_convention(name))
+        return factory()
+
+    @staticmethod
+    def _load_by_convention(name: str):
+        if name is None:
+            raise MessageBusException("Message name not specified")
+        class_name = name + 'Avro'
+        module_name = MESSAGES_PACKAGE + '.' + re.sub(r'(?<!^)(?=[A-Z])', '_', class_name).lower()
+        try:
+            module = importlib.import_module(module_name)
+            return getattr(module, class_name)
+        except (ImportError, AttributeError) as e:
+            raise MessageBusException("Unknown message {}: {}".format(name, e))
+
+    def __contains__(self, name: str) -> bool:
+        return self.get_factory(name) is not None
+
+    def __len__(self):
+        return len(self.factories)
+
+
+def _load_default_registry() -> MessageRegistry:
+    """
+    Build the registry from the message name constants declared on IMessageAvro and the shared record classes
+    """
+    from fabric_mb.message_bus.messages.add_update_reservation_record import AddUpdateReservationRecord
+    from fabric_mb.message_bus.messages.add_update_slice_record import AddUpdateSliceRecord
+    from fabric_mb.message_bus.messages.request_by_id_record import RequestByIdRecord
+    from fabric_mb.message_bus.messages.reservation_or_delegation_record import ReservationOrDelegationRecord
+    from fabric_mb.message_bus.messages.result_record_list import ResultRecordList
+
+    registry = MessageRegistry()
+    for attribute, name in vars(IMessageAvro).items():
+        if attribute.startswith('_') or not isinstance(name, str):
+            continue
+        registry.register(name, MessageRegistry._load_by_convention(name))
+
+    for record_class in [AddUpdateReservationRecord, AddUpdateSliceRecord, RequestByIdRecord,
+                         ReservationOrDelegationRecord, ResultRecordList]:
+        registry.register(record_class.__name__, record_class)
+    return registry
+
+
+default_registry = _load_default_registry()
+
+
+def register_message(name: str, factory: Callable[[], IMessageAvro] = None):
+    """
+    Register a message type with the default registry; usable as a class decorator
+    :param name: message name
+    :param factory: callable returning a new message instance
+    """
+    return default_registry.register(name, factory)
+
+
+def create_generated_registry(source: MessageRegistry = None) -> MessageRegistry:
+    """
+    Build a registry mapping each message name to the generated class (fabric_mb.message_bus.generated.records)
+    of the record the message is encoded against. Messages not bound to a record are left out
+    :param source: registry the message names are taken from; defaults to the default registry
+    :return registry
+    """
+    from fabric_mb.message_bus.generated.records import RECORDS
+
+    source = default_registry if source is None else source
+    registry = MessageRegistry()
+    for name, factory in list(source.factories.items()):
+        record_class = RECORDS.get(factory().get_schema_name())
+        if record_class is not None:
+            registry.register(name, record_class)
+    return registry
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Resolves a standalone Avro schema for each named record in schema/message.avsc
+"""
+import copy
+import json
+import os
+import threading
+from typing import Dict, Iterable, Set
+
+from confluent_kafka import avro
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.messages.message import IMessageAvro
+
+DEFAULT_SCHEMA_FILE = os.path.join(os.path.dirname(__file__), 'schema', 'message.avsc')
+
+PRIMITIVE_TYPES = {"null", "boolean", "int", "long", "float", "double", "bytes", "string"}
+NAMED_TYPES = {"record", "error", "enum", "fixed"}
+
+
+class MessageSchemas:
+    """
+    Splits the top level union in schema/message.avsc into one self contained record schema per message type.
+    Encoding against the record a message is bound to (IMessageAvro.schema_name) avoids the Avro writer trying
+    every branch of the union on each produce. Schemas are resolved on first use and cached.
+    Projected reader schemas leave out the fields a consumer does not read, so that they are skipped on decode.
+    """
+    def __init__(self, schema_str: str = None, schema_file: str = DEFAULT_SCHEMA_FILE):
+        """
+        Initialize from a schema string or file
+        :param schema_str: Avro schema as JSON string; takes precedence over schema_file
+        :param schema_file: path of the Avro schema file
+        """
+        if schema_str is None:
+            with open(schema_file, "r") as f:
+                schema_str = f.read()
+        self.definitions = {}
+        self.aliases = {}
+        self.parsed = json.loads(schema_str)
+        for s in self.parsed if isinstance(self.parsed, list) else [self.parsed]:
+            self._index(s, None)
+        self.records = {}
+        self.schemas = {}
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def _full_name(name: str, namespace: str) -> str:
+        if '.' in name or not namespace:
+            return name
+        return "{}.{}".format(namespace, name)
+
+    def _index(self, schema, namespace: str):
+        """
+        Record the definitions of all named types, including the ones declared inline
+        """
+        if isinstance(schema, list):
+            for s in schema:
+                self._index(s, namespace)
+        elif isinstance(schema, dict):
+            schema_type = schema.get('type')
+            if schema_type in NAMED_TYPES:
+                namespace = schema.get('namespace', namespace)
+                full_name = self._full_name(schema['name'], namespace)
+                self.definitions[full_name] = (schema, namespace)
+                self.aliases.setdefault(schema['name'], full_name)
+                for f in schema.get('fields', []):
+                    self._index(f['type'], namespace)
+            elif schema_type == 'array':
+                self._index(schema['items'], namespace)
+            elif schema_type == 'map':
+                self._index(schema['values'], namespace)
+            else:
+                self._index(schema_type, namespace)
+
+    def _expand(self, schema, namespace: str, defined: set, projection: Dict[str, Set[str]] = None):
+        """
+        Inline the definition of every named type at its first reference so that the result is self contained
+        :param projection: fields kept per record full name; records not listed keep all their fields
+        """
+        if isinstance(schema, str):
+            if schema in PRIMITIVE_TYPES:
+                return schema
+            full_name = self._full_name(schema, namespace)
+            if full_name not in self.definitions:
+                full_name = self.aliases.get(schema, full_name)
+            if full_name in defined:
+                return full_name
+            if full_name not in self.definitions:
+                raise MessageBusException("Unknown Avro type {}".format(schema))
+            definition, definition_namespace = self.definitions[full_name]
+            return self._expand(definition, definition_namespace, defined, projection)
+
+        if isinstance(schema, list):
+            return [self._expand(s, namespace, defined, projection) for s in schema]
+
+        schema_type = schema.get('type')
+        result = dict(schema)
+        if schema_type in NAMED_TYPES:
+            namespace = schema.get('namespace', namespace)
+            full_name = self._full_name(schema['name'], namespace)
+            if full_name in defined:
+                return full_name
+            defined.add(full_name)
+            if namespace is not None:
+                result['namespace'] = namespace
+            if 'fields' in schema:
+                kept = projection.get(full_name) if projection is not None else None
+                result['fields'] = []
+                for f in schema['fields']:
+                    # Fields without a default are kept as from_dict reads them unconditionally
+                    if kept is not None and f['name'] not in kept and 'default' not in f:
+                        kept = kept | {f['name']}
+                    if kept is not None and f['name'] not in kept:
+                        continue
+                    field = dict(f)
+                    field['type'] = self._expand(f['type'], namespace, defined, projection)
+                    result['fields'].append(field)
+        elif schema_type == 'array':
+            result['items'] = self._expand(schema['items'], namespace, defined, projection)
+        elif schema_type == 'map':
+            result['values'] = self._expand(schema['values'], namespace, defined, projection)
+        elif not isinstance(schema_type, str) or schema_type not in PRIMITIVE_TYPES:
+            result['type'] = self._expand(schema_type, namespace, defined, projection)
+        return result
+
+    def _resolve_name(self, name: str) -> str:
+        if name in self.definitions:
+            return name
+        full_name = self.aliases.get(name)
+        if full_name is None:
+            raise MessageBusException("Unknown Avro record {}".format(name))
+        return full_name
+
+    def get_record_json(self, name: str) -> dict:
+        """
+        Return the self contained JSON definition of a named record
+        :param name: short or full name of the record e.g. Query or fabric.cf.model.Query
+        :return record schema as dict
+        """
+        name = self._resolve_name(name)
+        record = self.records.get(name)
+        if record is None:
+            with self.lock:
+                record = self.records.get(name)
+                if record is None:
+                    record = self._expand(name, None, set())
+                    self.records[name] = record
+        return copy.deepcopy(record)
+
+    def get_schema(self, name: str):
+        """
+        Return the loaded Avro schema for a named record
+        :param name: short or full name of the record
+        :return loaded Avro schema
+        """
+        name = self._resolve_name(name)
+        schema = self.schemas.get(name)
+        if schema is None:
+            with self.lock:
+                schema = self.schemas.get(name)
+                if schema is None:
+                    schema = avro.loads(json.dumps(self.get_record_json(name)))
+                    self.schemas[name] = schema
+        return schema
+
+    def resolve_projection(self, projection: Dict[str, Iterable[str]]) -> Dict[str, Set[str]]:
+        """
+        Resolve the record names of a projection to full names and check that the fields exist
+        :param projection: fields to decode per record, keyed by short or full record name
+        :return fields per record full name
+        :raises MessageBusException if a record or field is unknown
+        """
+        result = {}
+        for name, fields in projection.items():
+            full_name = self._resolve_name(name)
+            definition, namespace = self.definitions[full_name]
+            known = {f['name'] for f in definition.get('fields', [])}
+            unknown = set(fields) - known
+            if len(unknown) > 0:
+                raise MessageBusException("Unknown fields {} in record {}".format(sorted(unknown), name))
+            result[full_name] = set(fields)
+        return result
+
+    def get_projected_json(self, projection: Dict[str, Iterable[str]]):
+        """
+        Return the JSON of the whole schema with only some of the fields of some records, to be used as reader
+        schema so that Avro skips the other fields. Fields without a default are always kept
+        :param projection: fields to decode per record, keyed by short or full record name; records not listed
+                           keep all their fields
+        :return projected schema as dict, or list for a union
+        """
+        projection = self.resolve_projection(projection)
+        defined = set()
+        if isinstance(self.parsed, list):
+            return [self._expand(s, None, defined, projection) for s in self.parsed]
+        return self._expand(self.parsed, None, defined, projection)
+
+    def get_projected_schema(self, projection: Dict[str, Iterable[str]]):
+        """
+        Return the loaded Avro reader schema for a projection; see get_projected_json
+        :param projection: fields to decode per record, keyed by short or full record name
+        :return loaded Avro schema
+        """
+        return avro.loads(json.dumps(self.get_projected_json(projection)))
+
+    def get_message_schema(self, message: IMessageAvro):
+        """
+        Return the loaded Avro schema a message is bound to
+        :param message: message
+        :return loaded Avro schema or None if the message is not bound to a record
+        """
+        name = message.get_schema_name()
+        if name is None:
+            return None
+        return self.get_schema(name)
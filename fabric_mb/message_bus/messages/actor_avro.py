@@ -68,7 +68,9 @@ class ActorAvro:
         """
         self.name = value.get('name', None)
         self.type = value.get('type', None)
-        self.owner = value.get('owner', None)
+        if value.get('owner', None) is not None:
+            self.owner = AuthAvro()
+            self.owner.from_dict(value['owner'])
         self.description = value.get('description', None)
         self.policy_class = value.get('policy_class', None)
         self.policy_module = value.get('policy_module', None)
@@ -42,6 +42,8 @@ class AddReservationsAvro(IMessageAvro):
     """
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "guid", "auth", "reservation_list", "callback_topic", "id_token", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "AddReservations"
 
     def __init__(self):
         self.name = IMessageAvro.add_reservations
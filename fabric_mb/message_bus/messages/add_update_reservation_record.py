@@ -43,6 +43,8 @@ class AddUpdateReservationRecord(IMessageAvro):
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "guid", "auth", "reservation_obj", "reservation_id",
                  "callback_topic", "id_token", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "AddUpdateReservation"
 
     def __init__(self):
         self.name = None
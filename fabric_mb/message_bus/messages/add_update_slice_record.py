@@ -40,6 +40,8 @@ class AddUpdateSliceRecord(IMessageAvro):
     """
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "callback_topic", "guid", "slice_obj", "auth", "id_token", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "AddUpdateSlice"
 
     def __init__(self):
         self.name = None
@@ -40,6 +40,8 @@ class ExtendReservationAvro(IMessageAvro):
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "guid", "auth", "reservation_id", "end_time", "new_units", "new_resource_type",
                  "request_properties", "config_properties", "callback_topic", "id_token", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "ExtendReservationAvro"
 
     def __init__(self):
         self.name = IMessageAvro.extend_reservation
@@ -38,7 +38,10 @@ class FailedRpcAvro(IMessageAvro):
     Implements Avro representation of a Failed RPC Message
     """
     # Use __slots__ to explicitly declare all data members.
-    __slots__ = ["name", "message_id", "request_id", "properties", "auth", "id"]
+    __slots__ = ["name", "message_id", "request_type", "request_id", "reservation_id", "error_details", "properties",
+                 "auth", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "FailedRPC"
 
     def __init__(self):
         self.name = IMessageAvro.failed_rpc
@@ -40,6 +40,8 @@ class GetReservationsStateRequestAvro(IMessageAvro):
     """
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "guid", "auth", "reservation_ids", "callback_topic", "id_token", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "GetReservationsStateRequest"
 
     def __init__(self):
         self.name = IMessageAvro.get_reservations_state_request
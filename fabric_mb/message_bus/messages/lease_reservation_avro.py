@@ -40,6 +40,9 @@ class LeaseReservationAvro(TicketReservationAvro):
     """
     Implements Avro representation of a Lease Reservation
     """
+    # Fields to_dict leaves out when empty
+    omit_if_empty = ("redeem_processors",)
+
     def __init__(self):
         super().__init__()
         self.authority = None
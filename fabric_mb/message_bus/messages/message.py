@@ -87,6 +87,13 @@ class IMessageAvro:
     result_broker_query_model = "ResultBrokerQueryModel"
     result_actor = "ResultActor"
 
+    # Keeps the generated slotted messages (fabric_mb.message_bus.generated.records) free of an instance dict
+    __slots__ = ()
+
+    # Name of the record in schema/message.avsc this message is encoded against; None selects the default
+    # (union) value schema configured on the producer
+    schema_name = None
+
     def to_dict(self) -> dict:
         """
         The Avro Python library does not support code generation.
@@ -127,6 +134,12 @@ class IMessageAvro:
         """
         raise NotImplementedError
 
+    def get_schema_name(self) -> str:
+        """
+        Returns the name of the Avro record this message is encoded against
+        """
+        return self.schema_name
+
     def validate(self) -> bool:
         """
         Check if the object is valid and contains all mandatory fields
@@ -39,6 +39,8 @@ class QueryAvro(IMessageAvro):
     """
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "properties", "callback_topic", "auth", "id_token", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "Query"
 
     def __init__(self):
         self.name = IMessageAvro.query
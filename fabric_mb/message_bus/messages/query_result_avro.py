@@ -39,6 +39,8 @@ class QueryResultAvro(IMessageAvro):
     """
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "request_id", "properties", "auth", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "QueryResult"
 
     def __init__(self):
         self.name = IMessageAvro.query_result
@@ -37,6 +37,8 @@ class RequestByIdRecord(IMessageAvro):
     """
     Implements Avro representation of a Get Request Message
     """
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "RequestById"
 
     def __init__(self):
         self.name = None
@@ -43,6 +43,8 @@ class ReservationOrDelegationRecord(IMessageAvro):
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "callback_topic", "update_data", "reservation", "delegation", "auth",
                  "id_token", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "ReservationOrDelegation"
 
     def __init__(self):
         self.name = None
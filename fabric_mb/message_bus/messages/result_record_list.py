@@ -52,6 +52,8 @@ class ResultRecordList(IMessageAvro):
     # Use __slots__ to explicitly declare all data members.
     __slots__ = ["name", "message_id", "status", "slices", "reservations", "reservation_states", "units",
                  "proxies", "model", "actors", "delegations", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "ResultRecordList"
 
     def __init__(self):
         self.name = None
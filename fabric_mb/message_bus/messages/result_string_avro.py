@@ -40,7 +40,9 @@ class ResultStringAvro(IMessageAvro):
     Implements Avro representation of a Result Message containing String
     """
     # Use __slots__ to explicitly declare all data members.
-    __slots__ = ["name", "message_id", "result_str", "id"]
+    __slots__ = ["name", "message_id", "result_str", "status", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "ResultString"
 
     def __init__(self):
         self.name = IMessageAvro.result_string
@@ -41,7 +41,9 @@ class ResultStringsAvro(IMessageAvro):
     Implements Avro representation of a Result Message containing Strings
     """
     # Use __slots__ to explicitly declare all data members.
-    __slots__ = ["name", "message_id", "result", "callback_topic", "id"]
+    __slots__ = ["name", "message_id", "result", "callback_topic", "status", "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "ResultStrings"
 
     def __init__(self):
         self.name = IMessageAvro.result_strings
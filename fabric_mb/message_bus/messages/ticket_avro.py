@@ -39,7 +39,10 @@ class TicketAvro(IMessageAvro):
     Implements Avro representation of a ticket
     """
     # Use __slots__ to explicitly declare all data members.
-    __slots__ = ["name", "message_id", "callback_topic", "reservation", "auth", "id"]
+    __slots__ = ["name", "message_id", "callback_topic", "update_data", "reservation", "delegation", "auth", "id_token",
+                 "id"]
+    # Record in schema/message.avsc this message is encoded against
+    schema_name = "ReservationOrDelegation"
 
     def __init__(self):
         self.name = IMessageAvro.ticket
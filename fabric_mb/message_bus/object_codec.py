@@ -0,0 +1,902 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Codec writing message objects straight into the Avro binary encoding and reading them back, without building
+the intermediate dicts of to_dict() and from_dict()
+"""
+import io
+import json
+import struct
+from typing import BinaryIO, Callable, Dict, Iterable, List, Set, Tuple
+
+from fastavro import parse_schema, schemaless_writer
+
+from fabric_mb.message_bus.codec import FastAvroCodec
+from fabric_mb.message_bus.lazy_message import MIN_LAZY_SIZE, Pending, get_lazy_class
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_registry import MessageRegistry, default_registry
+from fabric_mb.message_bus.message_schemas import MessageSchemas
+from fabric_mb.message_bus.messages.actor_avro import ActorAvro
+from fabric_mb.message_bus.messages.auth_avro import AuthAvro
+from fabric_mb.message_bus.messages.broker_query_model_avro import BrokerQueryModelAvro
+from fabric_mb.message_bus.messages.delegation_avro import DelegationAvro
+from fabric_mb.message_bus.messages.lease_reservation_avro import LeaseReservationAvro
+from fabric_mb.message_bus.messages.lease_reservation_state_avro import LeaseReservationStateAvro
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.messages.proxy_avro import ProxyAvro
+from fabric_mb.message_bus.messages.reservation_avro import ReservationAvro
+from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
+from fabric_mb.message_bus.messages.reservation_predecessor_avro import ReservationPredecessorAvro
+from fabric_mb.message_bus.messages.reservation_state_avro import ReservationStateAvro
+from fabric_mb.message_bus.messages.resource_set_avro import ResourceSetAvro
+from fabric_mb.message_bus.messages.resource_ticket_avro import ResourceTicketAvro
+from fabric_mb.message_bus.messages.result_avro import ResultAvro
+from fabric_mb.message_bus.messages.slice_avro import SliceAvro
+from fabric_mb.message_bus.messages.term_avro import TermAvro
+from fabric_mb.message_bus.messages.ticket import Ticket
+from fabric_mb.message_bus.messages.ticket_reservation_avro import TicketReservationAvro
+from fabric_mb.message_bus.messages.unit_avro import UnitAvro
+from fabric_mb.message_bus.messages.update_data_avro import UpdateDataAvro
+
+Writer = Callable[[bytearray, object], None]
+Reader = Callable[[bytes, int], Tuple[object, int]]
+
+# Class of the nested records of schema/message.avsc, as created by from_dict
+RECORD_CLASSES = {
+    "ActorRecord": ActorAvro,
+    "AuthRecord": AuthAvro,
+    "BrokerQueryModelRecord": BrokerQueryModelAvro,
+    "DelegationRecord": DelegationAvro,
+    "ProxyRecord": ProxyAvro,
+    "ReservationMngRecord": ReservationMng,
+    "ReservationPredecessorMngRecord": ReservationPredecessorAvro,
+    "ReservationRecord": ReservationAvro,
+    "ReservationStateRecord": ReservationStateAvro,
+    "ResourceTicketRecord": ResourceTicketAvro,
+    "ResultRecord": ResultAvro,
+    "SliceRecord": SliceAvro,
+    "TermRecord": TermAvro,
+    "TicketRecord": Ticket,
+    "UnitRecord": UnitAvro,
+    "resource_set_record": ResourceSetAvro,
+    "update_data": UpdateDataAvro,
+}
+
+# Subclasses picked by the name field of a nested record
+NAMED_CLASSES = {
+    "ReservationMngRecord": [LeaseReservationAvro, TicketReservationAvro, ReservationMng],
+    "ReservationStateRecord": [LeaseReservationStateAvro, ReservationStateAvro],
+}
+
+# Class of the records of a field, where from_dict does not go by the record name; (record, field) -> class
+FIELD_CLASSES = {
+    ("AddReservations", "reservation_list"): TicketReservationAvro,
+}
+
+
+def write_long(buf: bytearray, value: int):
+    """
+    Write an int or long as a zig-zag encoded varint
+    """
+    value = (value << 1) ^ (value >> 63)
+    while value & ~0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def write_string(buf: bytearray, value: str):
+    """
+    Write a string as its length followed by its UTF-8 bytes
+    """
+    encoded = value.encode()
+    write_long(buf, len(encoded))
+    buf += encoded
+
+
+def write_bytes(buf: bytearray, value: bytes):
+    """
+    Write bytes as their length followed by the bytes
+    """
+    write_long(buf, len(value))
+    buf += value
+
+
+def write_boolean(buf: bytearray, value: bool):
+    """
+    Write a boolean as a single byte
+    """
+    buf.append(1 if value else 0)
+
+
+def write_null(buf: bytearray, value):
+    """
+    Nothing is written for null
+    """
+    if value is not None:
+        raise ValueError("{} is not null".format(value))
+
+
+def write_float(buf: bytearray, value: float):
+    """
+    Write a float as 4 bytes little endian
+    """
+    buf += struct.pack('<f', value)
+
+
+def write_double(buf: bytearray, value: float):
+    """
+    Write a double as 8 bytes little endian
+    """
+    buf += struct.pack('<d', value)
+
+
+PRIMITIVE_WRITERS = {
+    "null": write_null,
+    "boolean": write_boolean,
+    "int": write_long,
+    "long": write_long,
+    "float": write_float,
+    "double": write_double,
+    "bytes": write_bytes,
+    "string": write_string,
+}
+
+# Types accepted by each primitive branch of a union
+PRIMITIVE_TYPES = {
+    "boolean": (bool,),
+    "int": (int,),
+    "long": (int,),
+    "float": (float, int),
+    "double": (float, int),
+    "bytes": (bytes, bytearray),
+    "string": (str,),
+}
+
+
+class ObjectWriter:
+    """
+    Writes values against a schema; built once per schema.
+
+    Records are read from the attributes named after their fields, so that an IMessageAvro and its nested
+    objects are written without calling to_dict(). The output is the same as writing the to_dict() value:
+    - an attribute set to None is written as if to_dict() left the field out
+    - fields listed in the omit_if_empty class attribute of an object are written as null when empty, for
+      to_dict() implementations leaving out empty lists
+    - objects are validated as in to_dict() and raise MessageBusException when invalid
+    Plain dicts are accepted wherever a record is expected.
+    """
+    def __init__(self, schema):
+        """
+        :param schema: parsed fastavro schema
+        """
+        self.schema = schema
+        # full name -> record writer
+        self.records = {}
+        self.writer = self.compile(schema)
+
+    def encode(self, value) -> bytes:
+        """
+        Return the Avro binary encoding of value
+        """
+        buf = bytearray()
+        self.writer(buf, value)
+        return bytes(buf)
+
+    def compile(self, schema) -> Writer:
+        """
+        Return the writer for a schema
+        """
+        if isinstance(schema, str):
+            if schema in PRIMITIVE_WRITERS:
+                return PRIMITIVE_WRITERS[schema]
+            # Named types are defined before being referenced
+            return self.records[schema]
+        if isinstance(schema, list):
+            return self.compile_union(schema)
+        schema_type = schema['type']
+        if schema_type == 'record':
+            return self.compile_record(schema)
+        if schema_type == 'array':
+            return self.compile_array(schema)
+        if schema_type == 'map':
+            return self.compile_map(schema)
+        if schema_type == 'enum':
+            return self.compile_enum(schema)
+        if schema_type == 'fixed':
+            return self.compile_fixed(schema)
+        # Primitive with attributes e.g. logical types; written as their underlying type
+        return self.compile(schema_type)
+
+    def compile_record(self, schema: dict) -> Writer:
+        name = schema['name']
+        writer = self.records.get(name, None)
+        if writer is not None:
+            return writer
+        fields = []  # type: List[Tuple[str, Writer, object]]
+
+        def write_record(buf: bytearray, value):
+            if isinstance(value, dict):
+                for field_name, write, default in fields:
+                    write(buf, value.get(field_name, default))
+                return
+            validate = getattr(value, 'validate', None)
+            if validate is not None and not validate():
+                raise MessageBusException("Invalid arguments")
+            omit = getattr(value, 'omit_if_empty', None)
+            for field_name, write, default in fields:
+                field_value = getattr(value, field_name, None)
+                if field_value is None or (omit is not None and field_name in omit and len(field_value) == 0):
+                    field_value = default
+                write(buf, field_value)
+
+        self.records[name] = write_record
+        for field in schema['fields']:
+            fields.append((field['name'], self.compile(field['type']), field.get('default', None)))
+        return write_record
+
+    def compile_array(self, schema: dict) -> Writer:
+        write_item = self.compile(schema['items'])
+
+        def write_array(buf: bytearray, value):
+            if len(value) > 0:
+                write_long(buf, len(value))
+                for item in value:
+                    write_item(buf, item)
+            buf.append(0)
+
+        return write_array
+
+    def compile_map(self, schema: dict) -> Writer:
+        write_value = self.compile(schema['values'])
+
+        def write_map(buf: bytearray, value: dict):
+            if len(value) > 0:
+                write_long(buf, len(value))
+                for key, item in value.items():
+                    write_string(buf, key)
+                    write_value(buf, item)
+            buf.append(0)
+
+        return write_map
+
+    @staticmethod
+    def compile_enum(schema: dict) -> Writer:
+        symbols = {symbol: index for index, symbol in enumerate(schema['symbols'])}
+        return lambda buf, value: write_long(buf, symbols[value])
+
+    @staticmethod
+    def compile_fixed(schema: dict) -> Writer:
+        size = schema['size']
+
+        def write_fixed(buf: bytearray, value: bytes):
+            if len(value) != size:
+                raise ValueError("{} is not {} bytes long".format(value, size))
+            buf += value
+
+        return write_fixed
+
+    def compile_union(self, schema: list) -> Writer:
+        # Nullable type, the most common union in schema/message.avsc
+        if len(schema) == 2 and 'null' in schema:
+            null_index = schema.index('null')
+            write_other = self.compile(schema[1 - null_index])
+            null_byte = bytes([null_index * 2])
+            other_byte = bytes([(1 - null_index) * 2])
+
+            def write_nullable(buf: bytearray, value):
+                if value is None:
+                    buf += null_byte
+                else:
+                    buf += other_byte
+                    write_other(buf, value)
+
+            return write_nullable
+
+        top = schema is self.schema
+        # (index, accepted python types, writer) of the primitive branches
+        primitives = []  # type: List[Tuple[int, tuple, Writer]]
+        # record name -> (index, writer)
+        records = {}  # type: Dict[str, Tuple[int, Writer]]
+        for index, branch in enumerate(schema):
+            write = self.compile(branch)
+            if isinstance(branch, dict) and branch['type'] == 'record':
+                records[branch['name'].split('.')[-1]] = (index, write)
+            elif isinstance(branch, str) and branch in self.records:
+                records[branch.split('.')[-1]] = (index, write)
+            elif branch == 'null':
+                primitives.append((index, (type(None),), write))
+            elif isinstance(branch, str) and branch in PRIMITIVE_TYPES:
+                primitives.append((index, PRIMITIVE_TYPES[branch], write))
+
+        def write_union(buf: bytearray, value):
+            get_schema_name = getattr(value, 'get_schema_name', None)
+            if get_schema_name is not None:
+                # Objects name their record
+                entry = records.get(get_schema_name(), None)
+                if entry is None:
+                    raise ValueError("{} does not match the union".format(get_schema_name()))
+                write_long(buf, entry[0])
+                entry[1](buf, value)
+                return
+            for index, types, write in primitives:
+                if isinstance(value, types) and (bool in types or not isinstance(value, bool)):
+                    write_long(buf, index)
+                    write(buf, value)
+                    return
+            if not top:
+                raise ValueError("{} does not match a primitive branch of the union".format(value))
+            # Dicts; leave the choice of branch to fastavro
+            out = io.BytesIO()
+            schemaless_writer(out, self.schema, value)
+            buf += out.getvalue()
+
+        return write_union
+
+
+def read_long(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    Read a zig-zag encoded varint
+    """
+    b = data[pos]
+    if b < 0x80:
+        return (b >> 1) ^ -(b & 1), pos + 1
+    pos += 1
+    n = b & 0x7F
+    shift = 7
+    while b & 0x80:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        shift += 7
+    return (n >> 1) ^ -(n & 1), pos
+
+
+def read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    """
+    Read a string
+    """
+    size = data[pos]
+    if size < 0x80:
+        pos += 1
+        size >>= 1
+    else:
+        size, pos = read_long(data, pos)
+    end = pos + size
+    return data[pos:end].decode(), end
+
+
+def read_bytes(data: bytes, pos: int) -> Tuple[bytes, int]:
+    """
+    Read bytes
+    """
+    size, pos = read_long(data, pos)
+    end = pos + size
+    return data[pos:end], end
+
+
+def read_boolean(data: bytes, pos: int) -> Tuple[bool, int]:
+    """
+    Read a boolean
+    """
+    return data[pos] == 1, pos + 1
+
+
+def read_null(data: bytes, pos: int) -> Tuple[None, int]:
+    """
+    Nothing is read for null
+    """
+    return None, pos
+
+
+def read_float(data: bytes, pos: int) -> Tuple[float, int]:
+    """
+    Read a float
+    """
+    return struct.unpack_from('<f', data, pos)[0], pos + 4
+
+
+def read_double(data: bytes, pos: int) -> Tuple[float, int]:
+    """
+    Read a double
+    """
+    return struct.unpack_from('<d', data, pos)[0], pos + 8
+
+
+PRIMITIVE_READERS = {
+    "null": read_null,
+    "boolean": read_boolean,
+    "int": read_long,
+    "long": read_long,
+    "float": read_float,
+    "double": read_double,
+    "bytes": read_bytes,
+    "string": read_string,
+}
+
+
+def skip_long(data: bytes, pos: int) -> int:
+    """
+    Skip a varint
+    """
+    while data[pos] & 0x80:
+        pos += 1
+    return pos + 1
+
+
+def skip_string(data: bytes, pos: int) -> int:
+    """
+    Skip a string or bytes
+    """
+    size = data[pos]
+    if size < 0x80:
+        return pos + 1 + (size >> 1)
+    size, pos = read_long(data, pos)
+    return pos + size
+
+
+SKIPPERS = {
+    "null": lambda data, pos: pos,
+    "boolean": lambda data, pos: pos + 1,
+    "int": skip_long,
+    "long": skip_long,
+    "float": lambda data, pos: pos + 4,
+    "double": lambda data, pos: pos + 8,
+    "bytes": skip_string,
+    "string": skip_string,
+}
+
+
+class ObjectReader:
+    """
+    Reads values written against a schema; built once per schema.
+
+    Records are read into objects of the classes from_dict creates, setting the attribute named after each
+    field: messages are created by the registry from their name, nested records as listed in RECORD_CLASSES,
+    NAMED_CLASSES and FIELD_CLASSES. Records of other schemas are read into dicts.
+
+    Lazy fields are skipped and only read on first access, by a subclass of the message class (get_lazy_class).
+    Fields left out of a projection are skipped and never read; their attributes keep the class defaults.
+    """
+    def __init__(self, schema, registry: MessageRegistry, lazy_fields: Iterable[str] = None,
+                 projection: Dict[str, Set[str]] = None):
+        """
+        :param schema: parsed fastavro schema
+        :param registry: registry creating the messages
+        :param lazy_fields: names of the fields of messages and nested objects read on first access
+        :param projection: fields read per record full name; records not listed are read whole
+        """
+        self.registry = registry
+        self.lazy_fields = frozenset(lazy_fields) if lazy_fields is not None else frozenset()
+        self.projection = projection if projection is not None else {}
+        # full name -> definition of the named types
+        self.definitions = {}
+        # (full name, class) -> record reader
+        self.records = {}
+        self.reader = self.compile(schema)
+
+    def decode(self, data: bytes):
+        """
+        Return the value read from the Avro binary encoding
+        """
+        return self.reader(data, 0)[0]
+
+    def compile(self, schema, record_class: type = None) -> Reader:
+        """
+        Return the reader for a schema
+        :param schema: schema
+        :param record_class: class of the records read, overriding the default one
+        """
+        if isinstance(schema, str):
+            if schema in PRIMITIVE_READERS:
+                return PRIMITIVE_READERS[schema]
+            return self.compile_record(self.definitions[schema], record_class)
+        if isinstance(schema, list):
+            return self.compile_union(schema, record_class)
+        schema_type = schema['type']
+        if schema_type == 'record':
+            return self.compile_record(schema, record_class)
+        if schema_type == 'array':
+            return self.compile_array(schema, record_class)
+        if schema_type == 'map':
+            return self.compile_map(schema, record_class)
+        if schema_type == 'enum':
+            return self.compile_enum(schema)
+        if schema_type == 'fixed':
+            return self.compile_fixed(schema)
+        return self.compile(schema_type)
+
+    def get_factory(self, schema: dict, record_class: type = None,
+                    lazy_names: List[str] = None) -> Tuple[type, Callable[[list], object]]:
+        """
+        Return the class of a record, or else the function creating its object from the field values; both are
+        None when the record is read into a dict
+        :param schema: record schema
+        :param record_class: class of the record, overriding the default one
+        :param lazy_names: fields of the record read lazily
+        """
+        name = schema['name'].split('.')[-1]
+        field_names = [field['name'] for field in schema['fields']]
+        if record_class is None:
+            record_class = RECORD_CLASSES.get(name, None)
+
+        def lazy(cls: type) -> type:
+            return get_lazy_class(cls, lazy_names) if lazy_names else cls
+
+        if 'name' in field_names:
+            name_index = field_names.index('name')
+            if record_class is None and 'message_id' in field_names:
+                registry = self.registry
+                return None, lambda values: self.make_lazy(registry.create(values[name_index]), lazy_names, values)
+            if record_class is not None and name in NAMED_CLASSES:
+                classes = {c.__name__: lazy(c) for c in NAMED_CLASSES[name]}
+                default = lazy(record_class)
+                return None, lambda values: classes.get(values[name_index], default)()
+        return (None if record_class is None else lazy(record_class)), None
+
+    @staticmethod
+    def make_lazy(message, lazy_names: List[str], values: list):
+        """
+        Switch a message created by the registry to its lazy subclass; pending values are read right away when
+        the class cannot be switched
+        """
+        if not lazy_names or not any(type(value) is Pending for value in values):
+            return message
+        try:
+            message.__class__ = get_lazy_class(type(message), lazy_names)
+        except TypeError:
+            for index, value in enumerate(values):
+                if type(value) is Pending:
+                    values[index] = value.load()
+        return message
+
+    def is_object(self, schema: dict, record_class: type = None) -> bool:
+        """
+        Return True if a record is read into an object rather than a dict
+        """
+        name = schema['name'].split('.')[-1]
+        field_names = [field['name'] for field in schema['fields']]
+        return record_class is not None or name in RECORD_CLASSES or \
+            ('name' in field_names and 'message_id' in field_names)
+
+    def compile_record(self, schema: dict, record_class: type = None) -> Reader:
+        full_name = schema['name']
+        self.definitions[full_name] = schema
+        key = (full_name, record_class)
+        reader = self.records.get(key, None)
+        if reader is not None:
+            return reader
+        name = full_name.split('.')[-1]
+        kept = self.projection.get(full_name, None)
+        # Fields left out of the projection are named None and skipped
+        names = [field['name'] if kept is None or field['name'] in kept else None for field in schema['fields']]
+        lazy_names = []
+        if self.is_object(schema, record_class):
+            lazy_names = [field['name'] for field, field_name in zip(schema['fields'], names)
+                          if field_name in self.lazy_fields and self.is_deferrable(field['type'])]
+        fields = []  # type: List[Tuple[str, Reader]]
+        record_class, factory = self.get_factory(schema, record_class, lazy_names)
+        # Fields to_dict leaves out when empty keep their empty default
+        omit = getattr(record_class, 'omit_if_empty', ())
+
+        def read_object(data: bytes, pos: int):
+            result = record_class()
+            for field_name, read in fields:
+                value, pos = read(data, pos)
+                if field_name is None or (value is None and field_name in omit):
+                    continue
+                setattr(result, field_name, value)
+            return result, pos
+
+        def read_record(data: bytes, pos: int):
+            values = []
+            for field_name, read in fields:
+                value, pos = read(data, pos)
+                values.append(value)
+            if factory is None:
+                if skipped:
+                    return {n: v for n, v in zip(names, values) if n is not None}, pos
+                return dict(zip(names, values)), pos
+            result = factory(values)
+            result_omit = getattr(result, 'omit_if_empty', ())
+            for field_name, value in zip(names, values):
+                if field_name is None or (value is None and field_name in result_omit):
+                    continue
+                setattr(result, field_name, value)
+            return result, pos
+
+        skipped = None in names
+        reader = read_object if record_class is not None else read_record
+        self.records[key] = reader
+        for field, field_name in zip(schema['fields'], names):
+            if field_name is None:
+                skip = self.compile_skip(field['type'])
+                fields.append((None, lambda data, pos, skip=skip: (None, skip(data, pos))))
+                continue
+            read = self.compile(field['type'], FIELD_CLASSES.get((name, field_name), None))
+            if field_name in lazy_names:
+                read = self.compile_lazy(field['type'], read)
+            fields.append((field_name, read))
+        return reader
+
+    def is_deferrable(self, schema) -> bool:
+        """
+        Return True if values of a schema may be worth reading lazily, i.e. are not numbers, booleans or nulls
+        """
+        if isinstance(schema, list):
+            return any(self.is_deferrable(branch) for branch in schema)
+        if isinstance(schema, dict):
+            return schema['type'] in ('record', 'array', 'map', 'fixed') or self.is_deferrable(schema['type'])
+        return schema in ('string', 'bytes') or schema not in PRIMITIVE_READERS
+
+    def compile_lazy(self, schema, read: Reader) -> Reader:
+        """
+        Return a reader leaving values of a schema pending, except for values encoded in less than MIN_LAZY_SIZE
+        bytes, which are cheaper to read right away
+        """
+        skip = self.compile_skip(schema)
+
+        def read_lazy(data: bytes, pos: int):
+            end = skip(data, pos)
+            if end - pos < MIN_LAZY_SIZE:
+                return read(data, pos)
+            return Pending(read, data, pos), end
+
+        return read_lazy
+
+    def compile_skip(self, schema) -> Callable[[bytes, int], int]:
+        """
+        Return a function returning the position after a value of a schema, without reading it
+        """
+        if isinstance(schema, str):
+            if schema in SKIPPERS:
+                return SKIPPERS[schema]
+            return self.compile_skip(self.definitions[schema])
+        if isinstance(schema, list):
+            skippers = [self.compile_skip(branch) for branch in schema]
+            if len(schema) == 2 and schema[0] == 'null':
+                skip_other = skippers[1]
+                return lambda data, pos: pos + 1 if data[pos] == 0 else skip_other(data, pos + 1)
+
+            def skip_union(data: bytes, pos: int) -> int:
+                index, pos = read_long(data, pos)
+                return skippers[index](data, pos)
+
+            return skip_union
+        schema_type = schema['type']
+        if schema_type == 'record':
+            self.definitions[schema['name']] = schema
+            skippers = [self.compile_skip(field['type']) for field in schema['fields']]
+
+            def skip_record(data: bytes, pos: int) -> int:
+                for skip in skippers:
+                    pos = skip(data, pos)
+                return pos
+
+            return skip_record
+        if schema_type in ('array', 'map'):
+            skip_item = self.compile_skip(schema['items'] if schema_type == 'array' else schema['values'])
+            is_map = schema_type == 'map'
+
+            def skip_block(data: bytes, pos: int) -> int:
+                count, pos = read_long(data, pos)
+                while count != 0:
+                    if count < 0:
+                        # Blocks carrying their size in bytes are skipped at once
+                        size, pos = read_long(data, pos)
+                        pos += size
+                    else:
+                        for i in range(count):
+                            if is_map:
+                                pos = skip_string(data, pos)
+                            pos = skip_item(data, pos)
+                    count, pos = read_long(data, pos)
+                return pos
+
+            return skip_block
+        if schema_type == 'enum':
+            return skip_long
+        if schema_type == 'fixed':
+            size = schema['size']
+            return lambda data, pos: pos + size
+        return self.compile_skip(schema_type)
+
+    def compile_array(self, schema: dict, record_class: type = None) -> Reader:
+        read_item = self.compile(schema['items'], record_class)
+
+        def read_array(data: bytes, pos: int):
+            result = []
+            count, pos = read_long(data, pos)
+            while count != 0:
+                if count < 0:
+                    count = -count
+                    # Block size in bytes
+                    size, pos = read_long(data, pos)
+                for i in range(count):
+                    item, pos = read_item(data, pos)
+                    result.append(item)
+                count, pos = read_long(data, pos)
+            return result, pos
+
+        return read_array
+
+    def compile_map(self, schema: dict, record_class: type = None) -> Reader:
+        read_value = self.compile(schema['values'], record_class)
+
+        def read_map(data: bytes, pos: int):
+            result = {}
+            count, pos = read_long(data, pos)
+            while count != 0:
+                if count < 0:
+                    count = -count
+                    size, pos = read_long(data, pos)
+                for i in range(count):
+                    key, pos = read_string(data, pos)
+                    result[key], pos = read_value(data, pos)
+                count, pos = read_long(data, pos)
+            return result, pos
+
+        return read_map
+
+    @staticmethod
+    def compile_enum(schema: dict) -> Reader:
+        symbols = schema['symbols']
+
+        def read_enum(data: bytes, pos: int):
+            index, pos = read_long(data, pos)
+            return symbols[index], pos
+
+        return read_enum
+
+    @staticmethod
+    def compile_fixed(schema: dict) -> Reader:
+        size = schema['size']
+        return lambda data, pos: (data[pos:pos + size], pos + size)
+
+    def compile_union(self, schema: list, record_class: type = None) -> Reader:
+        readers = [self.compile(branch, record_class) for branch in schema]
+        if len(schema) == 2 and schema[0] == 'null':
+            read_other = readers[1]
+
+            def read_nullable(data: bytes, pos: int):
+                if data[pos] == 0:
+                    return None, pos + 1
+                return read_other(data, pos + 1)
+
+            return read_nullable
+
+        def read_union(data: bytes, pos: int):
+            index = data[pos]
+            if index < 0x80:
+                # Single byte index, i.e. any union of less than 64 branches
+                return readers[index >> 1](data, pos + 1)
+            index, pos = read_long(data, pos)
+            return readers[index](data, pos)
+
+        return read_union
+
+
+class ObjectCodec(FastAvroCodec):
+    """
+    Codec encoding IMessageAvro objects directly into the Avro binary encoding, skipping to_dict(), and decoding
+    them back without from_dict(). Produces the same bytes as FastAvroCodec; decoded values are message objects,
+    which AvroConsumerApi.create_message passes through. With lazy_fields, the envelope of a message is read
+    right away and the listed fields when first accessed.
+    """
+    name = "object"
+
+    def __init__(self, registry: MessageRegistry = None, lazy_fields: Iterable[str] = None):
+        """
+        :param registry: registry creating the decoded messages; AvroConsumerApi sets its own when None
+        :param lazy_fields: names of the fields read on first access, e.g. LAZY_FIELDS; None reads all fields
+        """
+        super().__init__()
+        self.registry = registry
+        self.lazy_fields = lazy_fields
+        # schema JSON -> object writer
+        self.writers = {}
+
+    def get_writer(self, schema) -> ObjectWriter:
+        """
+        Return the object writer for a loaded AVRO schema
+        """
+        key = str(schema)
+        with self.lock:
+            writer = self.writers.get(key, None)
+        if writer is None:
+            writer = ObjectWriter(self.parse(schema))
+            with self.lock:
+                self.writers[key] = writer
+        return writer
+
+    def get_encoder(self, writer_schema) -> Callable[[object, BinaryIO], None]:
+        writer = self.get_writer(writer_schema)
+        return lambda value, fp: fp.write(writer.encode(value))
+
+    def get_decoder(self, writer_schema, reader_schema=None) -> Callable[[BinaryIO], object]:
+        registry = self.registry if self.registry is not None else default_registry
+        projection = {} if reader_schema is None else self.get_projection(writer_schema, reader_schema)
+        if projection is not None:
+            reader = ObjectReader(self.parse(writer_schema), registry, lazy_fields=self.lazy_fields,
+                                  projection=projection)
+            return lambda fp: reader.decode(fp.read())
+
+        # Resolve against the reader schema into a dict, then create the message as from_dict does
+        decode = super().get_decoder(writer_schema, reader_schema)
+
+        def decode_message(fp: BinaryIO):
+            value = decode(fp)
+            message = registry.create(value.get('name', None))
+            message.from_dict(value)
+            return message
+
+        return decode_message
+
+    def prepare(self, record: IMessageAvro, writer_schema) -> object:
+        return record
+
+    def get_projection(self, writer_schema, reader_schema) -> Dict[str, Set[str]]:
+        """
+        Return the fields per record the reader schema keeps when it is a projection of the writer schema, as
+        built by MessageSchemas.get_projected_schema, so that the object reader skips the other fields
+        :return {} when both schemas match, None when the reader schema needs Avro schema resolution
+        """
+        if self.is_projection(writer_schema, reader_schema):
+            return {}
+        writer = MessageSchemas(schema_str=str(writer_schema))
+        reader = MessageSchemas(schema_str=str(reader_schema))
+        projection = {}
+        for full_name, (definition, namespace) in reader.definitions.items():
+            if 'fields' in definition and full_name in writer.definitions:
+                projection[full_name] = {field['name'] for field in definition['fields']}
+        try:
+            projected = writer.get_projected_json(projection)
+        except MessageBusException:
+            return None
+        if not self.is_projection(json.dumps(projected), reader_schema):
+            return None
+        return projection
+
+    @staticmethod
+    def is_projection(writer_schema, reader_schema) -> bool:
+        """
+        Return True if resolving the writer schema against the reader schema reads the writer schema as is,
+        i.e. both are the same or the writer schema is a branch of the reader union
+        """
+        writer = str(writer_schema)
+        reader = str(reader_schema)
+        if writer == reader:
+            return True
+        reader_json = json.loads(reader)
+        if not isinstance(reader_json, list):
+            return False
+        expanded = parse_schema(json.loads(writer), expand=True)
+        if isinstance(expanded, dict):
+            # Leave out the fastavro bookkeeping of a parsed schema
+            expanded = {k: v for k, v in expanded.items() if not k.startswith('__')}
+        expanded = json.dumps(expanded, sort_keys=True)
+        branches = parse_schema(reader_json, expand=True)
+        return any(json.dumps(branch, sort_keys=True) == expanded for branch in branches)
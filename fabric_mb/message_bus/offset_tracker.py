@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Tracks out of order completion of consumed messages to compute safe commit offsets, and commits them
+asynchronously
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+from confluent_kafka import KafkaError, KafkaException, TopicPartition
+
+from fabric_mb.message_bus.base import Base
+
+
+class PartitionOffsets:
+    """
+    Offsets of a single partition. Messages are added in the order they are consumed and may complete in any order.
+    The watermark is the offset after the last message of the contiguous completed prefix; every message below it
+    has been fully processed. The generation tells assignments of the partition apart.
+    """
+    __slots__ = ["pending", "completed", "watermark", "committed", "generation"]
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.pending = deque()
+        self.completed = set()
+        self.watermark = None
+        self.committed = None
+
+    def add(self, offset: int):
+        self.pending.append(offset)
+
+    def complete(self, offset: int):
+        self.completed.add(offset)
+        while len(self.pending) > 0 and self.pending[0] in self.completed:
+            done = self.pending.popleft()
+            self.completed.discard(done)
+            self.watermark = done + 1
+
+    def in_flight(self) -> int:
+        return len(self.pending) - len(self.completed)
+
+
+class OffsetTracker:
+    """
+    Tracks consumed offsets per (topic, partition) and computes the offsets that can be committed without skipping
+    a message that is still being processed. A partition tracked again after remove, e.g. revoked and assigned
+    back, starts a new generation; completions of messages added in an earlier generation are ignored.
+    """
+    def __init__(self):
+        self.partitions = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def add(self, topic: str, partition: int, offset: int) -> int:
+        """
+        Record a consumed message
+        :param topic: topic
+        :param partition: partition
+        :param offset: offset
+        :return generation of the partition, to pass to complete
+        """
+        with self.lock:
+            offsets = self.partitions.get((topic, partition))
+            if offsets is None:
+                self.generation += 1
+                offsets = PartitionOffsets(self.generation)
+                self.partitions[(topic, partition)] = offsets
+            offsets.add(offset)
+            return offsets.generation
+
+    def complete(self, topic: str, partition: int, offset: int, generation: int = None):
+        """
+        Record that a message has been processed; completions for partitions no longer tracked, or tracked again
+        since the message was added, are ignored
+        :param topic: topic
+        :param partition: partition
+        :param offset: offset
+        :param generation: generation returned by add; None accepts any generation
+        """
+        with self.lock:
+            offsets = self.partitions.get((topic, partition))
+            if offsets is not None and (generation is None or generation == offsets.generation):
+                offsets.complete(offset)
+
+    def in_flight(self, topic: str = None, partition: int = None) -> int:
+        """
+        Return the number of messages added but not completed, for one partition or in total
+        """
+        with self.lock:
+            if topic is not None:
+                offsets = self.partitions.get((topic, partition))
+                return offsets.in_flight() if offsets is not None else 0
+            return sum(o.in_flight() for o in self.partitions.values())
+
+    def get_in_flight(self) -> Dict[Tuple[str, int], int]:
+        """
+        Return the number of messages added but not completed per (topic, partition)
+        """
+        with self.lock:
+            return {tp: offsets.in_flight() for tp, offsets in self.partitions.items()}
+
+    def get_commit_offsets(self) -> List[TopicPartition]:
+        """
+        Return the offsets to commit for partitions whose watermark advanced since the last call; the returned
+        offsets are considered committed
+        :return list of TopicPartition carrying the offset of the next message to consume
+        """
+        result = []
+        with self.lock:
+            for (topic, partition), offsets in self.partitions.items():
+                if offsets.watermark is not None and offsets.watermark != offsets.committed:
+                    offsets.committed = offsets.watermark
+                    result.append(TopicPartition(topic, partition, offsets.watermark))
+        return result
+
+    def reset_committed(self, partitions: List[TopicPartition]):
+        """
+        Consider offsets returned by get_commit_offsets as not committed, e.g. once their commit failed, so that
+        the next call returns them again unless the watermark advanced meanwhile
+        :param partitions: offsets whose commit failed
+        """
+        with self.lock:
+            for tp in partitions:
+                offsets = self.partitions.get((tp.topic, tp.partition))
+                if offsets is not None and offsets.committed == tp.offset:
+                    offsets.committed = None
+
+    def remove(self, partitions: List[TopicPartition]):
+        """
+        Stop tracking partitions e.g. on revocation
+        :param partitions: partitions
+        """
+        with self.lock:
+            for tp in partitions:
+                self.partitions.pop((tp.topic, tp.partition), None)
+
+
+class OffsetCommitter(Base):
+    """
+    Commits the offsets of an OffsetTracker asynchronously. Completions are coalesced: a commit is issued once
+    commit_count messages completed, or commit_interval seconds elapsed since the last commit, and carries the
+    watermark of each partition that advanced. The watermark never passes a message still being processed.
+    Offsets whose asynchronous commit failed are committed again with the next commit; pass on_commit to the
+    consumer's on_commit callback to be told about failures.
+    """
+    def __init__(self, consumer, tracker: OffsetTracker = None, commit_interval: float = 1.0,
+                 commit_count: int = 100, logger=None):
+        """
+        :param consumer: confluent_kafka consumer the offsets are committed with
+        :param tracker: offset tracker; defaults to a new tracker
+        :param commit_interval: maximum time in seconds between a completion and the commit of its offset
+        :param commit_count: number of completions triggering a commit before commit_interval elapsed
+        :param logger: logger
+        """
+        super().__init__(logger)
+        self.consumer = consumer
+        self.tracker = tracker if tracker is not None else OffsetTracker()
+        self.commit_interval = commit_interval
+        self.commit_count = commit_count
+        self.completed = 0
+        self.last_commit = time.monotonic()
+        self.commits = 0
+        self.failed_commits = 0
+        self.lock = threading.Lock()
+
+    def add(self, topic: str, partition: int, offset: int) -> int:
+        """
+        Record a consumed message, see OffsetTracker.add
+        :return generation of the partition, to pass to complete
+        """
+        return self.tracker.add(topic, partition, offset)
+
+    def complete(self, topic: str, partition: int, offset: int, generation: int = None):
+        """
+        Record that a message has been processed, see OffsetTracker.complete; may be called from any thread
+        """
+        self.tracker.complete(topic, partition, offset, generation)
+        with self.lock:
+            self.completed += 1
+
+    def maybe_commit(self) -> bool:
+        """
+        Commit asynchronously if commit_count messages completed or commit_interval elapsed since the last commit.
+        Called from the thread polling the consumer
+        :return True if a commit was issued
+        """
+        with self.lock:
+            if self.completed == 0 or (self.completed < self.commit_count and
+                                       time.monotonic() - self.last_commit < self.commit_interval):
+                return False
+        return self.commit()
+
+    def commit(self, asynchronous: bool = True) -> bool:
+        """
+        Commit the offsets up to which all messages have been processed
+        :param asynchronous: False to wait for the commit, e.g. before partitions are revoked or on shutdown
+        :return True if a commit was issued
+        """
+        with self.lock:
+            self.completed = 0
+            self.last_commit = time.monotonic()
+        offsets = self.tracker.get_commit_offsets()
+        if len(offsets) == 0:
+            return False
+        try:
+            self.consumer.commit(offsets=offsets, asynchronous=asynchronous)
+        except KafkaException as e:
+            self.log_error("Failed to commit offsets {}: {}".format(offsets, e))
+            self.tracker.reset_committed(offsets)
+            with self.lock:
+                self.failed_commits += 1
+            return False
+        with self.lock:
+            self.commits += 1
+        return True
+
+    def on_commit(self, err: KafkaError, partitions: List[TopicPartition]):
+        """
+        Handle the result of a commit, as reported to the on_commit callback of the consumer
+        :param err: error, None if the commit succeeded
+        :param partitions: committed partitions, each carrying its own error if any
+        """
+        if err is not None and err.code() == KafkaError._NO_OFFSET:
+            return
+        failed = [tp for tp in partitions if err is not None or tp.error is not None]
+        if len(failed) > 0:
+            self.log_error("Failed to commit offsets {}: {}".format(failed, err))
+            self.tracker.reset_committed(failed)
+            with self.lock:
+                self.failed_commits += 1
+
+    def remove(self, partitions: List[TopicPartition]):
+        """
+        Commit synchronously, then stop tracking partitions, e.g. on revocation
+        :param partitions: partitions
+        """
+        self.commit(asynchronous=False)
+        self.tracker.remove(partitions)
+
+    def get_metrics(self) -> dict:
+        """
+        Return the number of commits issued (commits), of commits that failed (failed_commits) and of messages in
+        flight (in_flight)
+        """
+        with self.lock:
+            return {"commits": self.commits, "failed_commits": self.failed_commits,
+                    "in_flight": self.tracker.in_flight()}
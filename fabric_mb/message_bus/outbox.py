@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Durable outbox of encoded records, spooled to disk while Kafka is unavailable and replayed in order once it is back
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Dict, List, Tuple
+
+from fabric_mb.message_bus.backpressure import EncodedRecord
+
+# Length of the payload and its CRC32
+RECORD_HEADER = struct.Struct('>II')
+# Segment and position of the oldest record not yet delivered
+HEAD = struct.Struct('>QQ')
+SEGMENT_SUFFIX = ".seg"
+HEAD_FILE = "head"
+
+
+def encode_record(record: EncodedRecord) -> bytes:
+    """
+    Return the payload of a record in a segment
+    """
+    topic, key, value, headers = record
+    parts = [struct.pack('>H', len(topic.encode('utf-8'))), topic.encode('utf-8')]
+    for data in (key, value):
+        if data is None:
+            parts.append(struct.pack('>i', -1))
+        else:
+            parts.append(struct.pack('>i', len(data)))
+            parts.append(data)
+    headers = headers or []
+    parts.append(struct.pack('>H', len(headers)))
+    for name, data in headers:
+        name = name.encode('utf-8')
+        parts.append(struct.pack('>H', len(name)))
+        parts.append(name)
+        parts.append(struct.pack('>i', len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def decode_record(payload: bytes) -> EncodedRecord:
+    """
+    Return the record stored in a payload
+    """
+    pos = 0
+
+    def read(size: int) -> bytes:
+        nonlocal pos
+        pos += size
+        return payload[pos - size:pos]
+
+    topic = read(struct.unpack('>H', read(2))[0]).decode('utf-8')
+    key_value = []
+    for i in range(2):
+        size = struct.unpack('>i', read(4))[0]
+        key_value.append(None if size < 0 else read(size))
+    headers = []
+    for i in range(struct.unpack('>H', read(2))[0]):
+        name = read(struct.unpack('>H', read(2))[0]).decode('utf-8')
+        headers.append((name, read(struct.unpack('>i', read(4))[0])))
+    return topic, key_value[0], key_value[1], headers if len(headers) > 0 else None
+
+
+class Segment:
+    """
+    Memory mapped segment file; records are appended one after the other, each preceded by its length and CRC.
+    The file is preallocated so that the unused tail reads as zeros
+    """
+    def __init__(self, path: str, size: int):
+        self.path = path
+        exists = os.path.exists(path)
+        self.file = open(path, 'r+b' if exists else 'w+b')
+        if not exists or os.path.getsize(path) < size:
+            self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.end = 0
+
+    def scan(self, position: int) -> List[Tuple[int, int]]:
+        """
+        Return the position and size of the valid records from position, and set the end of the segment after
+        the last one. A record torn by a crash, i.e. not matching its CRC, ends the segment
+        """
+        result = []
+        while position + RECORD_HEADER.size <= len(self.map):
+            length, crc = RECORD_HEADER.unpack_from(self.map, position)
+            start = position + RECORD_HEADER.size
+            if length == 0 or start + length > len(self.map) or \
+                    zlib.crc32(self.map[start:start + length]) != crc:
+                break
+            result.append((position, RECORD_HEADER.size + length))
+            position = start + length
+        self.end = position
+        return result
+
+    def append(self, payload: bytes) -> int:
+        """
+        Append a payload
+        :return position of the record, or -1 if the segment is full
+        """
+        size = RECORD_HEADER.size + len(payload)
+        if self.end + size > len(self.map):
+            return -1
+        position = self.end
+        RECORD_HEADER.pack_into(self.map, position, len(payload), zlib.crc32(payload))
+        self.map[position + RECORD_HEADER.size:position + size] = payload
+        self.end = position + size
+        return position
+
+    def read(self, position: int) -> bytes:
+        length, crc = RECORD_HEADER.unpack_from(self.map, position)
+        start = position + RECORD_HEADER.size
+        return self.map[start:start + length]
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class Outbox:
+    """
+    Durable FIFO of encoded records, stored in append only memory mapped segment files under a directory.
+
+    Records are handed out in order by next and removed once acknowledged by ack; the oldest record not yet
+    acknowledged is persisted as the head, so that records survive a restart of the process and are replayed from
+    there. Records handed out but not yet delivered when the process stops are replayed as well, so a record may be
+    produced twice. rewind hands out again the records not yet acknowledged, e.g. after a failed delivery.
+
+    Writes go to the page cache and are synced to disk in batches, once sync_interval seconds or sync_bytes bytes
+    have been written since the last sync, so that a crash loses at most that much.
+    """
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024, sync_interval: float = 0.05,
+                 sync_bytes: int = 1024 * 1024):
+        """
+        :param directory: directory of the segment files; created if needed
+        :param segment_size: size of the segment files; larger records get a segment of their own
+        :param sync_interval: maximum time in seconds between syncs to disk
+        :param sync_bytes: maximum number of bytes written between syncs to disk
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_size = segment_size
+        self.sync_interval = sync_interval
+        self.sync_bytes = sync_bytes
+        self.lock = threading.RLock()
+        self.segments = {}  # type: Dict[int, Segment]
+        # (segment, position, size) of the records not yet acknowledged, oldest first
+        self.pending = deque()
+        self.acked = set()
+        # Number of pending records handed out by next
+        self.sent = 0
+        self.size = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.head = (0, 0)
+        self.head_fd = os.open(os.path.join(directory, HEAD_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        self._load()
+
+    def _path(self, index: int) -> str:
+        return os.path.join(self.directory, "{:020d}{}".format(index, SEGMENT_SUFFIX))
+
+    def _load(self):
+        data = os.pread(self.head_fd, HEAD.size, 0)
+        if len(data) == HEAD.size:
+            self.head = HEAD.unpack(data)
+        indexes = sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in os.listdir(self.directory)
+                         if name.endswith(SEGMENT_SUFFIX))
+        for index in indexes:
+            if index < self.head[0]:
+                # Fully delivered before the head was persisted
+                os.remove(self._path(index))
+                continue
+            segment = Segment(self._path(index), self.segment_size)
+            self.segments[index] = segment
+            for position, size in segment.scan(self.head[1] if index == self.head[0] else 0):
+                self.pending.append((index, position, size))
+                self.size += size
+        if len(self.segments) == 0:
+            self.segments[self.head[0]] = Segment(self._path(self.head[0]), self.segment_size)
+
+    def append(self, record: EncodedRecord):
+        """
+        Append a record
+        :param record: encoded record
+        """
+        payload = encode_record(record)
+        with self.lock:
+            index = max(self.segments)
+            position = self.segments[index].append(payload)
+            if position < 0:
+                self.segments[index].flush()
+                index += 1
+                size = max(self.segment_size, RECORD_HEADER.size + len(payload))
+                self.segments[index] = Segment(self._path(index), size)
+                position = self.segments[index].append(payload)
+            size = RECORD_HEADER.size + len(payload)
+            self.pending.append((index, position, size))
+            self.size += size
+            self.unsynced += size
+            self.sync(force=False)
+
+    def next(self) -> Tuple[Tuple[int, int], EncodedRecord]:
+        """
+        Hand out the next record
+        :return id of the record to pass to ack, and the record; None if all records have been handed out
+        """
+        with self.lock:
+            while self.sent < len(self.pending):
+                index, position, size = self.pending[self.sent]
+                self.sent += 1
+                if (index, position) not in self.acked:
+                    return (index, position), decode_record(self.segments[index].read(position))
+            return None
+
+    def cancel(self):
+        """
+        Take back the last record handed out by next, e.g. when it could not be produced
+        """
+        with self.lock:
+            self.sent = max(0, self.sent - 1)
+
+    def rewind(self):
+        """
+        Hand out again, from the oldest one, the records not yet acknowledged
+        """
+        with self.lock:
+            self.sent = 0
+
+    def ack(self, record_id: Tuple[int, int]):
+        """
+        Acknowledge the delivery of a record; the head moves past the records acknowledged in a row
+        :param record_id: id returned by next
+        """
+        with self.lock:
+            self.acked.add(record_id)
+            while len(self.pending) > 0 and self.pending[0][:2] in self.acked:
+                index, position, size = self.pending.popleft()
+                self.acked.discard((index, position))
+                self.sent = max(0, self.sent - 1)
+                self.size -= size
+            if len(self.pending) > 0:
+                head = self.pending[0][:2]
+            else:
+                index = max(self.segments)
+                head = (index, self.segments[index].end)
+            if head != self.head:
+                self.head = head
+                # Segments before the head are fully delivered
+                for index in [i for i in self.segments if i < head[0]]:
+                    self.segments.pop(index).close()
+                    os.remove(self._path(index))
+                self.unsynced += HEAD.size
+                self.sync(force=False)
+
+    def sync(self, force: bool = True):
+        """
+        Sync the records and the head to disk
+        :param force: sync even if less than sync_bytes were written within sync_interval
+        """
+        with self.lock:
+            if self.unsynced == 0 or (not force and self.unsynced < self.sync_bytes and
+                                      time.monotonic() - self.last_sync < self.sync_interval):
+                return
+            for segment in self.segments.values():
+                segment.flush()
+            os.pwrite(self.head_fd, HEAD.pack(*self.head), 0)
+            os.fsync(self.head_fd)
+            self.unsynced = 0
+            self.last_sync = time.monotonic()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def close(self):
+        """
+        Sync and close the segment files
+        """
+        with self.lock:
+            if self.head_fd is None:
+                return
+            self.sync()
+            for segment in self.segments.values():
+                segment.close()
+            self.segments.clear()
+            os.close(self.head_fd)
+            self.head_fd = None
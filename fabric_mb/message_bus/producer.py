@@ -26,23 +26,47 @@
 """
 Defines AvroProducer API class which exposes interface for various producer functions
 """
+import struct
+import threading
+import time
 import traceback
+from contextlib import contextmanager
+from concurrent.futures import Future, wait
+from typing import Callable, Dict, Iterable, List, Tuple, Union
 
+from confluent_kafka import KafkaError, KafkaException, Producer
 from confluent_kafka.avro import AvroProducer
 
 from fabric_mb.message_bus.admin import AdminApi
+from fabric_mb.message_bus.backpressure import BLOCK, DROP, FAIL, OVERFLOW, POLICIES, OverflowBuffer, \
+    ProducerMetrics
 from fabric_mb.message_bus.base import Base
+from fabric_mb.message_bus.codec import AvroCodec, install_codec
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_headers import build_headers
+from fabric_mb.message_bus.message_keys import KeyFunction, default_ordering_key, get_key_function
+from fabric_mb.message_bus.message_schemas import MessageSchemas
 from fabric_mb.message_bus.messages.query_avro import QueryAvro
+from fabric_mb.message_bus.outbox import Outbox
 from fabric_mb.message_bus.messages.query_result_avro import QueryResultAvro
 from fabric_mb.message_bus.messages.message import IMessageAvro
 
+# Errors due to Kafka being unavailable, on top of the ones flagged retriable
+OUTAGE_ERRORS = {KafkaError._ALL_BROKERS_DOWN, KafkaError._TRANSPORT, KafkaError._MSG_TIMED_OUT,
+                 KafkaError._TIMED_OUT}
+
 
 class AvroProducerApi(Base):
     """
         This class implements the Interface for Kafka producer carrying Avro messages.
         It is expected that the users would extend this class and override on_delivery function.
     """
-    def __init__(self, conf, key_schema, record_schema, logger=None):
+    def __init__(self, conf, key_schema, record_schema, logger=None, value_schemas: MessageSchemas = None,
+                 max_in_flight: int = 1000, codec: AvroCodec = None, stamp_headers: bool = True,
+                 partition_key: Union[str, KeyFunction] = default_ordering_key, poll_interval: float = None,
+                 on_queue_full: str = BLOCK, queue_full_timeout: float = 10.0, max_buffer_bytes: int = None,
+                 overflow: OverflowBuffer = None, outbox: Outbox = None, idempotent: bool = True,
+                 transactional_id: str = None, transaction_timeout: float = 30.0):
         """
             Initialize the Producer API
             :param conf: configuration e.g:
@@ -50,9 +74,100 @@ class AvroProducerApi(Base):
                         'schema.registry.url': http://localhost:8083}
             :param key_schema: loaded AVRO schema for the key
             :param record_schema: loaded AVRO schema for the value
+            :param value_schemas: per message type schemas; when set, each record is encoded against the record
+                                  schema it is bound to instead of record_schema. Messages not bound to a record
+                                  fall back to record_schema
+            :param max_in_flight: maximum number of records sent via send/produce_sync awaiting a delivery report
+            :param codec: codec used to encode records, e.g. FastAvroCodec; None keeps the confluent_kafka.avro
+                          encoder
+            :param stamp_headers: add Kafka headers carrying the message name, schema id, message id and produce
+                                  time (see message_headers) so that consumers can filter without decoding
+            :param partition_key: key records are partitioned by, so that records with the same key keep their
+                                  order: a name in message_keys.KEY_FUNCTIONS e.g. "slice_id", or a callable.
+                                  Defaults to the reservation id, else the delegation id, else the slice id.
+                                  Records without a key are keyed by their delivery tracking id (get_id) and
+                                  spread across partitions; None keys every record that way
+            :param poll_interval: when set, a background thread serves delivery reports continuously, blocking at
+                                  most poll_interval seconds per poll; see start_poller
+            :param on_queue_full: what produce_async does when the local producer queue is full, see backpressure:
+                                  BLOCK serves delivery reports and retries for up to queue_full_timeout seconds,
+                                  FAIL raises BufferError, DROP drops the record and OVERFLOW holds the encoded
+                                  record in the overflow buffer until the queue has room
+            :param queue_full_timeout: maximum time in seconds BLOCK waits for room in the queue
+            :param max_buffer_bytes: bound on the memory used by queued records, in bytes rather than records
+                                     (queue.buffering.max.kbytes), also bounding the default overflow buffer
+            :param overflow: buffer used by OVERFLOW; defaults to an in memory OverflowBuffer dropping the oldest
+                             records
+            :param outbox: durable outbox produce_async spools records to while Kafka is unavailable, replayed in
+                           order once it is back; use with poll_interval so that replay does not wait for the next
+                           produce
+            :param idempotent: enable idempotence (enable.idempotence) unless set in conf, so that retries do not
+                               write records twice nor out of order. Requires acks=all, which is then the default;
+                               idempotence is left off when conf sets acks to another value
+            :param transactional_id: when set, records are produced in transactions, see begin, commit and
+                                     transaction. Must be unique per producer instance and stable across restarts
+            :param transaction_timeout: default time in seconds to wait for the transaction coordinator on begin,
+                                        commit and abort
         """
         super().__init__(logger)
+        if on_queue_full not in POLICIES:
+            raise MessageBusException("Unknown queue full policy {}; expected one of {}".format(on_queue_full,
+                                                                                               POLICIES))
+        if transactional_id is not None and (outbox is not None or on_queue_full == OVERFLOW):
+            # Both produce records outside of the transaction they were sent in
+            raise MessageBusException("Transactional producers support neither the outbox nor the OVERFLOW policy")
+        acks = conf.get('acks', conf.get('request.required.acks', None))
+        acks_all = acks is None or str(acks) in ('all', '-1')
+        if transactional_id is not None and not acks_all:
+            raise MessageBusException("Transactional producers require acks=all, not acks={}".format(acks))
+        if (idempotent and acks_all) or transactional_id is not None:
+            conf = dict(conf)
+            conf.setdefault('enable.idempotence', True)
+        elif idempotent and 'enable.idempotence' not in conf:
+            self.log_debug("Idempotence left off as acks={}".format(acks))
+        if transactional_id is not None:
+            conf['transactional.id'] = transactional_id
+        if max_buffer_bytes is not None:
+            conf = dict(conf)
+            conf.setdefault('queue.buffering.max.kbytes', max(1, max_buffer_bytes // 1024))
+            # Leave the size as the bound
+            conf.setdefault('queue.buffering.max.messages', 10000000)
+        self.outbox = outbox
+        self.unavailable = False
+        if outbox is not None:
+            conf = dict(conf)
+            error_cb = conf.get('error_cb', None)
+            conf['error_cb'] = lambda err: self._on_error(err, error_cb)
         self.producer = AvroProducer(conf, default_key_schema=key_schema, default_value_schema=record_schema)
+        self.value_schemas = value_schemas
+        self.codec = codec
+        if codec is not None:
+            install_codec(self.producer, codec)
+        self.stamp_headers = stamp_headers
+        self.key_function = get_key_function(partition_key) if partition_key is not None else None
+        # (subject, id of the schema) -> (schema, schema id)
+        self.schema_ids = {}
+        self.window = threading.BoundedSemaphore(max_in_flight)
+        self.poll_lock = threading.Lock()
+        self.on_queue_full = on_queue_full
+        self.queue_full_timeout = queue_full_timeout
+        if overflow is None and on_queue_full == OVERFLOW:
+            overflow = OverflowBuffer() if max_buffer_bytes is None else OverflowBuffer(max_bytes=max_buffer_bytes)
+        self.overflow = overflow
+        self.overflow_lock = threading.Lock()
+        self.outbox_lock = threading.Lock()
+        # Records produced from the outbox awaiting a delivery report
+        self.outbox_in_flight = 0
+        self.outbox_count_lock = threading.Lock()
+        self.metrics = ProducerMetrics()
+        self.transactional_id = transactional_id
+        self.transaction_timeout = transaction_timeout
+        self.transactions_initialized = False
+        self.in_transaction = False
+        self.poller = None
+        self.poller_stop = threading.Event()
+        if poll_interval is not None:
+            self.start_poller(poll_interval)
 
     def set_logger(self, logger):
         """
@@ -74,6 +189,126 @@ class AvroProducerApi(Base):
             self.log_debug('Message {} successfully produced to {} [{}] at offset {}'.format(
                 obj.id, msg.topic(), msg.partition(), msg.offset()))
 
+    @staticmethod
+    def is_outage(err: KafkaError) -> bool:
+        """
+        Return True if an error is due to Kafka being unavailable, so that producing again later may succeed
+        """
+        return err.code() in OUTAGE_ERRORS or err.retriable()
+
+    def _on_error(self, err: KafkaError, error_cb: Callable[[KafkaError], None] = None):
+        if self.is_outage(err):
+            self.log_error("Kafka unavailable, spooling records to the outbox: {}".format(err))
+            self.unavailable = True
+        if error_cb is not None:
+            error_cb(err)
+
+    def get_value_schema(self, record: IMessageAvro):
+        """
+        Return the value schema for a record; None selects the producer default
+        :param record: record/message to be written
+        :return loaded AVRO schema or None
+        """
+        if self.value_schemas is None:
+            return None
+        return self.value_schemas.get_message_schema(record)
+
+    def get_key(self, record: IMessageAvro) -> str:
+        """
+        Return the partition key of a record
+        :param record: record/message to be written
+        :return key from the partition key function, else the delivery tracking id of the record
+        """
+        if self.key_function is not None:
+            key = self.key_function(record)
+            if key is not None:
+                return str(key)
+        return record.get_id()
+
+    def _produce(self, topic, record: IMessageAvro, **kwargs):
+        """
+        Encode and enqueue a record
+        :param topic: topic to which messages are written to
+        :param record: record/message to be written
+        :param kwargs: additional arguments passed to producer.produce
+        """
+        value_schema = self.get_value_schema(record)
+        if value_schema is not None:
+            kwargs['value_schema'] = value_schema
+        else:
+            value_schema = self.producer._value_schema
+        if self.stamp_headers:
+            kwargs['headers'] = build_headers(record, self.get_schema_id(topic, value_schema))
+        self.producer.produce(topic=topic, key=self.get_key(record), value=self.prepare_value(record, value_schema),
+                              **kwargs)
+
+    def prepare_value(self, record: IMessageAvro, value_schema) -> object:
+        """
+        Return the value handed to the encoder for a record
+        :param record: record/message to be written
+        :param value_schema: loaded AVRO schema the record is encoded against
+        """
+        if self.codec is None:
+            return record.to_dict()
+        return self.codec.prepare(record, value_schema)
+
+    def encode(self, topics: List[str], record: IMessageAvro) -> Dict[str, Tuple[bytes, bytes]]:
+        """
+        Serialize the key and value of a record for several topics. The record is serialized once for all topics
+        whose subjects resolve to the same schema ids
+        :param topics: topics the record is written to
+        :param record: record/message to be written
+        :return serialized key and value per topic
+        """
+        serializer = self.producer._serializer
+        key_schema = self.producer._key_schema
+        value_schema = self.get_value_schema(record)
+        if value_schema is None:
+            value_schema = self.producer._value_schema
+        key = self.get_key(record)
+        value = self.prepare_value(record, value_schema)
+
+        encoded = {}
+        result = {}
+        for topic in topics:
+            schema_ids = (self.get_schema_id(topic, key_schema, is_key=True), self.get_schema_id(topic, value_schema))
+            if schema_ids not in encoded:
+                encoded[schema_ids] = (serializer.encode_record_with_schema(topic, key_schema, key, True),
+                                       serializer.encode_record_with_schema(topic, value_schema, value))
+            result[topic] = encoded[schema_ids]
+        return result
+
+    def get_encoded_headers(self, record: IMessageAvro, value: bytes) -> list:
+        """
+        Return the headers of a record serialized by encode, None if headers are not stamped
+        """
+        if not self.stamp_headers:
+            return None
+        # The schema id follows the magic byte of the value
+        return build_headers(record, struct.unpack('>I', value[1:5])[0])
+
+    def get_schema_id(self, topic: str, schema, is_key: bool = False) -> int:
+        """
+        Return the id of a schema registered under the key or value subject of a topic
+        :param topic: topic
+        :param schema: loaded AVRO schema
+        :param is_key: True for the key subject
+        :return schema id
+        """
+        subject = topic + ('-key' if is_key else '-value')
+        # Schemas are hashed by their JSON on lookup in the registry client; look up the schema objects first
+        key = (subject, id(schema))
+        cached = self.schema_ids.get(key, None)
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        registry = self.producer._serializer.registry_client
+        if registry.auto_register_schemas:
+            schema_id = registry.register(subject, schema)
+        else:
+            schema_id = registry.check_registration(subject, schema)
+        self.schema_ids[key] = (schema, schema_id)
+        return schema_id
+
     def produce_async(self, topic, record: IMessageAvro) -> bool:
         """
             Produce records for a specific topic
@@ -83,34 +318,522 @@ class AvroProducerApi(Base):
         """
         self.log_debug("Producing records to topic {}.".format(topic))
         try:
+            # Records go to the outbox while Kafka is unavailable, and until the outbox is replayed
+            if self.outbox is not None and (self.unavailable or len(self.outbox) > 0):
+                return self._spool(topic, record)
+            # Records held in the overflow buffer go first so that records keep their order
+            if self.overflow is not None and len(self.overflow) > 0 and not self.drain_overflow():
+                return self._overflow(topic, record)
             # The message passed to the delivery callback will already be serialized.
             # To aid in debugging we provide the original object to the delivery callback.
-            self.producer.produce(topic=topic, key=record.get_id(), value=record.to_dict(),
-                                  callback=lambda err, msg, obj=record: self.delivery_report(err, msg, obj))
-            # Serve on_delivery callbacks from previous asynchronous produce()
-            self.producer.poll(0)
-            return True
+            produced = self._produce_or_wait(
+                topic, record,
+                lambda: self._produce(topic, record,
+                                      callback=lambda err, msg, obj=record: self._on_delivery(err, msg, obj)))
+            if self.poller is None:
+                # Serve on_delivery callbacks from previous asynchronous produce()
+                self.producer.poll(0)
+            return produced
         except ValueError as ex:
             traceback.print_exc()
             self.log_error("Invalid input, discarding record...{}".format(ex))
         return False
 
-    def produce_sync(self, topic, record: IMessageAvro) -> bool:
+    def _on_delivery(self, err, msg, obj: IMessageAvro):
+        if err is not None and self.outbox is not None and self.is_outage(err):
+            self.unavailable = True
+            # Delivery reports do not carry the headers
+            self.outbox.append((msg.topic(), msg.key(), msg.value(), self.get_encoded_headers(obj, msg.value())))
+            self.log_error("Message {} spooled to the outbox".format(obj.id))
+        self.delivery_report(err, msg, obj)
+
+    def _spool(self, topic, record: IMessageAvro) -> bool:
         """
-            Produce records for a specific topic
+        Append a record to the outbox
+        :return True
+        """
+        key, value = self.encode([topic], record)[topic]
+        self.outbox.append((topic, key, value, self.get_encoded_headers(record, value)))
+        self.drain_outbox()
+        return True
+
+    def drain_outbox(self):
+        """
+        Produce the records of the outbox, oldest first, without encoding them again. While Kafka is unavailable a
+        single record is produced at a time, to probe whether it is back
+        """
+        if not self.outbox_lock.acquire(blocking=False):
+            return
+        try:
+            while not (self.unavailable and self.outbox_in_flight > 0):
+                entry = self.outbox.next()
+                if entry is None:
+                    break
+                record_id, (topic, key, value, headers) = entry
+                try:
+                    self._produce_encoded(topic, key, value, headers=headers,
+                                          callback=lambda err, msg, r=record_id: self._on_outbox_delivery(err, msg, r))
+                except BufferError:
+                    self.outbox.cancel()
+                    break
+                with self.outbox_count_lock:
+                    self.outbox_in_flight += 1
+            self.outbox.sync(force=False)
+        finally:
+            self.outbox_lock.release()
+
+    def _on_outbox_delivery(self, err, msg, record_id):
+        with self.outbox_count_lock:
+            self.outbox_in_flight -= 1
+        if err is None:
+            self.unavailable = False
+            self.outbox.ack(record_id)
+        elif self.is_outage(err):
+            self.unavailable = True
+            self.outbox.rewind()
+        else:
+            # Producing again would fail the same way, e.g. for a record too large
+            self.log_error("Discarding record from the outbox, delivery to {} failed with error {}".format(
+                msg.topic(), err))
+            self.outbox.ack(record_id)
+
+    def _produce_encoded(self, topic, key: bytes, value: bytes, **kwargs):
+        """
+        Produce a serialized record
+        """
+        if isinstance(self.producer, AvroProducer):
+            # Bypass AvroProducer.produce which would serialize the record again
+            Producer.produce(self.producer, topic, value, key, **kwargs)
+        else:
+            self.producer.produce(topic, value, key, **kwargs)
+
+    def _produce_or_wait(self, topic, record: IMessageAvro, produce) -> bool:
+        """
+        Call produce, applying the queue full policy when the local producer queue is full
+        :return True if the record was queued, or held in the overflow buffer
+        :raises BufferError if the queue is full and the policy is FAIL
+        """
+        try:
+            produce()
+            return True
+        except BufferError:
+            self.metrics.add(queue_full=1)
+            if self.on_queue_full == FAIL:
+                raise
+            if self.on_queue_full == OVERFLOW:
+                return self._overflow(topic, record)
+            if self.on_queue_full == DROP:
+                self.metrics.add(dropped=1)
+                self.log_error("Producer queue full, dropping record {}".format(record.get_message_id()))
+                return False
+
+        start = time.monotonic()
+        try:
+            while True:
+                # Delivered records make room in the queue once their delivery reports are served
+                if not self.serve_delivery_reports(0.05):
+                    time.sleep(0.01)
+                try:
+                    produce()
+                    return True
+                except BufferError:
+                    if time.monotonic() - start >= self.queue_full_timeout:
+                        break
+        finally:
+            self.metrics.add(blocked_time=time.monotonic() - start)
+        self.metrics.add(dropped=1)
+        self.log_error("Producer queue full for {} seconds, dropping record {}".format(self.queue_full_timeout,
+                                                                                    record.get_message_id()))
+        return False
+
+    def _overflow(self, topic, record: IMessageAvro) -> bool:
+        """
+        Hold a record in the overflow buffer
+        :return True
+        """
+        key, value = self.encode([topic], record)[topic]
+        headers = self.get_encoded_headers(record, value)
+        # Appending may drop the oldest record, which drain_overflow must not be producing meanwhile
+        with self.overflow_lock:
+            dropped = self.overflow.append((topic, key, value, headers))
+        self.metrics.add(overflowed=1, dropped=dropped)
+        if dropped > 0:
+            self.log_error("Overflow buffer full, dropped {} records".format(dropped))
+        return True
+
+    def drain_overflow(self) -> bool:
+        """
+        Move the records held in the overflow buffer to the producer queue, oldest first, while it has room
+        :return True if the overflow buffer is empty
+        """
+        if not self.overflow_lock.acquire(blocking=False):
+            return False
+        try:
+            while True:
+                encoded = self.overflow.peek()
+                if encoded is None:
+                    return True
+                topic, key, value, headers = encoded
+                try:
+                    self._produce_encoded(topic, key, value, callback=self.overflow_delivery_report, headers=headers)
+                except BufferError:
+                    return False
+                self.overflow.pop()
+        finally:
+            self.overflow_lock.release()
+
+    def overflow_delivery_report(self, err, msg):
+        """
+            Handle delivery reports of records produced from the overflow buffer, which no longer hold the
+            original record
+        """
+        if err is not None:
+            self.log_error('Message delivery failed to {} with error {}'.format(msg.topic(), err))
+        else:
+            self.log_debug('Message successfully produced to {} [{}] at offset {}'.format(
+                msg.topic(), msg.partition(), msg.offset()))
+
+    def get_metrics(self) -> dict:
+        """
+            Return the backpressure metrics (see ProducerMetrics.to_dict) along with queue_depth: records queued
+            or awaiting a delivery report, overflow_depth and overflow_bytes: records and bytes held in the
+            overflow buffer, outbox_depth: records in the outbox not yet delivered
+        """
+        result = self.metrics.to_dict()
+        result["queue_depth"] = self.outstanding()
+        result["overflow_depth"] = len(self.overflow) if self.overflow is not None else 0
+        result["overflow_bytes"] = self.overflow.size if self.overflow is not None else 0
+        result["outbox_depth"] = len(self.outbox) if self.outbox is not None else 0
+        return result
+
+    def serve_delivery_reports(self, timeout: float = 0.05) -> bool:
+        """
+            Serve delivery callbacks. Only one thread polls at a time; other callers return immediately
+            :param timeout: maximum time to block in producer.poll in seconds
+            :return True if this thread polled, False if another thread was polling
+        """
+        if not self.poll_lock.acquire(blocking=False):
+            return False
+        try:
+            self.producer.poll(timeout)
+        finally:
+            self.poll_lock.release()
+        return True
+
+    def start_poller(self, interval: float = 0.1):
+        """
+            Start a background thread serving delivery reports as they arrive, rather than on the next produce.
+            Records are released as soon as they are delivered and delivery errors are reported without delay.
+            Stopped by close
+            :param interval: maximum time in seconds the thread blocks in producer.poll
+        """
+        if self.poller is not None:
+            return
+        self.poller_stop.clear()
+        self.poller = threading.Thread(target=self._poll_loop, args=(interval,), name="AvroProducerPoller",
+                                       daemon=True)
+        self.poller.start()
+
+    def _poll_loop(self, interval: float):
+        while not self.poller_stop.is_set():
+            try:
+                if not self.serve_delivery_reports(interval):
+                    # Another thread is serving delivery reports
+                    self.poller_stop.wait(interval)
+                if self.overflow is not None and len(self.overflow) > 0:
+                    self.drain_overflow()
+                if self.outbox is not None:
+                    self.drain_outbox()
+            except Exception as e:
+                self.log_error("Failed to serve delivery reports: {}".format(e))
+                self.log_error(traceback.format_exc())
+
+    def outstanding(self) -> int:
+        """
+            Return the number of records queued or awaiting a delivery report, including delivery reports not
+            yet served
+        """
+        return len(self.producer)
+
+    def close(self, timeout: float = 10) -> int:
+        """
+            Stop the delivery report thread, if any, then wait for outstanding records, including the ones held in
+            the overflow buffer and the outbox, to be delivered. Records left in the outbox are replayed by the
+            next producer opening it. A transaction still in progress is aborted
+            :param timeout: maximum time to wait for outstanding records in seconds
+            :return number of records still awaiting delivery
+        """
+        if self.poller is not None:
+            self.poller_stop.set()
+            self.poller.join()
+            self.poller = None
+        if self.in_transaction:
+            self.log_error("Aborting transaction in progress on close")
+            self.abort(timeout)
+        deadline = time.monotonic() + timeout
+        if self.overflow is not None:
+            while not self.drain_overflow() and time.monotonic() < deadline:
+                self.producer.poll(0.05)
+        if self.outbox is not None:
+            while len(self.outbox) > 0 and time.monotonic() < deadline:
+                self.drain_outbox()
+                self.producer.poll(0.05)
+        remaining = self.producer.flush(max(0.0, deadline - time.monotonic()))
+        if self.overflow is not None:
+            remaining += len(self.overflow)
+        if self.outbox is not None:
+            # Left in the outbox for the next run
+            self.outbox.sync()
+            remaining += len(self.outbox)
+        if remaining > 0:
+            self.log_error("{} records not delivered on close".format(remaining))
+        return remaining
+
+    def _check_transactional(self):
+        if self.transactional_id is None:
+            raise MessageBusException("Producer is not transactional; pass transactional_id")
+
+    def begin(self, timeout: float = None):
+        """
+            Begin a transaction. Records produced until commit are only read by read_committed consumers once the
+            transaction is committed, and are discarded by abort. The first call registers the transactional id with
+            the transaction coordinator, fencing off any previous producer instance with the same id
+            :param timeout: maximum time in seconds to wait for the transaction coordinator; defaults to
+                            transaction_timeout
+            :raises MessageBusException if the producer is not transactional or a transaction is in progress
+        """
+        self._check_transactional()
+        if self.in_transaction:
+            raise MessageBusException("Transaction already in progress")
+        if not self.transactions_initialized:
+            self.producer.init_transactions(timeout if timeout is not None else self.transaction_timeout)
+            self.transactions_initialized = True
+        self.producer.begin_transaction()
+        self.in_transaction = True
+
+    def commit(self, timeout: float = None) -> bool:
+        """
+            Commit the transaction in progress. Outstanding records are flushed first, so a single commit replaces a
+            flush per record. Retriable errors are retried until timeout; a transaction failing otherwise is
+            aborted
+            :param timeout: maximum time in seconds to wait; defaults to transaction_timeout
+            :return True if the transaction was committed, False if it was aborted
+            :raises MessageBusException if no transaction is in progress, or on a fatal error, e.g. once fenced off
+                    by another producer with the same transactional id
+        """
+        self._check_transactional()
+        if not self.in_transaction:
+            raise MessageBusException("No transaction in progress")
+        timeout = timeout if timeout is not None else self.transaction_timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.producer.commit_transaction(max(0.0, deadline - time.monotonic()))
+                self.in_transaction = False
+                return True
+            except KafkaException as e:
+                error = e.args[0]
+                if error.retriable() and time.monotonic() < deadline:
+                    continue
+                if error.fatal():
+                    self.in_transaction = False
+                    raise MessageBusException("Transaction failed: {}".format(error))
+                self.log_error("Aborting transaction, commit failed with error {}".format(error))
+                self.abort(timeout)
+                return False
+
+    def abort(self, timeout: float = None):
+        """
+            Abort the transaction in progress, discarding the records produced since begin
+            :param timeout: maximum time in seconds to wait; defaults to transaction_timeout
+            :raises MessageBusException if no transaction is in progress, or the abort failed
+        """
+        self._check_transactional()
+        if not self.in_transaction:
+            raise MessageBusException("No transaction in progress")
+        try:
+            self.producer.abort_transaction(timeout if timeout is not None else self.transaction_timeout)
+        except KafkaException as e:
+            raise MessageBusException("Failed to abort transaction: {}".format(e.args[0]))
+        finally:
+            self.in_transaction = False
+
+    def send_offsets(self, offsets: list, group_metadata, timeout: float = None):
+        """
+            Add consumer offsets to the transaction in progress; they are committed for the consumer group along with
+            the records of the transaction, or not at all
+            :param offsets: list of TopicPartition carrying the offset of the next message to consume
+            :param group_metadata: consumer group metadata, from Consumer.consumer_group_metadata()
+            :param timeout: maximum time in seconds to wait; defaults to transaction_timeout
+            :raises MessageBusException if no transaction is in progress
+        """
+        self._check_transactional()
+        if not self.in_transaction:
+            raise MessageBusException("No transaction in progress")
+        self.producer.send_offsets_to_transaction(offsets, group_metadata,
+                                                  timeout if timeout is not None else self.transaction_timeout)
+
+    @contextmanager
+    def transaction(self, timeout: float = None):
+        """
+            Run a block in a transaction: committed when the block completes, aborted if it raises, e.g.
+                with producer.transaction():
+                    producer.produce_async(topic, add_reservations)
+                    producer.produce_async(topic, update_slice)
+            :param timeout: maximum time in seconds to wait on begin, commit and abort
+            :raises MessageBusException if the transaction was aborted on commit
+        """
+        self.begin(timeout)
+        try:
+            yield self
+        except BaseException:
+            self.abort(timeout)
+            raise
+        if not self.commit(timeout):
+            raise MessageBusException("Transaction aborted")
+
+    def produce_transaction(self, records: Iterable[Tuple[str, IMessageAvro]], timeout: float = None) -> bool:
+        """
+            Produce related records in a single transaction: either all of them are written or none
+            :param records: (topic, record) pairs in the order they are written
+            :param timeout: maximum time in seconds to wait on begin, commit and abort
+            :return True if the transaction was committed
+        """
+        self.begin(timeout)
+        try:
+            for topic, record in records:
+                if not self.produce_async(topic, record):
+                    self.log_error("Aborting transaction, record {} not produced".format(record.get_message_id()))
+                    self.abort(timeout)
+                    return False
+        except BaseException:
+            self.abort(timeout)
+            raise
+        return self.commit(timeout)
+
+    def _acquire_window(self, deadline: float = None) -> bool:
+        while not self.window.acquire(blocking=False):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            # Records holding the window are only released once their delivery reports are served
+            if not self.serve_delivery_reports() and self.window.acquire(timeout=0.05):
+                break
+        return True
+
+    def _send(self, record: IMessageAvro, timeout: float, produce) -> Future:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._acquire_window(deadline):
+            raise MessageBusException("Timed out waiting for in-flight window")
+        future = Future()
+
+        def on_delivery(err, msg, obj=record):
+            self.window.release()
+            self.delivery_report(err, msg, obj)
+            if err is not None:
+                future.set_exception(KafkaException(err))
+            else:
+                future.set_result(msg)
+
+        try:
+            produce(on_delivery)
+        except Exception:
+            self.window.release()
+            raise
+        return future
+
+    def send(self, topic, record: IMessageAvro, timeout: float = None) -> Future:
+        """
+            Produce a record and return a future resolved with its delivery report. Blocks while max_in_flight
+            records are awaiting their delivery reports
             :param topic: topic to which messages are written to
             :param record: record/message to be written
-            :return:
+            :param timeout: maximum time in seconds to wait for room in the in-flight window
+            :return future resolved with the delivered message; failed with KafkaException if delivery failed
+            :raises MessageBusException if no room became available in the in-flight window within timeout
+        """
+        return self._send(record, timeout, lambda callback: self._produce(topic, record, callback=callback))
+
+    def send_encoded(self, topic, key: bytes, value: bytes, record: IMessageAvro, timeout: float = None) -> Future:
+        """
+            Produce a record serialized by encode; same as send otherwise
+            :param topic: topic to which messages are written to
+            :param key: serialized key
+            :param value: serialized value
+            :param record: record/message the key and value were serialized from
+            :param timeout: maximum time in seconds to wait for room in the in-flight window
+            :return future resolved with the delivered message; failed with KafkaException if delivery failed
+            :raises MessageBusException if no room became available in the in-flight window within timeout
+        """
+        headers = self.get_encoded_headers(record, value)
+        return self._send(record, timeout,
+                          lambda callback: self._produce_encoded(topic, key, value, callback=callback,
+                                                                 headers=headers))
+
+    def forward(self, topic, key: bytes, value: bytes, headers: list = None, timeout: float = None) -> bool:
+        """
+            Produce a serialized record as is, e.g. a consumed record moved to another topic, and wait for its
+            delivery report
+            :param topic: topic to which messages are written to
+            :param key: serialized key
+            :param value: serialized value
+            :param headers: headers, list of name and value
+            :param timeout: maximum time to wait for the delivery report in seconds
+            :return True if the record was delivered
+        """
+        future = Future()
+
+        def on_delivery(err, msg):
+            self.overflow_delivery_report(err, msg)
+            if err is not None:
+                future.set_exception(KafkaException(err))
+            else:
+                future.set_result(msg)
+
+        try:
+            self._produce_encoded(topic, key, value, headers=headers, callback=on_delivery)
+        except (BufferError, KafkaException) as e:
+            self.log_error("Failed to forward record to {}: {}".format(topic, e))
+            return False
+        if not self.wait_for_delivery(future, timeout=timeout):
+            self.log_error("Record forwarded to {} not delivered within {} seconds".format(topic, timeout))
+            return False
+        return future.exception() is None
+
+    def wait_for_delivery(self, future: Future, timeout: float = None) -> bool:
+        """
+            Wait for the delivery report of a record returned by send, serving delivery callbacks meanwhile
+            :param future: future returned by send
+            :param timeout: maximum time to wait in seconds
+            :return True if the delivery report was received within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not future.done():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            if not self.serve_delivery_reports():
+                wait([future], timeout=0.05)
+        return True
+
+    def produce_sync(self, topic, record: IMessageAvro, timeout: float = None) -> bool:
+        """
+            Produce records for a specific topic and wait for the delivery report of this record only
+            :param topic: topic to which messages are written to
+            :param record: record/message to be written
+            :param timeout: maximum time to wait for the delivery report in seconds
+            :return True if the record was delivered
         """
         try:
             self.log_debug("Record type={}".format(type(record)))
-            self.log_debug("Producing key {} to topic {}.".format(record.get_id(), topic))
-            self.log_debug("Producing record {} to topic {}.".format(record.to_dict(), topic))
+            self.log_debug("Producing key {} to topic {}.".format(self.get_key(record), topic))
+            if self.is_debug_enabled():
+                self.log_debug("Producing record {} to topic {}.".format(record.to_dict(), topic))
 
             # Pass the message synchronously
-            self.producer.produce(topic=topic, key=record.get_id(), value=record.to_dict())
-            self.producer.flush()
-            return True
+            future = self.send(topic, record, timeout=timeout)
+            if not self.wait_for_delivery(future, timeout=timeout):
+                self.log_error("Message {} not delivered within {} seconds".format(record.get_id(), timeout))
+                return False
+            return future.exception() is None
         except ValueError as ex:
             self.log_error("Invalid input, discarding record...")
             self.logger.error(f"Exception occurred {ex}")
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Defines RpcClient which sends requests and correlates replies received on a shared callback topic, either one
+reply per request or, for scatter-gather, one reply per peer
+"""
+import heapq
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError, TimeoutError
+from typing import Callable, Dict, List
+
+from confluent_kafka.avro import SerializerError
+from confluent_kafka.cimpl import KafkaError
+
+from fabric_mb.message_bus.base import Base
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.dead_letter import RoutingException
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.producer import AvroProducerApi
+
+
+def get_correlation_id(message: IMessageAvro) -> str:
+    """
+    Returns the message_id of the request a reply answers. QueryResult and FailedRpc carry it in request_id;
+    management results reuse the message_id of the request
+    :param message: reply
+    :return request message_id
+    """
+    request_id = getattr(message, 'request_id', None)
+    if request_id is not None:
+        return request_id
+    return message.get_message_id()
+
+
+def get_peer(message: IMessageAvro) -> str:
+    """
+    Returns the guid of the actor that sent a reply
+    :param message: reply
+    :return actor guid or None
+    """
+    auth = getattr(message, 'auth', None)
+    return auth.guid if auth is not None else None
+
+
+def complete_future(future: Future, result=None, exception: BaseException = None) -> bool:
+    """
+    Complete a future unless it is already done, e.g. cancelled or expired
+    :return True if the future was completed by this call
+    """
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+        return True
+    except InvalidStateError:
+        return False
+
+
+class PendingCall:
+    """
+    Request awaiting its reply
+    """
+    __slots__ = ["message_id", "topic", "future", "sent", "deadline"]
+
+    def __init__(self, message_id: str, topic: str, timeout: float):
+        self.message_id = message_id
+        self.topic = topic
+        self.future = Future()
+        self.sent = time.monotonic()
+        self.deadline = self.sent + timeout
+
+    def add_reply(self, message: IMessageAvro):
+        """
+        Record a reply
+        """
+        complete_future(self.future, result=message)
+
+    def expire(self):
+        """
+        Called once the deadline passed without the call being completed
+        """
+        complete_future(self.future, exception=TimeoutError("No reply to {} from {} within deadline".format(
+            self.message_id, self.topic)))
+
+    def fail(self, exception: BaseException):
+        """
+        Called if the request could not be delivered
+        """
+        complete_future(self.future, exception=exception)
+
+
+class GatherResult:
+    """
+    Replies collected by a scatter-gather call
+    """
+    def __init__(self, peers: List[str]):
+        self.peers = peers
+        # peer -> reply
+        self.replies = {}
+        # peer -> seconds from sending the request to receiving the reply
+        self.latencies = {}
+        # peer -> exception raised while sending the request
+        self.errors = {}
+
+    def get_missing(self) -> List[str]:
+        """
+        Returns the peers that did not reply
+        """
+        return [peer for peer in self.peers if peer not in self.replies]
+
+    def is_complete(self) -> bool:
+        """
+        Returns True if every peer replied
+        """
+        return len(self.replies) == len(self.peers)
+
+    def __str__(self):
+        return "replies: {} missing: {} errors: {} latencies: {}".format(
+            list(self.replies.keys()), self.get_missing(), self.errors, self.latencies)
+
+
+class PendingGather(PendingCall):
+    """
+    Request sent to several peers awaiting their replies; completes once all peers replied, a quorum of peers
+    replied or the deadline passed
+    """
+    __slots__ = ["result", "quorum", "peer_function", "lock"]
+
+    def __init__(self, message_id: str, peers: List[str], timeout: float, quorum: int,
+                 peer_function: Callable[[IMessageAvro], str]):
+        super().__init__(message_id, ",".join(peers), timeout)
+        self.result = GatherResult(peers)
+        self.quorum = quorum
+        self.peer_function = peer_function
+        self.lock = threading.Lock()
+
+    def add_reply(self, message: IMessageAvro):
+        peer = self.peer_function(message)
+        with self.lock:
+            if peer not in self.result.peers or peer in self.result.replies:
+                return
+            self.result.replies[peer] = message
+            self.result.latencies[peer] = time.monotonic() - self.sent
+            done = len(self.result.replies) >= self.quorum
+        if done:
+            complete_future(self.future, result=self.result)
+
+    def fail_peer(self, peer: str, exception: BaseException):
+        """
+        Called if the request could not be delivered to a peer
+        """
+        with self.lock:
+            self.result.errors[peer] = exception
+            done = len(self.result.peers) - len(self.result.errors) < self.quorum
+        if done:
+            complete_future(self.future, result=self.result)
+
+    def expire(self):
+        complete_future(self.future, result=self.result)
+
+    def fail(self, exception: BaseException):
+        complete_future(self.future, exception=exception)
+
+
+class RpcClient(Base):
+    """
+    Sends requests and routes the replies received on a shared callback topic to the future of the matching
+    request. A single thread polls the callback topic, serves producer delivery reports and expires deadlines,
+    regardless of the number of calls in flight.
+
+        rpc = RpcClient(producer, consumer)
+        reply = rpc.request("broker-topic", request, timeout=10)
+        rpc.stop()
+
+    Messages on the callback topic which do not answer a pending call are passed on to consumer.handle_message.
+    Without a consumer, replies received elsewhere must be routed through handle_reply.
+    """
+    def __init__(self, producer: AvroProducerApi, consumer: AvroConsumerApi = None, timeout: float = 30.0,
+                 callback_topic: str = None, poll_timeout: float = 0.1, finished_size: int = 10000, logger=None):
+        """
+        Initialize the RPC client
+        :param producer: producer the requests are sent with
+        :param consumer: consumer subscribed to the callback topic
+        :param timeout: default deadline of a call in seconds
+        :param callback_topic: callback topic set on requests that carry none; defaults to the first topic of the
+                               consumer
+        :param poll_timeout: maximum time in seconds the client thread blocks in poll
+        :param finished_size: number of completed message_ids remembered to recognize late replies
+        :param logger: logger; defaults to the logger of the producer
+        """
+        super().__init__(logger if logger is not None else producer.logger)
+        self.producer = producer
+        self.consumer = consumer
+        self.timeout = timeout
+        if callback_topic is None and consumer is not None and len(consumer.topics) > 0:
+            callback_topic = consumer.topics[0]
+        self.callback_topic = callback_topic
+        self.poll_timeout = poll_timeout
+        self.finished_size = finished_size
+        self.pending = {}
+        self.deadlines = []
+        self.finished = OrderedDict()
+        self.late_replies = 0
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+
+    def start(self):
+        """
+        Start the client thread; invoked by the first call if not called explicitly
+        """
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="RpcClient", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """
+        Stop the client thread and cancel all pending calls
+        """
+        with self.lock:
+            thread = self.thread
+            self.running = False
+            self.thread = None
+        if thread is not None:
+            thread.join()
+        with self.lock:
+            pending = list(self.pending.values())
+        for call in pending:
+            call.future.cancel()
+
+    def get_pending(self) -> int:
+        """
+        Returns the number of calls awaiting a reply
+        """
+        with self.lock:
+            return len(self.pending)
+
+    def _register(self, call: PendingCall):
+        with self.lock:
+            if call.message_id in self.pending:
+                raise MessageBusException("Request {} is already pending".format(call.message_id))
+            self.pending[call.message_id] = call
+            heapq.heappush(self.deadlines, (call.deadline, call.message_id))
+        # Completion, cancellation and expiry all remove the call from the pending table
+        call.future.add_done_callback(lambda f, message_id=call.message_id: self._finish(message_id))
+
+    def _finish(self, message_id: str):
+        with self.lock:
+            self.pending.pop(message_id, None)
+            self.finished[message_id] = None
+            while len(self.finished) > self.finished_size:
+                self.finished.popitem(last=False)
+
+    def _prepare(self, request: IMessageAvro) -> str:
+        message_id = request.get_message_id()
+        if message_id is None:
+            raise MessageBusException("Request has no message_id")
+        if self.callback_topic is not None and getattr(request, 'callback_topic', self.callback_topic) is None:
+            request.callback_topic = self.callback_topic
+        return message_id
+
+    def _send(self, call: PendingCall, topic: str, request: IMessageAvro):
+        try:
+            delivery = self.producer.send(topic, request)
+        except Exception as e:
+            call.fail(e)
+            return
+        delivery.add_done_callback(lambda d: d.exception() is not None and call.fail(d.exception()))
+
+    def call(self, topic: str, request: IMessageAvro, timeout: float = None) -> Future:
+        """
+        Send a request and return a future resolved with the reply. The reply may be a FailedRpc message
+        :param topic: topic the request is sent to
+        :param request: request; must carry a message_id. A missing callback_topic is set to the callback topic
+        :param timeout: deadline in seconds; defaults to the client timeout
+        :return future resolved with the reply; failed with TimeoutError once the deadline passed or with the
+                delivery error if the request could not be sent. Cancelling the future drops the call
+        :raises MessageBusException if the request has no message_id or a call with that id is pending
+        """
+        call = PendingCall(self._prepare(request), topic, self.timeout if timeout is None else timeout)
+        self._register(call)
+        self.start()
+        self._send(call, topic, request)
+        return call.future
+
+    def request(self, topic: str, request: IMessageAvro, timeout: float = None) -> IMessageAvro:
+        """
+        Send a request and wait for the reply
+        :param topic: topic the request is sent to
+        :param request: request
+        :param timeout: deadline in seconds; defaults to the client timeout
+        :return reply
+        :raises TimeoutError if no reply was received within the deadline
+        """
+        return self.call(topic, request, timeout=timeout).result()
+
+    def gather(self, peers: Dict[str, str], request: IMessageAvro, quorum: int = None, timeout: float = None,
+               peer_function: Callable[[IMessageAvro], str] = get_peer) -> Future:
+        """
+        Send the same request to several peers and collect their replies. The request is serialized once and
+        produced to all topics before any delivery report is awaited
+        :param peers: topic of each peer keyed by the peer identifier returned by peer_function for its replies
+        :param request: request; must carry a message_id. A missing callback_topic is set to the callback topic
+        :param quorum: number of replies the call completes with; defaults to all peers
+        :param timeout: deadline in seconds; defaults to the client timeout
+        :param peer_function: returns the peer that sent a reply; defaults to the guid of the replying actor
+        :return future resolved with a GatherResult once all peers or a quorum of peers replied, the deadline
+                passed or too few peers remain reachable to reach the quorum
+        :raises MessageBusException if the request has no message_id or a call with that id is pending
+        """
+        quorum = len(peers) if quorum is None else min(quorum, len(peers))
+        call = PendingGather(self._prepare(request), list(peers.keys()), self.timeout if timeout is None else timeout,
+                             quorum, peer_function)
+        self._register(call)
+        if quorum <= 0:
+            # Nothing to wait for; the request is still sent to the peers if any
+            complete_future(call.future, result=call.result)
+            if len(peers) == 0:
+                return call.future
+        self.start()
+        try:
+            encoded = self.producer.encode(list(set(peers.values())), request)
+        except Exception as e:
+            call.fail(e)
+            return call.future
+        for peer, topic in peers.items():
+            key, value = encoded[topic]
+            try:
+                delivery = self.producer.send_encoded(topic, key, value, request)
+            except Exception as e:
+                call.fail_peer(peer, e)
+                continue
+            delivery.add_done_callback(
+                lambda d, p=peer: d.exception() is not None and call.fail_peer(p, d.exception()))
+        return call.future
+
+    def scatter_gather(self, peers: Dict[str, str], request: IMessageAvro, quorum: int = None,
+                       timeout: float = None, peer_function: Callable[[IMessageAvro], str] = get_peer) -> GatherResult:
+        """
+        Send the same request to several peers and wait for their replies; see gather
+        :return replies received before all or a quorum of peers replied or the deadline passed
+        """
+        return self.gather(peers, request, quorum=quorum, timeout=timeout, peer_function=peer_function).result()
+
+    def handle_reply(self, message: IMessageAvro) -> bool:
+        """
+        Route a reply to its pending call
+        :param message: incoming message
+        :return True if the message answers a pending or recently completed call
+        """
+        message_id = get_correlation_id(message)
+        with self.lock:
+            call = self.pending.get(message_id, None)
+            late = call is None and message_id in self.finished
+            if late:
+                self.late_replies += 1
+        if call is not None:
+            call.add_reply(message)
+            return True
+        if late:
+            self.log_debug("Discarding late reply {} for request {}".format(message.get_message_id(), message_id))
+        return late
+
+    def _expire(self) -> float:
+        """
+        Expire calls whose deadline passed
+        :return time in seconds until the next deadline or None
+        """
+        now = time.monotonic()
+        expired = []
+        with self.lock:
+            while len(self.deadlines) > 0 and self.deadlines[0][0] <= now:
+                deadline, message_id = heapq.heappop(self.deadlines)
+                call = self.pending.get(message_id, None)
+                if call is not None and call.deadline == deadline:
+                    expired.append(call)
+            next_deadline = self.deadlines[0][0] - now if len(self.deadlines) > 0 else None
+        for call in expired:
+            call.expire()
+        return next_deadline
+
+    def _poll(self, timeout: float):
+        msg = self.consumer.poll(timeout)
+        if msg is None:
+            return
+        if msg.error():
+            if msg.error().code() != KafkaError._PARTITION_EOF:
+                self.log_error("Consumer error: {}".format(msg.error()))
+            return
+        # Stored as received, as enable.auto.offset.store would
+        self.consumer.store_offsets([msg])
+        message = self.consumer.create_message(msg.value())
+        if not self.handle_reply(message):
+            self.consumer.handle_message(message)
+
+    def _run(self):
+        if self.consumer is not None:
+            self.consumer.consumer.subscribe(self.consumer.get_topics())
+        try:
+            while self.running:
+                try:
+                    next_deadline = self._expire()
+                    timeout = self.poll_timeout if next_deadline is None else min(self.poll_timeout, next_deadline)
+                    self.producer.serve_delivery_reports(0)
+                    if self.consumer is not None:
+                        self._poll(timeout)
+                    else:
+                        time.sleep(timeout)
+                except SerializerError as e:
+                    # Report malformed record, discard results, continue polling
+                    self.log_error("Message deserialization failed {}".format(e))
+                except RoutingException:
+                    # Stop polling rather than commit past the record
+                    raise
+                except Exception as e:
+                    self.log_error("Discarding message: {}".format(e))
+                    self.log_error(traceback.format_exc())
+        finally:
+            if self.consumer is not None:
+                self.log_debug("Shutting down consumer..")
+                self.consumer.close()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the asyncio producer and consumer facades
+"""
+import asyncio
+import logging
+import unittest
+
+from fabric_mb.message_bus.async_consumer import AsyncAvroConsumer
+from fabric_mb.message_bus.async_producer import AsyncAvroProducer
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.test.consumer_test import RecordingConsumer, build_messages
+from fabric_mb.message_bus.test.fake_kafka import FakeConsumer, FakeMessage, build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query
+
+
+class AsyncTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_send(self):
+        async def run():
+            producer = build_mock_producer(logger=logging.getLogger(__name__))
+            async with AsyncAvroProducer(producer) as async_producer:
+                futures = [async_producer.send("topic1", build_query("msg{}".format(i))) for i in range(500)]
+                messages = await asyncio.gather(*futures)
+                return messages, async_producer.thread
+
+        messages, thread = asyncio.run(run())
+        self.assertEqual(500, len({(m.partition(), m.offset()) for m in messages}))
+        self.assertFalse(thread.is_alive())
+
+    def test_send_invalid_record(self):
+        async def run():
+            producer = build_mock_producer(logger=logging.getLogger(__name__))
+            async with AsyncAvroProducer(producer) as async_producer:
+                with self.assertRaises(MessageBusException):
+                    async_producer.send("topic1", build_query(None))
+                return await async_producer.send("topic1", build_query("msg"))
+
+        self.assertIsNotNone(asyncio.run(run()).offset())
+
+    def test_async_for(self):
+        msgs = build_messages(40)
+        msgs.insert(10, FakeMessage('topic1', 0, -1, value={'name': 'NoSuchMessage'}))
+        api = RecordingConsumer(logger=logging.getLogger(__name__))
+        api.consumer = FakeConsumer(msgs, api)
+
+        async def run():
+            received = []
+            async with AsyncAvroConsumer(api, max_pending=4, poll_timeout=0.01) as async_consumer:
+                async for message in async_consumer:
+                    received.append(message)
+                    # Polling is bounded by max_pending while the event loop lags behind
+                    await asyncio.sleep(0)
+                    self.assertLessEqual(async_consumer.queue.qsize(), 5)
+            return received, async_consumer.thread
+
+        received, thread = asyncio.run(run())
+        self.assertEqual([m.value()['message_id'] for m in msgs if m.offset() >= 0],
+                         [m.get_message_id() for m in received])
+        self.assertTrue(api.consumer.closed)
+        self.assertFalse(thread.is_alive())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the producer queue full policies against the librdkafka mock cluster
+"""
+import threading
+import unittest
+
+from fabric_mb.message_bus.backpressure import BLOCK, DROP, FAIL, OVERFLOW, OverflowBuffer
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.test.fake_kafka import FakeProducer, build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query
+
+# A single record fits in the queue, and stays there for linger.ms
+FULL_CONF = {'queue.buffering.max.messages': 1, 'linger.ms': 200}
+
+
+class BackpressureTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_overflow_buffer(self):
+        buffer = OverflowBuffer(max_bytes=12)
+        self.assertEqual(0, buffer.append(("topic1", b"k1", b"1234", None)))
+        self.assertEqual(0, buffer.append(("topic1", b"k2", b"1234", None)))
+        self.assertEqual(12, buffer.size)
+        # The oldest records make room for new ones
+        self.assertEqual(1, buffer.append(("topic1", b"k3", b"12", None)))
+        self.assertEqual(b"k2", buffer.peek()[1])
+        self.assertEqual(2, buffer.append(("topic1", b"k4", b"123456789", None)))
+        self.assertEqual(1, len(buffer))
+        # Larger than the buffer on its own
+        self.assertEqual(1, buffer.append(("topic1", b"k5", b"1234567890123", None)))
+        buffer.pop()
+        self.assertIsNone(buffer.peek())
+        self.assertEqual(0, buffer.size)
+
+    def test_fail(self):
+        api = build_mock_producer(FULL_CONF, on_queue_full=FAIL)
+        self.assertTrue(api.produce_async("topic1", build_query("msg1")))
+        with self.assertRaises(BufferError):
+            api.produce_async("topic1", build_query("msg2"))
+        self.assertEqual(1, api.get_metrics()["queue_full"])
+        with self.assertRaises(MessageBusException):
+            build_mock_producer(on_queue_full="no_such_policy")
+
+    def test_drop(self):
+        api = build_mock_producer(FULL_CONF, on_queue_full=DROP)
+        self.assertTrue(api.produce_async("topic1", build_query("msg1")))
+        self.assertFalse(api.produce_async("topic1", build_query("msg2")))
+        self.assertEqual(1, api.get_metrics()["dropped"])
+        self.assertEqual(0, api.close(timeout=10))
+
+    def test_block(self):
+        api = build_mock_producer(FULL_CONF, on_queue_full=BLOCK, queue_full_timeout=10)
+        for i in range(3):
+            self.assertTrue(api.produce_async("topic1", build_query("msg{}".format(i))))
+        metrics = api.get_metrics()
+        self.assertEqual(2, metrics["queue_full"])
+        self.assertGreater(metrics["blocked_time"], 0)
+        self.assertEqual(0, metrics["dropped"])
+
+        api = build_mock_producer(FULL_CONF, on_queue_full=BLOCK, queue_full_timeout=0)
+        self.assertTrue(api.produce_async("topic1", build_query("msg1")))
+        self.assertFalse(api.produce_async("topic1", build_query("msg2")))
+        self.assertEqual(1, api.get_metrics()["dropped"])
+
+    def test_overflow(self):
+        api = build_mock_producer(FULL_CONF, on_queue_full=OVERFLOW, max_buffer_bytes=1024 * 1024)
+        for i in range(5):
+            self.assertTrue(api.produce_async("topic1", build_query("msg{}".format(i))))
+        metrics = api.get_metrics()
+        self.assertEqual(4, metrics["overflow_depth"])
+        self.assertGreater(metrics["overflow_bytes"], 0)
+        self.assertEqual(4, metrics["overflowed"])
+        self.assertEqual(0, api.close(timeout=10))
+        self.assertEqual(0, api.get_metrics()["overflow_depth"])
+
+    def test_overflow_while_draining(self):
+        api = build_mock_producer(on_queue_full=OVERFLOW)
+        key, value = api.encode(["topic1"], build_query("msg1"))["topic1"]
+        # Holds a single record
+        api.overflow = OverflowBuffer(max_bytes=len(key) + len(value))
+        api.overflow.append(("topic1", key, value, None))
+        fake = FakeProducer(api.producer._key_schema, api.producer._value_schema)
+        produce = fake.produce
+        thread = threading.Thread(target=api._overflow, args=("topic1", build_query("msg2")))
+
+        def produce_overflowing(*args, **kwargs):
+            # Another thread overflows while the oldest record is being produced
+            thread.start()
+            thread.join(timeout=0.2)
+            fake.produce = produce
+            produce(*args, **kwargs)
+
+        fake.produce = produce_overflowing
+        api.producer = fake
+        self.assertTrue(api.drain_overflow())
+        thread.join()
+        self.assertEqual(1, len(api.overflow))
+        self.assertTrue(api.drain_overflow())
+        fake.poll()
+        self.assertEqual(2, len(fake.delivered))
+        self.assertEqual(0, api.get_metrics()["dropped"])
+
+
+if __name__ == '__main__':
+    unittest.main()
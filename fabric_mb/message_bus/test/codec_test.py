@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the Avro codecs
+"""
+import unittest
+
+from confluent_kafka import avro
+from confluent_kafka.avro.serializer.message_serializer import MessageSerializer
+
+from fabric_mb.message_bus.codec import AvroCodec, CodecSerializer, FastAvroCodec
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE, MessageSchemas
+from fabric_mb.message_bus.test.consumer_test import CONF
+from fabric_mb.message_bus.test.fake_kafka import FakeMessage, FakeSchemaRegistry, build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query, build_result_reservations, build_samples
+
+
+class CodecTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        with open(DEFAULT_SCHEMA_FILE, "r") as f:
+            self.union_schema = avro.loads(f.read())
+        self.schemas = MessageSchemas()
+        self.registry = FakeSchemaRegistry()
+        self.legacy = MessageSerializer(self.registry)
+        self.reader = MessageSerializer(self.registry, reader_value_schema=self.union_schema)
+
+    def encode(self, codec: AvroCodec, message, schema) -> bytes:
+        serializer = CodecSerializer(self.registry, codec)
+        return serializer.encode_record_with_schema("topic1", schema, codec.prepare(message, schema))
+
+    def test_wire_compatible(self):
+        samples = build_samples() + [build_result_reservations(200)]
+        for codec in [AvroCodec(), FastAvroCodec()]:
+            decoder = CodecSerializer(self.registry, codec, reader_value_schema=self.union_schema)
+            for message in samples:
+                name = "{} {}".format(codec.name, type(message).__name__)
+                encoded = self.encode(codec, message, self.union_schema)
+                # Decoded by confluent_kafka.avro and the codec alike
+                self.assertEqual(self.reader.decode_message(encoded), decoder.decode_message(encoded), name)
+                self.assertEqual(message.get_message_id(), decoder.decode_message(encoded)['message_id'], name)
+
+    def test_same_bytes(self):
+        fast = FastAvroCodec()
+        for message in build_samples():
+            schema = self.schemas.get_message_schema(message)
+            name = type(message).__name__
+            expected = self.legacy.encode_record_with_schema("topic1", schema, message.to_dict())
+            self.assertEqual(expected, self.encode(AvroCodec(), message, schema), name)
+            self.assertEqual(expected, self.encode(fast, message, schema), name)
+
+            # Naming the union branch writes the same bytes as the record schema after the branch index
+            encoded = self.encode(fast, message, self.union_schema)
+            self.assertTrue(encoded[5:].endswith(expected[5:]), name)
+
+    def test_producer_codec(self):
+        api = build_mock_producer(codec=FastAvroCodec())
+        self.assertIsInstance(api.producer._serializer, CodecSerializer)
+        self.assertTrue(api.produce_sync("topic1", build_query(), timeout=10))
+
+    def test_consumer_codec(self):
+        api = AvroConsumerApi(CONF, None, self.union_schema, ['topic1'], codec=FastAvroCodec())
+        self.assertIsInstance(api.deserializer, CodecSerializer)
+        # poll and consume decode with the same serializer
+        self.assertIs(api.consumer._serializer, api.deserializer)
+        api.deserializer.registry_client = self.registry
+        message = build_query()
+        encoded = self.encode(FastAvroCodec(), message, self.union_schema)
+        key, value = api.decode(FakeMessage("topic1", 0, 0, value=encoded))
+        self.assertEqual(message.to_dict(), api.create_message(value).to_dict())
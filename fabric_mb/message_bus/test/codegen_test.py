@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the classes generated from the schema
+"""
+import typing
+import unittest
+
+from confluent_kafka.avro.serializer.message_serializer import MessageSerializer
+
+from fabric_mb.message_bus import codegen
+from fabric_mb.message_bus.generated import records
+from fabric_mb.message_bus.message_registry import MESSAGES_PACKAGE, create_generated_registry, default_registry
+from fabric_mb.message_bus.message_schemas import MessageSchemas
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.test.fake_kafka import FakeSchemaRegistry
+from fabric_mb.message_bus.test.message_samples import build_result_reservations, build_samples
+
+
+# Python type -> value set on fields of that type by CodegenTest.populate
+SAMPLE_VALUES = {"str": "value", "int": 1, "float": 1.0, "bool": True, "bytes": b"value", "dict": {"key": "value"},
+                 "object": None}
+
+
+class CodegenTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        self.schemas = MessageSchemas()
+        self.serializer = MessageSerializer(FakeSchemaRegistry())
+        self.registry = create_generated_registry()
+        self.generator = codegen.Generator()
+        self.generator.get_records()
+
+    def test_up_to_date(self):
+        with open(records.__file__, "r") as f:
+            self.assertEqual(codegen.generate(), f.read(), "Run python -m fabric_mb.message_bus.codegen")
+
+    def test_round_trip(self):
+        for message in build_samples() + [build_result_reservations(50)]:
+            name = type(message).__name__
+            generated = self.registry.create(message.get_message_name())
+            self.assertIsNotNone(generated, name)
+            generated.from_dict(message.to_dict())
+            self.assertEqual(message.get_message_id(), generated.get_message_id(), name)
+            self.assertEqual(message.get_schema_name(), generated.get_schema_name(), name)
+
+            # Both encode to the same bytes
+            schema = self.schemas.get_message_schema(message)
+            expected = self.serializer.encode_record_with_schema("topic1", schema, message.to_dict())
+            self.assertEqual(expected, self.serializer.encode_record_with_schema("topic1", schema,
+                                                                                 generated.to_dict()), name)
+
+    def test_slots(self):
+        for record_class in records.RECORDS.values():
+            self.assertFalse(hasattr(record_class(), "__dict__"), record_class.__name__)
+        message = build_result_reservations(1)
+        generated = self.registry.create(message.get_message_name())
+        generated.from_dict(message.to_dict())
+        self.assertFalse(hasattr(generated.get_reservations()[0], "__dict__"))
+
+    def test_accessors(self):
+        # Public methods of the hand written classes, nested records included, are available on the generated ones
+        generated_registry = create_generated_registry()
+        for name, factory in default_registry.factories.items():
+            generated = generated_registry.get_factory(name)
+            self.assertIsNotNone(generated, name)
+            self.assertTrue(issubclass(generated, IMessageAvro), name)
+            message = factory()
+            value = self.populate(generated)
+            # Base records registered by class name do not set a message name
+            value.name = message.get_message_name() or name
+            message.from_dict(value.to_dict())
+            self.compare(message, generated, name)
+
+    def populate(self, record_class):
+        """
+        Return an instance of a generated record class with every field set
+        """
+        result = record_class()
+        for f, t in self.generator.get_fields(self.generator.record_names[record_class.__name__]):
+            setattr(result, f, self.sample_value(t))
+        return result
+
+    def sample_value(self, field_type: codegen.FieldType):
+        if field_type.kind == 'record':
+            return self.populate(records.RECORDS[getattr(records, field_type.record).schema_name])
+        if field_type.kind == 'array':
+            return [self.sample_value(field_type.item)]
+        if field_type.kind == 'map':
+            return {"key": self.sample_value(field_type.item)}
+        return SAMPLE_VALUES[field_type.python_type]
+
+    def compare(self, hand_written, generated, path: str):
+        """
+        Check that the generated class has the public methods of the class of hand_written and of its subclasses,
+        which the hand written converters may pick by name, then recurse into the nested records
+        :param hand_written: hand written record populated from the generated one, or the hand written class
+        """
+        hand_written_class = hand_written if isinstance(hand_written, type) else type(hand_written)
+        for cls in [hand_written_class] + subclasses(hand_written_class):
+            missing = public_methods(cls) - public_methods(generated)
+            self.assertEqual(set(), missing, "{} {} {}".format(path, cls.__name__, generated.__name__))
+        if isinstance(hand_written, type):
+            return
+        full_name = self.generator.record_names[generated.__name__]
+        aliases = codegen.ACCESSOR_ALIASES.get(full_name.split('.')[-1], {})
+        for f, t in self.generator.get_fields(full_name):
+            nested = t if t.kind == 'record' else t.item
+            if nested is None or nested.kind != 'record':
+                continue
+            getter = "get_" + next((a for a, field in aliases.items() if field == f), f)
+            if hasattr(hand_written, getter):
+                value = getattr(hand_written, getter)()
+            else:
+                # Some hand written messages only carry part of the fields of the record
+                value = getattr(hand_written, f, None)
+                if value is None:
+                    continue
+            if isinstance(value, list):
+                value = value[0]
+            elif isinstance(value, dict):
+                value = next(iter(value.values()))
+            if value is None:
+                # Converters picking the class by name leave the field unset; check the declared class instead
+                value = typing.get_type_hints(getattr(hand_written, getter))['return']
+            self.compare(value, getattr(records, nested.record), "{}.{}".format(path, f))
+
+
+def public_methods(cls) -> set:
+    return {name for name in dir(cls) if not name.startswith("_") and callable(getattr(cls, name))}
+
+
+def subclasses(cls) -> list:
+    """
+    Return the hand written subclasses of cls; classes defined elsewhere e.g. by other tests are left out
+    """
+    result = []
+    for subclass in cls.__subclasses__():
+        if subclass.__module__.startswith(MESSAGES_PACKAGE + '.'):
+            result.append(subclass)
+        result.extend(subclasses(subclass))
+    return result
+
+
+if __name__ == '__main__':
+    unittest.main()
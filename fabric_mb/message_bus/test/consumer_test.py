@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the consumer loops against an in memory consumer
+"""
+import unittest
+from typing import List
+
+from confluent_kafka import KafkaError
+
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.test.fake_kafka import FakeConsumer, FakeMessage
+from fabric_mb.message_bus.test.message_samples import build_samples
+
+CONF = {'bootstrap.servers': 'localhost:19092', 'group.id': 'test',
+        'schema.registry.url': 'http://localhost:8081'}
+
+
+class RecordingConsumer(AvroConsumerApi):
+    """
+    Records handled messages and batches
+    """
+    def __init__(self, **kwargs):
+        super().__init__(CONF, None, None, ['topic1'], **kwargs)
+        self.handled = []
+        self.batches = []
+
+    def handle_message(self, message: IMessageAvro):
+        self.handled.append(message)
+
+    def handle_messages(self, messages: List[IMessageAvro]):
+        self.batches.append(len(messages))
+        super().handle_messages(messages)
+
+
+def build_messages(count: int, topic: str = 'topic1', partition: int = 0) -> List[FakeMessage]:
+    samples = build_samples()
+    return [FakeMessage(topic, partition, i, value=samples[i % len(samples)].to_dict()) for i in range(count)]
+
+
+class ConsumerTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_consume_batch(self):
+        api = RecordingConsumer(max_batch_size=10)
+        msgs = build_messages(25)
+        msgs.insert(5, FakeMessage('topic1', 0, -1, error=KafkaError(KafkaError._PARTITION_EOF)))
+        api.consumer = FakeConsumer(msgs, api)
+        api.consume_batch()
+
+        # The end of partition event takes a slot in the first batch
+        self.assertEqual([9, 10, 6], api.batches)
+        self.assertEqual([m.value()['message_id'] for m in msgs if m.error() is None],
+                         [m.get_message_id() for m in api.handled])
+        self.assertEqual(3, len(api.consumer.commits))
+        self.assertTrue(api.consumer.closed)
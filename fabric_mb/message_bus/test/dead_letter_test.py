@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test routing failed records to retry and dead letter topics
+"""
+import threading
+import time
+import unittest
+
+from confluent_kafka import OFFSET_BEGINNING, Consumer, TopicPartition
+
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.dead_letter import ERROR_TYPE_HEADER, ORIGINAL_OFFSET_HEADER, ORIGINAL_TOPIC_HEADER, \
+    RETRY_AT_HEADER, RETRY_COUNT_HEADER, DeadLetterRouter, RoutingException, build_retry_topics
+from fabric_mb.message_bus.message_headers import MESSAGE_ID_HEADER, parse_headers
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.test.consumer_test import RecordingConsumer
+from fabric_mb.message_bus.test.fake_kafka import FakeConsumer, FakeMessage, build_mock_consumer, \
+    build_mock_producer, get_bootstrap_servers
+from fabric_mb.message_bus.test.message_samples import build_query
+
+TOPIC = "requests"
+DLQ_TOPIC = "requests.dlq"
+
+
+class FailingConsumer(AvroConsumerApi):
+    """
+    Fails to handle msg2
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.handled = []
+
+    def handle_message(self, message: IMessageAvro):
+        self.handled.append(message.get_message_id())
+        if message.get_message_id() == "msg2":
+            raise ValueError("Failed to handle {}".format(message.get_message_id()))
+
+
+class FailingRecordingConsumer(RecordingConsumer):
+    """
+    Fails to handle msg2
+    """
+    def handle_message(self, message: IMessageAvro):
+        if message.get_message_id() == "msg2":
+            raise ValueError("Failed to handle {}".format(message.get_message_id()))
+        super().handle_message(message)
+
+
+def read_headers(producer, topic: str, count: int) -> list:
+    """
+    Return the headers of the first count records of a topic of the mock cluster of a producer
+    """
+    consumer = Consumer({'bootstrap.servers': get_bootstrap_servers(producer), 'group.id': 'test-dlq'})
+    try:
+        metadata = producer.producer.list_topics(topic, timeout=10)
+        consumer.assign([TopicPartition(topic, p, OFFSET_BEGINNING) for p in metadata.topics[topic].partitions])
+        return [parse_headers(msg.headers()) for msg in consumer.consume(num_messages=count, timeout=10)]
+    finally:
+        consumer.close()
+
+
+class DeadLetterTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_retry_topics(self):
+        self.assertEqual([("topic.retry.1s", 1), ("topic.retry.0.5s", 0.5)], build_retry_topics("topic", [1, 0.5]))
+
+    def run_consumer(self, consume: str):
+        producer = build_mock_producer()
+        router = DeadLetterRouter(producer, DLQ_TOPIC, retry_topics=build_retry_topics(TOPIC, [1, 2]))
+        # Created upfront by a metadata request, so that the consumer group does not rebalance as each topic is
+        # created
+        for topic in [TOPIC, DLQ_TOPIC] + router.get_topics():
+            producer.producer.list_topics(topic, timeout=10)
+        api = build_mock_consumer(producer, [TOPIC], api_class=FailingConsumer, dead_letter=router)
+        producer.produce_sync(TOPIC, build_query("msg1"), timeout=10)
+        producer.forward(TOPIC, None, b"malformed", timeout=10)
+        producer.produce_sync(TOPIC, build_query("msg2"), timeout=10)
+
+        errors = []
+
+        def run():
+            try:
+                getattr(api, consume)()
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 60
+        while router.get_metrics()["dead_lettered"] < 2:
+            self.assertLess(time.monotonic(), deadline, "Records not routed: {}".format(api.handled))
+            if "msg2" in api.handled and "msg4" not in api.handled and router.get_metrics()["retried"] == 1:
+                # Produced while msg2 awaits its retries
+                producer.produce_sync(TOPIC, build_query("msg4"), timeout=10)
+                while "msg4" not in api.handled and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            self.assertEqual([], errors)
+            time.sleep(0.01)
+        api.shutdown()
+        thread.join()
+        self.assertEqual([], errors)
+
+        self.assertIn("msg1", api.handled)
+        # Not held back by the retries of msg2
+        self.assertLess(api.handled.index("msg4"), len(api.handled) - api.handled[::-1].index("msg2") - 1)
+        # Handled once, and on each of its two retries; consume_batch also handles it again one message at a time
+        self.assertGreaterEqual(api.handled.count("msg2"), 3)
+        self.assertEqual({"retried": 2, "dead_lettered": 2, "route_failures": 0, "held": 0}, router.get_metrics())
+
+        dead_letters = sorted(read_headers(producer, DLQ_TOPIC, 2), key=lambda h: h[ERROR_TYPE_HEADER])
+        self.assertEqual(["SerializerError", "ValueError"], [h[ERROR_TYPE_HEADER] for h in dead_letters])
+        malformed, failed = dead_letters
+        self.assertEqual(TOPIC, malformed[ORIGINAL_TOPIC_HEADER])
+        self.assertTrue(malformed[ORIGINAL_OFFSET_HEADER].isdigit())
+        self.assertEqual("msg2", failed[MESSAGE_ID_HEADER])
+        self.assertEqual(TOPIC, failed[ORIGINAL_TOPIC_HEADER])
+        self.assertEqual("2", failed[RETRY_COUNT_HEADER])
+
+    def test_consume_sync(self):
+        self.run_consumer("consume_sync")
+
+    def run_held(self, consume: str):
+        retry_topic, delay = build_retry_topics(TOPIC, [60])[0]
+        api = RecordingConsumer(batch_size=1, max_batch_size=10,
+                                dead_letter=DeadLetterRouter(build_mock_producer(), DLQ_TOPIC,
+                                                             retry_topics=[(retry_topic, delay)]))
+        api.topics = [TOPIC]
+        retry_at = str(int((time.time() + delay) * 1000)).encode('utf-8')
+        msgs = [FakeMessage(retry_topic, 0, offset, value=build_query("retry{}".format(offset)).to_dict(),
+                            headers=[(RETRY_AT_HEADER, retry_at)]) for offset in range(2)]
+        msgs.extend(FakeMessage(TOPIC, 0, offset, value=build_query("msg{}".format(offset)).to_dict())
+                    for offset in range(3))
+        api.consumer = FakeConsumer(msgs, api)
+
+        thread = threading.Thread(target=getattr(api, consume), daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 10
+        while len(api.handled) < 3 or len(api.consumer.commits) == 0:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        api.shutdown()
+        thread.join()
+
+        self.assertEqual(["msg0", "msg1", "msg2"], [m.get_message_id() for m in api.handled])
+        committed = {(tp.topic, tp.partition): tp.offset for commit in api.consumer.commits for tp in commit}
+        # The held retries are neither handled nor committed
+        self.assertEqual({(TOPIC, 0): 3}, committed)
+
+    def run_route_failure(self, consume: str):
+        producer = build_mock_producer()
+        # The retry and dead letter topics are unavailable
+        producer.forward = lambda *args, **kwargs: False
+        router = DeadLetterRouter(producer, DLQ_TOPIC, retry_topics=build_retry_topics(TOPIC, [1]))
+        api = FailingRecordingConsumer(batch_size=1, max_batch_size=10, dead_letter=router)
+        api.topics = [TOPIC]
+        api.consumer = FakeConsumer([FakeMessage(TOPIC, 0, offset, value=build_query("msg{}".format(offset)).to_dict())
+                                     for offset in range(5)], api)
+
+        with self.assertRaises(RoutingException):
+            getattr(api, consume)()
+        self.assertEqual(1, router.get_metrics()["route_failures"])
+        committed = [tp.offset for commit in api.consumer.commits for tp in commit]
+        # Never past the record that could not be routed
+        self.assertLessEqual(max(committed, default=0), 2)
+
+    def test_route_failure(self):
+        for consume in ["consume_sync", "consume_batch", "consume_parallel"]:
+            self.run_route_failure(consume)
+
+    def test_commit_after_hold(self):
+        self.run_held("consume_sync")
+        self.run_held("consume_batch")
+
+    def test_consume_batch(self):
+        self.run_consumer("consume_batch")
+
+    def test_consume_parallel(self):
+        self.run_consumer("consume_parallel")
+
+
+if __name__ == '__main__':
+    unittest.main()
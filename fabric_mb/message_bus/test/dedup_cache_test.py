@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the dedup cache and the consumers dropping duplicate messages
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from fabric_mb.message_bus.dedup_cache import BloomFilter, DedupCache
+from fabric_mb.message_bus.test.consumer_test import RecordingConsumer
+from fabric_mb.message_bus.test.fake_kafka import FakeConsumer, FakeMessage
+from fabric_mb.message_bus.test.message_samples import build_query
+
+
+def build_messages(message_ids: list):
+    return [FakeMessage('topic1', 0, offset, value=build_query(message_id).to_dict())
+            for offset, message_id in enumerate(message_ids)]
+
+
+class DedupCacheTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_lru(self):
+        cache = DedupCache(max_size=2, ttl=0.2)
+        for message_id in ["msg1", "msg2", "msg3"]:
+            self.assertFalse(cache.contains(message_id))
+            cache.add(message_id)
+        # Evicted past max_size
+        self.assertFalse(cache.contains("msg1"))
+        self.assertTrue(cache.contains("msg3"))
+        time.sleep(0.3)
+        # Expired past ttl
+        self.assertFalse(cache.contains("msg3"))
+        self.assertEqual({"hits": 1, "misses": 5, "size": 2}, cache.get_metrics())
+
+    def test_bloom(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add("msg{}".format(i))
+        self.assertTrue(all("msg{}".format(i) in bloom for i in range(1000)))
+        false_positives = sum("other{}".format(i) in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+        # Ids evicted from the LRU are still found in the Bloom filter
+        cache = DedupCache(max_size=10, bloom_capacity=1000)
+        for i in range(100):
+            cache.add("msg{}".format(i))
+        self.assertEqual(10, len(cache))
+        self.assertTrue(cache.contains("msg0"))
+
+    def test_save(self):
+        path = os.path.join(self.directory, "dedup.json")
+        cache = DedupCache(max_size=10, bloom_capacity=100, path=path)
+        for i in range(20):
+            cache.add("msg{}".format(i))
+        cache.save()
+
+        loaded = DedupCache(max_size=10, bloom_capacity=100, path=path)
+        self.assertEqual(10, len(loaded))
+        self.assertTrue(loaded.contains("msg19"))
+        self.assertTrue(loaded.contains("msg0"))
+        self.assertFalse(DedupCache(max_size=10, path=path).contains("msg0"))
+
+    def test_concurrent_save(self):
+        path = os.path.join(self.directory, "dedup.json")
+        cache = DedupCache(max_size=1000, path=path, save_interval=0)
+        errors = []
+
+        def add(worker: int):
+            try:
+                for i in range(100):
+                    cache.add("msg{}-{}".format(worker, i))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=add, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        cache.save()
+        self.assertEqual(800, len(DedupCache(max_size=1000, path=path)))
+
+    def test_consumer(self):
+        path = os.path.join(self.directory, "dedup.json")
+        api = RecordingConsumer(dedup=DedupCache(path=path))
+        api.consumer = FakeConsumer(build_messages(["msg1", "msg2", "msg1", "msg3"]), api)
+        api.consume_sync()
+        self.assertEqual(["msg1", "msg2", "msg3"], [m.get_message_id() for m in api.handled])
+        self.assertEqual(1, api.dedup.get_metrics()["hits"])
+
+        # Redelivered after a restart
+        api = RecordingConsumer(dedup=DedupCache(path=path))
+        api.consumer = FakeConsumer(build_messages(["msg3", "msg4", "msg4"]), api)
+        api.consume_batch()
+        self.assertEqual(["msg4"], [m.get_message_id() for m in api.handled])
+
+        api = RecordingConsumer(dedup=DedupCache(path=path))
+        api.consumer = FakeConsumer(build_messages(["msg1", "msg5"]), api)
+        api.consume_parallel(max_workers=2)
+        self.assertEqual(["msg5"], [m.get_message_id() for m in api.handled])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test keyed dispatch, offset tracking and offset commits
+"""
+import random
+import threading
+import time
+import unittest
+
+from confluent_kafka import Consumer, KafkaError, KafkaException, TopicPartition
+
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.dispatcher import KeyedDispatcher
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.offset_tracker import OffsetCommitter, OffsetTracker
+from fabric_mb.message_bus.test.consumer_test import RecordingConsumer, build_messages
+from fabric_mb.message_bus.test.fake_kafka import FakeConsumer, FakeMessage, build_mock_consumer, build_mock_producer, \
+    get_bootstrap_servers
+from fabric_mb.message_bus.test.message_samples import build_query
+
+
+class CommitRecorder:
+    """
+    Records the commits issued by an OffsetCommitter, failing them on demand
+    """
+    def __init__(self):
+        self.commits = []
+        self.fail = False
+
+    def commit(self, offsets=None, asynchronous=True):
+        if self.fail:
+            raise KafkaException(KafkaError(KafkaError._INVALID_ARG))
+        self.commits.append(([(tp.topic, tp.partition, tp.offset) for tp in offsets], asynchronous))
+
+
+class CountingConsumer(AvroConsumerApi):
+    """
+    Shuts down once count messages have been handled
+    """
+    def __init__(self, count: int, **kwargs):
+        super().__init__(**kwargs)
+        self.count = count
+        self.handled = []
+        self.lock = threading.Lock()
+
+    def handle_message(self, message: IMessageAvro):
+        with self.lock:
+            self.handled.append(message.get_message_id())
+            if len(self.handled) == self.count:
+                self.shutdown()
+
+
+class DispatcherTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_offset_tracker(self):
+        tracker = OffsetTracker()
+        for offset in range(10, 15):
+            tracker.add("t", 0, offset)
+        tracker.add("t", 1, 0)
+        self.assertEqual([], tracker.get_commit_offsets())
+        self.assertEqual(6, tracker.in_flight())
+
+        tracker.complete("t", 0, 12)
+        tracker.complete("t", 0, 11)
+        self.assertEqual([], tracker.get_commit_offsets())
+        self.assertEqual(3, tracker.in_flight("t", 0))
+
+        tracker.complete("t", 0, 10)
+        offsets = tracker.get_commit_offsets()
+        self.assertEqual([("t", 0, 13)], [(tp.topic, tp.partition, tp.offset) for tp in offsets])
+        # Nothing advanced since the last call
+        self.assertEqual([], tracker.get_commit_offsets())
+
+        tracker.complete("t", 0, 14)
+        tracker.complete("t", 1, 0)
+        self.assertEqual([("t", 1, 1)], [(tp.topic, tp.partition, tp.offset) for tp in tracker.get_commit_offsets()])
+        tracker.complete("t", 0, 13)
+        offsets = tracker.get_commit_offsets()
+        self.assertEqual([("t", 0, 15)], [(tp.topic, tp.partition, tp.offset) for tp in offsets])
+        self.assertEqual(0, tracker.in_flight())
+
+        # Completions of partitions no longer tracked are ignored
+        tracker.remove(offsets)
+        tracker.complete("t", 0, 15)
+        self.assertEqual([], tracker.get_commit_offsets())
+
+        # Nor are completions from an earlier assignment of a partition assigned back
+        generation = tracker.add("t", 0, 15)
+        tracker.remove(offsets)
+        self.assertNotEqual(generation, tracker.add("t", 0, 15))
+        tracker.complete("t", 0, 15, generation)
+        self.assertEqual(1, tracker.in_flight("t", 0))
+        self.assertEqual([], tracker.get_commit_offsets())
+
+    def test_offset_committer(self):
+        consumer = CommitRecorder()
+        committer = OffsetCommitter(consumer, commit_interval=60, commit_count=3)
+        for offset in range(6):
+            committer.add("t", 0, offset)
+
+        # Completions are coalesced until commit_count is reached
+        committer.complete("t", 0, 1)
+        committer.complete("t", 0, 2)
+        self.assertFalse(committer.maybe_commit())
+        committer.complete("t", 0, 3)
+        # Offset 0 is still in flight, the watermark cannot move past it
+        self.assertFalse(committer.maybe_commit())
+        self.assertEqual([], consumer.commits)
+
+        committer.complete("t", 0, 0)
+        committer.complete("t", 0, 5)
+        committer.complete("t", 0, 4)
+        self.assertTrue(committer.maybe_commit())
+        self.assertEqual([([("t", 0, 6)], True)], consumer.commits)
+
+        # A commit failing, synchronously or through on_commit, is issued again
+        committer.add("t", 0, 6)
+        committer.complete("t", 0, 6)
+        consumer.fail = True
+        self.assertFalse(committer.commit())
+        consumer.fail = False
+        self.assertTrue(committer.commit())
+        committer.on_commit(KafkaError(KafkaError._INVALID_ARG), [TopicPartition("t", 0, 7)])
+        self.assertTrue(committer.commit(asynchronous=False))
+        self.assertEqual([([("t", 0, 7)], True), ([("t", 0, 7)], False)], consumer.commits[1:])
+        self.assertEqual({"commits": 3, "failed_commits": 2, "in_flight": 0}, committer.get_metrics())
+
+    def test_offset_committer_interval(self):
+        consumer = CommitRecorder()
+        committer = OffsetCommitter(consumer, commit_interval=0.1, commit_count=100)
+        committer.add("t", 0, 0)
+        self.assertFalse(committer.maybe_commit())
+        committer.complete("t", 0, 0)
+        self.assertFalse(committer.maybe_commit())
+        time.sleep(0.2)
+        self.assertTrue(committer.maybe_commit())
+        self.assertEqual([([("t", 0, 1)], True)], consumer.commits)
+
+    def test_keyed_ordering(self):
+        handled = {}
+        active = set()
+        overlaps = []
+        lock = threading.Lock()
+
+        def handler(item):
+            key, seq = item
+            with lock:
+                if key in active:
+                    overlaps.append(item)
+                active.add(key)
+            time.sleep(random.random() / 1000)
+            with lock:
+                active.discard(key)
+                handled.setdefault(key, []).append(seq)
+
+        dispatcher = KeyedDispatcher(handler, max_workers=8)
+        for seq in range(200):
+            key = "key-{}".format(seq % 5)
+            dispatcher.submit(key, (key, seq))
+        self.assertTrue(dispatcher.wait(timeout=30))
+        dispatcher.shutdown()
+
+        self.assertEqual([], overlaps)
+        for key, sequence in handled.items():
+            self.assertEqual(sorted(sequence), sequence)
+        self.assertEqual(200, sum(len(s) for s in handled.values()))
+
+    def test_parallel_keys(self):
+        barrier = threading.Barrier(3, timeout=5)
+        dispatcher = KeyedDispatcher(lambda item: barrier.wait(), max_workers=3)
+        errors = []
+        for key in ["a", "b", None]:
+            dispatcher.submit(key, key, lambda item, error: errors.append(error))
+        self.assertTrue(dispatcher.wait(timeout=10))
+        dispatcher.shutdown()
+        # All three handlers had to run concurrently to pass the barrier
+        self.assertEqual([None, None, None], errors)
+
+    def test_handler_failure(self):
+        completed = []
+
+        def handler(item):
+            if item == 1:
+                raise ValueError("failed")
+
+        dispatcher = KeyedDispatcher(handler, max_workers=2, logger=None)
+        for item in range(3):
+            dispatcher.submit("k", item, lambda i, error: completed.append((i, error is None)))
+        dispatcher.shutdown()
+        self.assertEqual([(0, True), (1, False), (2, True)], completed)
+
+    def test_consume_parallel(self):
+        api = RecordingConsumer()
+        msgs = build_messages(40)
+        api.consumer = FakeConsumer(msgs, api)
+        api.consume_parallel(max_workers=4)
+
+        self.assertEqual(sorted(m.value()['message_id'] for m in msgs),
+                         sorted(m.get_message_id() for m in api.handled))
+        last = api.consumer.commits[-1]
+        self.assertEqual([("topic1", 0, 40)], [(tp.topic, tp.partition, tp.offset) for tp in last])
+        self.assertTrue(api.consumer.closed)
+
+    def test_consume_parallel_failure(self):
+        api = RecordingConsumer()
+        msgs = [FakeMessage("topic1", 0, offset, value=build_query("msg{}".format(offset)).to_dict())
+                for offset in range(20)]
+        api.consumer = FakeConsumer(msgs, api)
+
+        def handler(message: IMessageAvro):
+            if message.get_message_id() == "msg5":
+                raise ValueError("failed")
+            api.handle_message(message)
+
+        with self.assertRaises(ValueError):
+            api.consume_parallel(max_workers=4, handler=handler)
+        committed = [tp.offset for commit in api.consumer.commits for tp in commit]
+        # The watermark stops at the failed message
+        self.assertEqual(5, max(committed))
+        self.assertTrue(api.consumer.closed)
+
+    def test_consume_sync_async_commit(self):
+        api = RecordingConsumer(batch_size=10)
+        msgs = build_messages(25)
+        api.consumer = FakeConsumer(msgs, api)
+        api.consume_sync(async_commit=True)
+
+        self.assertEqual(25, len(api.handled))
+        offsets = [[(tp.topic, tp.partition, tp.offset) for tp in commit] for commit in api.consumer.commits]
+        self.assertEqual([[("topic1", 0, 10)], [("topic1", 0, 20)], [("topic1", 0, 25)]], offsets)
+        self.assertIsNone(api.committer)
+
+    def run_mock_consumer(self, consume: str, **kwargs):
+        producer = build_mock_producer()
+        producer.producer.list_topics("topic1", timeout=10)
+        for i in range(5):
+            producer.produce_sync("topic1", build_query("msg{}".format(i)), timeout=10)
+        api = build_mock_consumer(producer, ["topic1"], api_class=CountingConsumer, count=5, batch_size=2)
+        # Run in this thread: an exception raised by the on_revoke callback while closing fails the test
+        getattr(api, consume)(**kwargs)
+        self.assertIsNone(api.committer)
+        self.assertEqual(["msg{}".format(i) for i in range(5)], sorted(api.handled))
+
+        consumer = Consumer({'bootstrap.servers': get_bootstrap_servers(producer), 'group.id': 'test'})
+        try:
+            partitions = producer.producer.list_topics("topic1", timeout=10).topics["topic1"].partitions
+            committed = consumer.committed([TopicPartition("topic1", p) for p in partitions], timeout=10)
+        finally:
+            consumer.close()
+        self.assertEqual(5, sum(tp.offset for tp in committed if tp.offset >= 0))
+
+    def test_consume_parallel_shutdown(self):
+        self.run_mock_consumer("consume_parallel", max_workers=2)
+
+    def test_consume_sync_async_commit_shutdown(self):
+        self.run_mock_consumer("consume_sync", async_commit=True)
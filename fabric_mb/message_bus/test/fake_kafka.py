@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+In memory stand-ins for the Kafka clients used by the unit tests
+"""
+import logging
+import threading
+import time
+from typing import List
+
+from confluent_kafka import OFFSET_BEGINNING, KafkaError, KafkaException, TopicPartition, avro
+from confluent_kafka.avro import SerializerError
+from confluent_kafka.avro.serializer.message_serializer import MessageSerializer
+
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE
+from fabric_mb.message_bus.producer import AvroProducerApi
+
+KEY_SCHEMA_FILE = DEFAULT_SCHEMA_FILE.replace("message.avsc", "key.avsc")
+
+
+class FakeMessage:
+    """
+    Mimics confluent_kafka.Message; values are kept decoded
+    """
+    def __init__(self, topic: str, partition: int, offset: int, value=None, key=None, headers: list = None,
+                 error: KafkaError = None):
+        self._topic = topic
+        self._partition = partition
+        self._offset = offset
+        self._value = value
+        self._key = key
+        self._headers = headers
+        self._error = error
+
+    def topic(self):
+        return self._topic
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def value(self):
+        return self._value
+
+    def key(self):
+        return self._key
+
+    def headers(self):
+        return self._headers
+
+    def error(self):
+        return self._error
+
+    def set_value(self, value):
+        self._value = value
+
+    def set_key(self, key):
+        self._key = key
+
+    def set_headers(self, headers):
+        self._headers = headers
+
+
+class FakeSerializer:
+    """
+    Mimics MessageSerializer for values that are already decoded; bytes stand for malformed records
+    """
+    def __init__(self):
+        self.decoded = 0
+
+    def decode_message(self, message, is_key=False):
+        if message is None:
+            return None
+        if isinstance(message, bytes):
+            raise SerializerError("Malformed record")
+        if not is_key:
+            self.decoded += 1
+        return message
+
+
+class FakeConsumer:
+    """
+    Mimics AvroConsumer; messages are served in order from an in memory list, skipping paused partitions. Once
+    drained, the owning AvroConsumerApi, if any, is shut down so that the consume loops terminate. Offsets are
+    stored as messages are served unless auto_offset_store is False, which defaults to whether the owning
+    AvroConsumerApi has a dead letter router, and commit without offsets commits the stored offsets. The fake
+    serializer also decodes the messages the owning AvroConsumerApi receives from consume.
+    """
+    def __init__(self, messages: List[FakeMessage], api=None, auto_offset_store: bool = None):
+        self.messages = list(messages)
+        self.served = []
+        self.paused = set()
+        self.api = api
+        if auto_offset_store is None:
+            auto_offset_store = api is None or api.dead_letter is None
+        self.auto_offset_store = auto_offset_store
+        # (topic, partition) -> stored offset
+        self.stored = {}
+        self.commits = []
+        self.closed = False
+        self.subscribed = None
+        self._serializer = FakeSerializer()
+        if api is not None:
+            api.deserializer = self._serializer
+        self.lock = threading.Lock()
+
+    def subscribe(self, topics, **kwargs):
+        self.subscribed = topics
+
+    def _next(self, count: int) -> List[FakeMessage]:
+        with self.lock:
+            result = []
+            remaining = []
+            for msg in self.messages:
+                if len(result) < count and (msg.topic(), msg.partition()) not in self.paused:
+                    result.append(msg)
+                else:
+                    remaining.append(msg)
+            self.messages = remaining
+            self.served.extend(result)
+            if self.auto_offset_store:
+                for msg in result:
+                    if msg.error() is None:
+                        self.stored[(msg.topic(), msg.partition())] = msg.offset() + 1
+            if len(self.messages) == 0 and len(result) == 0 and self.api is not None:
+                self.api.shutdown()
+            return result
+
+    def add(self, messages: List[FakeMessage]):
+        with self.lock:
+            self.messages.extend(messages)
+
+    def poll(self, timeout=None):
+        result = self._next(1)
+        if len(result) == 0:
+            if timeout:
+                time.sleep(min(timeout, 0.01))
+            return None
+        msg = result[0]
+        if msg.error() is None:
+            msg.set_value(self._serializer.decode_message(msg.value()))
+        return msg
+
+    def consume(self, num_messages=1, timeout=-1):
+        return self._next(num_messages)
+
+    def pause(self, partitions):
+        with self.lock:
+            self.paused.update((tp.topic, tp.partition) for tp in partitions)
+
+    def resume(self, partitions):
+        with self.lock:
+            self.paused.difference_update((tp.topic, tp.partition) for tp in partitions)
+
+    def seek(self, partition):
+        # Serve the messages of the partition from the offset again
+        with self.lock:
+            again = [msg for msg in self.served if msg.topic() == partition.topic and
+                     msg.partition() == partition.partition and msg.offset() >= partition.offset]
+            self.served = [msg for msg in self.served if not any(msg is m for m in again)]
+            queued = [msg for msg in self.messages if not (msg.topic() == partition.topic and
+                                                           msg.partition() == partition.partition)]
+            later = [msg for msg in self.messages if msg not in queued]
+            self.messages = again + later + queued
+
+    def store_offsets(self, message=None, offsets=None):
+        with self.lock:
+            if message is not None:
+                offsets = [TopicPartition(message.topic(), message.partition(), message.offset() + 1)]
+            for tp in offsets:
+                self.stored[(tp.topic, tp.partition)] = tp.offset
+
+    def commit(self, message=None, offsets=None, asynchronous=True):
+        with self.lock:
+            if message is None and offsets is None:
+                if len(self.stored) == 0:
+                    raise KafkaException(KafkaError(KafkaError._NO_OFFSET))
+                offsets = [TopicPartition(topic, partition, offset)
+                           for (topic, partition), offset in self.stored.items()]
+            self.commits.append(offsets if offsets is not None else message)
+        return None if asynchronous else offsets
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSchemaRegistry:
+    """
+    Mimics CachedSchemaRegistryClient; schemas are registered in memory. Pass as schema_registry to
+    AvroProducer/AvroConsumer to run against the librdkafka mock cluster (test.mock.num.brokers).
+    """
+    def __init__(self):
+        self.auto_register_schemas = True
+        self.ids = {}
+        self.schemas = {}
+        self.lock = threading.Lock()
+
+    def register(self, subject, avro_schema):
+        with self.lock:
+            schema_id = self.ids.setdefault(str(avro_schema), len(self.ids) + 1)
+            self.schemas[schema_id] = avro_schema
+            return schema_id
+
+    def check_registration(self, subject, avro_schema):
+        return self.register(subject, avro_schema)
+
+    def get_by_id(self, schema_id):
+        return self.schemas.get(schema_id)
+
+
+class FakeProducer:
+    """
+    Stands in for AvroProducer against a cluster that fails on demand: queued records are delivered when poll serves
+    their delivery reports, or fail with _MSG_TIMED_OUT while available is False, as they would once
+    message.timeout.ms elapses during an outage
+    """
+    def __init__(self, key_schema, value_schema):
+        self._serializer = MessageSerializer(FakeSchemaRegistry())
+        self._key_schema = key_schema
+        self._value_schema = value_schema
+        self.available = True
+        self.queue = []
+        self.delivered = []  # type: List[FakeMessage]
+        self.lock = threading.Lock()
+
+    def produce(self, topic, value=None, key=None, callback=None, headers=None, value_schema=None, key_schema=None,
+                **kwargs):
+        if value is not None and not isinstance(value, bytes):
+            value = self._serializer.encode_record_with_schema(topic, value_schema or self._value_schema, value)
+        if key is not None and not isinstance(key, bytes):
+            key = self._serializer.encode_record_with_schema(topic, key_schema or self._key_schema, key, True)
+        with self.lock:
+            self.queue.append((FakeMessage(topic, 0, -1, value=value, key=key, headers=headers), callback))
+
+    def poll(self, timeout=None):
+        with self.lock:
+            queue, self.queue = self.queue, []
+        for msg, callback in queue:
+            err = None
+            if self.available:
+                msg._offset = len(self.delivered)
+                self.delivered.append(msg)
+            else:
+                err = KafkaError(KafkaError._MSG_TIMED_OUT)
+            if callback is not None:
+                callback(err, msg)
+        return len(queue)
+
+    def flush(self, timeout=None):
+        self.poll()
+        return len(self)
+
+    def __len__(self):
+        return len(self.queue)
+
+
+def build_mock_producer(conf: dict = None, logger: logging.Logger = None, bootstrap_servers: str = None,
+                        registry: FakeSchemaRegistry = None, **kwargs) -> AvroProducerApi:
+    """
+    Build an AvroProducerApi writing to a librdkafka mock cluster with an in memory schema registry. The producer
+    is created by AvroProducerApi from the configuration it derives from conf and kwargs
+    :param conf: additional producer configuration
+    :param logger: logger
+    :param bootstrap_servers: mock cluster of another client, see get_bootstrap_servers; defaults to a new cluster
+    :param registry: schema registry of another client; defaults to a new registry
+    :param kwargs: passed on to AvroProducerApi
+    """
+    with open(KEY_SCHEMA_FILE, "r") as f:
+        key_schema = avro.loads(f.read())
+    with open(DEFAULT_SCHEMA_FILE, "r") as f:
+        value_schema = avro.loads(f.read())
+    mock_conf = {'test.mock.num.brokers': 1, 'linger.ms': 0, 'schema.registry.url': 'http://localhost:8081'}
+    if bootstrap_servers is not None:
+        mock_conf = {'bootstrap.servers': bootstrap_servers, 'linger.ms': 0,
+                     'schema.registry.url': 'http://localhost:8081'}
+    mock_conf.update(conf or {})
+    api = AvroProducerApi(mock_conf, key_schema, value_schema, logger=logger, **kwargs)
+    # Kept by the codec serializer too, if any
+    api.producer._serializer.registry_client = registry if registry is not None else FakeSchemaRegistry()
+    return api
+
+
+def get_bootstrap_servers(api: AvroProducerApi) -> str:
+    """
+    Return the address of the mock cluster a producer built by build_mock_producer writes to
+    """
+    broker = list(api.producer.list_topics(timeout=10).brokers.values())[0]
+    return "{}:{}".format(broker.host, broker.port)
+
+
+def build_mock_consumer(producer: AvroProducerApi, topics: List[str], conf: dict = None, api_class=AvroConsumerApi,
+                        **kwargs) -> AvroConsumerApi:
+    """
+    Build a consumer reading from the mock cluster of a producer built by build_mock_producer, decoding with the
+    schema registry of the producer
+    :param producer: producer
+    :param topics: topics to subscribe to
+    :param conf: additional consumer configuration
+    :param api_class: AvroConsumerApi or a derived class taking the same arguments
+    :param kwargs: passed on to api_class
+    """
+    consumer_conf = {'bootstrap.servers': get_bootstrap_servers(producer), 'group.id': 'test',
+                     'schema.registry.url': 'http://localhost:8081', 'auto.offset.reset': 'earliest',
+                     'enable.auto.commit': False}
+    consumer_conf.update(conf or {})
+    api = api_class(conf=consumer_conf, key_schema=producer.producer._key_schema,
+                    record_schema=producer.producer._value_schema, topics=topics, **kwargs)
+    api.deserializer.registry_client = producer.producer._serializer.registry_client
+    return api
+
+
+def read_messages(producer: AvroProducerApi, topic: str, read_committed: bool = True, timeout: float = 3):
+    """
+    Read back the messages written to a topic of the mock cluster of a producer built by build_mock_producer
+    :param producer: producer
+    :param topic: topic
+    :param read_committed: read as a read_committed consumer
+    :param timeout: time in seconds to wait for messages
+    :return decoded messages
+    """
+    consumer = build_mock_consumer(producer, [topic], read_committed=read_committed)
+    try:
+        metadata = producer.producer.list_topics(topic, timeout=10)
+        partitions = metadata.topics[topic].partitions
+        consumer.consumer.assign([TopicPartition(topic, p, OFFSET_BEGINNING) for p in partitions])
+        return consumer.process_batch(consumer.consumer.consume(num_messages=1000, timeout=timeout))
+    finally:
+        consumer.consumer.close()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test pausing and resuming partitions on the backlog of messages in flight
+"""
+import asyncio
+import time
+import unittest
+
+from fabric_mb.message_bus.async_consumer import AsyncAvroConsumer
+from fabric_mb.message_bus.flow_control import FlowControl
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.test.consumer_test import RecordingConsumer, build_messages
+from fabric_mb.message_bus.test.fake_kafka import FakeConsumer
+
+
+class SlowConsumer(RecordingConsumer):
+    """
+    Records the largest backlog of messages received but not handled yet
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.max_backlog = 0
+
+    def handle_message(self, message: IMessageAvro):
+        self.max_backlog = max(self.max_backlog, len(self.consumer.served) - len(self.handled))
+        time.sleep(0.005)
+        super().handle_message(message)
+
+
+class FlowControlTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_update(self):
+        consumer = FakeConsumer([])
+        flow_control = FlowControl(high_watermark=4, low_watermark=1)
+        flow_control.update(consumer, {("topic1", 0): 4, ("topic1", 1): 3})
+        self.assertEqual({("topic1", 0)}, consumer.paused)
+        flow_control.update(consumer, {("topic1", 0): 2})
+        self.assertEqual({("topic1", 0)}, consumer.paused)
+        time.sleep(0.01)
+        flow_control.update(consumer, {})
+        self.assertEqual(set(), consumer.paused)
+
+        metrics = flow_control.get_metrics()
+        self.assertEqual(0, metrics["paused"])
+        self.assertEqual(1, metrics["pauses"])
+        self.assertGreater(metrics["pause_time"], 0)
+
+    def test_consume_parallel(self):
+        api = SlowConsumer(flow_control=FlowControl(high_watermark=5, low_watermark=2))
+        msgs = build_messages(50) + build_messages(50, partition=1)
+        api.consumer = FakeConsumer(msgs, api)
+        api.consume_parallel(max_workers=2)
+
+        self.assertEqual(100, len(api.handled))
+        self.assertGreater(api.flow_control.get_metrics()["pauses"], 0)
+        # One message over the high watermark per partition, received before the partition is paused
+        self.assertLessEqual(api.max_backlog, 2 * 6)
+
+    def test_async_for(self):
+        api = RecordingConsumer(flow_control=FlowControl(high_watermark=4))
+        api.consumer = FakeConsumer(build_messages(40), api)
+
+        async def run():
+            received = []
+            async with AsyncAvroConsumer(api, poll_timeout=0.01) as async_consumer:
+                async for message in async_consumer:
+                    received.append(message)
+                    await asyncio.sleep(0.002)
+                    self.assertLessEqual(async_consumer.queue.qsize(), 5)
+            return received
+
+        self.assertEqual(40, len(asyncio.run(run())))
+        self.assertGreater(api.flow_control.get_metrics()["pauses"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
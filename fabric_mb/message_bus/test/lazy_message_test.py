@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test lazily decoded message fields
+"""
+import pickle
+import unittest
+
+from confluent_kafka import avro
+
+from fabric_mb.message_bus.codec import CodecSerializer
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.lazy_message import LAZY_FIELDS, LazyMessage, is_loaded
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE
+from fabric_mb.message_bus.messages.claim_delegation_avro import ClaimDelegationAvro
+from fabric_mb.message_bus.messages.delegation_avro import DelegationAvro
+from fabric_mb.message_bus.messages.result_reservation_avro import ResultReservationAvro
+from fabric_mb.message_bus.object_codec import ObjectCodec
+from fabric_mb.message_bus.test.consumer_test import CONF
+from fabric_mb.message_bus.test.fake_kafka import FakeMessage, FakeSchemaRegistry
+from fabric_mb.message_bus.test.message_samples import build_auth, build_delegation, build_result_reservations, \
+    build_samples
+
+
+class LazyMessageTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        with open(DEFAULT_SCHEMA_FILE, "r") as f:
+            self.union_schema = avro.loads(f.read())
+        self.registry = FakeSchemaRegistry()
+        self.eager = CodecSerializer(self.registry, ObjectCodec(), reader_value_schema=self.union_schema)
+        self.lazy = CodecSerializer(self.registry, ObjectCodec(lazy_fields=LAZY_FIELDS),
+                                    reader_value_schema=self.union_schema)
+
+    def encode(self, message) -> bytes:
+        return self.eager.encode_record_with_schema("topic1", self.union_schema, message)
+
+    def test_same_messages(self):
+        for message in build_samples() + [build_result_reservations(50)]:
+            name = type(message).__name__
+            encoded = self.encode(message)
+            expected = self.eager.decode_message(encoded)
+            decoded = self.lazy.decode_message(encoded)
+            self.assertIsInstance(decoded, type(expected), name)
+            self.assertEqual(expected.to_dict(), decoded.to_dict(), name)
+            # Re-encoded without reading the pending fields first
+            self.assertEqual(encoded, self.encode(self.lazy.decode_message(encoded)), name)
+
+    def test_envelope_first(self):
+        message = build_result_reservations(100)
+        decoded = self.lazy.decode_message(self.encode(message))
+        self.assertIsInstance(decoded, LazyMessage)
+        self.assertIsInstance(decoded, ResultReservationAvro)
+        self.assertEqual(message.get_message_id(), decoded.get_message_id())
+        self.assertEqual(message.get_status().code, decoded.get_status().code)
+        self.assertFalse(is_loaded(decoded, "reservations"))
+
+        reservations = decoded.get_reservations()
+        self.assertTrue(is_loaded(decoded, "reservations"))
+        self.assertIs(reservations, decoded.reservations)
+        self.assertEqual(100, len(reservations))
+        self.assertEqual(message.reservations[99].reservation_id, reservations[99].reservation_id)
+
+        # Setting a pending field drops the encoded value
+        decoded = self.lazy.decode_message(self.encode(message))
+        decoded.reservations = []
+        self.assertEqual([], decoded.get_reservations())
+
+    def test_slotted_record(self):
+        # Records without an instance dict, read into a lazy subclass
+        message = ClaimDelegationAvro()
+        message.auth = build_auth()
+        message.message_id = "msg1"
+        message.callback_topic = "topic"
+        message.delegation = build_delegation()
+        message.delegation.graph = "graph" * 1000
+        decoded = self.lazy.decode_message(self.encode(message))
+        self.assertIsInstance(decoded.delegation, DelegationAvro)
+        self.assertFalse(is_loaded(decoded.delegation, "graph"))
+        self.assertEqual(message.delegation.graph, decoded.delegation.get_graph())
+        self.assertTrue(is_loaded(decoded.delegation, "graph"))
+
+    def test_pickle(self):
+        message = build_result_reservations(10)
+        decoded = pickle.loads(pickle.dumps(self.lazy.decode_message(self.encode(message))))
+        self.assertIs(ResultReservationAvro, type(decoded))
+        self.assertEqual(message.to_dict(), decoded.to_dict())
+
+    def test_consumer(self):
+        api = AvroConsumerApi(CONF, None, self.union_schema, ['topic1'], codec=ObjectCodec(lazy_fields=LAZY_FIELDS))
+        api.deserializer.registry_client = self.registry
+        message = build_result_reservations(10)
+        key, value = api.decode(FakeMessage("topic1", 0, 0, value=self.encode(message)))
+        received = api.create_message(value)
+        self.assertFalse(is_loaded(received, "reservations"))
+        self.assertEqual(message.to_dict(), received.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
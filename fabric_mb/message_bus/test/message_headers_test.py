@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the message headers and the consumer header filter
+"""
+import unittest
+
+from confluent_kafka import Consumer, TopicPartition
+
+from fabric_mb.message_bus.message_headers import MESSAGE_ID_HEADER, NAME_HEADER, SCHEMA_ID_HEADER, \
+    TIMESTAMP_HEADER, build_header_filter, build_headers, parse_headers
+from fabric_mb.message_bus.test.consumer_test import RecordingConsumer
+from fabric_mb.message_bus.test.fake_kafka import FakeConsumer, FakeMessage, build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query, build_samples
+
+
+class FilteringConsumer(RecordingConsumer):
+    """
+    Records the messages left out by the header filter
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.filtered = []
+
+    def handle_filtered(self, msg):
+        self.filtered.append(msg)
+
+
+def build_messages():
+    result = []
+    for offset, message in enumerate(build_samples()):
+        result.append(FakeMessage('topic1', 0, offset, value=message.to_dict(), headers=build_headers(message, 1)))
+    # Messages from producers not stamping headers
+    result.append(FakeMessage('topic1', 0, len(result), value=build_query("msg-no-headers").to_dict()))
+    # Messages from producers writing binary headers
+    result.append(FakeMessage('topic1', 0, len(result), value=build_query("msg-binary-headers").to_dict(),
+                              headers=[("trace", b"\xff\xfe\x00")]))
+    return result
+
+
+class MessageHeadersTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_headers(self):
+        headers = parse_headers(build_headers(build_query("msg1"), 7))
+        self.assertEqual("Query", headers[NAME_HEADER])
+        self.assertEqual("7", headers[SCHEMA_ID_HEADER])
+        self.assertEqual("msg1", headers[MESSAGE_ID_HEADER])
+        self.assertTrue(int(headers[TIMESTAMP_HEADER]) > 0)
+        self.assertEqual({}, parse_headers(None))
+        self.assertEqual({"trace": "\ufffd\ufffd\x00", NAME_HEADER: "Query"},
+                         parse_headers([("trace", b"\xff\xfe\x00"), (NAME_HEADER, b"Query")]))
+
+        accept = build_header_filter(["Query"])
+        self.assertTrue(accept(headers))
+        self.assertFalse(accept({NAME_HEADER: "ResultReservation"}))
+        self.assertTrue(accept({}))
+
+    @staticmethod
+    def read_headers(api, future) -> dict:
+        """
+        Read back the headers of a delivered message from the mock cluster of the producer
+        """
+        api.wait_for_delivery(future, timeout=10)
+        broker = list(api.producer.list_topics(timeout=10).brokers.values())[0]
+        consumer = Consumer({'bootstrap.servers': "{}:{}".format(broker.host, broker.port), 'group.id': 'test'})
+        try:
+            msg = future.result()
+            consumer.assign([TopicPartition(msg.topic(), msg.partition(), msg.offset())])
+            return parse_headers(consumer.consume(num_messages=1, timeout=10)[0].headers())
+        finally:
+            consumer.close()
+
+    def test_producer(self):
+        api = build_mock_producer()
+        headers = self.read_headers(api, api.send("topic1", build_query("msg1")))
+        self.assertEqual("Query", headers[NAME_HEADER])
+        self.assertEqual("msg1", headers[MESSAGE_ID_HEADER])
+        self.assertEqual(str(api.get_schema_id("topic1", api.producer._value_schema)), headers[SCHEMA_ID_HEADER])
+
+        key, value = api.encode(["topic1"], build_query("msg2"))["topic1"]
+        encoded_headers = self.read_headers(api, api.send_encoded("topic1", key, value, build_query("msg2")))
+        self.assertEqual("msg2", encoded_headers[MESSAGE_ID_HEADER])
+        self.assertEqual(headers[SCHEMA_ID_HEADER], encoded_headers[SCHEMA_ID_HEADER])
+
+        api = build_mock_producer(stamp_headers=False)
+        self.assertEqual({}, self.read_headers(api, api.send("topic1", build_query("msg1"))))
+
+    def test_consume_sync(self):
+        api = FilteringConsumer(header_filter=["Query", "ResultReservation"])
+        msgs = build_messages()
+        api.consumer = FakeConsumer(msgs, api)
+        api.consume_sync()
+
+        handled = [m.get_message_name() for m in api.handled]
+        # Messages without the name header are accepted, whatever their other headers
+        self.assertEqual(["Query", "ResultReservation", "Query", "Query"], handled)
+        self.assertEqual(len(msgs) - len(handled), len(api.filtered))
+        # Only the messages handled were decoded
+        self.assertEqual(len(handled), api.deserializer.decoded)
+
+    def test_consume_batch(self):
+        api = FilteringConsumer(header_filter=lambda headers: headers.get(NAME_HEADER, None) == "Query")
+        api.consumer = FakeConsumer(build_messages(), api)
+        api.consume_batch()
+
+        self.assertEqual(["msg1"], [m.get_message_id() for m in api.handled])
+        self.assertEqual(1, api.deserializer.decoded)
+
+
+if __name__ == '__main__':
+    unittest.main()
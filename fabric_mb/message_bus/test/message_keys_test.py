@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test message keys and partitioning by key
+"""
+import unittest
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_keys import KEY_FUNCTIONS, get_key_function
+from fabric_mb.message_bus.test.fake_kafka import build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query, build_samples
+
+
+class MessageKeysTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_key_functions(self):
+        samples = {m.get_message_name(): m for m in build_samples()}
+        self.assertEqual("res123", KEY_FUNCTIONS["reservation_id"](samples["Redeem"]))
+        self.assertEqual("rid1", KEY_FUNCTIONS["reservation_id"](samples["ExtendReservation"]))
+        self.assertEqual("dlg123", KEY_FUNCTIONS["delegation_id"](samples["ClaimDelegation"]))
+        self.assertEqual("slice-id-0", KEY_FUNCTIONS["slice_id"](samples["GetSlicesRequest"]))
+        self.assertEqual("slice_1", KEY_FUNCTIONS["slice_id"](samples["AddReservations"]))
+        self.assertEqual("guid", KEY_FUNCTIONS["actor_guid"](samples["GetSlicesRequest"]))
+        self.assertEqual("testguid", KEY_FUNCTIONS["actor_guid"](samples["Query"]))
+        self.assertEqual("res123", KEY_FUNCTIONS["ordering"](samples["Redeem"]))
+        self.assertIsNone(KEY_FUNCTIONS["ordering"](samples["ResultString"]))
+
+        key = get_key_function(lambda message: message.get_message_id())
+        self.assertEqual("msg1", key(build_query("msg1")))
+        with self.assertRaises(MessageBusException):
+            get_key_function("no_such_key")
+
+    def test_partition_key(self):
+        samples = {m.get_message_name(): m for m in build_samples()}
+        api = build_mock_producer()
+        self.assertEqual("res123", api.get_key(samples["Redeem"]))
+        # Delivery is still tracked by the record id
+        self.assertNotEqual(samples["Redeem"].get_id(), api.get_key(samples["Redeem"]))
+        self.assertEqual(samples["ResultString"].get_id(), api.get_key(samples["ResultString"]))
+        self.assertEqual("guid1", build_mock_producer(partition_key="actor_guid").get_key(samples["AddSlice"]))
+        self.assertEqual(samples["Redeem"].get_id(), build_mock_producer(partition_key=None).get_key(samples["Redeem"]))
+
+        # Records with the same key land on the same partition, in order
+        api = build_mock_producer(partition_key="actor_guid")
+        futures = []
+        for i in range(10):
+            message = build_query("msg{}".format(i))
+            message.auth.guid = "actor1"
+            futures.append(api.send("topic1", message))
+        for future in futures:
+            self.assertTrue(api.wait_for_delivery(future, timeout=10))
+        self.assertEqual(1, len({f.result().partition() for f in futures}))
+        self.assertEqual(sorted(f.result().offset() for f in futures), [f.result().offset() for f in futures])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the message registry
+"""
+import unittest
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_registry import MessageRegistry, default_registry
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.messages.query_avro import QueryAvro
+from fabric_mb.message_bus.messages.request_by_id_record import RequestByIdRecord
+from fabric_mb.message_bus.messages.result_record_list import ResultRecordList
+from fabric_mb.message_bus.test.message_samples import build_samples
+
+
+class MessageRegistryTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_default_registry(self):
+        for attribute, name in vars(IMessageAvro).items():
+            if attribute.startswith('_') or not isinstance(name, str):
+                continue
+            message = default_registry.create(name)
+            self.assertIsInstance(message, IMessageAvro)
+            self.assertEqual(name + 'Avro', type(message).__name__)
+
+        self.assertIsInstance(default_registry.create(RequestByIdRecord.__name__), RequestByIdRecord)
+        self.assertIsInstance(default_registry.create(ResultRecordList.__name__), ResultRecordList)
+
+    def test_create_returns_new_instance(self):
+        self.assertIsNot(default_registry.create(IMessageAvro.query), default_registry.create(IMessageAvro.query))
+
+    def test_samples_round_trip(self):
+        for outgoing in build_samples():
+            value = outgoing.to_dict()
+            incoming = default_registry.create(value['name'])
+            self.assertIs(type(outgoing), type(incoming))
+            incoming.from_dict(value)
+            self.assertEqual(outgoing.get_message_id(), incoming.get_message_id())
+
+    def test_register(self):
+        registry = MessageRegistry(parent=default_registry)
+
+        @registry.register("CustomQuery")
+        class CustomQueryAvro(QueryAvro):
+            pass
+
+        self.assertIsInstance(registry.create("CustomQuery"), CustomQueryAvro)
+        self.assertIsInstance(registry.create(IMessageAvro.query), QueryAvro)
+        self.assertNotIn("CustomQuery", default_registry)
+
+        registry.register(IMessageAvro.query, CustomQueryAvro)
+        self.assertIsInstance(registry.create(IMessageAvro.query), CustomQueryAvro)
+        self.assertIs(type(default_registry.create(IMessageAvro.query)), QueryAvro)
+
+        registry.unregister(IMessageAvro.query)
+        self.assertIs(type(registry.create(IMessageAvro.query)), QueryAvro)
+
+    def test_unknown_message(self):
+        registry = MessageRegistry()
+        self.assertIsInstance(registry.create(IMessageAvro.query), QueryAvro)
+        self.assertIn(IMessageAvro.query, registry)
+        with self.assertRaises(MessageBusException):
+            registry.create("NoSuchMessage")
+        with self.assertRaises(MessageBusException):
+            registry.create(None)
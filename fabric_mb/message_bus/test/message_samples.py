@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Sample messages shared by the unit tests and benchmarks
+"""
+import os
+from typing import List
+
+from fabric_mb.message_bus.messages.actor_avro import ActorAvro
+from fabric_mb.message_bus.messages.add_reservations_avro import AddReservationsAvro
+from fabric_mb.message_bus.messages.add_slice_avro import AddSliceAvro
+from fabric_mb.message_bus.messages.auth_avro import AuthAvro
+from fabric_mb.message_bus.messages.broker_query_model_avro import BrokerQueryModelAvro
+from fabric_mb.message_bus.messages.claim_delegation_avro import ClaimDelegationAvro
+from fabric_mb.message_bus.messages.delegation_avro import DelegationAvro
+from fabric_mb.message_bus.messages.extend_reservation_avro import ExtendReservationAvro
+from fabric_mb.message_bus.messages.failed_rpc_avro import FailedRpcAvro
+from fabric_mb.message_bus.messages.get_reservations_state_request_avro import GetReservationsStateRequestAvro
+from fabric_mb.message_bus.messages.get_slices_request_avro import GetSlicesRequestAvro
+from fabric_mb.message_bus.messages.lease_reservation_avro import LeaseReservationAvro
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.messages.query_avro import QueryAvro
+from fabric_mb.message_bus.messages.query_result_avro import QueryResultAvro
+from fabric_mb.message_bus.messages.redeem_avro import RedeemAvro
+from fabric_mb.message_bus.messages.reservation_avro import ReservationAvro
+from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
+from fabric_mb.message_bus.messages.reservation_state_avro import ReservationStateAvro
+from fabric_mb.message_bus.messages.resource_set_avro import ResourceSetAvro
+from fabric_mb.message_bus.messages.resource_ticket_avro import ResourceTicketAvro
+from fabric_mb.message_bus.messages.result_avro import ResultAvro
+from fabric_mb.message_bus.messages.result_broker_query_model_avro import ResultBrokerQueryModelAvro
+from fabric_mb.message_bus.messages.result_reservation_avro import ResultReservationAvro
+from fabric_mb.message_bus.messages.result_reservation_state_avro import ResultReservationStateAvro
+from fabric_mb.message_bus.messages.result_string_avro import ResultStringAvro
+from fabric_mb.message_bus.messages.result_strings_avro import ResultStringsAvro
+from fabric_mb.message_bus.messages.result_units_avro import ResultUnitsAvro
+from fabric_mb.message_bus.messages.result_actor_avro import ResultActorAvro
+from fabric_mb.message_bus.messages.slice_avro import SliceAvro
+from fabric_mb.message_bus.messages.term_avro import TermAvro
+from fabric_mb.message_bus.messages.ticket import Ticket
+from fabric_mb.message_bus.messages.ticket_avro import TicketAvro
+from fabric_mb.message_bus.messages.ticket_reservation_avro import TicketReservationAvro
+from fabric_mb.message_bus.messages.unit_avro import UnitAvro
+from fabric_mb.message_bus.messages.update_data_avro import UpdateDataAvro
+from fabric_mb.message_bus.messages.update_ticket_avro import UpdateTicketAvro
+
+GRAPHML_FILE = os.path.join(os.path.dirname(__file__), 'abqm.graphml')
+
+
+def build_auth() -> AuthAvro:
+    auth = AuthAvro()
+    auth.guid = "testguid"
+    auth.name = "testactor"
+    auth.oidc_sub_claim = "test-oidc"
+    return auth
+
+
+def build_slice(index: int = 0) -> SliceAvro:
+    slice_obj = SliceAvro()
+    slice_obj.set_slice_name("slice-{}".format(index))
+    slice_obj.set_slice_id("slice-id-{}".format(index))
+    slice_obj.set_owner(build_auth())
+    slice_obj.set_description("test description")
+    slice_obj.set_config_properties({"key": "value"})
+    slice_obj.set_resource_type("site.vm")
+    slice_obj.set_client_slice(False)
+    slice_obj.set_broker_client_slice(False)
+    return slice_obj
+
+
+def build_term() -> TermAvro:
+    term = TermAvro()
+    term.start_time = 1593854111999
+    term.end_time = 1593854111999
+    term.new_start_time = 1593854111999
+    return term
+
+
+def build_reservation() -> ReservationAvro:
+    auth = build_auth()
+    reservation = ReservationAvro()
+    reservation.reservation_id = "res123"
+    reservation.sequence = 1
+    reservation.slice = build_slice()
+    reservation.term = build_term()
+
+    reservation.resource_set = ResourceSetAvro()
+    reservation.resource_set.units = 1
+    reservation.resource_set.type = "type1"
+
+    unit = build_unit()
+    reservation.resource_set.unit_set = [unit]
+
+    ticket = Ticket()
+    ticket.authority = auth
+    ticket.old_units = 0
+    ticket.delegation_id = "dlg123"
+    rt = ResourceTicketAvro()
+    rt.units = 1
+    rt.holder = "ab1"
+    rt.issuer = "si1"
+    rt.type = "rty1"
+    rt.properties = {"foo": "bar"}
+    rt.guid = "gid"
+    rt.term = build_term()
+    ticket.resource_ticket = rt
+    reservation.resource_set.ticket = ticket
+    return reservation
+
+
+def build_delegation() -> DelegationAvro:
+    delegation = DelegationAvro()
+    delegation.delegation_id = "dlg123"
+    delegation.sequence = 1
+    delegation.slice = build_slice()
+    delegation.graph = "graph"
+    return delegation
+
+
+def build_unit(index: int = 0) -> UnitAvro:
+    unit = UnitAvro()
+    unit.properties = {'test': 'value'}
+    unit.rtype = "abc"
+    unit.state = 1
+    unit.sequence = 0
+    unit.reservation_id = 'res-{}'.format(index)
+    unit.actor_id = 'act_1'
+    unit.slice_id = 'slc_2'
+    return unit
+
+
+def build_reservation_mng(index: int = 0, reservation_class=ReservationMng) -> ReservationMng:
+    res = reservation_class()
+    res.reservation_id = "res-{}".format(index)
+    res.rtype = 'site.baremetalce'
+    res.notices = 'notices for reservation {}'.format(index)
+    res.slice_id = "slice_1"
+    res.start = 1264827600000
+    res.end = 1927515600000
+    res.requested_end = 1927515600000
+    res.state = 2
+    res.pending_state = 1
+    res.config = {"image": "default_centos_8", "flavor": "m1.large"}
+    if isinstance(res, TicketReservationAvro):
+        res.broker = "broker1"
+        res.renewable = True
+        res.renew_time = 10
+    if isinstance(res, LeaseReservationAvro):
+        res.authority = "site1"
+        res.join_state = 1
+        res.leased_units = 1
+    return res
+
+
+def build_status() -> ResultAvro:
+    result = ResultAvro()
+    result.code = 0
+    return result
+
+
+def build_result_reservations(count: int) -> ResultReservationAvro:
+    """
+    Build a ResultRecordList carrying count lease reservations
+    """
+    result = ResultReservationAvro()
+    result.message_id = "msg-reservations"
+    result.status = build_status()
+    result.reservations = [build_reservation_mng(i, LeaseReservationAvro) for i in range(count)]
+    return result
+
+
+def build_query(message_id: str = "msg1") -> QueryAvro:
+    query = QueryAvro()
+    query.message_id = message_id
+    query.callback_topic = "topic"
+    query.properties = {"abc": "def"}
+    query.auth = build_auth()
+    return query
+
+
+def build_samples() -> List[IMessageAvro]:
+    """
+    Build one populated message for each record type in schema/message.avsc
+    """
+    auth = build_auth()
+    id_token = "id_token"
+    result = []
+
+    query = QueryAvro()
+    query.message_id = "msg1"
+    query.callback_topic = "topic"
+    query.properties = {"abc": "def"}
+    query.auth = auth
+    query.id_token = id_token
+    result.append(query)
+
+    query_result = QueryResultAvro()
+    query_result.message_id = "msg2"
+    query_result.request_id = "msg1"
+    query_result.properties = {"abc": "def"}
+    query_result.auth = auth
+    result.append(query_result)
+
+    failed_rpc = FailedRpcAvro()
+    failed_rpc.message_id = "msg3"
+    failed_rpc.request_id = "req3"
+    failed_rpc.reservation_id = "rsv_abc"
+    failed_rpc.request_type = 1
+    failed_rpc.error_details = "test error message"
+    failed_rpc.auth = auth
+    result.append(failed_rpc)
+
+    redeem = RedeemAvro()
+    redeem.message_id = "msg4"
+    redeem.callback_topic = "test"
+    redeem.reservation = build_reservation()
+    redeem.auth = auth
+    result.append(redeem)
+
+    claimd = ClaimDelegationAvro()
+    claimd.auth = auth
+    claimd.message_id = "msg5"
+    claimd.callback_topic = "test"
+    claimd.delegation = build_delegation()
+    claimd.id_token = id_token
+    result.append(claimd)
+
+    update_ticket = UpdateTicketAvro()
+    update_ticket.auth = auth
+    update_ticket.message_id = "msg6"
+    update_ticket.callback_topic = "test"
+    update_ticket.reservation = build_reservation()
+    update_ticket.update_data = UpdateDataAvro()
+    update_ticket.update_data.failed = False
+    update_ticket.update_data.message = ""
+    result.append(update_ticket)
+
+    ticket = TicketAvro()
+    ticket.message_id = "msg7"
+    ticket.reservation = build_reservation()
+    ticket.callback_topic = "topic1"
+    ticket.auth = auth
+    result.append(ticket)
+
+    get_slices = GetSlicesRequestAvro()
+    get_slices.auth = auth
+    get_slices.message_id = "msg8"
+    get_slices.callback_topic = "test"
+    get_slices.guid = "guid"
+    get_slices.slice_id = "slice-id-0"
+    get_slices.id_token = id_token
+    result.append(get_slices)
+
+    res_state_req = GetReservationsStateRequestAvro()
+    res_state_req.guid = "gud1"
+    res_state_req.message_id = "msg9"
+    res_state_req.reservation_ids = ["a1"]
+    res_state_req.callback_topic = "topic1"
+    res_state_req.auth = auth
+    res_state_req.id_token = id_token
+    result.append(res_state_req)
+
+    add_slice = AddSliceAvro()
+    add_slice.message_id = "msg10"
+    add_slice.guid = 'guid1'
+    add_slice.slice_obj = build_slice()
+    add_slice.callback_topic = 'test_topic'
+    add_slice.auth = auth
+    result.append(add_slice)
+
+    add_reservations = AddReservationsAvro()
+    add_reservations.message_id = "msg11"
+    add_reservations.guid = 'guid1'
+    add_reservations.reservation_list = [build_reservation_mng(0, TicketReservationAvro)]
+    add_reservations.callback_topic = 'test_topic'
+    add_reservations.auth = auth
+    result.append(add_reservations)
+
+    extend_res = ExtendReservationAvro()
+    extend_res.message_id = "msg12"
+    extend_res.guid = 'guid1'
+    extend_res.callback_topic = 'test_topic'
+    extend_res.auth = auth
+    extend_res.reservation_id = "rid1"
+    extend_res.new_units = -1
+    extend_res.new_resource_type = "abc"
+    extend_res.request_properties = {'abcd': 'eee'}
+    extend_res.config_properties = {'abcd': 'eee'}
+    extend_res.end_time = 1593854111999
+    result.append(extend_res)
+
+    status_resp = ResultStringAvro()
+    status_resp.message_id = "msg13"
+    status_resp.result_str = "abc"
+    status_resp.status = build_status()
+    result.append(status_resp)
+
+    res_strings = ResultStringsAvro()
+    res_strings.status = build_status()
+    res_strings.message_id = "msg14"
+    res_strings.result = ["r1"]
+    result.append(res_strings)
+
+    result.append(build_result_reservations(2))
+
+    res_state = ResultReservationStateAvro()
+    res_state.status = build_status()
+    res_state.message_id = "msg15"
+    state = ReservationStateAvro()
+    state.state = 1
+    state.pending_state = 2
+    res_state.reservation_states = [state]
+    result.append(res_state)
+
+    result_units = ResultUnitsAvro()
+    result_units.message_id = "msg16"
+    result_units.status = build_status()
+    result_units.units = [build_unit()]
+    result.append(result_units)
+
+    result_model = ResultBrokerQueryModelAvro()
+    result_model.model = BrokerQueryModelAvro()
+    result_model.model.level = 1
+    with open(GRAPHML_FILE, 'r') as f:
+        result_model.model.model = f.read()
+    result_model.message_id = "msg17"
+    result_model.status = build_status()
+    result.append(result_model)
+
+    result_actor = ResultActorAvro()
+    actor = ActorAvro()
+    actor.name = "abcd"
+    actor.owner = auth
+    actor.description = "desc"
+    actor.policy_module = "pol"
+    actor.policy_class = "cll"
+    actor.policy_guid = "guid"
+    actor.actor_module = "module"
+    actor.actor_class = "class"
+    actor.id = "a1"
+    result_actor.message_id = "msg18"
+    result_actor.status = build_status()
+    result_actor.actors = [actor]
+    result.append(result_actor)
+
+    return result
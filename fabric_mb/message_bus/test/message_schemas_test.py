@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test per message type schema resolution
+"""
+import io
+import unittest
+
+import avro.io
+from confluent_kafka import avro as confluent_avro
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_schemas import MessageSchemas, DEFAULT_SCHEMA_FILE
+from fabric_mb.message_bus.messages.reservation_or_delegation_record import ReservationOrDelegationRecord
+from fabric_mb.message_bus.test.message_samples import build_samples
+
+
+class MessageSchemasTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        self.schemas = MessageSchemas()
+        with open(DEFAULT_SCHEMA_FILE, "r") as f:
+            self.union_schema = confluent_avro.loads(f.read())
+
+    def test_record_is_self_contained(self):
+        record = self.schemas.get_record_json("Query")
+        self.assertEqual("Query", record['name'])
+        auth = [f for f in record['fields'] if f['name'] == 'auth'][0]
+        self.assertEqual(["null", "record"], [t if isinstance(t, str) else t['type'] for t in auth['type']])
+
+        # Named types referenced twice are defined once and referred to by name afterwards
+        record = self.schemas.get_record_json("ReservationOrDelegation")
+        reservation = [f for f in record['fields'] if f['name'] == 'reservation'][0]['type'][1]
+        slice_record = [f for f in reservation['fields'] if f['name'] == 'slice'][0]['type'][1]
+        self.assertEqual("SliceRecord", slice_record['name'])
+        delegation = [f for f in record['fields'] if f['name'] == 'delegation'][0]['type'][1]
+        self.assertEqual(["null", "fabric.cf.model.SliceRecord"], [f for f in delegation['fields']
+                                                                  if f['name'] == 'slice'][0]['type'])
+
+    def test_schema_is_cached(self):
+        self.assertIs(self.schemas.get_schema("RequestById"), self.schemas.get_schema("RequestById"))
+        self.assertIs(self.schemas.get_schema("Query"), self.schemas.get_schema("fabric.cf.model.Query"))
+
+    def test_unknown_record(self):
+        with self.assertRaises(MessageBusException):
+            self.schemas.get_schema("NoSuchRecord")
+
+    def test_unbound_message(self):
+        class UnboundRecord(ReservationOrDelegationRecord):
+            schema_name = None
+
+        self.assertIsNone(self.schemas.get_message_schema(UnboundRecord()))
+
+    def test_round_trip(self):
+        for message in build_samples():
+            value = message.to_dict()
+            schema = self.schemas.get_message_schema(message)
+            self.assertIsNotNone(schema, type(message).__name__)
+
+            expected = io.BytesIO()
+            avro.io.DatumWriter(self.union_schema).write(value, avro.io.BinaryEncoder(expected))
+            actual = io.BytesIO()
+            avro.io.DatumWriter(schema).write(value, avro.io.BinaryEncoder(actual))
+
+            # Written with the record schema and read with the union, the result must match the union path
+            reader = avro.io.DatumReader(schema, self.union_schema)
+            decoded = reader.read(avro.io.BinaryDecoder(io.BytesIO(actual.getvalue())))
+            reader = avro.io.DatumReader(self.union_schema, self.union_schema)
+            self.assertEqual(reader.read(avro.io.BinaryDecoder(io.BytesIO(expected.getvalue()))), decoded)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the object codec
+"""
+import json
+import unittest
+
+from confluent_kafka import avro
+
+from fabric_mb.message_bus.codec import AvroCodec, CodecSerializer, FastAvroCodec
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_registry import default_registry
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE, MessageSchemas
+from fabric_mb.message_bus.object_codec import ObjectCodec
+from fabric_mb.message_bus.test.consumer_test import CONF
+from fabric_mb.message_bus.test.fake_kafka import FakeMessage, FakeSchemaRegistry, build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query, build_result_reservations, build_samples
+
+
+class ObjectCodecTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        with open(DEFAULT_SCHEMA_FILE, "r") as f:
+            self.union_schema = avro.loads(f.read())
+        self.schemas = MessageSchemas()
+        self.registry = FakeSchemaRegistry()
+
+    def encode(self, codec: AvroCodec, message, schema) -> bytes:
+        serializer = CodecSerializer(self.registry, codec)
+        return serializer.encode_record_with_schema("topic1", schema, codec.prepare(message, schema))
+
+    def test_same_bytes(self):
+        fast = FastAvroCodec()
+        codec = ObjectCodec()
+        for message in build_samples() + [build_result_reservations(200)]:
+            name = type(message).__name__
+            for schema in [self.union_schema, self.schemas.get_message_schema(message)]:
+                self.assertEqual(self.encode(fast, message, schema), self.encode(codec, message, schema), name)
+
+    def test_empty_and_dict_values(self):
+        codec = ObjectCodec()
+        message = build_result_reservations(3)
+        # Empty and unset values, some of which to_dict() leaves out
+        message.reservations[0].redeem_processors = []
+        message.reservations[1].units = None
+        message.reservations[2].notices = ""
+        schema = self.schemas.get_message_schema(message)
+        self.assertEqual(self.encode(FastAvroCodec(), message, schema), self.encode(codec, message, schema))
+
+        # Dicts are written as by fastavro
+        value = message.to_dict()
+        writer = codec.get_writer(self.union_schema)
+        self.assertEqual(self.encode(FastAvroCodec(), message, self.union_schema)[5:], writer.encode(value))
+
+    def test_invalid(self):
+        message = build_result_reservations(1)
+        message.reservations[0].reservation_id = None
+        with self.assertRaises(MessageBusException):
+            ObjectCodec().get_writer(self.union_schema).encode(message)
+
+    def test_producer(self):
+        api = build_mock_producer(codec=ObjectCodec())
+        self.assertTrue(api.produce_sync("topic1", build_query(), timeout=10))
+
+    def test_decode(self):
+        codec = ObjectCodec()
+        decoder = CodecSerializer(self.registry, codec, reader_value_schema=self.union_schema)
+        fast = CodecSerializer(self.registry, FastAvroCodec(), reader_value_schema=self.union_schema)
+        for message in build_samples() + [build_result_reservations(50)]:
+            name = type(message).__name__
+            for schema in [self.union_schema, self.schemas.get_message_schema(message)]:
+                encoded = self.encode(codec, message, schema)
+                value = fast.decode_message(encoded)
+                expected = default_registry.create(value['name'])
+                expected.from_dict(value)
+                decoded = decoder.decode_message(encoded)
+                self.assertIs(type(expected), type(decoded), name)
+                self.assertEqual(expected.to_dict(), decoded.to_dict(), name)
+                self.assertEqual(message.to_dict(), decoded.to_dict(), name)
+            self.assertTrue(ObjectCodec.is_projection(self.schemas.get_message_schema(message), self.union_schema))
+
+        message = decoder.decode_message(self.encode(codec, build_result_reservations(2), self.union_schema))
+        self.assertEqual([], message.reservations[0].redeem_processors)
+
+    def test_decode_resolved(self):
+        # A reader schema leaving out a field is resolved by fastavro then converted by from_dict
+        query = build_query()
+        schema = self.schemas.get_message_schema(query)
+        reader = json.loads(str(schema))
+        reader['fields'] = [f for f in reader['fields'] if f['name'] != 'id_token']
+        reader_schema = avro.loads(json.dumps(reader))
+        self.assertFalse(ObjectCodec.is_projection(schema, reader_schema))
+        decoder = CodecSerializer(self.registry, ObjectCodec(), reader_value_schema=reader_schema)
+        decoded = decoder.decode_message(self.encode(ObjectCodec(), query, schema))
+        self.assertIs(type(query), type(decoded))
+        self.assertEqual(query.get_message_id(), decoded.get_message_id())
+        self.assertEqual(query.properties, decoded.properties)
+
+    def test_consumer(self):
+        api = AvroConsumerApi(CONF, None, self.union_schema, ['topic1'], codec=ObjectCodec())
+        self.assertIs(api.registry, api.codec.registry)
+        api.deserializer.registry_client = self.registry
+        message = build_query()
+        key, value = api.decode(FakeMessage("topic1", 0, 0, value=self.encode(ObjectCodec(), message,
+                                                                             self.union_schema)))
+        self.assertIs(value, api.create_message(value))
+        self.assertEqual(message.to_dict(), value.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the durable outbox, and the producer spooling to it while Kafka is unavailable
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from fabric_mb.message_bus.outbox import Outbox
+from fabric_mb.message_bus.test.fake_kafka import FakeProducer, build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query
+
+
+class OutboxTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def segments(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".seg"))
+
+    def test_outbox(self):
+        records = [("topic1", b"key1", b"value1", [("h", b"1")]), ("topic2", None, b"value2", None),
+                   ("topic1", b"key3", b"", None)]
+        outbox = Outbox(self.directory)
+        for record in records:
+            outbox.append(record)
+        first, record = outbox.next()
+        self.assertEqual(records[0], record)
+        second, record = outbox.next()
+        self.assertEqual(records[1], record)
+        # Acknowledged out of order, the head stays on the first record
+        outbox.ack(second)
+        self.assertEqual(3, len(outbox))
+        outbox.rewind()
+        self.assertEqual(first, outbox.next()[0])
+        self.assertEqual(records[2], outbox.next()[1])
+        self.assertIsNone(outbox.next())
+        outbox.ack(first)
+        self.assertEqual(1, len(outbox))
+        outbox.close()
+
+        # Records not acknowledged survive a restart; a torn record at the end is left out
+        with open(os.path.join(self.directory, self.segments()[0]), 'r+b') as f:
+            f.seek(200)
+            f.write(b"\x00\x00\x00\x10garbage")
+        outbox = Outbox(self.directory)
+        self.assertEqual(1, len(outbox))
+        third, record = outbox.next()
+        self.assertEqual(records[2], record)
+        outbox.ack(third)
+        self.assertEqual(0, len(outbox))
+        outbox.close()
+        outbox = Outbox(self.directory)
+        self.assertEqual(0, len(outbox))
+        outbox.close()
+
+    def test_segments(self):
+        outbox = Outbox(self.directory, segment_size=64)
+        for i in range(5):
+            outbox.append(("topic1", b"key", b"v" * 30, None))
+        # Records larger than a segment get one of their own
+        outbox.append(("topic1", b"key", b"v" * 100, None))
+        self.assertEqual(6, len(self.segments()))
+        for i in range(5):
+            outbox.ack(outbox.next()[0])
+        self.assertEqual(1, len(self.segments()))
+        self.assertEqual(b"v" * 100, outbox.next()[1][2])
+        outbox.close()
+
+    def test_producer_outage(self):
+        api = build_mock_producer(outbox=Outbox(self.directory))
+        fake = FakeProducer(api.producer._key_schema, api.producer._value_schema)
+        api.producer = fake
+        self.assertTrue(api.produce_async("topic1", build_query("msg0")))
+        fake.poll()
+
+        # Kafka goes away: the failed record and the next ones are spooled
+        fake.available = False
+        for i in range(1, 4):
+            self.assertTrue(api.produce_async("topic1", build_query("msg{}".format(i))))
+            fake.poll()
+        self.assertTrue(api.unavailable)
+        self.assertEqual(3, api.get_metrics()["outbox_depth"])
+        spooled = [api.outbox.next()[1] for i in range(3)]
+        api.outbox.rewind()
+        self.assertEqual(1, len(fake.delivered))
+        self.assertEqual(3, api.close(timeout=0.2))
+        api.outbox.close()
+
+        # Restarted, the records are replayed in order once Kafka is back, as encoded before
+        api = build_mock_producer(outbox=Outbox(self.directory))
+        api.producer = fake
+        fake.available = True
+        api.drain_outbox()
+        fake.poll()
+        self.assertFalse(api.unavailable)
+        api.drain_outbox()
+        self.assertEqual(0, api.close(timeout=10))
+        self.assertEqual([r[2] for r in spooled], [m.value() for m in fake.delivered[1:]])
+        self.assertEqual(spooled[0][3], fake.delivered[1].headers())
+        self.assertTrue(api.produce_async("topic1", build_query("msg4")))
+        self.assertEqual(0, api.get_metrics()["outbox_depth"])
+        api.outbox.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the producer against the librdkafka mock cluster
+"""
+import logging
+import threading
+import unittest
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.messages.query_avro import QueryAvro
+from fabric_mb.message_bus.test.fake_kafka import build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_query
+
+
+def build_producer(**kwargs):
+    return build_mock_producer(logger=logging.getLogger(__name__), **kwargs)
+
+
+class ProducerTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_produce_sync(self):
+        api = build_producer()
+        for i in range(5):
+            self.assertTrue(api.produce_sync("topic1", build_query("msg{}".format(i)), timeout=10))
+
+    def test_send(self):
+        api = build_producer()
+        futures = [api.send("topic1", build_query("msg{}".format(i))) for i in range(10)]
+        for future in futures:
+            self.assertTrue(api.wait_for_delivery(future, timeout=10))
+        self.assertEqual(10, len({(f.result().partition(), f.result().offset()) for f in futures}))
+
+    def test_window_bounds_in_flight(self):
+        api = build_producer(max_in_flight=2)
+        futures = [api.send("topic1", build_query("msg{}".format(i))) for i in range(2)]
+        with self.assertRaises(MessageBusException):
+            api.send("topic1", build_query("msg2"), timeout=0)
+
+        # Serving delivery reports frees up the window
+        for future in futures:
+            api.wait_for_delivery(future, timeout=10)
+        self.assertTrue(api.wait_for_delivery(api.send("topic1", build_query("msg2"), timeout=10), timeout=10))
+
+    def test_invalid_record_releases_window(self):
+        api = build_producer(max_in_flight=1)
+        for i in range(3):
+            self.assertFalse(api.produce_sync("topic1", QueryAvro(), timeout=1))
+        self.assertTrue(api.produce_sync("topic1", build_query("msg"), timeout=10))
+
+    def test_poller(self):
+        api = build_producer(poll_interval=0.05)
+        delivered = threading.Event()
+        api.delivery_report = lambda err, msg, obj: delivered.set()
+        self.assertTrue(api.produce_async("topic1", build_query("msg")))
+        # Served by the poller thread, without producing again
+        self.assertTrue(delivered.wait(timeout=10))
+        self.assertTrue(api.wait_for_delivery(api.send("topic1", build_query("msg1")), timeout=10))
+
+        self.assertTrue(api.produce_async("topic1", build_query("msg2")))
+        self.assertEqual(0, api.close(timeout=10))
+        self.assertIsNone(api.poller)
+        self.assertEqual(0, api.outstanding())
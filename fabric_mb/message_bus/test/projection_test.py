@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test decoding with a reader schema projecting the message schema
+"""
+import unittest
+
+from confluent_kafka import avro
+
+from fabric_mb.message_bus.codec import CodecSerializer, FastAvroCodec
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.message_registry import default_registry
+from fabric_mb.message_bus.message_schemas import DEFAULT_SCHEMA_FILE, MessageSchemas
+from fabric_mb.message_bus.object_codec import ObjectCodec
+from fabric_mb.message_bus.test.consumer_test import CONF
+from fabric_mb.message_bus.test.fake_kafka import FakeMessage, FakeSchemaRegistry
+from fabric_mb.message_bus.test.message_samples import build_result_reservations, build_samples
+
+PROJECTION = {"ReservationMngRecord": ["reservation_id", "state"], "BrokerQueryModelRecord": ["level"]}
+
+
+class ProjectionTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        with open(DEFAULT_SCHEMA_FILE, "r") as f:
+            self.union_schema = avro.loads(f.read())
+        self.schemas = MessageSchemas()
+        self.reader_schema = self.schemas.get_projected_schema(PROJECTION)
+        self.registry = FakeSchemaRegistry()
+
+    def encode(self, message, schema) -> bytes:
+        serializer = CodecSerializer(self.registry, ObjectCodec())
+        return serializer.encode_record_with_schema("topic1", schema, message)
+
+    def test_projected_schema(self):
+        reader = MessageSchemas(schema_str=str(self.reader_schema))
+        reservation = reader.get_record_json("ReservationMngRecord")
+        # Fields without a default are kept
+        self.assertEqual(['name', 'reservation_id', 'rtype', 'state', 'notices'],
+                         [f['name'] for f in reservation['fields']])
+
+        self.assertEqual(str(self.union_schema), str(self.schemas.get_projected_schema({})))
+        with self.assertRaises(MessageBusException):
+            self.schemas.get_projected_schema({"ReservationMngRecord": ["no_such_field"]})
+        with self.assertRaises(MessageBusException):
+            self.schemas.get_projected_schema({"NoSuchRecord": ["state"]})
+
+    def test_decode(self):
+        fast = CodecSerializer(self.registry, FastAvroCodec(), reader_value_schema=self.reader_schema)
+        decoder = CodecSerializer(self.registry, ObjectCodec(), reader_value_schema=self.reader_schema)
+        for message in build_samples() + [build_result_reservations(20)]:
+            name = type(message).__name__
+            for schema in [self.union_schema, self.schemas.get_message_schema(message)]:
+                self.assertEqual({}, ObjectCodec().get_projection(schema, schema))
+                self.assertIsNotNone(ObjectCodec().get_projection(schema, self.reader_schema), name)
+                encoded = self.encode(message, schema)
+                value = fast.decode_message(encoded)
+                expected = default_registry.create(value['name'])
+                expected.from_dict(value)
+                decoded = decoder.decode_message(encoded)
+                self.assertIs(type(expected), type(decoded), name)
+                if message.get_message_name() == "ResultBrokerQueryModel":
+                    self.assertEqual(1, decoded.model.level)
+                    self.assertIsNone(decoded.model.model)
+                    continue
+                self.assertEqual(expected.to_dict(), decoded.to_dict(), name)
+
+        decoded = decoder.decode_message(self.encode(build_result_reservations(2), self.union_schema))
+        reservation = decoded.reservations[1]
+        self.assertEqual("res-1", reservation.reservation_id)
+        self.assertIsNotNone(reservation.notices)
+        self.assertIsNone(reservation.slice_id)
+        self.assertIsNone(reservation.units)
+
+    def test_consumer(self):
+        api = AvroConsumerApi(CONF, None, self.union_schema, ['topic1'], codec=ObjectCodec(), projection=PROJECTION)
+        api.deserializer.registry_client = self.registry
+        key, value = api.decode(FakeMessage("topic1", 0, 0, value=self.encode(build_result_reservations(3),
+                                                                             self.union_schema)))
+        self.assertEqual(["res-0", "res-1", "res-2"], [r.reservation_id for r in value.reservations])
+        self.assertIsNone(value.reservations[0].sliver)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the RPC client
+"""
+import logging
+import time
+import unittest
+from concurrent.futures import TimeoutError, wait
+
+from fabric_mb.message_bus.messages.query_result_avro import QueryResultAvro
+from fabric_mb.message_bus.messages.result_string_avro import ResultStringAvro
+from fabric_mb.message_bus.rpc import RpcClient, get_correlation_id
+from fabric_mb.message_bus.test.consumer_test import RecordingConsumer
+from fabric_mb.message_bus.test.fake_kafka import FakeConsumer, FakeMessage, build_mock_producer
+from fabric_mb.message_bus.test.message_samples import build_auth, build_query, build_status
+
+
+def build_result_string(message_id: str) -> ResultStringAvro:
+    reply = ResultStringAvro()
+    reply.message_id = message_id
+    reply.result_str = "abc"
+    reply.status = build_status()
+    return reply
+
+
+def build_query_result(request_id: str, peer: str = None) -> QueryResultAvro:
+    reply = QueryResultAvro()
+    reply.message_id = "reply-" + request_id
+    reply.request_id = request_id
+    reply.properties = {"abc": "def"}
+    reply.auth = build_auth()
+    if peer is not None:
+        reply.auth.guid = peer
+    return reply
+
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class RpcTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def setUp(self) -> None:
+        logger = logging.getLogger(__name__)
+        self.consumer = RecordingConsumer(logger=logger)
+        self.consumer.consumer = FakeConsumer([])
+        self.rpc = RpcClient(build_mock_producer(logger=logger), self.consumer, timeout=10)
+
+    def tearDown(self) -> None:
+        self.rpc.stop()
+
+    def reply(self, replies: list):
+        self.consumer.consumer.add([FakeMessage('topic1', 0, i, value=r.to_dict()) for i, r in enumerate(replies)])
+
+    def test_call(self):
+        requests = [build_query("msg{}".format(i)) for i in range(200)]
+        futures = [self.rpc.call("broker", request) for request in requests]
+        self.assertEqual(200, self.rpc.get_pending())
+
+        # Replies arrive out of order; queries are answered through request_id, other requests through message_id
+        self.reply([build_query_result(r.message_id) if i % 2 else build_result_string(r.message_id)
+                    for i, r in enumerate(reversed(requests))])
+        for request, future in zip(requests, futures):
+            self.assertEqual(request.message_id, get_correlation_id(future.result(5)))
+        self.assertTrue(wait_for(lambda: self.rpc.get_pending() == 0))
+        self.assertEqual(0, len(self.consumer.handled))
+
+    def test_callback_topic(self):
+        request = build_query("msg")
+        request.callback_topic = None
+        self.rpc.call("broker", request)
+        self.assertEqual("topic1", request.callback_topic)
+
+    def test_timeout_and_late_reply(self):
+        future = self.rpc.call("broker", build_query("msg"), timeout=0.05)
+        with self.assertRaises(TimeoutError):
+            future.result(5)
+        self.assertTrue(wait_for(lambda: self.rpc.get_pending() == 0))
+
+        self.reply([build_result_string("msg")])
+        self.assertTrue(wait_for(lambda: self.rpc.late_replies == 1))
+        self.assertEqual(0, len(self.consumer.handled))
+
+    def test_cancel(self):
+        futures = [self.rpc.call("broker", build_query("msg{}".format(i))) for i in range(3)]
+        self.assertTrue(futures[1].cancel())
+        self.assertEqual(2, self.rpc.get_pending())
+        self.reply([build_result_string("msg{}".format(i)) for i in range(3)])
+        done, not_done = wait([futures[0], futures[2]], timeout=5)
+        self.assertEqual(0, len(not_done))
+        self.assertTrue(wait_for(lambda: self.rpc.late_replies == 1))
+
+    def test_unsolicited_message(self):
+        self.rpc.start()
+        self.reply([build_result_string("unknown")])
+        self.assertTrue(wait_for(lambda: len(self.consumer.handled) == 1))
+        self.assertEqual("unknown", self.consumer.handled[0].get_message_id())
+
+    def test_stop_cancels_pending(self):
+        future = self.rpc.call("broker", build_query("msg"))
+        self.rpc.stop()
+        self.assertTrue(future.cancelled())
+        self.assertTrue(self.consumer.consumer.closed)
+
+    def test_gather(self):
+        peers = {"broker{}".format(i): "broker{}-topic".format(i) for i in range(3)}
+        future = self.rpc.gather(peers, build_query("msg"))
+        self.reply([build_query_result("msg", peer) for peer in ["broker2", "broker0", "unknown", "broker1"]])
+        result = future.result(5)
+        self.assertTrue(result.is_complete())
+        self.assertEqual({}, result.errors)
+        self.assertEqual(set(peers.keys()), set(result.latencies.keys()))
+        self.assertEqual(0, len(self.consumer.handled))
+
+    def test_gather_quorum(self):
+        peers = {"broker{}".format(i): "broker{}-topic".format(i) for i in range(3)}
+        future = self.rpc.gather(peers, build_query("msg"), quorum=2)
+        self.reply([build_query_result("msg", "broker1"), build_query_result("msg", "broker1")])
+        self.assertFalse(future.done())
+        self.reply([build_query_result("msg", "broker0")])
+        result = future.result(5)
+        self.assertEqual(["broker2"], result.get_missing())
+        self.assertFalse(result.is_complete())
+
+    def test_gather_no_quorum(self):
+        # Complete right away rather than at the deadline
+        self.assertTrue(self.rpc.gather({}, build_query("msg1")).done())
+        peers = {"broker{}".format(i): "broker{}-topic".format(i) for i in range(3)}
+        result = self.rpc.gather(peers, build_query("msg2"), quorum=0).result(0)
+        self.assertEqual(["broker0", "broker1", "broker2"], result.get_missing())
+        self.assertEqual(0, self.rpc.get_pending())
+
+    def test_gather_deadline(self):
+        peers = {"broker{}".format(i): "broker{}-topic".format(i) for i in range(3)}
+        future = self.rpc.gather(peers, build_query("msg"), timeout=0.1)
+        self.reply([build_query_result("msg", "broker1")])
+        result = future.result(5)
+        self.assertEqual(["broker1"], list(result.replies.keys()))
+        self.assertEqual(["broker0", "broker2"], result.get_missing())
+
+    def test_gather_serializes_once(self):
+        serializer = self.rpc.producer.producer._serializer
+        encode = serializer.encode_record_with_schema
+        calls = []
+        serializer.encode_record_with_schema = lambda *args, **kwargs: calls.append(args[0]) or encode(*args, **kwargs)
+        peers = {"broker{}".format(i): "broker{}-topic".format(i) for i in range(10)}
+        self.rpc.gather(peers, build_query("msg"))
+        # Key and value
+        self.assertEqual(2, len(calls))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the transactional producer and read_committed consumers
+"""
+import unittest
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.test.fake_kafka import build_mock_producer, read_messages
+from fabric_mb.message_bus.test.message_samples import build_query
+
+TOPIC = "transactions"
+
+
+class TransactionTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_transactions(self):
+        # Records linger in the queue until the transaction ends: commit flushes them, abort purges them. The mock
+        # cluster does not filter out aborted records for read_committed consumers, so they must not be written
+        api = build_mock_producer({'linger.ms': 5000}, transactional_id="test-transactions")
+        self.assertTrue(api.produce_transaction([(TOPIC, build_query("msg1")), (TOPIC, build_query("msg2"))]))
+
+        api.begin()
+        api.produce_async(TOPIC, build_query("msg3"))
+        api.abort()
+
+        with self.assertRaises(ValueError):
+            with api.transaction():
+                api.produce_async(TOPIC, build_query("msg4"))
+                raise ValueError("failed")
+        self.assertFalse(api.in_transaction)
+
+        with api.transaction():
+            api.produce_async(TOPIC, build_query("msg5"))
+        self.assertEqual(0, api.close())
+
+        self.assertEqual(["msg1", "msg2", "msg5"], sorted(m.get_message_id() for m in read_messages(api, TOPIC)))
+
+    def test_acks(self):
+        # Idempotence requires acks=all; it is left off rather than failing the configuration
+        api = build_mock_producer({'acks': '1'})
+        self.assertTrue(api.produce_sync(TOPIC, build_query("msg1"), timeout=10))
+        api.close()
+        with self.assertRaises(MessageBusException):
+            build_mock_producer({'acks': '1'}, transactional_id="test-acks")
+
+    def test_not_transactional(self):
+        api = build_mock_producer()
+        with self.assertRaises(MessageBusException):
+            api.begin()
+        with self.assertRaises(MessageBusException):
+            build_mock_producer(transactional_id="test", outbox=object())
+
+        api = build_mock_producer(transactional_id="test-state")
+        with self.assertRaises(MessageBusException):
+            api.commit()
+        api.begin()
+        with self.assertRaises(MessageBusException):
+            api.begin()
+        api.abort()
+
+
+if __name__ == '__main__':
+    unittest.main()
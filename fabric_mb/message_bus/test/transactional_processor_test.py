@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Module to test the exactly-once consume-transform-produce loop
+"""
+import time
+import unittest
+
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.test.fake_kafka import build_mock_consumer, build_mock_producer, get_bootstrap_servers, \
+    read_messages
+from fabric_mb.message_bus.test.message_samples import build_query
+from fabric_mb.message_bus.transactional_processor import TransactionalProcessor
+
+REQUESTS = "requests"
+REPLIES = "replies"
+COUNT = 10
+
+
+class FailingProcessor(TransactionalProcessor):
+    """
+    Replies to each request, failing the transaction of the first batch
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = []
+
+    def transform(self, message):
+        self.received.append(message.get_message_id())
+        # Not a topic; produce raises and the transaction is aborted
+        topic = None if len(self.received) == 1 else REPLIES
+        return [(topic, build_query("reply-" + message.get_message_id()))]
+
+
+class TransactionalProcessorTest(unittest.TestCase):
+    """
+    Implements test functions
+    """
+    def test_process(self):
+        requests = build_mock_producer()
+        for i in range(COUNT):
+            requests.produce_async(REQUESTS, build_query("msg{}".format(i)))
+        self.assertEqual(0, requests.close())
+
+        producer = build_mock_producer({'linger.ms': 5000}, bootstrap_servers=get_bootstrap_servers(requests),
+                                       registry=requests.producer._serializer.registry_client,
+                                       transactional_id="test-processor")
+        consumer = build_mock_consumer(requests, [REQUESTS])
+        # The mock cluster does not store offsets committed in transactions; record them instead
+        offsets = {}
+        send_offsets = producer.send_offsets
+
+        def record_offsets(partitions, group_metadata, timeout=None):
+            send_offsets(partitions, group_metadata, timeout)
+            offsets.update({(tp.topic, tp.partition): tp.offset for tp in partitions})
+
+        producer.send_offsets = record_offsets
+        processor = FailingProcessor(consumer, producer, max_batch_size=COUNT)
+        consumer.consumer.subscribe([REQUESTS])
+        deadline = time.monotonic() + 30
+        while sum(offsets.values()) < COUNT and time.monotonic() < deadline:
+            processor.process_next()
+        consumer.consumer.close()
+
+        # The aborted batch was consumed again, and committed with its replies
+        self.assertEqual(1, processor.aborted)
+        self.assertEqual(COUNT, sum(offsets.values()))
+        self.assertEqual(COUNT, len(set(processor.received)))
+        self.assertEqual(sorted("reply-msg{}".format(i) for i in range(COUNT)),
+                         sorted(m.get_message_id() for m in read_messages(producer, REPLIES)))
+
+    def test_not_transactional(self):
+        with self.assertRaises(MessageBusException):
+            TransactionalProcessor(build_mock_consumer(build_mock_producer(), [REQUESTS]), build_mock_producer())
+
+
+if __name__ == '__main__':
+    unittest.main()
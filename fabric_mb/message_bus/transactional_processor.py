@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Defines TransactionalProcessor, an exactly-once consume-transform-produce loop: the replies to a batch of
+requests and the consumed offsets of the batch are committed in a single transaction
+"""
+import traceback
+from typing import Callable, Iterable, List, Tuple
+
+from confluent_kafka import TopicPartition
+
+from fabric_mb.message_bus.base import Base
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+from fabric_mb.message_bus.message_bus_exception import MessageBusException
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.producer import AvroProducerApi
+
+Transform = Callable[[IMessageAvro], Iterable[Tuple[str, IMessageAvro]]]
+
+
+class TransactionalProcessor(Base):
+    """
+    Consumes requests with an AvroConsumerApi and writes the replies through a transactional AvroProducerApi. Each
+    batch of up to max_batch_size requests is processed in one transaction which also commits the offsets of the
+    batch, so a reply is written once per request even if the processor crashes in between:
+
+        processor = TransactionalProcessor(consumer, producer, transform=lambda ticket: [(topic, update_ticket)])
+        processor.run()
+
+    The consumer must be configured with 'enable.auto.commit': False, and consumers of the replies with
+    read_committed. A batch whose transaction is aborted is consumed again. A request whose transform raises gets no
+    reply and is not retried.
+    """
+    def __init__(self, consumer: AvroConsumerApi, producer: AvroProducerApi, transform: Transform = None,
+                 max_batch_size: int = 100, max_batch_wait: float = 1.0, logger=None):
+        """
+        Initialize the processor
+        :param consumer: consumer the requests are read from; its topics are subscribed to by run
+        :param producer: transactional producer the replies are written with
+        :param transform: callable returning the (topic, reply) pairs to write for a request; defaults to
+                          calling transform, which may be overridden instead
+        :param max_batch_size: maximum number of requests processed per transaction
+        :param max_batch_wait: maximum time in seconds to wait to fill a batch
+        :param logger: logger; defaults to the logger of the consumer
+        :raises MessageBusException if the producer is not transactional
+        """
+        super().__init__(logger if logger is not None else consumer.logger)
+        if producer.transactional_id is None:
+            raise MessageBusException("Producer is not transactional; pass transactional_id")
+        self.consumer = consumer
+        self.producer = producer
+        self.transform_function = transform
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.committed = 0
+        self.aborted = 0
+        self.running = False
+
+    def transform(self, message: IMessageAvro) -> Iterable[Tuple[str, IMessageAvro]]:
+        """
+        Return the replies to write for a request; may be overridden by the derived class
+        :param message: request
+        :return (topic, reply) pairs
+        """
+        if self.transform_function is None:
+            return []
+        return self.transform_function(message)
+
+    @staticmethod
+    def get_offsets(msgs: list) -> Tuple[List[TopicPartition], List[TopicPartition]]:
+        """
+        Return the offsets of the first message of a batch per partition, and of the message following the batch
+        :param msgs: messages returned by consumer.consume
+        :return offsets to rewind to, offsets to commit
+        """
+        first = {}
+        last = {}
+        for msg in msgs:
+            if msg.error() is not None:
+                continue
+            tp = (msg.topic(), msg.partition())
+            first.setdefault(tp, msg.offset())
+            last[tp] = msg.offset()
+        return [TopicPartition(t, p, o) for (t, p), o in first.items()], \
+            [TopicPartition(t, p, o + 1) for (t, p), o in last.items()]
+
+    def process_batch(self, msgs: list) -> bool:
+        """
+        Process a batch of messages returned by consumer.consume in one transaction: write the replies of every
+        request along with the offsets of the batch. The consumer is rewound to the start of the batch if the
+        transaction is aborted
+        :param msgs: messages
+        :return True if the transaction was committed
+        """
+        start, offsets = self.get_offsets(msgs)
+        if len(offsets) == 0:
+            return True
+        messages = self.consumer.process_batch(msgs)
+        self.producer.begin()
+        try:
+            for message in messages:
+                try:
+                    replies = list(self.transform(message))
+                except Exception as e:
+                    self.log_error("Failed to process message {}: {}".format(message.get_message_id(), e))
+                    self.log_error(traceback.format_exc())
+                    continue
+                for topic, reply in replies:
+                    if not self.producer.produce_async(topic, reply):
+                        raise MessageBusException("Reply {} to {} not produced".format(reply.get_message_id(),
+                                                                                      message.get_message_id()))
+            self.producer.send_offsets(offsets, self.consumer.consumer.consumer_group_metadata())
+        except Exception as e:
+            self.log_error("Aborting transaction: {}".format(e))
+            self.log_error(traceback.format_exc())
+            self.producer.abort()
+            committed = False
+        else:
+            committed = self.producer.commit()
+        if committed:
+            self.committed += 1
+        else:
+            self.aborted += 1
+            self.rewind(start)
+        return committed
+
+    def rewind(self, offsets: List[TopicPartition]):
+        """
+        Seek back so that the messages of an aborted batch are consumed again
+        :param offsets: offset of the first message of the batch per partition
+        """
+        for tp in offsets:
+            try:
+                self.consumer.consumer.seek(tp)
+            except Exception as e:
+                # The partition was revoked; its new owner resumes from the committed offset
+                self.log_error("Failed to seek {} [{}] to offset {}: {}".format(tp.topic, tp.partition, tp.offset, e))
+
+    def process_next(self) -> int:
+        """
+        Consume a batch of up to max_batch_size messages and process it
+        :return number of messages consumed
+        """
+        msgs = self.consumer.consumer.consume(num_messages=self.max_batch_size, timeout=self.max_batch_wait)
+        if msgs:
+            self.process_batch(msgs)
+        return len(msgs)
+
+    def run(self):
+        """
+        Subscribe to the topics of the consumer and process batches until stop is called
+        """
+        self.running = True
+        self.consumer.consumer.subscribe(self.consumer.get_topics())
+        try:
+            while self.running:
+                try:
+                    self.process_next()
+                except KeyboardInterrupt:
+                    break
+        finally:
+            self.log_debug("Shutting down processor..")
+            self.consumer.close()
+
+    def stop(self):
+        """
+        Stop run once the batch in progress is processed
+        """
+        self.running = False